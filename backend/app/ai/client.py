@@ -0,0 +1,103 @@
+"""
+Process-wide Anthropic client.
+
+One AsyncAnthropic instance is created in the app lifespan and shared by all
+requests, so Claude calls reuse pooled HTTP connections and never block the
+event loop. A semaphore caps how many calls are in flight at once, so a burst
+of recommendation requests queues here instead of exhausting the pool; a
+call that queues longer than ANTHROPIC_QUEUE_TIMEOUT_SECONDS gives up, and
+callers serve their fallback.
+"""
+
+import asyncio
+import time
+from typing import Any, Optional
+
+import httpx
+from anthropic import AsyncAnthropic, DefaultAsyncHttpxClient
+from anthropic.types import Message
+
+from app.config.settings import get_settings
+from app.middleware.request_metrics import record_llm_call
+
+_client: Optional[AsyncAnthropic] = None
+_semaphore: Optional[asyncio.Semaphore] = None
+
+
+def init_anthropic_client() -> Optional[AsyncAnthropic]:
+    """
+    Create the shared Anthropic client (called from the app lifespan).
+
+    Returns:
+        The client, or None if no API key is configured
+    """
+    global _client, _semaphore
+
+    settings = get_settings()
+    if not settings.anthropic_api_key:
+        return None
+
+    _client = AsyncAnthropic(
+        api_key=settings.anthropic_api_key,
+        base_url=settings.anthropic_base_url,
+        timeout=settings.anthropic_timeout_seconds,
+        max_retries=settings.anthropic_max_retries,
+        http_client=DefaultAsyncHttpxClient(
+            limits=httpx.Limits(
+                max_connections=settings.anthropic_max_connections,
+                max_keepalive_connections=settings.anthropic_max_connections,
+            ),
+        ),
+    )
+    _semaphore = asyncio.Semaphore(settings.anthropic_max_concurrency)
+    return _client
+
+
+async def close_anthropic_client() -> None:
+    """Close the shared client and its connection pool."""
+    global _client, _semaphore
+
+    if _client is not None:
+        await _client.close()
+    _client = None
+    _semaphore = None
+
+
+def get_anthropic_client() -> Optional[AsyncAnthropic]:
+    """Get the shared client, or None if it is not configured."""
+    return _client
+
+
+async def create_message(**kwargs: Any) -> Message:
+    """
+    Call the Messages API through the shared client.
+
+    Waits for a free concurrency slot first. Accepts the same keyword
+    arguments as ``AsyncAnthropic.messages.create``. Latency (including
+    the wait) and token usage are recorded with the request metrics.
+
+    Raises:
+        RuntimeError: If the client has not been initialized
+        TimeoutError: If no slot frees up within the queue timeout
+    """
+    if _client is None or _semaphore is None:
+        raise RuntimeError("Anthropic client is not initialized")
+
+    started = time.perf_counter()
+    try:
+        await asyncio.wait_for(
+            _semaphore.acquire(), timeout=get_settings().anthropic_queue_timeout_seconds
+        )
+    except asyncio.TimeoutError:
+        raise TimeoutError("timed out waiting for a free Claude call slot") from None
+    try:
+        message = await _client.messages.create(**kwargs)
+    finally:
+        _semaphore.release()
+    record_llm_call(
+        model=kwargs.get("model", "unknown"),
+        seconds=time.perf_counter() - started,
+        input_tokens=message.usage.input_tokens,
+        output_tokens=message.usage.output_tokens,
+    )
+    return message
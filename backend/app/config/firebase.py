@@ -3,7 +3,10 @@ Firebase Admin SDK initialization.
 Handles authentication token verification and Firestore access.
 """
 
+import base64
+import hashlib
 import json
+import time
 from functools import lru_cache
 from typing import Optional
 
@@ -11,6 +14,7 @@ import firebase_admin
 from firebase_admin import auth, credentials, firestore
 
 from app.config.settings import get_settings
+from app.utils.cache import TTLCache
 
 
 def _get_credentials() -> credentials.Certificate:
@@ -49,20 +53,40 @@ def get_firestore_client() -> firestore.Client:
     return firestore.client()
 
 
+@lru_cache
+def _get_token_cache() -> TTLCache[dict]:
+    """Get the cache of verified ID tokens, keyed by token hash."""
+    return TTLCache(maxsize=get_settings().token_cache_size)
+
+
+def _token_cache_key(id_token: str) -> str:
+    return hashlib.sha256(id_token.encode()).hexdigest()
+
+
 def verify_firebase_token(id_token: str) -> Optional[dict]:
     """
     Verify a Firebase ID token and return the decoded token.
 
+    Successfully verified tokens are cached until their ``exp`` claim (capped
+    at ``token_cache_max_age_seconds``), so repeat requests with the same
+    token skip signature verification. The age cap bounds how long a token
+    revoked server-side keeps working. Failures are never cached.
+
     Args:
         id_token: The Firebase ID token from the client
 
     Returns:
         Decoded token dict with user info, or None if invalid
     """
+    cache = _get_token_cache()
+    key = _token_cache_key(id_token)
+    cached = cache.get(key)
+    if cached is not None:
+        return cached
+
     initialize_firebase()
     try:
         decoded_token = auth.verify_id_token(id_token)
-        return decoded_token
     except auth.InvalidIdTokenError:
         return None
     except auth.ExpiredIdTokenError:
@@ -70,6 +94,53 @@ def verify_firebase_token(id_token: str) -> Optional[dict]:
     except Exception:
         return None
 
+    max_age = get_settings().token_cache_max_age_seconds
+    expires_at = min(decoded_token.get("exp", 0), time.time() + max_age)
+    cache.set(key, decoded_token, expires_at=expires_at)
+    return decoded_token
+
+
+def _jwt_segment(data: dict) -> str:
+    return base64.urlsafe_b64encode(json.dumps(data).encode()).rstrip(b"=").decode()
+
+
+def prefetch_token_certificates() -> None:
+    """
+    Fetch Google's ID token signing certificates into the verifier's cache.
+
+    The Admin SDK caches the certificates according to their Cache-Control
+    headers and otherwise fetches them lazily during verification, inside a
+    user's request. Calling this on startup and periodically afterwards keeps
+    that cache warm.
+
+    Only public APIs are used: an unsigned token with valid claims passes
+    the SDK's claim checks, so verifying it fetches the certificates
+    (through the same cached session real verifications use) before its
+    signature is rejected.
+
+    Raises:
+        auth.CertificateFetchError: If the certificates couldn't be fetched
+    """
+    initialize_firebase()
+    project_id = firebase_admin.get_app().project_id
+    now = int(time.time())
+    dummy_token = ".".join([
+        _jwt_segment({"alg": "RS256", "kid": "certificate-prefetch", "typ": "JWT"}),
+        _jwt_segment({
+            "iss": f"https://securetoken.google.com/{project_id}",
+            "aud": project_id,
+            "sub": "certificate-prefetch",
+            "iat": now,
+            "exp": now + 300,
+        }),
+        "c2lnbmF0dXJl",
+    ])
+    try:
+        auth.verify_id_token(dummy_token)
+    except auth.InvalidIdTokenError:
+        # Expected: no certificate has the dummy key ID
+        pass
+
 
 def get_user_by_uid(uid: str) -> Optional[auth.UserRecord]:
     """Get Firebase user by UID."""
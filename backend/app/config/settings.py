@@ -27,8 +27,48 @@ class Settings(BaseSettings):
     firebase_service_account_path: Optional[str] = None
     firebase_service_account_json: Optional[str] = None
 
+    # Auth - verified ID token cache and signing certificate refresh
+    token_cache_size: int = 10000
+    token_cache_max_age_seconds: int = 300
+    token_cert_refresh_seconds: int = 600
+
+    # Cycle - per-user phase calendar cache
+    calendar_cache_size: int = 10000
+    calendar_cache_max_mb: int = 64
+
+    # Firestore - size of the thread pool that runs blocking client calls
+    firestore_max_workers: int = 32
+
+    # Instrumentation - per-request timing/Firestore/Claude summary header
+    server_timing_header: bool = True
+    # /metrics is only served with this set, as "Authorization: Bearer <token>"
+    metrics_token: Optional[str] = None
+
+    # Profiling - requests sending "X-Profile: <token>" are profiled with
+    # pyinstrument (must be installed) and saved as speedscope files
+    profiling_enabled: bool = False
+    profiling_token: Optional[str] = None
+    profiling_output_dir: str = "profiles"
+    profiling_interval_seconds: float = 0.001
+
+    # Bulk history import - rows accepted per upload
+    import_max_rows: int = 100000
+
+    # Data export - documents read per Firestore page
+    export_page_size: int = 500
+
     # Claude AI
     anthropic_api_key: Optional[str] = None
+    anthropic_base_url: Optional[str] = None  # Override to point at a mock server
+    anthropic_timeout_seconds: float = 20.0
+    anthropic_max_retries: int = 1
+    anthropic_max_concurrency: int = 16
+    anthropic_queue_timeout_seconds: float = 5.0  # Wait for a concurrency slot
+    anthropic_max_connections: int = 32
+
+    # Recommendation cache - "memory" (per process) or "firestore" (shared)
+    recommendation_cache_backend: str = "memory"
+    recommendation_cache_size: int = 10000
 
     # Vimeo (deferred)
     vimeo_access_token: Optional[str] = None
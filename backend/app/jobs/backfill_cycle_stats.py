@@ -0,0 +1,75 @@
+"""
+Backfill of the cycle stats document for existing users.
+
+Every cycle write now keeps ``users/{uid}/cycleStats/summary`` (cycle
+count, newest cycles, median and spread of their lengths, earliest start
+date) up to date, and reads that need counts or averages use it instead
+of re-reading cycles. Histories logged before it existed get it built on
+first use, which reads every cycle once; this job builds it ahead of time
+so no request pays for that.
+
+Users without cycles get empty stats, so their reads never fall back to
+a rebuild either. The job is idempotent: users who already have stats
+are skipped.
+
+Usage:
+    python -m app.jobs.backfill_cycle_stats [--dry-run] [--page-size 200]
+        [--start-after USER_ID]
+"""
+
+import argparse
+import asyncio
+from typing import Optional
+
+from app.config.firebase import get_firestore_client, initialize_firebase
+from app.services import cycle_service
+from app.utils.firestore import fetch_documents
+
+
+async def run(page_size: int, dry_run: bool, start_after: Optional[str] = None) -> tuple[int, int]:
+    """
+    Build cycle stats for every user without them.
+
+    Returns:
+        Tuple of (users checked, users whose stats were built)
+    """
+    db = get_firestore_client()
+    checked = built = 0
+    last_user_id = start_after
+
+    while True:
+        query = db.collection("users").order_by("__name__").limit(page_size)
+        if last_user_id:
+            query = query.start_after({"__name__": last_user_id})
+        users = await fetch_documents(query.select([]))
+        if not users:
+            break
+
+        for user in users:
+            checked += 1
+            if await cycle_service.build_cycle_stats(user.id, dry_run=dry_run):
+                built += 1
+
+        last_user_id = users[-1].id
+        print(f"through user {last_user_id}: checked={checked} built={built}")
+        if len(users) < page_size:
+            break
+
+    return checked, built
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Build cycle stats for existing users")
+    parser.add_argument("--dry-run", action="store_true", help="report without writing")
+    parser.add_argument("--page-size", type=int, default=200)
+    parser.add_argument("--start-after", help="resume after this user ID")
+    args = parser.parse_args()
+
+    initialize_firebase()
+    checked, built = asyncio.run(run(args.page_size, args.dry_run, args.start_after))
+    prefix = "Dry run" if args.dry_run else "Done"
+    print(f"{prefix}: {checked} users checked, stats built for {built}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,200 @@
+"""
+One-time migration of energy logs to date-keyed document IDs.
+
+Energy logs used to be stored under auto-generated IDs and found with a
+``date ==`` query; they now live at ``energy_logs/<YYYY-MM-DD>`` so logging
+is a single write and a day's log a single read. This job walks every user
+and rewrites each auto-ID log to its date key, normalizing ``date`` to a
+midnight UTC timestamp and keeping ``created_at``.
+
+Where several logs exist for one date (the old query-then-write could race),
+the most recently updated one wins. A date-keyed log written since the new
+code was deployed is kept if it is newer than the old ones.
+
+Each date is rewritten in its own transaction, which re-reads the
+date-keyed log and the old ones before writing: a log upserted while the
+job runs is never overwritten by an older one, and a user is never left
+with both copies of a log. The job is idempotent: rerunning it skips
+users that have nothing left to migrate.
+
+Usage:
+    python -m app.jobs.migrate_energy_log_ids [--dry-run] [--page-size 200]
+        [--start-after USER_ID]
+"""
+
+import argparse
+import asyncio
+from datetime import date, datetime, timezone
+from typing import Any, Optional
+
+from google.cloud.firestore_v1 import DocumentReference, DocumentSnapshot
+
+from app.config.firebase import get_firestore_client, initialize_firebase
+from app.services.energy_service import energy_log_id
+from app.utils.firestore import TransactionOps, fetch_documents, run_transaction
+
+
+class MigrationStats:
+    """Running totals for the migration."""
+
+    def __init__(self):
+        self.users = 0
+        self.migrated = 0
+        self.merged = 0
+        self.skipped = 0
+
+    def summary(self) -> str:
+        return (
+            f"users={self.users} migrated={self.migrated} "
+            f"duplicates_merged={self.merged} unreadable={self.skipped}"
+        )
+
+
+def _log_date(value: Any) -> Optional[date]:
+    """Date of a stored log, whatever type its ``date`` field ended up as."""
+    if isinstance(value, datetime):
+        return value.date()
+    if isinstance(value, date):
+        return value
+    if isinstance(value, str):
+        try:
+            return date.fromisoformat(value[:10])
+        except ValueError:
+            return None
+    return None
+
+
+def _as_utc(value: Any) -> datetime:
+    """Timestamp for ordering logs; missing or naive values count as UTC."""
+    if not isinstance(value, datetime):
+        return datetime.min.replace(tzinfo=timezone.utc)
+    return value if value.tzinfo else value.replace(tzinfo=timezone.utc)
+
+
+def plan_user_migration(
+    docs: list[DocumentSnapshot],
+) -> tuple[list[tuple[str, dict, list[DocumentSnapshot]]], int]:
+    """
+    Work out the rewrites for one user's energy logs.
+
+    Args:
+        docs: All of the user's energy log documents
+
+    Returns:
+        Tuple of (list of (date key, new document data, old documents to
+        delete), number of unreadable documents left in place)
+    """
+    by_key: dict[str, list[tuple[DocumentSnapshot, dict]]] = {}
+    skipped = 0
+    for doc in docs:
+        data = doc.to_dict()
+        log_date = _log_date(data.get("date"))
+        if log_date is None:
+            skipped += 1
+            continue
+        by_key.setdefault(energy_log_id(log_date), []).append((doc, data))
+
+    rewrites = []
+    for key, group in by_key.items():
+        legacy = [doc for doc, _ in group if doc.id != key]
+        if not legacy:
+            continue
+
+        # Newest entry wins; a date-keyed one already there competes too
+        _, newest = max(
+            group,
+            key=lambda entry: _as_utc(entry[1].get("updated_at") or entry[1].get("created_at")),
+        )
+        data = dict(newest)
+        data["date"] = datetime.combine(date.fromisoformat(key), datetime.min.time())
+        created = [d["created_at"] for _, d in group if isinstance(d.get("created_at"), datetime)]
+        if created:
+            data["created_at"] = min(created, key=_as_utc)
+        data.setdefault("updated_at", data.get("created_at", datetime.utcnow()))
+        rewrites.append((key, data, legacy))
+
+    return rewrites, skipped
+
+
+def _rewrite_date(
+    ops: TransactionOps,
+    key_ref: DocumentReference,
+    legacy_refs: list[DocumentReference],
+) -> None:
+    """Re-read one date's logs and rewrite them to the date key."""
+    docs = [ops.get(ref) for ref in [key_ref, *legacy_refs]]
+    rewrites, _ = plan_user_migration([doc for doc in docs if doc.exists])
+    for _, data, legacy in rewrites:
+        ops.set(key_ref, data)
+        for doc in legacy:
+            ops.delete(doc.reference)
+
+
+async def migrate_user(db: Any, user_id: str, dry_run: bool, stats: MigrationStats) -> None:
+    """Migrate one user's energy logs."""
+    logs_ref = db.collection("users").document(user_id).collection("energy_logs")
+    rewrites, skipped = plan_user_migration(await fetch_documents(logs_ref))
+    stats.skipped += skipped
+    if not rewrites:
+        return
+
+    stats.users += 1
+    stats.migrated += len(rewrites)
+    stats.merged += sum(len(legacy) for _, _, legacy in rewrites) - len(rewrites)
+    if dry_run:
+        return
+
+    for key, _, legacy in rewrites:
+        await run_transaction(
+            db,
+            _rewrite_date,
+            logs_ref.document(key),
+            [doc.reference for doc in legacy],
+        )
+
+
+async def run(page_size: int, dry_run: bool, start_after: Optional[str] = None) -> MigrationStats:
+    """
+    Migrate every user's energy logs.
+
+    Returns:
+        Totals for the run
+    """
+    db = get_firestore_client()
+    stats = MigrationStats()
+    last_user_id = start_after
+
+    while True:
+        query = db.collection("users").order_by("__name__").limit(page_size)
+        if last_user_id:
+            query = query.start_after({"__name__": last_user_id})
+        users = await fetch_documents(query.select([]))
+        if not users:
+            break
+
+        for user in users:
+            await migrate_user(db, user.id, dry_run, stats)
+
+        last_user_id = users[-1].id
+        print(f"through user {last_user_id}: {stats.summary()}")
+        if len(users) < page_size:
+            break
+
+    return stats
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Migrate energy logs to date-keyed IDs")
+    parser.add_argument("--dry-run", action="store_true", help="report without writing")
+    parser.add_argument("--page-size", type=int, default=200)
+    parser.add_argument("--start-after", help="resume after this user ID")
+    args = parser.parse_args()
+
+    initialize_firebase()
+    stats = asyncio.run(run(args.page_size, args.dry_run, args.start_after))
+    prefix = "Dry run" if args.dry_run else "Done"
+    print(f"{prefix}: {stats.summary()}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,250 @@
+"""
+Nightly batch job that pre-generates daily recommendations.
+
+Walks every user with cycle tracking enabled, works out their phase for the
+target day, and generates recommendations through recommendation_service so
+the results land in the recommendation cache. /recommendations/today then
+serves them from the cache and only falls back to live generation on a miss.
+
+Progress is checkpointed after each page of users, so an interrupted run
+resumes where it left off when restarted with the same arguments.
+
+Usage:
+    python -m app.jobs.pregenerate_recommendations [--days-ahead 1]
+        [--concurrency 8] [--rate 5] [--checkpoint pregenerate_checkpoint.json]
+
+Run it in the evening (of your users' main timezone) with --days-ahead 1, or
+shortly after midnight with --days-ahead 0. A shared cache backend
+(RECOMMENDATION_CACHE_BACKEND=firestore) is required for the API replicas to
+see the results; the job refuses to run without it.
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import sys
+import time
+from datetime import date, datetime
+from typing import Optional
+
+from app.ai.client import close_anthropic_client, init_anthropic_client
+from app.config.firebase import initialize_firebase
+from app.config.settings import get_settings
+from app.models.user import UserProfile
+from app.services import recommendation_service, user_service, workout_service
+from app.services.recommendation_cache import local_day_bounds
+from app.utils.cycle_calculations import calculate_current_phase
+
+
+class RateLimiter:
+    """Spaces out operations to at most ``rate`` per second."""
+
+    def __init__(self, rate: float):
+        self._interval = 1 / rate if rate > 0 else 0
+        self._next_slot = 0.0
+        self._lock = asyncio.Lock()
+
+    async def wait(self) -> None:
+        async with self._lock:
+            now = time.monotonic()
+            delay = self._next_slot - now
+            self._next_slot = max(now, self._next_slot) + self._interval
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+
+class JobStats:
+    """Running totals for throughput reporting."""
+
+    def __init__(self, users: int = 0, tokens: int = 0, skipped: int = 0, failed: int = 0):
+        self.users = users
+        self.tokens = tokens
+        self.skipped = skipped
+        self.failed = failed
+        self.started_at = time.monotonic()
+        self.users_this_run = 0
+        self.tokens_this_run = 0
+
+    def summary(self) -> str:
+        elapsed = max(time.monotonic() - self.started_at, 1e-9)
+        return (
+            f"users={self.users} skipped={self.skipped} failed={self.failed} "
+            f"tokens={self.tokens} | "
+            f"{self.users_this_run / elapsed:.2f} users/s, "
+            f"{self.tokens_this_run / elapsed:.1f} tokens/s"
+        )
+
+
+def _load_checkpoint(path: str, run_key: str) -> Optional[dict]:
+    if not os.path.exists(path):
+        return None
+    with open(path) as f:
+        checkpoint = json.load(f)
+    return checkpoint if checkpoint.get("run") == run_key else None
+
+
+def _save_checkpoint(path: str, checkpoint: dict) -> None:
+    # Write-then-rename so a crash never leaves a truncated checkpoint
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "w") as f:
+        json.dump(checkpoint, f)
+    os.replace(tmp_path, path)
+
+
+async def _pregenerate_for_user(
+    user: UserProfile,
+    days_ahead: int,
+    limiter: RateLimiter,
+    stats: JobStats,
+) -> None:
+    if user.last_period_start_date is None:
+        stats.skipped += 1
+        return
+
+    last_period = user.last_period_start_date.date() if isinstance(
+        user.last_period_start_date, datetime
+    ) else user.last_period_start_date
+    target_date, _ = local_day_bounds(user.timezone, days_ahead)
+
+    cycle_info = calculate_current_phase(
+        last_period_start=last_period,
+        average_cycle_length=user.average_cycle_length,
+        average_period_length=user.average_period_length,
+        reference_date=target_date,
+    )
+
+    await limiter.wait()
+    try:
+        result = await recommendation_service.get_recommendations_for_profile(
+            user,
+            phase=cycle_info.current_phase.value,
+            cycle_day=cycle_info.cycle_day,
+            days_ahead=days_ahead,
+        )
+    except Exception as e:
+        print(f"Failed to pre-generate for {user.id}: {e}")
+        stats.failed += 1
+        return
+    if result.message_json is not None:
+        # The fallback content: Claude failed and nothing was cached
+        print(f"Failed to pre-generate for {user.id}: got the fallback")
+        stats.failed += 1
+        return
+
+    stats.users += 1
+    stats.users_this_run += 1
+    stats.tokens += result.tokens_used
+    stats.tokens_this_run += result.tokens_used
+
+
+async def run(
+    days_ahead: int,
+    concurrency: int,
+    rate: float,
+    page_size: int,
+    checkpoint_path: str,
+) -> JobStats:
+    """
+    Pre-generate recommendations for every cycle-tracking user.
+
+    Returns:
+        Final JobStats for the run
+    """
+    run_key = f"{date.today().isoformat()}+{days_ahead}"
+    checkpoint = _load_checkpoint(checkpoint_path, run_key) or {"run": run_key}
+    if checkpoint.get("completed"):
+        print(f"Run {run_key} already completed; delete {checkpoint_path} to rerun")
+        return JobStats(**checkpoint.get("stats", {}))
+
+    stats = JobStats(**checkpoint.get("stats", {}))
+    last_user_id = checkpoint.get("last_user_id")
+    if last_user_id:
+        print(f"Resuming run {run_key} after user {last_user_id}")
+
+    limiter = RateLimiter(rate)
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def bounded(user: UserProfile) -> None:
+        async with semaphore:
+            await _pregenerate_for_user(user, days_ahead, limiter, stats)
+
+    while True:
+        users = await user_service.list_cycle_tracking_users(
+            limit=page_size, start_after=last_user_id
+        )
+        if not users:
+            break
+
+        await asyncio.gather(*(bounded(user) for user in users))
+
+        last_user_id = users[-1].id
+        checkpoint.update(
+            last_user_id=last_user_id,
+            stats={
+                "users": stats.users,
+                "tokens": stats.tokens,
+                "skipped": stats.skipped,
+                "failed": stats.failed,
+            },
+        )
+        _save_checkpoint(checkpoint_path, checkpoint)
+        print(stats.summary())
+
+        if len(users) < page_size:
+            break
+
+    checkpoint["completed"] = True
+    _save_checkpoint(checkpoint_path, checkpoint)
+    return stats
+
+
+async def _run_with_clients(args: argparse.Namespace) -> JobStats:
+    """Set up Firebase, the workout catalog and Claude the way the API does, then run."""
+    initialize_firebase()
+    # Prompts and cache keys are built from the catalog, so results made
+    # against any other catalog than the API's would never be served
+    await workout_service.load_workout_catalog()
+    if workout_service.catalog_is_placeholder():
+        print("Error: no workouts could be loaded from Firestore; not pre-generating")
+        sys.exit(1)
+
+    if init_anthropic_client() is None:
+        print("Warning: ANTHROPIC_API_KEY not set, nothing will be cached")
+    try:
+        return await run(
+            days_ahead=args.days_ahead,
+            concurrency=args.concurrency,
+            rate=args.rate,
+            page_size=args.page_size,
+            checkpoint_path=args.checkpoint,
+        )
+    finally:
+        await close_anthropic_client()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Pre-generate daily recommendations")
+    parser.add_argument("--days-ahead", type=int, default=1)
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--rate", type=float, default=5.0, help="max users started per second")
+    parser.add_argument("--page-size", type=int, default=200)
+    parser.add_argument("--checkpoint", default="pregenerate_checkpoint.json")
+    args = parser.parse_args()
+
+    # With a per-process cache the results would be dropped when the job
+    # exits, after paying for every Claude call
+    backend = get_settings().recommendation_cache_backend
+    if backend != "firestore":
+        print(
+            f"Error: RECOMMENDATION_CACHE_BACKEND is {backend!r}; set it to "
+            "'firestore' so the API replicas can serve the results"
+        )
+        sys.exit(1)
+
+    stats = asyncio.run(_run_with_clients(args))
+    print(f"Done: {stats.summary()}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,81 @@
+"""
+Finish account deletions that were interrupted.
+
+DELETE /users/me removes the profile at once and deletes the rest of the
+account's data in the background of the API process. If that process
+stops first (a deploy, a crash, a scale-down), the deletion record stays
+"running", or "failed" if the purge hit an error. This job finds records
+that haven't advanced for --stale-minutes and reruns the purge, which
+picks up whatever is left.
+
+Usage:
+    python -m app.jobs.resume_account_deletions [--stale-minutes 10]
+        [--dry-run]
+
+Run it on a schedule (every few minutes to hourly) so no account is left
+with orphaned data.
+"""
+
+import argparse
+import asyncio
+from datetime import datetime, timedelta, timezone
+
+from google.cloud.firestore_v1 import FieldFilter
+
+from app.config.firebase import get_firestore_client, initialize_firebase
+from app.services import user_service
+from app.utils.firestore import fetch_documents, update_document
+
+
+def _as_utc(value: datetime) -> datetime:
+    return value if value.tzinfo else value.replace(tzinfo=timezone.utc)
+
+
+async def run(stale_minutes: int, dry_run: bool) -> int:
+    """
+    Resume stale account deletions.
+
+    Returns:
+        Number of deletions resumed
+    """
+    db = get_firestore_client()
+    cutoff = datetime.now(timezone.utc) - timedelta(minutes=stale_minutes)
+    query = db.collection(user_service.ACCOUNT_DELETIONS).where(
+        filter=FieldFilter("status", "in", ["running", "failed"])
+    )
+
+    # Few records are ever unfinished, so staleness is checked here rather
+    # than with a composite index
+    stale = [
+        doc for doc in await fetch_documents(query)
+        if _as_utc(doc.to_dict()["updated_at"]) < cutoff
+    ]
+
+    for doc in stale:
+        data = doc.to_dict()
+        print(f"user {doc.id}: {data['status']}, {data['documents_deleted']} deleted so far")
+        if dry_run:
+            continue
+        await update_document(doc.reference, {
+            "status": "running",
+            "updated_at": datetime.utcnow(),
+        })
+        await user_service.purge_user_data(doc.id)
+
+    return len(stale)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Finish interrupted account deletions")
+    parser.add_argument("--stale-minutes", type=int, default=10)
+    parser.add_argument("--dry-run", action="store_true", help="report without deleting")
+    args = parser.parse_args()
+
+    initialize_firebase()
+    resumed = asyncio.run(run(args.stale_minutes, args.dry_run))
+    prefix = "Dry run" if args.dry_run else "Done"
+    print(f"{prefix}: {resumed} deletions resumed")
+
+
+if __name__ == "__main__":
+    main()
@@ -3,14 +3,31 @@ Strength Grace & Flow API
 Backend for the cycle-synced fitness iOS app
 """
 
+import asyncio
 from contextlib import asynccontextmanager
 
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 
-from app.config.firebase import initialize_firebase
+from app.ai.client import close_anthropic_client, init_anthropic_client
+from app.config.firebase import initialize_firebase, prefetch_token_certificates
 from app.config.settings import get_settings
-from app.routers import cycle, energy, health, recommendations, users, workouts
+from app.middleware.request_context import RequestContextMiddleware
+from app.middleware.profiling import ProfilingMiddleware, profiling_available
+from app.middleware.request_metrics import RequestMetricsMiddleware
+from app.routers import cycle, energy, health, metrics, recommendations, users, workouts
+from app.services import user_service, workout_service
+from app.utils.firestore import shutdown_firestore_executor
+
+
+async def refresh_token_certificates(interval_seconds: int) -> None:
+    """Keep the ID token signing certificates warm in the background."""
+    while True:
+        try:
+            await asyncio.to_thread(prefetch_token_certificates)
+        except Exception as e:
+            print(f"Warning: token certificate refresh failed: {e}")
+        await asyncio.sleep(interval_seconds)
 
 
 @asynccontextmanager
@@ -19,16 +36,41 @@ async def lifespan(app: FastAPI):
     settings = get_settings()
 
     # Initialize Firebase Admin SDK
+    cert_refresh_task = None
+    firebase_ready = False
     try:
         initialize_firebase()
         print("Firebase Admin SDK initialized successfully")
+        firebase_ready = True
+        cert_refresh_task = asyncio.create_task(
+            refresh_token_certificates(settings.token_cert_refresh_seconds)
+        )
     except Exception as e:
         print(f"Warning: Firebase initialization failed: {e}")
         if settings.is_production:
             raise
 
+    # Workout library, kept current by a Firestore listener
+    if firebase_ready:
+        await workout_service.load_workout_catalog()
+        try:
+            workout_service.start_workout_catalog_listener()
+        except Exception as e:
+            print(f"Warning: workout catalog listener failed to start: {e}")
+
+    # Shared Claude client (connection pool + concurrency limit)
+    if init_anthropic_client() is None:
+        print("Warning: ANTHROPIC_API_KEY not set, using fallback recommendations")
+
     yield
 
+    workout_service.stop_workout_catalog_listener()
+    await user_service.finish_purges(timeout=5)
+    await close_anthropic_client()
+    if cert_refresh_task is not None:
+        cert_refresh_task.cancel()
+    shutdown_firestore_executor()
+
 
 app = FastAPI(
     title="Strength Grace & Flow API",
@@ -48,8 +90,20 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Request-scoped memo (e.g. user profile loaded once per request)
+app.add_middleware(RequestContextMiddleware)
+
+# Per-route latency, Firestore and Claude metrics (outermost, so it times
+# everything else)
+app.add_middleware(RequestMetricsMiddleware)
+
+# Opt-in per-request profiling; not added at all unless enabled
+if get_settings().profiling_enabled and profiling_available():
+    app.add_middleware(ProfilingMiddleware)
+
 # Include routers
 app.include_router(health.router, tags=["Health"])
+app.include_router(metrics.router, tags=["Health"])
 app.include_router(users.router)
 app.include_router(cycle.router)
 app.include_router(energy.router)
@@ -0,0 +1,103 @@
+"""
+Opt-in sampling profiler for single requests.
+
+With PROFILING_ENABLED set, a request carrying ``X-Profile: <PROFILING_TOKEN>``
+runs under pyinstrument and its profile is written as a speedscope file
+(open it at https://www.speedscope.app) to PROFILING_OUTPUT_DIR. The file
+name comes back in the ``X-Profile-File`` response header.
+
+When the setting is off the middleware is never added to the app, so
+ordinary deployments pay nothing; pyinstrument is only imported when it
+is on.
+"""
+
+import asyncio
+import hmac
+import importlib.util
+import re
+import time
+import uuid
+from pathlib import Path
+
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.config.settings import get_settings
+
+PROFILE_HEADER = "x-profile"
+PROFILE_FILE_HEADER = "X-Profile-File"
+
+
+def profiling_available() -> bool:
+    """Check that profiling can be turned on, printing why if it can't."""
+    if not get_settings().profiling_token:
+        print("Warning: PROFILING_ENABLED is set without PROFILING_TOKEN, profiling disabled")
+        return False
+    if importlib.util.find_spec("pyinstrument") is None:
+        print("Warning: PROFILING_ENABLED is set but pyinstrument is not installed")
+        return False
+    return True
+
+
+def _profile_filename(scope: Scope) -> str:
+    slug = re.sub(r"[^A-Za-z0-9]+", "-", scope["path"]).strip("-") or "root"
+    now = time.time()
+    # Milliseconds plus a random suffix, so profiles of the same route in
+    # the same instant never overwrite each other
+    stamp = f"{time.strftime('%Y%m%dT%H%M%S', time.localtime(now))}.{int(now * 1000) % 1000:03d}"
+    suffix = uuid.uuid4().hex[:6]
+    return f"{stamp}-{scope['method']}-{slug[:80]}-{suffix}.speedscope.json"
+
+
+def _write_profile(path: Path, content: str) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(content)
+
+
+class ProfilingMiddleware:
+    """ASGI middleware that profiles requests carrying the profiling header."""
+
+    def __init__(self, app: ASGIApp):
+        # Deferred so pyinstrument is only needed where profiling is enabled
+        from pyinstrument import Profiler
+        from pyinstrument.renderers import SpeedscopeRenderer
+
+        self.app = app
+        self._profiler_class = Profiler
+        self._renderer_class = SpeedscopeRenderer
+        settings = get_settings()
+        self.token = settings.profiling_token or ""
+        self.interval = settings.profiling_interval_seconds
+        self.output_dir = Path(settings.profiling_output_dir)
+        # The profiler hooks the event loop thread, so one profile at a time
+        self._busy = False
+
+    def _requested(self, scope: Scope) -> bool:
+        value = Headers(scope=scope).get(PROFILE_HEADER)
+        return bool(self.token and value) and hmac.compare_digest(
+            value.encode(), self.token.encode()
+        )
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or self._busy or not self._requested(scope):
+            await self.app(scope, receive, send)
+            return
+
+        filename = _profile_filename(scope)
+
+        async def send_with_filename(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                MutableHeaders(scope=message).append(PROFILE_FILE_HEADER, filename)
+            await send(message)
+
+        self._busy = True
+        profiler = self._profiler_class(interval=self.interval, async_mode="enabled")
+        profiler.start()
+        try:
+            await self.app(scope, receive, send_with_filename)
+        finally:
+            profiler.stop()
+            self._busy = False
+            content = profiler.output(renderer=self._renderer_class())
+            await asyncio.to_thread(_write_profile, self.output_dir / filename, content)
+            print(f"Profile written to {self.output_dir / filename}")
@@ -0,0 +1,42 @@
+"""
+Request-scoped context shared by services during a single API request.
+"""
+
+from contextvars import ContextVar
+from typing import Any, Optional
+
+from starlette.types import ASGIApp, Receive, Scope, Send
+
+# Per-request memo for values that are expensive to load and read by
+# several services in the same request (e.g. the user profile).
+_request_cache: ContextVar[Optional[dict[str, Any]]] = ContextVar(
+    "request_cache", default=None
+)
+
+
+def get_request_cache() -> Optional[dict[str, Any]]:
+    """
+    Get the memo dict for the current request.
+
+    Returns None outside of an HTTP request (background jobs, scripts),
+    in which case callers should skip memoization.
+    """
+    return _request_cache.get()
+
+
+class RequestContextMiddleware:
+    """ASGI middleware that opens a fresh request cache for each HTTP request."""
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        token = _request_cache.set({})
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            _request_cache.reset(token)
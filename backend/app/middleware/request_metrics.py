@@ -0,0 +1,269 @@
+"""
+Per-request latency, Firestore and Claude instrumentation.
+
+RequestMetricsMiddleware opens a RequestStats for each HTTP request. The
+Firestore helpers in app/utils/firestore.py and the shared Claude client
+add to it as calls complete. When the request finishes, its totals are
+recorded per route on /metrics and summarized in a Server-Timing
+response header, so N+1 read patterns show up without a profiler.
+"""
+
+import time
+from contextvars import ContextVar
+from datetime import datetime
+from typing import Any, Optional
+
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.config.settings import get_settings
+from app.utils.metrics import LATENCY_BUCKETS, Counter, Histogram
+
+# Reads per request: 0 (cache hit) up to a long history listing
+_READ_BUCKETS = (0, 1, 2, 3, 5, 10, 25, 50, 100, 250, 1000)
+
+HTTP_REQUEST_DURATION = Histogram(
+    "http_request_duration_seconds",
+    "Wall time of HTTP requests",
+    LATENCY_BUCKETS,
+    labels=("method", "route"),
+)
+HTTP_REQUESTS = Counter(
+    "http_requests_total",
+    "HTTP requests served",
+    labels=("method", "route", "status"),
+)
+FIRESTORE_READS_PER_REQUEST = Histogram(
+    "http_request_firestore_reads",
+    "Firestore documents read per HTTP request",
+    _READ_BUCKETS,
+    labels=("method", "route"),
+)
+FIRESTORE_READS = Counter(
+    "firestore_reads_total",
+    "Firestore documents read",
+    labels=("route",),
+)
+FIRESTORE_WRITES = Counter(
+    "firestore_writes_total",
+    "Firestore documents written or deleted",
+    labels=("route",),
+)
+FIRESTORE_READ_BYTES = Counter(
+    "firestore_read_bytes_total",
+    "Estimated storage size of Firestore documents read",
+    labels=("route",),
+)
+FIRESTORE_CALL_DURATION = Histogram(
+    "firestore_call_duration_seconds",
+    "Wall time of Firestore calls, including the wait for a pool thread",
+    LATENCY_BUCKETS,
+    labels=("operation",),
+)
+LLM_CALL_DURATION = Histogram(
+    "llm_call_duration_seconds",
+    "Wall time of Claude calls, including the wait for a concurrency slot",
+    LATENCY_BUCKETS,
+    labels=("model",),
+)
+LLM_TOKENS = Counter(
+    "llm_tokens_total",
+    "Claude tokens used",
+    labels=("model", "kind"),
+)
+
+# Label for requests outside every route (404s), keeping cardinality bounded
+_UNMATCHED_ROUTE = "unmatched"
+# Label for work done outside an HTTP request (startup, listeners, jobs)
+_NO_ROUTE = "none"
+
+
+class RequestStats:
+    """Counters for one HTTP request."""
+
+    __slots__ = (
+        "firestore_calls",
+        "firestore_reads",
+        "firestore_writes",
+        "firestore_bytes_read",
+        "firestore_seconds",
+        "llm_calls",
+        "llm_seconds",
+        "llm_input_tokens",
+        "llm_output_tokens",
+    )
+
+    def __init__(self):
+        self.firestore_calls = 0
+        self.firestore_reads = 0
+        self.firestore_writes = 0
+        self.firestore_bytes_read = 0
+        self.firestore_seconds = 0.0
+        self.llm_calls = 0
+        self.llm_seconds = 0.0
+        self.llm_input_tokens = 0
+        self.llm_output_tokens = 0
+
+
+_request_stats: ContextVar[Optional[RequestStats]] = ContextVar(
+    "request_stats", default=None
+)
+
+
+def get_request_stats() -> Optional[RequestStats]:
+    """Get the current request's stats, or None outside of an HTTP request."""
+    return _request_stats.get()
+
+
+def record_firestore_call(
+    operation: str,
+    seconds: float,
+    reads: int = 0,
+    writes: int = 0,
+    bytes_read: int = 0,
+) -> None:
+    """
+    Record a completed Firestore call.
+
+    Args:
+        operation: Helper name, used as the latency label (get, query, set, ...)
+        seconds: Wall time of the call
+        reads: Documents read (billed reads, so at least 1 for a get or query)
+        writes: Documents written or deleted
+        bytes_read: Estimated storage size of the documents read
+    """
+    FIRESTORE_CALL_DURATION.observe(seconds, operation=operation)
+    stats = _request_stats.get()
+    if stats is None:
+        # Not part of a request: count under a fixed label
+        FIRESTORE_READS.inc(reads, route=_NO_ROUTE)
+        FIRESTORE_WRITES.inc(writes, route=_NO_ROUTE)
+        FIRESTORE_READ_BYTES.inc(bytes_read, route=_NO_ROUTE)
+        return
+
+    stats.firestore_calls += 1
+    stats.firestore_reads += reads
+    stats.firestore_writes += writes
+    stats.firestore_bytes_read += bytes_read
+    stats.firestore_seconds += seconds
+
+
+def record_llm_call(model: str, seconds: float, input_tokens: int, output_tokens: int) -> None:
+    """Record a completed Claude call."""
+    LLM_CALL_DURATION.observe(seconds, model=model)
+    LLM_TOKENS.inc(input_tokens, model=model, kind="input")
+    LLM_TOKENS.inc(output_tokens, model=model, kind="output")
+
+    stats = _request_stats.get()
+    if stats is not None:
+        stats.llm_calls += 1
+        stats.llm_seconds += seconds
+        stats.llm_input_tokens += input_tokens
+        stats.llm_output_tokens += output_tokens
+
+
+def _value_size(value: Any) -> int:
+    # Firestore's documented storage sizes per value type
+    if value is None or isinstance(value, bool):
+        return 1
+    if isinstance(value, (int, float, datetime)):
+        return 8
+    if isinstance(value, str):
+        return len(value.encode()) + 1
+    if isinstance(value, bytes):
+        return len(value)
+    if isinstance(value, dict):
+        return sum(len(k.encode()) + 1 + _value_size(v) for k, v in value.items())
+    if isinstance(value, (list, tuple)):
+        return sum(_value_size(v) for v in value)
+    path = getattr(value, "path", None)
+    if isinstance(path, str):
+        # DocumentReference
+        return _name_size(path)
+    # GeoPoint and anything else
+    return 16
+
+
+def _name_size(path: str) -> int:
+    return sum(len(segment.encode()) + 1 for segment in path.split("/")) + 16
+
+
+def document_size(snapshot) -> int:
+    """
+    Estimate a document's storage size, per Firestore's sizing rules.
+
+    Returns 0 for documents that don't exist.
+    """
+    if not snapshot.exists:
+        return 0
+    return _name_size(snapshot.reference.path) + _value_size(snapshot.to_dict()) + 32
+
+
+def _route_label(scope: Scope) -> str:
+    route = scope.get("route")
+    path = getattr(route, "path", None)
+    return path if path else _UNMATCHED_ROUTE
+
+
+def _server_timing(stats: RequestStats, total_seconds: float) -> str:
+    entries = [f"app;dur={total_seconds * 1000:.1f}"]
+    if stats.firestore_calls:
+        entries.append(
+            f'firestore;dur={stats.firestore_seconds * 1000:.1f};'
+            f'desc="{stats.firestore_reads} reads, {stats.firestore_writes} writes, '
+            f'{stats.firestore_bytes_read} B"'
+        )
+    if stats.llm_calls:
+        entries.append(
+            f'llm;dur={stats.llm_seconds * 1000:.1f};'
+            f'desc="{stats.llm_input_tokens} in, {stats.llm_output_tokens} out tokens"'
+        )
+    return ", ".join(entries)
+
+
+class RequestMetricsMiddleware:
+    """ASGI middleware that times requests and records their per-route totals."""
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+        self.server_timing = get_settings().server_timing_header
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        stats = RequestStats()
+        token = _request_stats.set(stats)
+        started = time.perf_counter()
+        status = 500
+
+        async def send_with_timing(message: Message) -> None:
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+                if self.server_timing:
+                    # Covers the work done before the response starts, which
+                    # is all of it for anything but a streamed body
+                    headers = MutableHeaders(scope=message)
+                    headers.append(
+                        "Server-Timing",
+                        _server_timing(stats, time.perf_counter() - started),
+                    )
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_timing)
+        finally:
+            _request_stats.reset(token)
+            elapsed = time.perf_counter() - started
+            method = scope["method"]
+            route = _route_label(scope)
+            HTTP_REQUEST_DURATION.observe(elapsed, method=method, route=route)
+            HTTP_REQUESTS.inc(method=method, route=route, status=status)
+            FIRESTORE_READS_PER_REQUEST.observe(
+                stats.firestore_reads, method=method, route=route
+            )
+            FIRESTORE_READS.inc(stats.firestore_reads, route=route)
+            FIRESTORE_WRITES.inc(stats.firestore_writes, route=route)
+            FIRESTORE_READ_BYTES.inc(stats.firestore_bytes_read, route=route)
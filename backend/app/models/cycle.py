@@ -96,6 +96,17 @@ class CycleData(BaseModel):
     created_at: datetime
 
 
+class CycleStats(BaseModel):
+    """Summary of a user's cycle history, kept up to date by every cycle write."""
+    count: int = 0
+    # The newest cycles (up to 24), newest first
+    recent: list[CycleData] = []
+    # Of the completed cycles among the newest 12
+    median: Optional[int] = None
+    stdev: Optional[float] = None
+    earliest_start: Optional[date] = None
+
+
 class CycleHistoryResponse(BaseModel):
     """API response for cycle history."""
     cycles: list[CycleData]
@@ -114,3 +125,21 @@ class CyclePredictionsResponse(BaseModel):
     """API response for cycle predictions."""
     predictions: list[PhasePrediction]
     next_period_start: Optional[date] = None
+
+
+class PhaseRun(BaseModel):
+    """Consecutive days sharing one predicted phase (compact calendar format)."""
+    start_date: date
+    phase: CyclePhase
+    length: int = Field(ge=1)
+    start_cycle_day: int
+    # Cycle day of the n-th day is start_cycle_day + n * cycle_day_step.
+    # The step is 0 for days before the last logged period, which all
+    # count as cycle day 1.
+    cycle_day_step: Literal[0, 1] = 1
+
+
+class CyclePredictionRunsResponse(BaseModel):
+    """API response for cycle predictions in run-length format."""
+    runs: list[PhaseRun]
+    next_period_start: Optional[date] = None
@@ -4,7 +4,7 @@ User models for API requests and responses.
 
 from datetime import date, datetime
 from enum import Enum
-from typing import Optional
+from typing import Literal, Optional
 
 from pydantic import BaseModel, EmailStr, Field
 
@@ -44,6 +44,7 @@ class UserBase(BaseModel):
     average_period_length: int = Field(default=5, ge=2, le=10)
     cycle_tracking_enabled: bool = True
     notifications_enabled: bool = True
+    timezone: Optional[str] = None  # IANA name, e.g. "America/New_York"
 
 
 class UserCreate(UserBase):
@@ -60,6 +61,7 @@ class UserUpdate(BaseModel):
     average_period_length: Optional[int] = Field(default=None, ge=2, le=10)
     cycle_tracking_enabled: Optional[bool] = None
     notifications_enabled: Optional[bool] = None
+    timezone: Optional[str] = None
     last_period_start_date: Optional[datetime] = None
 
 
@@ -82,3 +84,32 @@ class UserProfile(UserBase):
 class UserProfileResponse(BaseModel):
     """API response wrapper for user profile."""
     user: UserProfile
+
+
+class ImportRowError(BaseModel):
+    """A rejected row in a bulk history import."""
+    line: int
+    message: str
+
+
+class HistoryImportResponse(BaseModel):
+    """API response for a bulk history import."""
+    energy_logs_imported: int = 0
+    periods_imported: int = 0
+    workouts_imported: int = 0
+    duplicates_skipped: int = 0
+    rows_rejected: int = 0
+    errors: list[ImportRowError] = Field(default_factory=list)  # First 100 only
+    # False if the upload stopped early (unreadable input or row limit);
+    # rows before that point are still imported
+    complete: bool = True
+
+
+class AccountDeletionStatus(BaseModel):
+    """Progress of an account deletion (DELETE /users/me)."""
+    status: Literal["running", "completed", "failed"]
+    documents_deleted: int = 0
+    requested_at: datetime
+    updated_at: datetime
+    completed_at: Optional[datetime] = None
+    error: Optional[str] = None
@@ -106,6 +106,12 @@ class LogWorkoutRequest(BaseModel):
     notes: Optional[str] = None
 
 
+class ImportWorkoutRequest(LogWorkoutRequest):
+    """A past workout in a bulk history import."""
+
+    completed_at: datetime
+
+
 class WorkoutHistoryResponse(BaseModel):
     """Response for workout history endpoint."""
 
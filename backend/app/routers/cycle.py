@@ -3,19 +3,23 @@ Cycle tracking API endpoints.
 """
 
 from datetime import date
+from typing import Literal, Optional, Union
 
-from fastapi import APIRouter, HTTPException, Query, status
+from fastapi import APIRouter, HTTPException, Query, Request, Response, status
 
 from app.middleware.auth import CurrentUser
 from app.models.cycle import (
     CycleData,
     CycleHistoryResponse,
     CycleInfoResponse,
+    CyclePredictionRunsResponse,
     CyclePredictionsResponse,
     LogPeriodRequest,
     UpdateCycleRequest,
 )
 from app.services import cycle_service
+from app.utils.http_cache import CALENDAR_CACHE_CONTROL, conditional_response, make_etag
+from app.utils.responses import json_object, raw_json_response
 
 router = APIRouter(prefix="/api/v1/cycle", tags=["Cycle Tracking"])
 
@@ -83,7 +87,9 @@ async def get_cycle_history(
     Returns past cycles with start dates, lengths, and notes.
     Limited to the most recent cycles (default 12, max 24).
     """
-    cycles = await cycle_service.get_cycle_history(user.uid, limit=limit)
+    # The stats keep the newest 24 cycles, so this is one document read
+    stats = await cycle_service.get_cycle_stats(user.uid)
+    cycles = stats.recent[:limit]
 
     # Calculate average from completed cycles
     completed_cycles = [c for c in cycles if c.cycle_length is not None]
@@ -99,10 +105,24 @@ async def get_cycle_history(
     )
 
 
-@router.get("/predictions", response_model=CyclePredictionsResponse)
+@router.get(
+    "/predictions",
+    response_model=Union[CyclePredictionsResponse, CyclePredictionRunsResponse],
+)
 async def get_cycle_predictions(
+    request: Request,
+    response: Response,
     user: CurrentUser,
     days: int = Query(default=30, ge=7, le=90),
+    response_format: Literal["days", "runs"] = Query(
+        default="days",
+        alias="format",
+        description="'days' for one row per day, 'runs' for run-length phase segments",
+    ),
+    since: Optional[date] = Query(
+        default=None,
+        description="Only return days on or after this date",
+    ),
 ):
     """
     Get predicted cycle phases for upcoming days.
@@ -110,24 +130,48 @@ async def get_cycle_predictions(
     Predicts the menstrual cycle phase for each day based on
     the user's average cycle length and last period date.
 
+    With format=runs, consecutive days in the same phase are collapsed
+    into one segment (start date, phase, length, starting cycle day).
+
+    Supports If-None-Match: returns 304 when the calendar is unchanged.
+
     Returns 404 if no period has been logged yet.
     """
-    predictions, next_period = await cycle_service.get_cycle_predictions(
-        user.uid,
-        days_ahead=days,
-    )
-
-    if not predictions:
+    version = await cycle_service.get_calendar_version(user.uid)
+    if version is None:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="No cycle data found. Please log your first period to get predictions.",
         )
 
-    return CyclePredictionsResponse(
-        predictions=predictions,
-        next_period_start=next_period,
+    etag = make_etag("predictions", *version, days, response_format, since)
+    not_modified = conditional_response(request, response, etag, CALENDAR_CACHE_CONTROL)
+    if not_modified is not None:
+        return not_modified
+
+    # The calendar cache holds the encoded predictions, so the body is
+    # assembled from bytes (same shape as the response models)
+    if response_format == "runs":
+        runs, next_period = await cycle_service.get_cycle_prediction_runs_json(
+            user.uid,
+            days_ahead=days,
+            since=since,
+        )
+        body = json_object({"runs": runs or b"[]", "next_period_start": next_period})
+        return raw_json_response(body, response)
+
+    predictions, next_period = await cycle_service.get_cycle_predictions_json(
+        user.uid,
+        days_ahead=days,
+        since=since,
     )
 
+    body = json_object({
+        "predictions": predictions or b"[]",
+        "next_period_start": next_period,
+    })
+    return raw_json_response(body, response)
+
 
 @router.patch("/history/{cycle_id}", response_model=CycleData)
 async def update_cycle_entry(
@@ -0,0 +1,44 @@
+"""Prometheus-style metrics endpoint"""
+
+import hmac
+from typing import Optional
+
+from fastapi import APIRouter, Header, HTTPException, status
+from fastapi.responses import PlainTextResponse
+
+from app.config.settings import get_settings
+from app.utils.metrics import render_prometheus
+
+router = APIRouter()
+
+
+def _authorized(authorization: Optional[str], token: str) -> bool:
+    scheme, _, credentials = (authorization or "").partition(" ")
+    return scheme.lower() == "bearer" and hmac.compare_digest(
+        credentials.encode(), token.encode()
+    )
+
+
+@router.get("/metrics", response_class=PlainTextResponse, include_in_schema=False)
+async def metrics(authorization: Optional[str] = Header(default=None)):
+    """
+    Process metrics in Prometheus text exposition format.
+
+    Only served when METRICS_TOKEN is set, to scrapers sending it as
+    ``Authorization: Bearer <token>``; the output names every route and
+    the app's Firestore and Claude usage.
+    """
+    token = get_settings().metrics_token
+    if not token:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Not Found")
+    if not _authorized(authorization, token):
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Invalid metrics token",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
+
+    return PlainTextResponse(
+        render_prometheus(),
+        media_type="text/plain; version=0.0.4",
+    )
@@ -9,6 +9,7 @@ from pydantic import BaseModel
 
 from app.middleware.auth import CurrentUser
 from app.services import cycle_service, recommendation_service
+from app.utils.responses import json_object, raw_json_response
 
 router = APIRouter(prefix="/api/v1/recommendations", tags=["Recommendations"])
 
@@ -31,6 +32,42 @@ class DailyRecommendationResponse(BaseModel):
     cycle_day: int
 
 
+def _build_response(
+    result: recommendation_service.RecommendationResult,
+    phase: str,
+    cycle_day: int,
+):
+    """Build the response, splicing in pre-encoded fallback messages when present."""
+    recommendations = []
+    for i, rec in enumerate(result.recommendations):
+        workout_id = result.workout_ids[i] if i < len(result.workout_ids) else None
+        recommendations.append(
+            WorkoutRecommendation(
+                workout_title=rec.get("workout_title", ""),
+                workout_id=workout_id,
+                reason=rec.get("reason", ""),
+            )
+        )
+
+    if result.message_json is not None:
+        body = json_object({
+            "daily_message": result.message_json["daily_message"],
+            "recommendations": [r.model_dump() for r in recommendations],
+            "self_care_tip": result.message_json["self_care_tip"],
+            "phase": phase,
+            "cycle_day": cycle_day,
+        })
+        return raw_json_response(body)
+
+    return DailyRecommendationResponse(
+        daily_message=result.daily_message,
+        recommendations=recommendations,
+        self_care_tip=result.self_care_tip,
+        phase=phase,
+        cycle_day=cycle_day,
+    )
+
+
 @router.get("/today", response_model=DailyRecommendationResponse)
 async def get_today_recommendations(user: CurrentUser):
     """
@@ -61,22 +98,8 @@ async def get_today_recommendations(user: CurrentUser):
             detail="Failed to generate recommendations.",
         )
 
-    # Build response
-    recommendations = []
-    for i, rec in enumerate(result.recommendations):
-        workout_id = result.workout_ids[i] if i < len(result.workout_ids) else None
-        recommendations.append(
-            WorkoutRecommendation(
-                workout_title=rec.get("workout_title", ""),
-                workout_id=workout_id,
-                reason=rec.get("reason", ""),
-            )
-        )
-
-    return DailyRecommendationResponse(
-        daily_message=result.daily_message,
-        recommendations=recommendations,
-        self_care_tip=result.self_care_tip,
+    return _build_response(
+        result,
         phase=cycle_info.cycle.current_phase.value,
         cycle_day=cycle_info.cycle.cycle_day,
     )
@@ -112,21 +135,4 @@ async def get_phase_recommendations(
             detail="Failed to generate recommendations.",
         )
 
-    recommendations = []
-    for i, rec in enumerate(result.recommendations):
-        workout_id = result.workout_ids[i] if i < len(result.workout_ids) else None
-        recommendations.append(
-            WorkoutRecommendation(
-                workout_title=rec.get("workout_title", ""),
-                workout_id=workout_id,
-                reason=rec.get("reason", ""),
-            )
-        )
-
-    return DailyRecommendationResponse(
-        daily_message=result.daily_message,
-        recommendations=recommendations,
-        self_care_tip=result.self_care_tip,
-        phase=phase,
-        cycle_day=cycle_day,
-    )
+    return _build_response(result, phase=phase, cycle_day=cycle_day)
@@ -2,16 +2,22 @@
 User profile API endpoints.
 """
 
-from fastapi import APIRouter, HTTPException, status
+import asyncio
+from typing import Literal
+
+from fastapi import APIRouter, HTTPException, Query, Request, Response, status
+from fastapi.responses import StreamingResponse
 
 from app.middleware.auth import CurrentUser
 from app.models.user import (
+    AccountDeletionStatus,
+    HistoryImportResponse,
     UserCreate,
     UserProfile,
     UserProfileResponse,
     UserUpdate,
 )
-from app.services import user_service
+from app.services import export_service, import_service, user_service
 
 router = APIRouter(prefix="/api/v1/users", tags=["Users"])
 
@@ -43,15 +49,24 @@ async def create_current_user_profile(
     Create a profile for the current user.
 
     This should be called after initial authentication to set up the user's profile.
-    Returns 409 if a profile already exists.
+    Returns 409 if a profile already exists, or while a deletion of the
+    previous one is still removing its data.
     """
     # Check if profile already exists
-    existing = await user_service.get_user_profile(user.uid)
+    existing, deletion = await asyncio.gather(
+        user_service.get_user_profile(user.uid),
+        user_service.get_account_deletion(user.uid),
+    )
     if existing is not None:
         raise HTTPException(
             status_code=status.HTTP_409_CONFLICT,
             detail="User profile already exists. Use PATCH to update.",
         )
+    if deletion is not None and deletion.status != "completed":
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail="Account deletion in progress. Try again once it completes.",
+        )
 
     profile = await user_service.create_user_profile(
         user_id=user.uid,
@@ -83,20 +98,125 @@ async def update_current_user_profile(
     return UserProfileResponse(user=profile)
 
 
-@router.delete("/me", status_code=status.HTTP_204_NO_CONTENT)
-async def delete_current_user_profile(user: CurrentUser):
+@router.post(
+    "/me/import",
+    response_model=HistoryImportResponse,
+    openapi_extra={
+        "requestBody": {
+            "required": True,
+            "content": {
+                media_type: {"schema": {"type": "string"}}
+                for media_type in import_service.IMPORT_FORMATS
+            },
+        },
+    },
+)
+async def import_current_user_history(user: CurrentUser, request: Request):
+    """
+    Import historical energy, period and workout logs.
+
+    The body is NDJSON or CSV (by Content-Type), one log per row; see
+    import_service for the row format. It is processed as it streams in.
+    Invalid rows are skipped and reported; everything else is imported.
+    Returns 404 if the profile doesn't exist and 415 for other content types.
+    """
+    content_type = request.headers.get("content-type", "").split(";")[0].strip().lower()
+    upload_format = import_service.IMPORT_FORMATS.get(content_type)
+    if upload_format is None:
+        raise HTTPException(
+            status_code=status.HTTP_415_UNSUPPORTED_MEDIA_TYPE,
+            detail=f"Content-Type must be one of: {', '.join(import_service.IMPORT_FORMATS)}",
+        )
+
+    if await user_service.get_user_profile(user.uid) is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="User profile not found. Please create a profile first.",
+        )
+
+    return await import_service.import_history(user.uid, request.stream(), upload_format)
+
+
+@router.get(
+    "/me/export",
+    response_class=StreamingResponse,
+    responses={200: {"content": {"application/x-ndjson": {}, "application/zip": {}}}},
+)
+async def export_current_user_data(
+    user: CurrentUser,
+    export_format: Literal["ndjson", "csv"] = Query(
+        default="ndjson",
+        alias="format",
+        description="'ndjson' for one JSON object per line, 'csv' for a zip of CSV files",
+    ),
+):
+    """
+    Export the current user's profile, cycle history, energy logs and workout history.
+
+    The body is streamed as the data is read, so any size of history
+    downloads in constant memory. Rows match the bulk import format.
+    Returns 404 if the profile doesn't exist.
+    """
+    profile = await user_service.get_user_profile(user.uid)
+    if profile is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="User profile not found.",
+        )
+
+    if export_format == "csv":
+        return StreamingResponse(
+            export_service.export_csv_zip(user.uid, profile),
+            media_type="application/zip",
+            headers={"Content-Disposition": 'attachment; filename="export.zip"'},
+        )
+
+    return StreamingResponse(
+        export_service.export_ndjson(user.uid, profile),
+        media_type="application/x-ndjson",
+        headers={"Content-Disposition": 'attachment; filename="export.ndjson"'},
+    )
+
+
+@router.delete(
+    "/me",
+    response_model=AccountDeletionStatus,
+    status_code=status.HTTP_202_ACCEPTED,
+)
+async def delete_current_user_profile(user: CurrentUser, response: Response):
     """
     Delete the current user's profile and all associated data.
 
     This is a destructive operation and cannot be undone.
+    The profile is removed immediately; the rest of the data is deleted in
+    the background, with progress at GET /me/deletion (the Location header).
     Note: This only deletes Firestore data, not the Firebase Auth account.
     """
-    deleted = await user_service.delete_user_profile(user.uid)
+    deletion = await user_service.delete_user_profile(user.uid)
 
-    if not deleted:
+    if deletion is None:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="User profile not found.",
         )
 
-    return None
+    response.headers["Location"] = router.url_path_for("get_current_user_deletion")
+    return deletion
+
+
+@router.get("/me/deletion", response_model=AccountDeletionStatus)
+async def get_current_user_deletion(user: CurrentUser):
+    """
+    Get the progress of the current user's account deletion.
+
+    Returns 404 if the account hasn't been deleted.
+    """
+    deletion = await user_service.get_account_deletion(user.uid)
+
+    if deletion is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="No account deletion found.",
+        )
+
+    return deletion
@@ -4,7 +4,7 @@ Workout API endpoints.
 
 from typing import Optional
 
-from fastapi import APIRouter, HTTPException, Query, status
+from fastapi import APIRouter, HTTPException, Query, Request, Response, status
 
 from app.middleware.auth import CurrentUser
 from app.models.workout import (
@@ -18,12 +18,16 @@ from app.models.workout import (
     WorkoutListResponse,
 )
 from app.services import workout_service
+from app.utils.http_cache import CATALOG_CACHE_CONTROL, conditional_response, make_etag
+from app.utils.responses import json_array, json_object, raw_json_response
 
 router = APIRouter(prefix="/api/v1/workouts", tags=["Workouts"])
 
 
 @router.get("", response_model=WorkoutListResponse)
 async def get_workouts(
+    request: Request,
+    response: Response,
     user: CurrentUser,
     category: Optional[WorkoutCategory] = Query(default=None),
     intensity: Optional[IntensityLevel] = Query(default=None),
@@ -35,8 +39,24 @@ async def get_workouts(
     Get all workouts with optional filters.
 
     Filter by category, intensity level, or recommended cycle phase.
+    Supports If-None-Match: returns 304 when the catalog is unchanged.
     """
-    workouts, total = await workout_service.get_all_workouts(
+    etag = make_etag(
+        "workouts",
+        workout_service.get_workout_catalog().digest,
+        category,
+        intensity,
+        phase,
+        limit,
+        offset,
+    )
+    not_modified = conditional_response(request, response, etag, CATALOG_CACHE_CONTROL)
+    if not_modified is not None:
+        return not_modified
+
+    # Summaries come pre-serialized from the catalog (same shape as
+    # WorkoutListResponse)
+    workouts, total = await workout_service.get_all_workouts_json(
         category=category,
         intensity=intensity,
         phase=phase,
@@ -44,15 +64,18 @@ async def get_workouts(
         offset=offset,
     )
 
-    return WorkoutListResponse(
-        workouts=workouts,
-        total=total,
-        has_more=(offset + len(workouts)) < total,
-    )
+    body = json_object({
+        "workouts": json_array(workouts),
+        "total": total,
+        "has_more": (offset + len(workouts)) < total,
+    })
+    return raw_json_response(body, response)
 
 
 @router.get("/recommended", response_model=WorkoutListResponse)
 async def get_recommended_workouts(
+    request: Request,
+    response: Response,
     user: CurrentUser,
     phase: CyclePhase = Query(..., description="Current cycle phase"),
     limit: int = Query(default=4, ge=1, le=10),
@@ -62,17 +85,27 @@ async def get_recommended_workouts(
 
     Returns workouts best suited for the user's current phase.
     """
-    workouts = await workout_service.get_recommended_workouts(phase=phase, limit=limit)
-
-    return WorkoutListResponse(
-        workouts=workouts,
-        total=len(workouts),
-        has_more=False,
+    etag = make_etag(
+        "recommended", workout_service.get_workout_catalog().digest, phase, limit
     )
+    not_modified = conditional_response(request, response, etag, CATALOG_CACHE_CONTROL)
+    if not_modified is not None:
+        return not_modified
+
+    workouts = await workout_service.get_recommended_workouts_json(phase=phase, limit=limit)
+
+    body = json_object({
+        "workouts": json_array(workouts),
+        "total": len(workouts),
+        "has_more": False,
+    })
+    return raw_json_response(body, response)
 
 
 @router.get("/{workout_id}", response_model=WorkoutDetailResponse)
 async def get_workout(
+    request: Request,
+    response: Response,
     user: CurrentUser,
     workout_id: str,
 ):
@@ -81,7 +114,12 @@ async def get_workout(
 
     Returns full workout details including description and video URL.
     """
-    workout = await workout_service.get_workout_by_id(workout_id)
+    etag = make_etag("workout", workout_service.get_workout_catalog().digest, workout_id)
+    not_modified = conditional_response(request, response, etag, CATALOG_CACHE_CONTROL)
+    if not_modified is not None:
+        return not_modified
+
+    workout = await workout_service.get_workout_json_by_id(workout_id)
 
     if workout is None:
         raise HTTPException(
@@ -89,7 +127,7 @@ async def get_workout(
             detail="Workout not found",
         )
 
-    return WorkoutDetailResponse(workout=workout)
+    return raw_json_response(json_object({"workout": workout}), response)
 
 
 @router.post("/history", response_model=WorkoutHistory, status_code=status.HTTP_201_CREATED)
@@ -2,27 +2,299 @@
 Cycle tracking service for Firestore operations.
 """
 
-from datetime import date, datetime
+from datetime import date, datetime, time, timedelta
+from functools import lru_cache
+import statistics
 from typing import Optional
 import uuid
 
+from google.cloud.firestore_v1 import DocumentReference
+from pydantic import TypeAdapter
+
 from app.config.firebase import get_firestore_client
+from app.config.settings import get_settings
 from app.models.cycle import (
     CycleData,
     CycleInfo,
     CycleInfoResponse,
+    CycleStats,
     LogPeriodRequest,
     PhasePrediction,
+    PhaseRun,
     UpdateCycleRequest,
 )
-from app.models.user import UserUpdate
+from app.models.user import UserProfile, UserUpdate
 from app.services import user_service
 from app.utils.cycle_calculations import (
     calculate_current_phase,
     calculate_median,
     estimate_next_period,
-    predict_phases,
+    predict_phase_range,
+    predict_phase_runs,
+    prediction_window,
+)
+from app.utils.firestore import (
+    MAX_BATCH_WRITES,
+    BatchWriter,
+    TransactionOps,
+    commit_batch,
+    delete_document,
+    fetch_documents,
+    get_document,
+    run_transaction,
+    update_document,
 )
+from app.utils.cache import TTLCache
+from app.utils.responses import json_array
+
+# Rough in-memory size of one cached PhasePrediction plus its encoded JSON,
+# for the memory budget
+_PREDICTION_BYTES = 350
+
+_PHASE_RUNS_ADAPTER = TypeAdapter(list[PhaseRun])
+
+# Newest cycles kept in a user's cycle stats: as many as /cycle/history
+# returns. The phase calendar goes back to the oldest of them, and the
+# profile's averages use the newest AVERAGE_WINDOW.
+STATS_RECENT = 24
+AVERAGE_WINDOW = 12
+
+# id -> cycle fields (with plain dates) of the cycles a stats update knows of
+_Cycles = dict[str, dict]
+
+
+@lru_cache
+def _get_calendar_cache() -> TTLCache[tuple]:
+    """
+    Get the per-user phase calendar cache.
+
+    Maps user_id -> (fingerprint, _PhaseCalendar). The fingerprint
+    holds the cycle settings, request window and today's date, so a stale
+    entry is never served even if an invalidation is missed.
+    """
+    settings = get_settings()
+    return TTLCache(
+        maxsize=settings.calendar_cache_size,
+        max_weight=settings.calendar_cache_max_mb * 1024 * 1024,
+    )
+
+
+def invalidate_phase_calendar(user_id: str) -> None:
+    """Drop a user's cached phase calendar after a cycle-related write."""
+    _get_calendar_cache().pop(user_id)
+
+
+def _midnight(day: date) -> datetime:
+    """A date as stored in Firestore, which has no date type."""
+    return datetime.combine(day, datetime.min.time())
+
+
+def _stats_ref(user_ref: DocumentReference) -> DocumentReference:
+    return user_ref.collection("cycleStats").document("summary")
+
+
+def _cycle_fields(data: dict) -> dict:
+    """A stored cycle, or a stats entry, with plain dates."""
+    end_date = data.get("end_date")
+    return {
+        "start_date": data["start_date"].date(),
+        "end_date": end_date.date() if end_date else None,
+        "cycle_length": data.get("cycle_length"),
+        "notes": data.get("notes"),
+        "created_at": data.get("created_at"),
+    }
+
+
+def _build_stats(count: int, cycles: _Cycles, earliest: Optional[date]) -> dict:
+    """
+    Build the stored cycle stats for a user's history.
+
+    Args:
+        count: Number of cycles in the history
+        cycles: Its newest cycles: at least STATS_RECENT of them, or all
+        earliest: Its earliest start date
+
+    Returns:
+        Stats document data
+    """
+    # In get_cycle_history's order
+    newest = sorted(
+        cycles.items(), key=lambda item: (item[1]["start_date"], item[0]), reverse=True
+    )[:STATS_RECENT]
+    lengths = [
+        cycle["cycle_length"]
+        for _, cycle in newest[:AVERAGE_WINDOW]
+        if cycle["cycle_length"] is not None
+    ]
+    return {
+        "count": count,
+        "recent": [
+            {
+                **cycle,
+                "id": cycle_id,
+                "start_date": _midnight(cycle["start_date"]),
+                "end_date": _midnight(cycle["end_date"]) if cycle["end_date"] else None,
+            }
+            for cycle_id, cycle in newest
+        ],
+        "median": calculate_median(lengths) if lengths else None,
+        "stdev": round(statistics.stdev(lengths), 2) if len(lengths) >= 2 else None,
+        "earliest_start": _midnight(earliest) if earliest else None,
+        "updated_at": datetime.utcnow(),
+    }
+
+
+def _parse_stats(data: dict, user_id: str) -> CycleStats:
+    earliest = data.get("earliest_start")
+    recent = []
+    for cycle in data["recent"]:
+        fields = _cycle_fields(cycle)
+        fields["created_at"] = fields["created_at"] or datetime.utcnow()
+        recent.append(CycleData(id=cycle["id"], user_id=user_id, **fields))
+    return CycleStats(
+        count=data["count"],
+        recent=recent,
+        median=data.get("median"),
+        stdev=data.get("stdev"),
+        earliest_start=earliest.date() if earliest else None,
+    )
+
+
+def _profile_averages(stats: dict, now: datetime) -> dict:
+    """Profile fields set from the stats, as recalculate_and_update_averages does."""
+    # Gaps in a history (months without a log) or edited dates can push the
+    # median outside the range a profile accepts, so it is clamped
+    average_cycle_length = min(max(stats["median"] or 28, 21), 45)
+    return {
+        "average_cycle_length": average_cycle_length,
+        # No period end dates are logged yet, so this stays the default
+        "average_period_length": 5,
+        "updated_at": now,
+    }
+
+
+def _earliest(cycles: _Cycles) -> Optional[date]:
+    return min((cycle["start_date"] for cycle in cycles.values()), default=None)
+
+
+def _read_history(
+    ops: TransactionOps,
+    user_ref: DocumentReference,
+) -> tuple[int, _Cycles, Optional[date], bool]:
+    """
+    Read what a cycle write needs to update the user's stats.
+
+    Normally just the stats document. Stats are built from the whole
+    history for users who don't have them yet.
+
+    Returns:
+        Tuple of (cycle count, newest cycles, earliest start date,
+        whether the cycles are the whole history)
+    """
+    cycles_ref = user_ref.collection("cycleData")
+    snapshot = ops.get(_stats_ref(user_ref))
+
+    if not snapshot.exists:
+        docs = ops.query(cycles_ref)
+        cycles = {
+            doc.id: _cycle_fields(data)
+            for doc in docs
+            if (data := doc.to_dict()).get("start_date") is not None
+        }
+        return len(docs), cycles, _earliest(cycles), True
+
+    stats = snapshot.to_dict()
+    cycles = {cycle["id"]: _cycle_fields(cycle) for cycle in stats["recent"]}
+    earliest = stats["earliest_start"].date() if stats.get("earliest_start") else None
+    return stats["count"], cycles, earliest, False
+
+
+def _newest_cycles(ops: TransactionOps, user_ref: DocumentReference) -> _Cycles:
+    """
+    The newest STATS_RECENT + 1 cycles, for a write that takes one of the
+    stored cycles out of the newest: the next one along replaces it.
+    """
+    query = (
+        user_ref.collection("cycleData")
+        .order_by("start_date", direction="DESCENDING")
+        .limit(STATS_RECENT + 1)
+    )
+    return {
+        doc.id: _cycle_fields(data)
+        for doc in ops.query(query)
+        if (data := doc.to_dict()).get("start_date") is not None
+    }
+
+
+def _oldest_start(
+    ops: TransactionOps,
+    user_ref: DocumentReference,
+    excluding: str,
+) -> Optional[date]:
+    """Earliest start date of a user's cycles other than ``excluding``."""
+    query = user_ref.collection("cycleData").order_by("start_date").limit(2)
+    for doc in ops.query(query):
+        if doc.id != excluding:
+            return doc.to_dict()["start_date"].date()
+    return None
+
+
+def _rebuild_stats(
+    ops: TransactionOps,
+    user_ref: DocumentReference,
+    write: bool = True,
+) -> tuple[dict, bool]:
+    # Not for a deleted (or never created) user, whose stats would be orphaned
+    if not ops.get(user_ref).exists:
+        return _build_stats(0, {}, None), False
+
+    count, cycles, earliest, whole = _read_history(ops, user_ref)
+    stats = _build_stats(count, cycles, earliest)
+    if whole and write:
+        ops.set(_stats_ref(user_ref), stats)
+    return stats, whole
+
+
+async def get_cycle_stats(user_id: str) -> CycleStats:
+    """
+    Get a user's cycle stats: counts, averages and the newest cycles in
+    one document read.
+
+    Every cycle write keeps the stats document up to date in the same
+    transaction. Users without one (profiles from before it existed) have
+    it built from all of their cycles on first use.
+
+    Args:
+        user_id: Firebase user UID
+
+    Returns:
+        CycleStats (empty if no cycles are logged)
+    """
+    db = get_firestore_client()
+    user_ref = db.collection("users").document(user_id)
+
+    doc = await get_document(_stats_ref(user_ref))
+    if doc.exists:
+        return _parse_stats(doc.to_dict(), user_id)
+    stats, _ = await run_transaction(db, _rebuild_stats, user_ref)
+    return _parse_stats(stats, user_id)
+
+
+async def build_cycle_stats(user_id: str, dry_run: bool = False) -> bool:
+    """
+    Build a user's cycle stats from all of their cycles, if they have none.
+
+    Args:
+        user_id: Firebase user UID
+        dry_run: Only report whether they would be built
+
+    Returns:
+        True if the user had no stats document
+    """
+    db = get_firestore_client()
+    user_ref = db.collection("users").document(user_id)
+    _, built = await run_transaction(db, _rebuild_stats, user_ref, not dry_run)
+    return built
 
 
 async def get_current_cycle_info(user_id: str) -> Optional[CycleInfoResponse]:
@@ -63,12 +335,59 @@ async def get_current_cycle_info(user_id: str) -> Optional[CycleInfoResponse]:
     )
 
 
+def _log_period_transaction(
+    ops: TransactionOps,
+    user_ref: DocumentReference,
+    cycle_ref: DocumentReference,
+    cycle_data: dict,
+    previous_start: Optional[date],
+) -> None:
+    # Closing the open cycle, creating the new one, updating the stats and
+    # moving the user's last period date commit together, so a failure
+    # can't leave two open cycles, stats that miss a cycle or a profile
+    # pointing at a cycle that was never written
+    start = cycle_data["start_date"]
+    cycles_ref = user_ref.collection("cycleData")
+    count, cycles, earliest, whole = _read_history(ops, user_ref)
+
+    # If there's a previous cycle, find the open cycle and close it. The
+    # stats know it unless it is older than the cycles they keep.
+    open_ids = []
+    if previous_start:
+        open_ids = [
+            cycle_id for cycle_id, cycle in cycles.items() if cycle["end_date"] is None
+        ][:1]
+        if not open_ids and not whole:
+            query = cycles_ref.where("end_date", "==", None).limit(1)
+            open_ids = [doc.id for doc in ops.query(query)]
+
+    for cycle_id in open_ids:
+        cycle_length = (start.date() - previous_start).days
+        ops.update(cycles_ref.document(cycle_id), {
+            "end_date": start,
+            "cycle_length": cycle_length,
+        })
+        if cycle_id in cycles:
+            cycles[cycle_id].update(end_date=start.date(), cycle_length=cycle_length)
+
+    ops.set(cycle_ref, cycle_data)
+    cycles[cycle_ref.id] = _cycle_fields(cycle_data)
+    earliest = min(earliest, start.date()) if earliest else start.date()
+    ops.set(_stats_ref(user_ref), _build_stats(count + 1, cycles, earliest))
+
+    # Update user's last period start date
+    ops.update(user_ref, {
+        "last_period_start_date": start,
+        "updated_at": cycle_data["created_at"],
+    })
+
+
 async def log_period(user_id: str, data: LogPeriodRequest) -> CycleData:
     """
     Log a new period start date.
 
-    This also updates the user's last_period_start_date and
-    closes any open previous cycle.
+    This also updates the user's last_period_start_date and cycle
+    stats, and closes any open previous cycle.
 
     Args:
         user_id: Firebase user UID
@@ -89,38 +408,31 @@ async def log_period(user_id: str, data: LogPeriodRequest) -> CycleData:
     now = datetime.utcnow()
     cycle_id = str(uuid.uuid4())
 
-    # If there's a previous cycle, close it
+    previous_start = None
     if user.last_period_start_date:
         previous_start = user.last_period_start_date.date() if isinstance(
             user.last_period_start_date, datetime
         ) else user.last_period_start_date
 
-        # Find the open cycle and close it
-        query = cycles_ref.where("end_date", "==", None).limit(1)
-        for doc in query.stream():
-            cycle_length = (data.start_date - previous_start).days
-            doc.reference.update({
-                "end_date": data.start_date,
-                "cycle_length": cycle_length,
-            })
-
     # Create new cycle entry
     cycle_data = {
         "user_id": user_id,
-        "start_date": datetime.combine(data.start_date, datetime.min.time()),
+        "start_date": _midnight(data.start_date),
         "end_date": None,  # Will be set when next period is logged
         "cycle_length": None,
         "notes": data.notes,
         "created_at": now,
     }
-
-    cycles_ref.document(cycle_id).set(cycle_data)
-
-    # Update user's last period start date
-    user_ref.update({
-        "last_period_start_date": datetime.combine(data.start_date, datetime.min.time()),
-        "updated_at": now,
-    })
+    await run_transaction(
+        db,
+        _log_period_transaction,
+        user_ref,
+        cycles_ref.document(cycle_id),
+        cycle_data,
+        previous_start,
+    )
+    user_service.invalidate_cached_profile(user_id)
+    invalidate_phase_calendar(user_id)
 
     return CycleData(
         id=cycle_id,
@@ -154,7 +466,7 @@ async def get_cycle_history(user_id: str, limit: int = 12) -> list[CycleData]:
     )
 
     cycles = []
-    for doc in cycles_ref.stream():
+    for doc in await fetch_documents(cycles_ref):
         data = doc.to_dict()
         cycles.append(
             CycleData(
@@ -171,41 +483,143 @@ async def get_cycle_history(user_id: str, limit: int = 12) -> list[CycleData]:
     return cycles
 
 
-async def get_cycle_predictions(
-    user_id: str,
-    days_ahead: int = 30,
-) -> tuple[list[PhasePrediction], Optional[date]]:
+async def get_calendar_version(user_id: str) -> Optional[tuple]:
     """
-    Get cycle phase predictions for upcoming days and full historical cycles.
+    Get the inputs a user's phase calendar is derived from, for ETags.
+
+    Every cycle write also stamps the profile's updated_at, so this changes
+    whenever the calendar can, without reading the cycle history.
 
     Args:
         user_id: Firebase user UID
-        days_ahead: Number of days to predict forward
 
     Returns:
-        Tuple of (predictions list, estimated next period date)
+        Tuple of calendar inputs, or None if no period has been logged
     """
     user = await user_service.get_user_profile(user_id)
     if user is None or user.last_period_start_date is None:
-        return [], None
+        return None
+    return _calendar_version(user_id, user)
+
+
+def _calendar_version(user_id: str, user: UserProfile) -> tuple:
+    return (
+        user_id,
+        user.last_period_start_date,
+        user.average_cycle_length,
+        user.average_period_length,
+        user.updated_at,
+        date.today(),
+    )
+
+
+class _PhaseCalendar:
+    """A user's phase calendar window, with each format built on first use."""
+
+    def __init__(
+        self,
+        last_period: date,
+        average_cycle_length: int,
+        average_period_length: int,
+        start_date: date,
+        total_days: int,
+        next_period: date,
+    ):
+        self.last_period = last_period
+        self.average_cycle_length = average_cycle_length
+        self.average_period_length = average_period_length
+        self.start_date = start_date
+        self.total_days = total_days
+        self.next_period = next_period
+        self._predictions: Optional[list[PhasePrediction]] = None
+        self._prediction_json: Optional[list[bytes]] = None
+        self._runs: Optional[list[PhaseRun]] = None
+        self._runs_json: Optional[bytes] = None
+
+    def _skipped_days(self, since: Optional[date]) -> int:
+        if since is None:
+            return 0
+        return min(max((since - self.start_date).days, 0), self.total_days)
+
+    def predictions(self, since: Optional[date] = None) -> list[PhasePrediction]:
+        """Per-day predictions, from ``since`` onwards if given."""
+        if self._predictions is None:
+            self._predictions = predict_phase_range(
+                last_period_start=self.last_period,
+                start_date=self.start_date,
+                total_days=self.total_days,
+                average_cycle_length=self.average_cycle_length,
+                average_period_length=self.average_period_length,
+            )
+        return self._predictions[self._skipped_days(since):]
+
+    def runs(self, since: Optional[date] = None) -> list[PhaseRun]:
+        """Run-length predictions, from ``since`` onwards if given."""
+        skipped = self._skipped_days(since)
+        if skipped:
+            # Cheap enough to compute directly for the shorter range
+            return predict_phase_runs(
+                last_period_start=self.last_period,
+                start_date=self.start_date + timedelta(days=skipped),
+                total_days=self.total_days - skipped,
+                average_cycle_length=self.average_cycle_length,
+                average_period_length=self.average_period_length,
+            )
+
+        if self._runs is None:
+            self._runs = predict_phase_runs(
+                last_period_start=self.last_period,
+                start_date=self.start_date,
+                total_days=self.total_days,
+                average_cycle_length=self.average_cycle_length,
+                average_period_length=self.average_period_length,
+            )
+        return self._runs
+
+    def predictions_json(self, since: Optional[date] = None) -> bytes:
+        """predictions(since) as an encoded JSON array, reusing per-day encodings."""
+        if self._prediction_json is None:
+            self._prediction_json = [
+                p.model_dump_json().encode() for p in self.predictions()
+            ]
+        return json_array(self._prediction_json[self._skipped_days(since):])
+
+    def runs_json(self, since: Optional[date] = None) -> bytes:
+        """runs(since) as an encoded JSON array."""
+        if self._skipped_days(since):
+            return _PHASE_RUNS_ADAPTER.dump_json(self.runs(since))
+        if self._runs_json is None:
+            self._runs_json = _PHASE_RUNS_ADAPTER.dump_json(self.runs())
+        return self._runs_json
+
+
+async def _get_phase_calendar(user_id: str, days_ahead: int) -> Optional[_PhaseCalendar]:
+    """Get a user's phase calendar from the cache, or build it."""
+    user = await user_service.get_user_profile(user_id)
+    if user is None or user.last_period_start_date is None:
+        return None
 
     last_period = user.last_period_start_date.date() if isinstance(
         user.last_period_start_date, datetime
     ) else user.last_period_start_date
 
-    # Get all cycle history to determine how far back to predict
-    cycles = await get_cycle_history(user_id, limit=24)
+    # The same inputs as the ETag, so a cycle write on another instance
+    # (which stamps the profile's updated_at) replaces this one's copy too
+    today = date.today()
+    fingerprint = (_calendar_version(user_id, user), days_ahead)
+    cache = _get_calendar_cache()
+    cached = cache.get(user_id)
+    if cached is not None and cached[0] == fingerprint:
+        return cached[1]
 
-    # Find the earliest cycle start date
-    earliest_cycle_date = None
-    if cycles:
-        earliest_cycle_date = min(cycle.start_date for cycle in cycles if cycle.start_date)
+    # The calendar goes back to the oldest of the newest STATS_RECENT cycles
+    stats = await get_cycle_stats(user_id)
+    earliest_cycle_date = stats.recent[-1].start_date if stats.recent else None
 
-    predictions = predict_phases(
+    start_date, total_days = prediction_window(
         last_period_start=last_period,
         average_cycle_length=user.average_cycle_length,
         average_period_length=user.average_period_length,
-        days_ahead=days_ahead,
         earliest_cycle_date=earliest_cycle_date,
     )
 
@@ -214,7 +628,110 @@ async def get_cycle_predictions(
         average_cycle_length=user.average_cycle_length,
     )
 
-    return predictions, next_period
+    calendar = _PhaseCalendar(
+        last_period,
+        user.average_cycle_length,
+        user.average_period_length,
+        start_date,
+        total_days,
+        next_period,
+    )
+
+    # Cached until midnight, when "today" (and so the calendar) changes.
+    # Weighted for the per-day format, the larger of the two.
+    cache.set(
+        user_id,
+        (fingerprint, calendar),
+        expires_at=datetime.combine(today + timedelta(days=1), time.min).timestamp(),
+        weight=total_days * _PREDICTION_BYTES,
+    )
+
+    return calendar
+
+
+async def get_cycle_predictions(
+    user_id: str,
+    days_ahead: int = 30,
+    since: Optional[date] = None,
+) -> tuple[list[PhasePrediction], Optional[date]]:
+    """
+    Get cycle phase predictions for upcoming days and full historical cycles.
+
+    Args:
+        user_id: Firebase user UID
+        days_ahead: Number of days to predict forward
+        since: Only return days on or after this date
+
+    Returns:
+        Tuple of (predictions list, estimated next period date)
+    """
+    calendar = await _get_phase_calendar(user_id, days_ahead)
+    if calendar is None:
+        return [], None
+
+    return calendar.predictions(since), calendar.next_period
+
+
+async def get_cycle_prediction_runs(
+    user_id: str,
+    days_ahead: int = 30,
+    since: Optional[date] = None,
+) -> tuple[list[PhaseRun], Optional[date]]:
+    """
+    Get the same predictions as get_cycle_predictions as run-length segments.
+
+    Args:
+        user_id: Firebase user UID
+        days_ahead: Number of days to predict forward
+        since: Only cover days on or after this date
+
+    Returns:
+        Tuple of (phase runs, estimated next period date)
+    """
+    calendar = await _get_phase_calendar(user_id, days_ahead)
+    if calendar is None:
+        return [], None
+
+    return calendar.runs(since), calendar.next_period
+
+
+async def get_cycle_predictions_json(
+    user_id: str,
+    days_ahead: int = 30,
+    since: Optional[date] = None,
+) -> tuple[Optional[bytes], Optional[date]]:
+    """
+    Same as get_cycle_predictions, with the predictions as encoded JSON.
+
+    The calendar cache keeps the encoding, so repeat requests for an
+    unchanged calendar skip serialization.
+
+    Returns:
+        Tuple of (JSON array of predictions or None, estimated next period date)
+    """
+    calendar = await _get_phase_calendar(user_id, days_ahead)
+    if calendar is None:
+        return None, None
+
+    return calendar.predictions_json(since), calendar.next_period
+
+
+async def get_cycle_prediction_runs_json(
+    user_id: str,
+    days_ahead: int = 30,
+    since: Optional[date] = None,
+) -> tuple[Optional[bytes], Optional[date]]:
+    """
+    Same as get_cycle_prediction_runs, with the runs as encoded JSON.
+
+    Returns:
+        Tuple of (JSON array of phase runs or None, estimated next period date)
+    """
+    calendar = await _get_phase_calendar(user_id, days_ahead)
+    if calendar is None:
+        return None, None
+
+    return calendar.runs_json(since), calendar.next_period
 
 
 async def calculate_average_cycle_length(user_id: str) -> Optional[int]:
@@ -229,14 +746,13 @@ async def calculate_average_cycle_length(user_id: str) -> Optional[int]:
     Returns:
         Average cycle length (median) or None if insufficient data
     """
-    cycles = await get_cycle_history(user_id, limit=6)
+    stats = await get_cycle_stats(user_id)
 
-    # Need at least 2 completed cycles to calculate average
-    completed_cycles = [c for c in cycles if c.cycle_length is not None]
-    if len(completed_cycles) < 2:
+    # Need at least 2 completed cycles among the newest 6 to calculate average
+    cycle_lengths = [c.cycle_length for c in stats.recent[:6] if c.cycle_length is not None]
+    if len(cycle_lengths) < 2:
         return None
 
-    cycle_lengths = [c.cycle_length for c in completed_cycles]
     return calculate_median(cycle_lengths)
 
 
@@ -265,6 +781,10 @@ async def initialize_cycle_tracking(
     now = datetime.utcnow()
 
     cycle_lengths = []
+    cycles: _Cycles = {}
+    # All cycles, their stats and the profile update commit in one
+    # round-trip, so a failed onboarding never leaves a partial history behind
+    batch = db.batch()
 
     # Create cycle entries
     for i, start_date in enumerate(sorted_dates):
@@ -288,26 +808,181 @@ async def initialize_cycle_tracking(
             "notes": "Initial data from onboarding",
             "created_at": now,
         }
+        batch.set(cycles_ref.document(cycle_id), cycle_data)
+        cycles[cycle_id] = _cycle_fields(cycle_data)
 
-        cycles_ref.document(cycle_id).set(cycle_data)
+    batch.set(_stats_ref(user_ref), _build_stats(len(cycles), cycles, sorted_dates[0]))
 
     # Calculate averages
     avg_cycle_length = calculate_median(cycle_lengths) if cycle_lengths else 28
     last_period_date = datetime.combine(sorted_dates[-1], datetime.min.time())
 
     # Update user profile
-    user_ref.update({
+    batch.update(user_ref, {
         "average_cycle_length": avg_cycle_length,
         "last_period_start_date": last_period_date,
         "updated_at": now,
     })
+    await commit_batch(batch)
+    user_service.invalidate_cached_profile(user_id)
+    invalidate_phase_calendar(user_id)
+
+
+def _plan_period_merge(
+    user_ref: DocumentReference,
+    docs: list,
+    periods: dict[date, Optional[str]],
+    now: datetime,
+) -> tuple[int, list[tuple[str, DocumentReference, dict]]]:
+    """
+    Plan the writes that merge imported periods into a cycle history.
+
+    Args:
+        user_ref: The user's document
+        docs: Every stored cycle
+        periods: Imported start dates, with their notes
+        now: Time of the import
+
+    Returns:
+        Tuple of (number of new cycles, writes as (method, reference,
+        data)); the stats and profile come last
+    """
+    cycles_ref = user_ref.collection("cycleData")
+
+    # start date -> (reference, stored data), or (None, notes) for new cycles
+    cycles: dict[date, tuple] = {}
+    # Cycles the re-chaining leaves alone (same start date as another),
+    # which the stats still count
+    chained: _Cycles = {}
+    for doc in docs:
+        data = doc.to_dict()
+        if data.get("start_date") is None:
+            continue
+        if data["start_date"].date() in cycles:
+            chained[doc.id] = _cycle_fields(data)
+        else:
+            cycles[data["start_date"].date()] = (doc.reference, data)
+
+    added = 0
+    for start_date, notes in periods.items():
+        if start_date not in cycles:
+            cycles[start_date] = (None, notes)
+            added += 1
+    if not added:
+        return 0, []
+
+    writes = []
+    starts = sorted(cycles)
+    for i, start_date in enumerate(starts):
+        next_start = starts[i + 1] if i + 1 < len(starts) else None
+        cycle_length = (next_start - start_date).days if next_start else None
+        end_date = datetime.combine(next_start, datetime.min.time()) if next_start else None
+
+        ref, stored = cycles[start_date]
+        if ref is None:
+            ref = cycles_ref.document(str(uuid.uuid4()))
+            cycle_data = {
+                "user_id": user_ref.id,
+                "start_date": datetime.combine(start_date, datetime.min.time()),
+                "end_date": end_date,
+                "cycle_length": cycle_length,
+                "notes": stored,
+                "created_at": now,
+            }
+            chained[ref.id] = _cycle_fields(cycle_data)
+            writes.append(("set", ref, cycle_data))
+            continue
+
+        chained[ref.id] = _cycle_fields(
+            {**stored, "end_date": end_date, "cycle_length": cycle_length}
+        )
+        stored_end = stored.get("end_date")
+        if (
+            stored.get("cycle_length") != cycle_length
+            or (stored_end.date() if stored_end else None) != next_start
+        ):
+            writes.append(("update", ref, {"end_date": end_date, "cycle_length": cycle_length}))
+
+    stats = _build_stats(len(docs) + added, chained, starts[0])
+    writes.append(("set", _stats_ref(user_ref), stats))
+
+    averages = _profile_averages(stats, now)
+    writes.append(("update", user_ref, {
+        "average_cycle_length": averages["average_cycle_length"],
+        "last_period_start_date": datetime.combine(starts[-1], datetime.min.time()),
+        "updated_at": now,
+    }))
+    return added, writes
+
+
+def _merge_periods_transaction(
+    ops: TransactionOps,
+    user_ref: DocumentReference,
+    periods: dict[date, Optional[str]],
+    now: datetime,
+) -> tuple[int, list[tuple[str, DocumentReference, dict]]]:
+    # Every cycle write also rewrites the stats, so reading them makes a
+    # concurrent log_period, edit or delete abort and retry this merge
+    # rather than be lost
+    ops.get(_stats_ref(user_ref))
+    added, writes = _plan_period_merge(
+        user_ref, ops.query(user_ref.collection("cycleData")), periods, now
+    )
+    if len(writes) > MAX_BATCH_WRITES:
+        # Too many for one commit: left to the caller
+        return added, writes
+    for method, ref, data in writes:
+        getattr(ops, method)(ref, data)
+    return added, []
+
+
+async def merge_imported_periods(
+    user_id: str,
+    periods: dict[date, Optional[str]],
+) -> int:
+    """
+    Add imported period start dates to a user's cycle history.
+
+    The whole history is re-chained once: each cycle ends where the next
+    one starts, the latest stays open, and the profile's average cycle
+    length, last period date and cycle stats are recomputed, as
+    log_period and recalculate_and_update_averages would after each
+    period in turn.
+    Dates already in the history are skipped. Only new and changed cycles
+    are written, in one transaction with the stats and profile. A merge
+    too big for one commit is written in batches instead, after deleting
+    the stats, so an interruption leaves them to be rebuilt from the
+    cycles rather than out of step. The caller drops the cached profile
+    and phase calendar.
+
+    Args:
+        user_id: Firebase user UID
+        periods: Imported start dates, with their notes
+
+    Returns:
+        Number of new cycles
+    """
+    db = get_firestore_client()
+    user_ref = db.collection("users").document(user_id)
+
+    added, writes = await run_transaction(
+        db, _merge_periods_transaction, user_ref, periods, datetime.utcnow()
+    )
+    if writes:
+        await delete_document(_stats_ref(user_ref))
+        writer = BatchWriter(db)
+        for method, ref, data in writes:
+            await getattr(writer, method)(ref, data)
+        await writer.flush()
+    return added
 
 
 async def recalculate_and_update_averages(user_id: str) -> tuple[int, int]:
     """
     Recalculate average cycle and period length from history.
 
-    Uses median for robustness to outliers.
+    Uses the median of the cycle stats for robustness to outliers. Cycle
+    writes already do this in their own transaction.
 
     Args:
         user_id: Firebase user UID
@@ -315,29 +990,61 @@ async def recalculate_and_update_averages(user_id: str) -> tuple[int, int]:
     Returns:
         Tuple of (average_cycle_length, average_period_length)
     """
-    cycles = await get_cycle_history(user_id, limit=12)
-
-    # Calculate average cycle length from completed cycles
-    completed_cycles = [c for c in cycles if c.cycle_length is not None]
-    if completed_cycles:
-        cycle_lengths = [c.cycle_length for c in completed_cycles]
-        avg_cycle_length = calculate_median(cycle_lengths)
-    else:
-        avg_cycle_length = 28  # default
-
-    # Use default average period length
-    avg_period_length = 5
+    stats = await get_cycle_stats(user_id)
+    averages = _profile_averages(stats.model_dump(), datetime.utcnow())
 
     # Update user profile
     db = get_firestore_client()
     user_ref = db.collection("users").document(user_id)
-    user_ref.update({
-        "average_cycle_length": avg_cycle_length,
-        "average_period_length": avg_period_length,
-        "updated_at": datetime.utcnow(),
-    })
+    await update_document(user_ref, averages)
+    user_service.invalidate_cached_profile(user_id)
+
+    return averages["average_cycle_length"], averages["average_period_length"]
+
+
+def _update_cycle_transaction(
+    ops: TransactionOps,
+    user_ref: DocumentReference,
+    cycle_ref: DocumentReference,
+    update_data: dict,
+) -> Optional[dict]:
+    snapshot = ops.get(cycle_ref)
+    if not snapshot.exists:
+        return None
+    stored = snapshot.to_dict()
+
+    moved = "start_date" in update_data
+    count, cycles, earliest, whole = _read_history(ops, user_ref)
+
+    if moved:
+        old_start = stored["start_date"].date()
+        new_start = update_data["start_date"].date()
+        # Moved back past the oldest stored cycle, it may no longer be among
+        # the newest
+        if (
+            cycle_ref.id in cycles
+            and count > len(cycles)
+            and new_start <= min(cycle["start_date"] for cycle in cycles.values())
+        ):
+            cycles = _newest_cycles(ops, user_ref)
+        if earliest == old_start and new_start > old_start and not whole:
+            earliest = _oldest_start(ops, user_ref, excluding=cycle_ref.id)
+        earliest = min(earliest, new_start) if earliest else new_start
+    if moved or cycle_ref.id in cycles:
+        cycles[cycle_ref.id] = _cycle_fields({**stored, **update_data})
+    if whole:
+        earliest = _earliest(cycles)
+
+    if update_data:
+        ops.update(cycle_ref, update_data)
+    stats = _build_stats(count, cycles, earliest)
+    if update_data or whole:
+        ops.set(_stats_ref(user_ref), stats)
+
+    # Recalculate averages
+    ops.update(user_ref, _profile_averages(stats, datetime.utcnow()))
 
-    return avg_cycle_length, avg_period_length
+    return {**stored, **update_data}
 
 
 async def update_cycle_entry(
@@ -348,7 +1055,8 @@ async def update_cycle_entry(
     """
     Update an existing cycle entry.
 
-    Recalculates affected cycle lengths and averages.
+    Updates the cycle stats and recalculates averages in the same
+    transaction.
 
     Args:
         user_id: Firebase user UID
@@ -359,37 +1067,23 @@ async def update_cycle_entry(
         Updated CycleData or None if not found
     """
     db = get_firestore_client()
-    cycle_ref = (
-        db.collection("users")
-        .document(user_id)
-        .collection("cycleData")
-        .document(cycle_id)
-    )
-
-    # Check if cycle exists
-    doc = cycle_ref.get()
-    if not doc.exists:
-        return None
+    user_ref = db.collection("users").document(user_id)
+    cycle_ref = user_ref.collection("cycleData").document(cycle_id)
 
     # Build update dict
     update_data = {}
     if data.start_date is not None:
-        update_data["start_date"] = datetime.combine(data.start_date, datetime.min.time())
+        update_data["start_date"] = _midnight(data.start_date)
     if data.notes is not None:
         update_data["notes"] = data.notes
 
-    if update_data:
-        cycle_ref.update(update_data)
-
-    # Recalculate averages
-    await recalculate_and_update_averages(user_id)
-
-    # Return updated cycle
-    updated_doc = cycle_ref.get()
-    if not updated_doc.exists:
+    doc_data = await run_transaction(db, _update_cycle_transaction, user_ref, cycle_ref, update_data)
+    if doc_data is None:
         return None
+    user_service.invalidate_cached_profile(user_id)
+    if update_data:
+        invalidate_phase_calendar(user_id)
 
-    doc_data = updated_doc.to_dict()
     return CycleData(
         id=cycle_id,
         user_id=user_id,
@@ -401,11 +1095,47 @@ async def update_cycle_entry(
     )
 
 
+def _delete_cycle_transaction(
+    ops: TransactionOps,
+    user_ref: DocumentReference,
+    cycle_ref: DocumentReference,
+) -> None:
+    # Check if cycle exists
+    snapshot = ops.get(cycle_ref)
+    if not snapshot.exists:
+        raise ValueError("Cycle not found")
+
+    count, cycles, earliest, whole = _read_history(ops, user_ref)
+    if count <= 1:
+        raise ValueError("Cannot delete the only cycle")
+    if cycle_ref.id in cycles and count > len(cycles):
+        cycles = _newest_cycles(ops, user_ref)
+
+    if earliest == snapshot.to_dict()["start_date"].date() and not whole:
+        earliest = _oldest_start(ops, user_ref, excluding=cycle_ref.id)
+
+    # Delete the cycle
+    ops.delete(cycle_ref)
+    cycles.pop(cycle_ref.id, None)
+    if whole:
+        earliest = _earliest(cycles)
+    stats = _build_stats(count - 1, cycles, earliest)
+    ops.set(_stats_ref(user_ref), stats)
+
+    # Recalculate averages, and move last_period_start_date back if we
+    # deleted the most recent cycle
+    profile_update = _profile_averages(stats, datetime.utcnow())
+    if stats["recent"]:
+        profile_update["last_period_start_date"] = stats["recent"][0]["start_date"]
+    ops.update(user_ref, profile_update)
+
+
 async def delete_cycle_entry(user_id: str, cycle_id: str) -> bool:
     """
     Delete a cycle entry from history.
 
-    Cannot delete if it's the only cycle. Recalculates averages after deletion.
+    Cannot delete if it's the only cycle. Updates the cycle stats and
+    recalculates averages in the same transaction.
 
     Args:
         user_id: Firebase user UID
@@ -415,32 +1145,11 @@ async def delete_cycle_entry(user_id: str, cycle_id: str) -> bool:
         True if deleted successfully
     """
     db = get_firestore_client()
-    cycles_ref = db.collection("users").document(user_id).collection("cycleData")
-    cycle_ref = cycles_ref.document(cycle_id)
-
-    # Check if cycle exists
-    if not cycle_ref.get().exists:
-        raise ValueError("Cycle not found")
-
-    # Count total cycles
-    total_cycles = sum(1 for _ in cycles_ref.stream())
-    if total_cycles <= 1:
-        raise ValueError("Cannot delete the only cycle")
-
-    # Delete the cycle
-    cycle_ref.delete()
+    user_ref = db.collection("users").document(user_id)
+    cycle_ref = user_ref.collection("cycleData").document(cycle_id)
 
-    # Recalculate averages
-    await recalculate_and_update_averages(user_id)
-
-    # Update last_period_start_date if we deleted the most recent cycle
-    remaining_cycles = await get_cycle_history(user_id, limit=1)
-    if remaining_cycles:
-        most_recent = remaining_cycles[0]
-        user_ref = db.collection("users").document(user_id)
-        user_ref.update({
-            "last_period_start_date": datetime.combine(most_recent.start_date, datetime.min.time()),
-            "updated_at": datetime.utcnow(),
-        })
+    await run_transaction(db, _delete_cycle_transaction, user_ref, cycle_ref)
+    user_service.invalidate_cached_profile(user_id)
+    invalidate_phase_calendar(user_id)
 
     return True
@@ -5,68 +5,84 @@ Energy tracking service for managing daily energy levels.
 from datetime import date, datetime, timedelta
 from typing import Optional
 
-from google.cloud.firestore_v1 import FieldFilter
+from google.cloud.firestore_v1 import DocumentSnapshot, FieldFilter
 
 from app.config.firebase import get_firestore_client
 from app.models.energy import EnergyLog, LogEnergyRequest
+from app.utils.firestore import (
+    create_document,
+    delete_document,
+    fetch_documents,
+    get_document,
+    set_document,
+)
+
+
+def energy_log_id(log_date: date) -> str:
+    """Document ID of a user's energy log for a date (one log per day)."""
+    return log_date.isoformat()
+
+
+def energy_log_fields(user_id: str, data: LogEnergyRequest, now: datetime) -> dict:
+    """Fields merged into a day's energy log document when it is logged."""
+    return {
+        "user_id": user_id,
+        # Firestore has no date type: stored as midnight UTC
+        "date": datetime.combine(data.date, datetime.min.time()),
+        "score": data.score,
+        "notes": data.notes,
+        "updated_at": now,
+    }
+
+
+def _doc_to_energy_log(doc: DocumentSnapshot, user_id: str) -> EnergyLog:
+    """Convert an energy log document to an EnergyLog."""
+    doc_data = doc.to_dict()
+    return EnergyLog(
+        id=doc.id,
+        user_id=user_id,
+        date=doc_data["date"].date(),
+        score=doc_data["score"],
+        notes=doc_data.get("notes"),
+        # Logs upserted before created_at was recorded only have updated_at
+        created_at=doc_data.get("created_at", doc_data["updated_at"]),
+        updated_at=doc_data["updated_at"],
+    )
 
 
 async def log_energy(user_id: str, data: LogEnergyRequest) -> EnergyLog:
     """
     Log daily energy level for a user.
 
-    If an entry already exists for the given date, it will be updated.
-    Otherwise, a new entry is created.
+    Logs are keyed by date, so logging the same date again updates that
+    day's entry. Nothing is read: the first log of a day creates its
+    document with created_at, and a re-log, whose create is refused,
+    merges over it, leaving the stored created_at alone. A re-log's
+    response carries its own time as created_at, since the stored one
+    isn't read back.
     """
     db = get_firestore_client()
-    energy_ref = db.collection("users").document(user_id).collection("energy_logs")
-
-    # Check if entry already exists for this date
-    existing_query = (
-        energy_ref
-        .where(filter=FieldFilter("date", "==", data.date))
-        .limit(1)
+    log_id = energy_log_id(data.date)
+    doc_ref = (
+        db.collection("users")
+        .document(user_id)
+        .collection("energy_logs")
+        .document(log_id)
     )
 
-    existing_docs = list(existing_query.stream())
-
     now = datetime.utcnow()
-
-    if existing_docs:
-        # Update existing entry
-        doc_ref = existing_docs[0].reference
-        doc_ref.update({
-            "score": data.score,
-            "notes": data.notes,
-            "updated_at": now,
-        })
-        doc_id = doc_ref.id
-    else:
-        # Create new entry
-        doc_data = {
-            "user_id": user_id,
-            "date": data.date,
-            "score": data.score,
-            "notes": data.notes,
-            "created_at": now,
-            "updated_at": now,
-        }
-        doc_ref = energy_ref.document()
-        doc_ref.set(doc_data)
-        doc_id = doc_ref.id
-
-    # Fetch and return the created/updated document
-    doc = doc_ref.get()
-    doc_data = doc.to_dict()
+    fields = energy_log_fields(user_id, data, now)
+    if not await create_document(doc_ref, {**fields, "created_at": now}):
+        await set_document(doc_ref, fields, merge=True)
 
     return EnergyLog(
-        id=doc_id,
+        id=log_id,
         user_id=user_id,
-        date=doc_data["date"],
-        score=doc_data["score"],
-        notes=doc_data.get("notes"),
-        created_at=doc_data["created_at"],
-        updated_at=doc_data["updated_at"],
+        date=data.date,
+        score=data.score,
+        notes=data.notes,
+        created_at=now,
+        updated_at=now,
     )
 
 
@@ -77,31 +93,17 @@ async def get_energy_for_date(user_id: str, target_date: date) -> Optional[Energ
     Returns None if no entry exists for the given date.
     """
     db = get_firestore_client()
-    energy_ref = db.collection("users").document(user_id).collection("energy_logs")
-
-    query = (
-        energy_ref
-        .where(filter=FieldFilter("date", "==", target_date))
-        .limit(1)
+    doc = await get_document(
+        db.collection("users")
+        .document(user_id)
+        .collection("energy_logs")
+        .document(energy_log_id(target_date))
     )
 
-    docs = list(query.stream())
-
-    if not docs:
+    if not doc.exists:
         return None
 
-    doc = docs[0]
-    doc_data = doc.to_dict()
-
-    return EnergyLog(
-        id=doc.id,
-        user_id=user_id,
-        date=doc_data["date"],
-        score=doc_data["score"],
-        notes=doc_data.get("notes"),
-        created_at=doc_data["created_at"],
-        updated_at=doc_data["updated_at"],
-    )
+    return _doc_to_energy_log(doc, user_id)
 
 
 async def get_energy_history(user_id: str, days: int = 30) -> list[EnergyLog]:
@@ -118,29 +120,14 @@ async def get_energy_history(user_id: str, days: int = 30) -> list[EnergyLog]:
 
     query = (
         energy_ref
-        .where(filter=FieldFilter("date", ">=", cutoff_date))
+        .where(filter=FieldFilter(
+            "date", ">=", datetime.combine(cutoff_date, datetime.min.time())
+        ))
         .order_by("date", direction="DESCENDING")
         .limit(days)
     )
 
-    docs = query.stream()
-
-    energy_logs = []
-    for doc in docs:
-        doc_data = doc.to_dict()
-        energy_logs.append(
-            EnergyLog(
-                id=doc.id,
-                user_id=user_id,
-                date=doc_data["date"],
-                score=doc_data["score"],
-                notes=doc_data.get("notes"),
-                created_at=doc_data["created_at"],
-                updated_at=doc_data["updated_at"],
-            )
-        )
-
-    return energy_logs
+    return [_doc_to_energy_log(doc, user_id) for doc in await fetch_documents(query)]
 
 
 async def delete_energy_log(user_id: str, log_id: str) -> bool:
@@ -157,7 +144,7 @@ async def delete_energy_log(user_id: str, log_id: str) -> bool:
         .document(log_id)
     )
 
-    doc = doc_ref.get()
+    doc = await get_document(doc_ref)
     if not doc.exists:
         return False
 
@@ -166,5 +153,5 @@ async def delete_energy_log(user_id: str, log_id: str) -> bool:
     if doc_data.get("user_id") != user_id:
         return False
 
-    doc_ref.delete()
+    await delete_document(doc_ref)
     return True
@@ -0,0 +1,188 @@
+"""
+Export of all of a user's data, streamed as it is read.
+
+The export holds the profile followed by every cycle, energy log and
+workout history entry, as NDJSON (one object per line) or a zip of CSV
+files. Rows use the same ``type`` values and field names as the bulk
+import (see import_service), so an export can be imported again.
+
+Each subcollection is read a page at a time, with the next page fetched
+while the current one is being sent, and each page is encoded and handed
+to the response before the next is read: memory stays at about two pages
+whatever the size of the history.
+"""
+
+import asyncio
+import csv
+import io
+import zipfile
+from datetime import datetime
+from typing import AsyncIterator, Iterable, Optional
+
+import orjson
+from google.cloud.firestore_v1 import DocumentSnapshot
+
+from app.config.firebase import get_firestore_client
+from app.config.settings import get_settings
+from app.models.user import UserProfile
+from app.utils.firestore import fetch_documents
+
+# (subcollection, row type, CSV file name, exported fields)
+_SECTIONS = (
+    ("cycleData", "period", "cycles.csv",
+     ("start_date", "end_date", "cycle_length", "notes", "created_at")),
+    ("energy_logs", "energy", "energy_logs.csv",
+     ("date", "score", "notes", "created_at", "updated_at")),
+    ("workoutHistory", "workout", "workouts.csv",
+     ("workout_id", "workout_title", "completed_at", "duration_minutes",
+      "calories_burned", "notes")),
+)
+
+# Stored as midnight timestamps, exported as plain dates
+_DATE_FIELDS = {"start_date", "end_date", "date"}
+
+
+def _export_row(row_type: str, doc: DocumentSnapshot, fields: tuple[str, ...]) -> dict:
+    """A subcollection document as an export row."""
+    data = doc.to_dict()
+    row = {"type": row_type, "id": doc.id}
+    for field in fields:
+        value = data.get(field)
+        if field in _DATE_FIELDS and isinstance(value, datetime):
+            value = value.date()
+        row[field] = value
+    return row
+
+
+def _profile_row(profile: UserProfile) -> dict:
+    return {"type": "profile", **profile.model_dump(mode="json")}
+
+
+async def _pages(
+    user_id: str,
+    collection: str,
+    page_size: int,
+) -> AsyncIterator[list[DocumentSnapshot]]:
+    """
+    Read a user's subcollection a page at a time, in document ID order.
+
+    The next page is requested as soon as the current one arrives, so its
+    round trip overlaps with sending the current one.
+    """
+    db = get_firestore_client()
+    query = (
+        db.collection("users")
+        .document(user_id)
+        .collection(collection)
+        .order_by("__name__")
+        .limit(page_size)
+    )
+
+    pending: Optional[asyncio.Future] = asyncio.ensure_future(fetch_documents(query))
+    try:
+        while pending is not None:
+            page = await pending
+            pending = None
+            if len(page) == page_size:
+                pending = asyncio.ensure_future(
+                    fetch_documents(query.start_after(page[-1]))
+                )
+            if page:
+                yield page
+    finally:
+        # The client went away mid-export
+        if pending is not None:
+            pending.cancel()
+
+
+async def export_ndjson(user_id: str, profile: UserProfile) -> AsyncIterator[bytes]:
+    """
+    Stream a user's data as NDJSON: the profile, then one line per document.
+
+    Args:
+        user_id: Firebase user UID
+        profile: The user's profile (the first line)
+
+    Yields:
+        Encoded lines, a page at a time
+    """
+    page_size = get_settings().export_page_size
+    yield orjson.dumps(_profile_row(profile)) + b"\n"
+
+    for collection, row_type, _, fields in _SECTIONS:
+        async for page in _pages(user_id, collection, page_size):
+            yield b"".join(
+                orjson.dumps(_export_row(row_type, doc, fields)) + b"\n" for doc in page
+            )
+
+
+class _ZipStream(io.RawIOBase):
+    """Unseekable file for zipfile to write to, drained after each page."""
+
+    def __init__(self):
+        self._chunks: list[bytes] = []
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, data) -> int:
+        self._chunks.append(bytes(data))
+        return len(data)
+
+    def drain(self) -> bytes:
+        data = b"".join(self._chunks)
+        self._chunks.clear()
+        return data
+
+
+def _csv_cell(value) -> object:
+    if isinstance(value, list):
+        return ";".join(str(item) for item in value)
+    if isinstance(value, datetime):
+        return value.isoformat()
+    return "" if value is None else value
+
+
+def _csv_lines(rows: Iterable[Iterable]) -> bytes:
+    out = io.StringIO()
+    writer = csv.writer(out)
+    for row in rows:
+        writer.writerow([_csv_cell(value) for value in row])
+    return out.getvalue().encode()
+
+
+async def export_csv_zip(user_id: str, profile: UserProfile) -> AsyncIterator[bytes]:
+    """
+    Stream a user's data as a zip of CSV files.
+
+    The archive holds profile.csv plus one file per subcollection, each
+    with a header row. Entries are written in streaming mode (sizes follow
+    the data), so the archive is never held whole.
+
+    Args:
+        user_id: Firebase user UID
+        profile: The user's profile
+
+    Yields:
+        Pieces of the zip archive, a page at a time
+    """
+    page_size = get_settings().export_page_size
+    stream = _ZipStream()
+
+    with zipfile.ZipFile(stream, "w", compression=zipfile.ZIP_DEFLATED) as archive:
+        row = _profile_row(profile)
+        with archive.open("profile.csv", "w") as entry:
+            entry.write(_csv_lines([row.keys(), row.values()]))
+        yield stream.drain()
+
+        for collection, row_type, filename, fields in _SECTIONS:
+            with archive.open(filename, "w") as entry:
+                entry.write(_csv_lines([("type", "id", *fields)]))
+                async for page in _pages(user_id, collection, page_size):
+                    entry.write(_csv_lines(
+                        _export_row(row_type, doc, fields).values() for doc in page
+                    ))
+                    yield stream.drain()
+
+    # The last entry's trailer and the central directory
+    yield stream.drain()
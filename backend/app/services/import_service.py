@@ -0,0 +1,285 @@
+"""
+Bulk import of historical energy, period and workout logs.
+
+An upload is NDJSON (one JSON object per line) or CSV (a header row, then
+one row per log). Each row has a ``type`` of ``energy``, ``period`` or
+``workout`` and the same fields as the matching log endpoint, plus
+``completed_at`` for workouts:
+
+    {"type": "energy", "date": "2024-03-01", "score": 7}
+    {"type": "period", "start_date": "2024-02-20"}
+    {"type": "workout", "workout_id": "w4", "completed_at": "2024-03-01T18:30:00Z"}
+
+The body is parsed as it arrives and never held whole. Energy logs and
+workouts are written in batches as they are read; a bad row is reported
+and skipped without failing the rest. Period dates are collected (a few
+hundred at most) and merged into the cycle history once at the end, so
+cycle lengths and averages are recomputed once rather than per row.
+
+Imports are idempotent: energy logs are keyed by date, workouts by their
+workout and completion time, and periods already logged are skipped.
+"""
+
+import codecs
+import csv
+import json
+import re
+import uuid
+from datetime import date, datetime, timezone
+from typing import AsyncIterator, Optional
+
+from pydantic import BaseModel, ValidationError
+
+from app.config.firebase import get_firestore_client
+from app.config.settings import get_settings
+from app.models.cycle import LogPeriodRequest
+from app.models.energy import LogEnergyRequest
+from app.models.user import HistoryImportResponse, ImportRowError
+from app.models.workout import ImportWorkoutRequest
+from app.services import cycle_service, energy_service, user_service, workout_service
+from app.utils.firestore import BatchWriter
+
+# Media type -> upload format
+IMPORT_FORMATS = {
+    "application/x-ndjson": "ndjson",
+    "application/jsonl": "ndjson",
+    "text/csv": "csv",
+}
+
+# Longest accepted line, so a body without newlines can't exhaust memory
+_MAX_LINE_CHARS = 64 * 1024
+_MAX_REPORTED_ERRORS = 100
+# What surrogateescape decodes bytes that aren't UTF-8 to
+_UNDECODABLE = re.compile("[\udc80-\udcff]")
+
+_ROW_MODELS: dict[str, type[BaseModel]] = {
+    "energy": LogEnergyRequest,
+    "period": LogPeriodRequest,
+    "workout": ImportWorkoutRequest,
+}
+
+
+class ImportFormatError(ValueError):
+    """The upload can't be read past ``line``."""
+
+    def __init__(self, line: int, message: str):
+        super().__init__(message)
+        self.line = line
+
+
+class _RowError(ValueError):
+    """A single row is invalid."""
+
+
+def _checked_line(number: int, line: str) -> str:
+    """A decoded line, or ImportFormatError if it can't be accepted."""
+    if len(line) > _MAX_LINE_CHARS:
+        raise ImportFormatError(number, "line is too long")
+    if _UNDECODABLE.search(line):
+        raise ImportFormatError(number, "not valid UTF-8")
+    return line.rstrip("\r")
+
+
+async def _iter_lines(chunks: AsyncIterator[bytes]) -> AsyncIterator[tuple[int, str]]:
+    """Decode a byte stream into numbered lines, without buffering it."""
+    # utf-8-sig drops the byte order mark spreadsheet exports start with.
+    # Invalid bytes are escaped rather than raised, so the lines before
+    # them in the same chunk are still read
+    decoder = codecs.getincrementaldecoder("utf-8-sig")(errors="surrogateescape")
+    pending = ""
+    number = 0
+    async for chunk in chunks:
+        pending += decoder.decode(chunk)
+        *lines, pending = pending.split("\n")
+        for line in lines:
+            number += 1
+            yield number, _checked_line(number, line)
+        if len(pending) > _MAX_LINE_CHARS:
+            raise ImportFormatError(number + 1, "line is too long")
+    pending += decoder.decode(b"", final=True)
+    if pending.strip():
+        yield number + 1, _checked_line(number + 1, pending)
+
+
+async def _ndjson_rows(lines: AsyncIterator[tuple[int, str]]) -> AsyncIterator[tuple[int, object]]:
+    """Rows of an NDJSON upload; blank lines are skipped."""
+    async for number, line in lines:
+        if not line.strip():
+            continue
+        try:
+            yield number, json.loads(line)
+        except json.JSONDecodeError as e:
+            yield number, _RowError(f"invalid JSON: {e.msg}")
+
+
+async def _csv_rows(lines: AsyncIterator[tuple[int, str]]) -> AsyncIterator[tuple[int, object]]:
+    """Rows of a CSV upload as dicts keyed by the header; empty cells are omitted."""
+    header: Optional[list[str]] = None
+    record: list[str] = []
+    first_line = 0
+    async for number, line in lines:
+        if not record:
+            first_line = number
+        record.append(line)
+        text = "\n".join(record)
+        # An odd number of quotes means a quoted field continues on the
+        # next line
+        if text.count('"') % 2:
+            if len(text) > _MAX_LINE_CHARS:
+                raise ImportFormatError(first_line, "row is too long")
+            continue
+        record = []
+        if not text.strip():
+            continue
+
+        values = next(csv.reader([text]))
+        if header is None:
+            header = [name.strip() for name in values]
+            continue
+        if len(values) != len(header):
+            yield first_line, _RowError(
+                f"expected {len(header)} columns, got {len(values)}"
+            )
+            continue
+        yield first_line, {
+            name: value for name, value in zip(header, values) if value != ""
+        }
+
+    if record:
+        raise ImportFormatError(first_line, "unterminated quoted field")
+
+
+def _validate(row: object) -> tuple[str, BaseModel]:
+    """Validate a parsed row against the log model for its type."""
+    if isinstance(row, _RowError):
+        raise row
+    if not isinstance(row, dict):
+        raise _RowError("row is not an object")
+
+    row_type = row.get("type")
+    model = _ROW_MODELS.get(row_type)
+    if model is None:
+        raise _RowError(f"type must be one of {', '.join(_ROW_MODELS)}")
+
+    try:
+        return row_type, model.model_validate(row)
+    except ValidationError as e:
+        raise _RowError("; ".join(
+            f"{'.'.join(str(part) for part in error['loc'])}: {error['msg']}"
+            for error in e.errors()
+        ))
+
+
+def _utc_naive(value: datetime) -> datetime:
+    """Timestamps are stored as naive UTC, like datetime.utcnow()."""
+    if value.tzinfo is None:
+        return value
+    return value.astimezone(timezone.utc).replace(tzinfo=None)
+
+
+async def import_history(
+    user_id: str,
+    chunks: AsyncIterator[bytes],
+    upload_format: str,
+) -> HistoryImportResponse:
+    """
+    Import a user's historical logs from a streamed upload.
+
+    Args:
+        user_id: Firebase user UID (the profile must exist)
+        chunks: Request body chunks
+        upload_format: "ndjson" or "csv"
+
+    Returns:
+        Counts of imported and rejected rows
+    """
+    db = get_firestore_client()
+    user_ref = db.collection("users").document(user_id)
+    energy_ref = user_ref.collection("energy_logs")
+    history_ref = user_ref.collection("workoutHistory")
+    max_rows = get_settings().import_max_rows
+
+    writer = BatchWriter(db)
+    result = HistoryImportResponse()
+    periods: dict[date, Optional[str]] = {}
+    now = datetime.utcnow()
+
+    def reject(line: int, message: str) -> None:
+        result.rows_rejected += 1
+        if len(result.errors) < _MAX_REPORTED_ERRORS:
+            result.errors.append(ImportRowError(line=line, message=message))
+
+    parse = _csv_rows if upload_format == "csv" else _ndjson_rows
+    rows = 0
+    try:
+        async for line, row in parse(_iter_lines(chunks)):
+            rows += 1
+            if rows > max_rows:
+                result.complete = False
+                result.errors.append(ImportRowError(
+                    line=line, message=f"row limit of {max_rows} reached"
+                ))
+                break
+
+            try:
+                row_type, data = _validate(row)
+            except _RowError as e:
+                reject(line, str(e))
+                continue
+
+            if row_type == "energy":
+                # The row replaces the day's log, so the import is its creation
+                await writer.set(
+                    energy_ref.document(energy_service.energy_log_id(data.date)),
+                    {**energy_service.energy_log_fields(user_id, data, now), "created_at": now},
+                    merge=True,
+                )
+                result.energy_logs_imported += 1
+
+            elif row_type == "period":
+                if data.start_date in periods:
+                    result.duplicates_skipped += 1
+                else:
+                    periods[data.start_date] = data.notes
+
+            else:
+                # Catalog lookups are in memory
+                workout = await workout_service.get_workout_by_id(data.workout_id)
+                if workout is None:
+                    reject(line, f"workout_id: unknown workout {data.workout_id!r}")
+                    continue
+                completed_at = _utc_naive(data.completed_at)
+                history_id = uuid.uuid5(
+                    uuid.NAMESPACE_URL,
+                    f"{user_id}/{data.workout_id}/{completed_at.isoformat()}",
+                )
+                await writer.set(history_ref.document(str(history_id)), {
+                    "user_id": user_id,
+                    "workout_id": data.workout_id,
+                    "workout_title": workout.title,
+                    "duration_minutes": data.duration_minutes or workout.duration_minutes,
+                    "completed_at": completed_at,
+                    "calories_burned": data.calories_burned or workout.calories_estimate,
+                    "notes": data.notes,
+                })
+                result.workouts_imported += 1
+
+    except ImportFormatError as e:
+        # Rows already read are kept; the history is still re-chained below
+        result.complete = False
+        result.errors.append(ImportRowError(line=e.line, message=str(e)))
+
+    await writer.flush()
+    if periods:
+        result.periods_imported = await cycle_service.merge_imported_periods(user_id, periods)
+        result.duplicates_skipped += len(periods) - result.periods_imported
+
+    if result.periods_imported:
+        user_service.invalidate_cached_profile(user_id)
+        cycle_service.invalidate_phase_calendar(user_id)
+    if result.periods_imported or result.workouts_imported:
+        # Phase and recent workouts feed the recommendation prompt
+        from app.services import recommendation_service
+        await recommendation_service.invalidate_user_recommendations(user_id)
+
+    return result
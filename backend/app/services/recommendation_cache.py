@@ -0,0 +1,112 @@
+"""
+Cache for generated daily recommendations.
+
+Results are stored under a digest of the model, system prompt, normalized
+user prompt and the user's local date, so users whose prompts come out
+identical share one entry. Entries expire at
+the user's local midnight.
+
+Two backends are available, chosen by the ``recommendation_cache_backend``
+setting:
+- "memory": per-process LRU, the default
+- "firestore": a shared ``recommendationCache`` collection, so every
+  replica benefits from a result generated by any of them. Enable a
+  Firestore TTL policy on the ``expires_at`` field to purge old entries.
+"""
+
+from datetime import date, datetime, time, timedelta, timezone
+from functools import lru_cache
+from typing import Optional
+from zoneinfo import ZoneInfo, ZoneInfoNotFoundError
+
+from app.config.firebase import get_firestore_client
+from app.config.settings import get_settings
+from app.utils.cache import TTLCache
+from app.utils.firestore import delete_document, get_document, set_document
+
+
+def local_day_bounds(
+    tz_name: Optional[str],
+    days_ahead: int = 0,
+) -> tuple[date, datetime]:
+    """
+    Get the user's local date and the moment that day ends.
+
+    Args:
+        tz_name: IANA timezone name (falls back to UTC if missing or unknown)
+        days_ahead: Offset from the user's current local date
+
+    Returns:
+        Tuple of (local date, following local midnight as an aware datetime)
+    """
+    try:
+        tz = ZoneInfo(tz_name) if tz_name else timezone.utc
+    except (ZoneInfoNotFoundError, ValueError):
+        tz = timezone.utc
+
+    day = datetime.now(tz).date() + timedelta(days=days_ahead)
+    midnight = datetime.combine(day + timedelta(days=1), time.min, tzinfo=tz)
+    return day, midnight
+
+
+class RecommendationCacheBackend:
+    """Storage interface for cached recommendation payloads."""
+
+    async def get(self, key: str) -> Optional[dict]:
+        raise NotImplementedError
+
+    async def set(self, key: str, value: dict, expires_at: datetime) -> None:
+        raise NotImplementedError
+
+    async def delete(self, key: str) -> None:
+        raise NotImplementedError
+
+
+class InMemoryRecommendationCache(RecommendationCacheBackend):
+    """Per-process LRU backend."""
+
+    def __init__(self, maxsize: int):
+        self._cache: TTLCache[dict] = TTLCache(maxsize=maxsize)
+
+    async def get(self, key: str) -> Optional[dict]:
+        return self._cache.get(key)
+
+    async def set(self, key: str, value: dict, expires_at: datetime) -> None:
+        self._cache.set(key, value, expires_at=expires_at.timestamp())
+
+    async def delete(self, key: str) -> None:
+        self._cache.pop(key)
+
+
+class FirestoreRecommendationCache(RecommendationCacheBackend):
+    """Backend shared by all replicas, stored in a Firestore collection."""
+
+    collection = "recommendationCache"
+
+    def _doc(self, key: str):
+        return get_firestore_client().collection(self.collection).document(key)
+
+    async def get(self, key: str) -> Optional[dict]:
+        doc = await get_document(self._doc(key))
+        if not doc.exists:
+            return None
+
+        data = doc.to_dict()
+        if data["expires_at"] <= datetime.now(timezone.utc):
+            return None
+        return data["value"]
+
+    async def set(self, key: str, value: dict, expires_at: datetime) -> None:
+        await set_document(self._doc(key), {"value": value, "expires_at": expires_at})
+
+    async def delete(self, key: str) -> None:
+        await delete_document(self._doc(key))
+
+
+@lru_cache
+def get_recommendation_cache() -> RecommendationCacheBackend:
+    """Get the configured recommendation cache backend."""
+    settings = get_settings()
+    if settings.recommendation_cache_backend == "firestore":
+        return FirestoreRecommendationCache()
+    return InMemoryRecommendationCache(maxsize=settings.recommendation_cache_size)
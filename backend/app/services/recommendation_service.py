@@ -2,19 +2,63 @@
 AI-powered workout recommendation service.
 """
 
+import asyncio
+import hashlib
 import json
 from typing import Optional
 
-from anthropic import Anthropic
+import orjson
 
+from app.ai.client import create_message, get_anthropic_client
 from app.ai.prompts.daily_recommendation import (
     FALLBACK_MESSAGES,
     SYSTEM_PROMPT,
     build_recommendation_prompt,
 )
-from app.config.settings import get_settings
+from app.models.user import UserProfile
 from app.models.workout import CyclePhase, Workout
 from app.services import user_service, workout_service
+from app.services.recommendation_cache import get_recommendation_cache, local_day_bounds
+from app.utils.metrics import CallbackGauge, Counter, ratio
+
+CLAUDE_MODEL = "claude-sonnet-4-20250514"
+
+RECOMMENDATION_REQUESTS = Counter(
+    "recommendation_requests_total",
+    "Daily recommendation lookups",
+)
+RECOMMENDATION_CACHE_HITS = Counter(
+    "recommendation_cache_hits_total",
+    "Lookups served from the recommendation cache",
+    labels=("tier",),
+)
+RECOMMENDATION_COALESCED = Counter(
+    "recommendation_coalesced_total",
+    "Lookups that joined an identical in-flight Claude call",
+)
+RECOMMENDATION_LLM_CALLS = Counter(
+    "recommendation_llm_calls_total",
+    "Claude calls made for recommendations",
+)
+CallbackGauge(
+    "recommendation_cache_hit_ratio",
+    "Share of lookups served from the recommendation cache",
+    lambda: ratio(RECOMMENDATION_CACHE_HITS.total(), RECOMMENDATION_REQUESTS.total()),
+)
+CallbackGauge(
+    "recommendation_coalesce_ratio",
+    "Share of lookups that joined an in-flight Claude call",
+    lambda: ratio(RECOMMENDATION_COALESCED.total(), RECOMMENDATION_REQUESTS.total()),
+)
+
+# FALLBACK_MESSAGES encoded once, so fallback responses splice them in as-is
+_FALLBACK_JSON = {
+    phase: {field: orjson.dumps(text) for field, text in messages.items()}
+    for phase, messages in FALLBACK_MESSAGES.items()
+}
+
+# Normalized prompt key -> future for the Claude call currently generating it
+_in_flight: dict[str, asyncio.Future] = {}
 
 
 class RecommendationResult:
@@ -26,11 +70,51 @@ class RecommendationResult:
         recommendations: list[dict],
         self_care_tip: str,
         workout_ids: list[str],
+        tokens_used: int = 0,
+        message_json: Optional[dict[str, bytes]] = None,
     ):
         self.daily_message = daily_message
         self.recommendations = recommendations
         self.self_care_tip = self_care_tip
         self.workout_ids = workout_ids
+        # Claude tokens spent producing this result (0 when served from cache)
+        self.tokens_used = tokens_used
+        # Pre-encoded daily_message/self_care_tip (set on fallback results)
+        self.message_json = message_json
+
+    def to_dict(self) -> dict:
+        """Serialize for the recommendation cache."""
+        return {
+            "daily_message": self.daily_message,
+            "recommendations": self.recommendations,
+            "self_care_tip": self.self_care_tip,
+            "workout_ids": self.workout_ids,
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "RecommendationResult":
+        """Rebuild a result stored by to_dict."""
+        return cls(**data)
+
+
+def _digest(*parts) -> str:
+    return hashlib.sha256(
+        json.dumps(parts, sort_keys=True, default=str).encode()
+    ).hexdigest()
+
+
+def _user_key(user_id: str) -> str:
+    return f"user-{user_id}"
+
+
+async def invalidate_user_recommendations(user_id: str) -> None:
+    """
+    Forget which cached recommendation a user was last served.
+
+    Called when something that feeds the prompt changes (a logged workout,
+    a profile update), so the next request re-reads the inputs.
+    """
+    await get_recommendation_cache().delete(_user_key(user_id))
 
 
 async def get_daily_recommendations(
@@ -49,13 +133,60 @@ async def get_daily_recommendations(
     Returns:
         RecommendationResult or None if failed
     """
-    settings = get_settings()
-
     # Get user profile
     user = await user_service.get_user_profile(user_id)
     if user is None:
         return None
 
+    return await get_recommendations_for_profile(user, phase, cycle_day)
+
+
+async def get_recommendations_for_profile(
+    user: UserProfile,
+    phase: str,
+    cycle_day: int,
+    days_ahead: int = 0,
+) -> RecommendationResult:
+    """
+    Get daily recommendations for an already-loaded user profile.
+
+    Results are cached until the end of the user's local day under a digest
+    of the normalized prompt, and concurrent requests for the same prompt
+    share a single Claude call. A per-user pointer to the last result lets repeat
+    requests skip the workout history read entirely until it is invalidated.
+
+    Args:
+        user: The user's profile
+        phase: Cycle phase on the target day
+        cycle_day: Cycle day on the target day
+        days_ahead: Target day relative to the user's local today
+            (the nightly pre-generation job uses 1)
+
+    Returns:
+        RecommendationResult (fallback content if the AI is unavailable)
+    """
+    RECOMMENDATION_REQUESTS.inc()
+
+    user_id = user.id
+    fitness_level = user.fitness_level.value if user.fitness_level else "intermediate"
+    # Sorted so equivalent profiles produce the same prompt
+    goals = sorted(g.value for g in user.goals) if user.goals else []
+
+    cache = get_recommendation_cache()
+    local_date, expires_at = local_day_bounds(user.timezone, days_ahead)
+
+    # Fast path: same phase/day/profile as this user's last request today,
+    # against the same workout catalog (a hot reload can change or remove
+    # the workouts the cached result recommends)
+    catalog_digest = workout_service.get_workout_catalog().digest
+    context = _digest(phase, cycle_day, fitness_level, goals, local_date, catalog_digest)
+    pointer = await cache.get(_user_key(user_id))
+    if pointer is not None and pointer["context"] == context:
+        cached = await cache.get(pointer["result_key"])
+        if cached is not None:
+            RECOMMENDATION_CACHE_HITS.inc(tier="user")
+            return RecommendationResult.from_dict(cached)
+
     # Get available workouts for this phase
     phase_enum = CyclePhase(phase)
     workouts, _ = await workout_service.get_all_workouts(phase=phase_enum, limit=20)
@@ -74,36 +205,103 @@ async def get_daily_recommendations(
 
     # Get recent workout titles to avoid repetition
     history, _, _ = await workout_service.get_workout_history(user_id, limit=5)
-    recent_titles = [h.workout_title for h in history]
+    recent_titles = sorted(set(h.workout_title for h in history))
 
-    # Build prompt
-    fitness_level = user.fitness_level.value if user.fitness_level else "intermediate"
-    goals = [g.value for g in user.goals] if user.goals else []
+    prompt = build_recommendation_prompt(
+        phase=phase,
+        cycle_day=cycle_day,
+        fitness_level=fitness_level,
+        goals=goals,
+        available_workouts=available_workouts,
+        recent_workouts=recent_titles,
+    )
 
-    # Check if API key is available
-    if not settings.anthropic_api_key:
-        # Return fallback recommendations without AI
-        return _get_fallback_recommendations(phase, available_workouts)
+    # Keyed by the normalized prompt, so it is shared by every user whose
+    # prompt comes out identical
+    result_key = "result-" + _digest(
+        CLAUDE_MODEL, SYSTEM_PROMPT, " ".join(prompt.split()), local_date
+    )
+    cached = await cache.get(result_key)
+    if cached is not None:
+        RECOMMENDATION_CACHE_HITS.inc(tier="shared")
+        result = RecommendationResult.from_dict(cached)
+    else:
+        result = await _generate_coalesced(result_key, phase, prompt, available_workouts)
+        if result is None:
+            # Fallbacks aren't cached so the AI is retried next time
+            return _get_fallback_recommendations(phase, available_workouts)
+        await cache.set(result_key, result.to_dict(), expires_at)
 
-    try:
-        # Call Claude API
-        client = Anthropic(api_key=settings.anthropic_api_key)
-
-        prompt = build_recommendation_prompt(
-            phase=phase,
-            cycle_day=cycle_day,
-            fitness_level=fitness_level,
-            goals=goals,
-            available_workouts=available_workouts,
-            recent_workouts=recent_titles,
+    if days_ahead == 0:
+        await cache.set(
+            _user_key(user_id),
+            {"context": context, "result_key": result_key},
+            expires_at,
         )
+    return result
+
+
+async def _generate_coalesced(
+    key: str,
+    phase: str,
+    prompt: str,
+    available_workouts: list[dict],
+) -> Optional[RecommendationResult]:
+    """
+    Generate recommendations, sharing one Claude call between concurrent
+    requests for the same normalized prompt.
+    """
+    future = _in_flight.get(key)
+    if future is not None:
+        RECOMMENDATION_COALESCED.inc()
+        try:
+            result = await asyncio.shield(future)
+        except asyncio.CancelledError:
+            if not future.cancelled():
+                raise
+            # The leading request was cancelled mid-call; serve the fallback
+            return None
+        # Copy without token usage, which belongs to the request that paid it
+        return RecommendationResult.from_dict(result.to_dict()) if result else None
+
+    future = asyncio.get_running_loop().create_future()
+    _in_flight[key] = future
+    try:
+        result = await _generate_recommendations(phase, prompt, available_workouts)
+        future.set_result(result)
+        return result
+    except BaseException:
+        future.cancel()
+        raise
+    finally:
+        _in_flight.pop(key, None)
+
 
-        message = client.messages.create(
-            model="claude-sonnet-4-20250514",
+async def _generate_recommendations(
+    phase: str,
+    prompt: str,
+    available_workouts: list[dict],
+) -> Optional[RecommendationResult]:
+    """
+    Ask Claude for recommendations.
+
+    Returns:
+        RecommendationResult, or None if the AI is unavailable or failed
+    """
+    # Check if the Claude client is configured (needs an API key)
+    if get_anthropic_client() is None:
+        return None
+
+    try:
+        # Call Claude API
+        RECOMMENDATION_LLM_CALLS.inc()
+        message = await create_message(
+            model=CLAUDE_MODEL,
             max_tokens=1024,
             system=SYSTEM_PROMPT,
             messages=[{"role": "user", "content": prompt}],
         )
+        tokens_used = message.usage.input_tokens + message.usage.output_tokens
 
         # Parse response
         response_text = message.content[0].text
@@ -119,7 +317,7 @@ async def get_daily_recommendations(
             if json_match:
                 result = json.loads(json_match.group())
             else:
-                return _get_fallback_recommendations(phase, available_workouts)
+                return None
 
         # Map workout titles to IDs
         workout_ids = []
@@ -135,11 +333,12 @@ async def get_daily_recommendations(
             recommendations=result.get("recommendations", []),
             self_care_tip=result.get("self_care_tip", FALLBACK_MESSAGES[phase]["self_care_tip"]),
             workout_ids=workout_ids,
+            tokens_used=tokens_used,
         )
 
     except Exception as e:
         print(f"AI recommendation failed: {e}")
-        return _get_fallback_recommendations(phase, available_workouts)
+        return None
 
 
 def _get_fallback_recommendations(
@@ -156,7 +355,8 @@ def _get_fallback_recommendations(
     Returns:
         RecommendationResult with fallback content
     """
-    fallback = FALLBACK_MESSAGES.get(phase, FALLBACK_MESSAGES["follicular"])
+    fallback_phase = phase if phase in FALLBACK_MESSAGES else "follicular"
+    fallback = FALLBACK_MESSAGES[fallback_phase]
 
     # Pick top 3 workouts
     top_workouts = available_workouts[:3]
@@ -171,4 +371,5 @@ def _get_fallback_recommendations(
         recommendations=recommendations,
         self_care_tip=fallback["self_care_tip"],
         workout_ids=workout_ids,
+        message_json=_FALLBACK_JSON[fallback_phase],
     )
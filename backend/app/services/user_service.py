@@ -2,13 +2,31 @@
 User service for Firestore operations.
 """
 
+import asyncio
+import contextvars
 from datetime import datetime
 from typing import Optional
 
-from google.cloud.firestore_v1 import DocumentSnapshot
+from google.cloud.firestore_v1 import (
+    CollectionReference,
+    DocumentSnapshot,
+    FieldFilter,
+    Increment,
+)
 
 from app.config.firebase import get_firestore_client
+from app.middleware.request_context import get_request_cache
+from app.utils.firestore import (
+    MAX_BATCH_WRITES,
+    commit_batch,
+    fetch_documents,
+    get_document,
+    list_subcollections,
+    set_document,
+    update_document,
+)
 from app.models.user import (
+    AccountDeletionStatus,
     FitnessGoal,
     FitnessLevel,
     SubscriptionStatus,
@@ -58,6 +76,7 @@ def _doc_to_user_profile(doc: DocumentSnapshot, user_id: str) -> Optional[UserPr
         average_period_length=data.get("average_period_length", 5),
         cycle_tracking_enabled=data.get("cycle_tracking_enabled", True),
         notifications_enabled=data.get("notifications_enabled", True),
+        timezone=data.get("timezone"),
         last_period_start_date=data.get("last_period_start_date"),
         subscription_status=subscription_status,
         subscription_expires_at=data.get("subscription_expires_at"),
@@ -67,19 +86,83 @@ def _doc_to_user_profile(doc: DocumentSnapshot, user_id: str) -> Optional[UserPr
     )
 
 
+# Account deletions, keyed by user ID. A record outlives the profile, so
+# progress can be reported and an interrupted deletion resumed.
+ACCOUNT_DELETIONS = "accountDeletions"
+
+# Background purges running in this process, referenced until they finish
+_purge_tasks: set[asyncio.Task] = set()
+
+
+def _profile_cache_key(user_id: str) -> str:
+    return f"user_profile:{user_id}"
+
+
+def invalidate_cached_profile(user_id: str) -> None:
+    """
+    Drop the request-scoped copy of a user's profile.
+
+    Must be called after any write to the user document so later reads in
+    the same request see the new data.
+    """
+    cache = get_request_cache()
+    if cache is not None:
+        cache.pop(_profile_cache_key(user_id), None)
+
+
 async def get_user_profile(user_id: str) -> Optional[UserProfile]:
     """
     Get user profile from Firestore.
 
+    The profile is memoized for the rest of the current request, so several
+    services can ask for it while only one Firestore read is made.
+
     Args:
         user_id: Firebase user UID
 
     Returns:
         UserProfile or None if not found
     """
+    cache = get_request_cache()
+    key = _profile_cache_key(user_id)
+    if cache is not None and key in cache:
+        return cache[key]
+
+    db = get_firestore_client()
+    doc = await get_document(db.collection("users").document(user_id))
+    profile = _doc_to_user_profile(doc, user_id)
+
+    if cache is not None:
+        cache[key] = profile
+    return profile
+
+
+async def list_cycle_tracking_users(
+    limit: int = 200,
+    start_after: Optional[str] = None,
+) -> list[UserProfile]:
+    """
+    Get a page of users with cycle tracking enabled, ordered by user ID.
+
+    Args:
+        limit: Page size
+        start_after: User ID of the last user on the previous page
+
+    Returns:
+        List of UserProfile (fewer than limit on the last page)
+    """
     db = get_firestore_client()
-    doc = db.collection("users").document(user_id).get()
-    return _doc_to_user_profile(doc, user_id)
+    query = (
+        db.collection("users")
+        .where(filter=FieldFilter("cycle_tracking_enabled", "==", True))
+        .order_by("__name__")
+        .limit(limit)
+    )
+    if start_after:
+        query = query.start_after({"__name__": start_after})
+
+    docs = await fetch_documents(query)
+    return [_doc_to_user_profile(doc, doc.id) for doc in docs]
 
 
 async def create_user_profile(
@@ -110,13 +193,15 @@ async def create_user_profile(
         "average_period_length": data.average_period_length,
         "cycle_tracking_enabled": data.cycle_tracking_enabled,
         "notifications_enabled": data.notifications_enabled,
+        "timezone": data.timezone,
         "subscription_status": SubscriptionStatus.NONE.value,
         "onboarding_completed": False,
         "created_at": now,
         "updated_at": now,
     }
 
-    db.collection("users").document(user_id).set(profile_data)
+    await set_document(db.collection("users").document(user_id), profile_data)
+    invalidate_cached_profile(user_id)
 
     # Initialize cycle tracking with historical dates if provided
     if data.initial_cycle_dates:
@@ -133,6 +218,7 @@ async def create_user_profile(
         average_period_length=data.average_period_length,
         cycle_tracking_enabled=data.cycle_tracking_enabled,
         notifications_enabled=data.notifications_enabled,
+        timezone=data.timezone,
         subscription_status=SubscriptionStatus.NONE,
         created_at=now,
         updated_at=now,
@@ -158,7 +244,8 @@ async def update_user_profile(
     doc_ref = db.collection("users").document(user_id)
 
     # Check if user exists
-    if not doc_ref.get().exists:
+    snapshot = await get_document(doc_ref)
+    if not snapshot.exists:
         return None
 
     # Build update dict with only provided fields
@@ -185,12 +272,15 @@ async def update_user_profile(
     if data.notifications_enabled is not None:
         update_data["notifications_enabled"] = data.notifications_enabled
 
+    if data.timezone is not None:
+        update_data["timezone"] = data.timezone
+
     if data.last_period_start_date is not None:
         update_data["last_period_start_date"] = data.last_period_start_date
 
     # Check if onboarding should be marked complete
     # (has display_name, fitness_level, and goals)
-    doc = doc_ref.get().to_dict()
+    doc = snapshot.to_dict()
     has_name = update_data.get("display_name") or doc.get("display_name")
     has_level = update_data.get("fitness_level") or doc.get("fitness_level")
     has_goals = update_data.get("goals") or doc.get("goals")
@@ -198,33 +288,163 @@ async def update_user_profile(
     if has_name and has_level and has_goals:
         update_data["onboarding_completed"] = True
 
-    doc_ref.update(update_data)
+    await update_document(doc_ref, update_data)
+    invalidate_cached_profile(user_id)
+
+    cycle_fields = {"average_cycle_length", "average_period_length", "last_period_start_date"}
+    if cycle_fields & update_data.keys():
+        from app.services import cycle_service
+        cycle_service.invalidate_phase_calendar(user_id)
+
+    from app.services import recommendation_service
+    await recommendation_service.invalidate_user_recommendations(user_id)
 
     return await get_user_profile(user_id)
 
 
-async def delete_user_profile(user_id: str) -> bool:
+async def get_account_deletion(user_id: str) -> Optional[AccountDeletionStatus]:
+    """
+    Get the status of a user's account deletion.
+
+    Args:
+        user_id: Firebase user UID
+
+    Returns:
+        AccountDeletionStatus or None if the account was never deleted
+    """
+    db = get_firestore_client()
+    doc = await get_document(db.collection(ACCOUNT_DELETIONS).document(user_id))
+    if not doc.exists:
+        return None
+    return AccountDeletionStatus.model_validate(doc.to_dict())
+
+
+async def delete_user_profile(user_id: str) -> Optional[AccountDeletionStatus]:
     """
-    Delete user profile from Firestore.
+    Delete user profile from Firestore and start deleting all of its data.
+
+    The profile and a deletion record are written in one batch, so the
+    account is gone at once and the record of what is left to delete can't
+    be lost. The subcollections are then deleted in the background
+    (purge_user_data), with progress kept on the record.
 
     Args:
         user_id: Firebase user UID
 
     Returns:
-        True if deleted, False if not found
+        The deletion's initial status, or None if not found
     """
     db = get_firestore_client()
     doc_ref = db.collection("users").document(user_id)
 
-    if not doc_ref.get().exists:
-        return False
+    if not (await get_document(doc_ref)).exists:
+        return None
+
+    now = datetime.utcnow()
+    record = {
+        "status": "running",
+        "documents_deleted": 0,
+        "requested_at": now,
+        "updated_at": now,
+        "completed_at": None,
+        "error": None,
+    }
+    batch = db.batch()
+    batch.delete(doc_ref)
+    batch.set(db.collection(ACCOUNT_DELETIONS).document(user_id), record)
+    await commit_batch(batch)
+
+    invalidate_cached_profile(user_id)
+    from app.services import cycle_service, recommendation_service
+    cycle_service.invalidate_phase_calendar(user_id)
+    await recommendation_service.invalidate_user_recommendations(user_id)
+
+    start_purge(user_id)
+    return AccountDeletionStatus(**record)
+
+
+def start_purge(user_id: str) -> None:
+    """Run purge_user_data in the background of this process."""
+    # A fresh context, so the work isn't counted against the request that
+    # started it
+    task = asyncio.create_task(purge_user_data(user_id), context=contextvars.Context())
+    _purge_tasks.add(task)
+    task.add_done_callback(_purge_tasks.discard)
+
+
+async def finish_purges(timeout: float) -> None:
+    """
+    Give background deletions a chance to finish (called on app shutdown).
+
+    Any still running are picked up by app.jobs.resume_account_deletions.
+    """
+    if _purge_tasks:
+        await asyncio.wait(set(_purge_tasks), timeout=timeout)
+
+
+async def purge_user_data(user_id: str) -> None:
+    """
+    Delete everything under a user's document and complete the deletion record.
+
+    The user document's subcollections are listed once, then each is
+    deleted with everything below it, at any depth, a page of an
+    all-descendants query at a time. Collections are deleted one after
+    another, so the purge has one Firestore call in flight and never
+    crowds requests out of the shared thread pool. Each batch also
+    advances the record's documents_deleted, so progress is exact even if
+    the purge is interrupted. Safe to rerun.
+
+    Args:
+        user_id: Firebase user UID
+    """
+    db = get_firestore_client()
+    deletion_ref = db.collection(ACCOUNT_DELETIONS).document(user_id)
+
+    try:
+        collections = await list_subcollections(db.collection("users").document(user_id))
+        for collection in collections:
+            await _delete_collection(collection, deletion_ref)
+    except Exception as e:
+        print(f"Warning: account deletion for {user_id} failed: {e}")
+        await update_document(deletion_ref, {
+            "status": "failed",
+            "error": str(e)[:500],
+            "updated_at": datetime.utcnow(),
+        })
+        return
 
-    # Delete subcollections first
-    for subcollection in ["cycleData", "workoutHistory", "preferences"]:
-        subcol_ref = doc_ref.collection(subcollection)
-        for doc in subcol_ref.stream():
-            doc.reference.delete()
+    now = datetime.utcnow()
+    await update_document(deletion_ref, {
+        "status": "completed",
+        "error": None,
+        "completed_at": now,
+        "updated_at": now,
+    })
 
-    # Delete the user document
-    doc_ref.delete()
-    return True
+
+async def _delete_collection(collection: CollectionReference, deletion_ref) -> None:
+    """
+    Delete every document in a collection and in all of its subcollections,
+    a batch at a time.
+    """
+    db = get_firestore_client()
+    # Each batch saves one write for the progress update
+    page_size = MAX_BATCH_WRITES - 1
+    # Descendants are matched by path, so documents below a parent with no
+    # fields of its own are found too
+    query = collection.recursive().select([]).limit(page_size)
+
+    while True:
+        docs = await fetch_documents(query)
+        if docs:
+            batch = db.batch()
+            for doc in docs:
+                batch.delete(doc.reference)
+            batch.update(deletion_ref, {
+                "documents_deleted": Increment(len(docs)),
+                "updated_at": datetime.utcnow(),
+            })
+            await commit_batch(batch)
+
+        if len(docs) < page_size:
+            break
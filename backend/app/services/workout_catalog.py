@@ -0,0 +1,317 @@
+"""
+Indexed in-memory workout catalog.
+
+Everything the workout endpoints need is built once when the catalog is
+loaded:
+- an id -> position dict for O(1) lookups
+- one bitset (a Python int, bit i = the i-th workout) per category,
+  intensity and recommended phase, so combined filters are a couple of
+  integer ANDs and the match count is a popcount
+- WorkoutSummary objects, so list endpoints never rebuild them, plus the
+  JSON encoding of every summary and workout, which the routes splice
+  into response bodies instead of serializing the same models per request
+
+Edits arrive through apply_changes, which updates the indexes in place
+(a removed workout leaves a cleared bit rather than shifting positions)
+and bumps ``version``. ``digest`` identifies the catalog's exact content
+and order (an XOR of per-position entry hashes, kept up to date
+incrementally), so replicas holding the same catalog agree on it. A lock
+keeps readers (including of ``version`` and ``digest``) from seeing a
+half-applied batch, since changes are applied from the Firestore listener
+thread.
+"""
+
+import hashlib
+import threading
+from typing import Iterable, Iterator, Optional
+
+from app.models.workout import (
+    CyclePhase,
+    IntensityLevel,
+    Workout,
+    WorkoutCategory,
+    WorkoutSummary,
+)
+
+# Bytes per block when walking a bitset; small enough that peeling bits
+# off one block is cheap, large enough that skipping whole blocks is fast
+_BLOCK_BYTES = 64
+
+
+def _workout_to_summary(workout: Workout) -> WorkoutSummary:
+    """Convert Workout to WorkoutSummary."""
+    return WorkoutSummary(
+        id=workout.id,
+        title=workout.title,
+        category=workout.category,
+        duration_minutes=workout.duration_minutes,
+        intensity=workout.intensity,
+        thumbnail_url=workout.thumbnail_url,
+        is_premium=workout.is_premium,
+    )
+
+
+def _to_json(model) -> bytes:
+    return model.model_dump_json().encode()
+
+
+def _entry_hash(position: int, workout_json: bytes) -> int:
+    """Hash of one catalog slot, combined into the catalog digest."""
+    payload = f"{position}:".encode() + workout_json
+    return int.from_bytes(hashlib.blake2b(payload, digest_size=8).digest(), "big")
+
+
+def _bitset(positions: list[int], size: int) -> int:
+    """Build a bitset int from ascending positions in one pass."""
+    bits = bytearray((size + 7) // 8)
+    for position in positions:
+        bits[position >> 3] |= 1 << (position & 7)
+    return int.from_bytes(bits, "little")
+
+
+def _iter_bits(mask: int, skip: int = 0) -> Iterator[int]:
+    """Yield the positions of set bits in ascending order, skipping the first ``skip``."""
+    data = mask.to_bytes((mask.bit_length() + 7) // 8, "little")
+    for start in range(0, len(data), _BLOCK_BYTES):
+        block = int.from_bytes(data[start : start + _BLOCK_BYTES], "little")
+        count = block.bit_count()
+        if skip >= count:
+            # Whole block is before the requested page
+            skip -= count
+            continue
+        while block:
+            lowest = block & -block
+            block ^= lowest
+            if skip:
+                skip -= 1
+            else:
+                yield start * 8 + lowest.bit_length() - 1
+
+
+class WorkoutCatalog:
+    """Workout library with precomputed lookup and filter indexes."""
+
+    def __init__(self, workouts: Iterable[Workout], version: int = 0):
+        self._lock = threading.Lock()
+        self._version = version
+        self._workouts: list[Optional[Workout]] = []
+        self._positions: dict[str, int] = {}
+
+        for workout in workouts:
+            if workout.id in self._positions:
+                # Later entries replace earlier ones, keeping the first position
+                self._workouts[self._positions[workout.id]] = workout
+                continue
+            self._positions[workout.id] = len(self._workouts)
+            self._workouts.append(workout)
+
+        self._summaries = [_workout_to_summary(w) for w in self._workouts]
+        self._summary_json = [_to_json(s) for s in self._summaries]
+        self._workout_json: list[Optional[bytes]] = [_to_json(w) for w in self._workouts]
+        self._live = (1 << len(self._workouts)) - 1
+        self._digest = 0
+        for position, workout_json in enumerate(self._workout_json):
+            self._digest ^= _entry_hash(position, workout_json)
+        self._holes = 0
+
+        categories: dict[WorkoutCategory, list[int]] = {}
+        intensities: dict[IntensityLevel, list[int]] = {}
+        phases: dict[CyclePhase, list[int]] = {}
+        for position, workout in enumerate(self._workouts):
+            categories.setdefault(workout.category, []).append(position)
+            intensities.setdefault(workout.intensity, []).append(position)
+            for phase in set(workout.recommended_phases):
+                phases.setdefault(phase, []).append(position)
+
+        size = len(self._workouts)
+        self._by_category = {k: _bitset(v, size) for k, v in categories.items()}
+        self._by_intensity = {k: _bitset(v, size) for k, v in intensities.items()}
+        self._by_phase = {k: _bitset(v, size) for k, v in phases.items()}
+
+    def __len__(self) -> int:
+        return len(self._positions)
+
+    @property
+    def version(self) -> int:
+        """Incremented every time apply_changes modifies the catalog."""
+        with self._lock:
+            return self._version
+
+    @property
+    def digest(self) -> str:
+        """Content digest for cache validators (ETags)."""
+        with self._lock:
+            return f"{self._digest:016x}"
+
+    @property
+    def workouts(self) -> list[Workout]:
+        """All workouts in catalog order."""
+        with self._lock:
+            return [w for w in self._workouts if w is not None]
+
+    def get(self, workout_id: str) -> Optional[Workout]:
+        """Get a workout by ID, or None if it isn't in the catalog."""
+        with self._lock:
+            position = self._positions.get(workout_id)
+            return None if position is None else self._workouts[position]
+
+    def get_json(self, workout_id: str) -> Optional[bytes]:
+        """Get a workout's JSON encoding by ID, or None if it isn't in the catalog."""
+        with self._lock:
+            position = self._positions.get(workout_id)
+            return None if position is None else self._workout_json[position]
+
+    def apply_changes(
+        self,
+        upserts: Iterable[Workout] = (),
+        removals: Iterable[str] = (),
+    ) -> bool:
+        """
+        Add, replace and remove workouts in place.
+
+        Args:
+            upserts: Workouts to add, or replace when the ID already exists
+            removals: IDs of workouts to remove
+
+        Returns:
+            True if anything changed (and the version was bumped)
+        """
+        with self._lock:
+            changed = False
+            for workout in upserts:
+                changed |= self._upsert(workout)
+            for workout_id in removals:
+                changed |= self._remove(workout_id)
+            if changed:
+                self._version += 1
+            return changed
+
+    def _index(self, position: int, workout: Workout, add: bool) -> None:
+        bit = 1 << position
+        keyed = [
+            (self._by_category, workout.category),
+            (self._by_intensity, workout.intensity),
+            *((self._by_phase, phase) for phase in set(workout.recommended_phases)),
+        ]
+        for index, key in keyed:
+            mask = index.get(key, 0)
+            index[key] = mask | bit if add else mask & ~bit
+
+    def _upsert(self, workout: Workout) -> bool:
+        position = self._positions.get(workout.id)
+        summary = _workout_to_summary(workout)
+        if position is None:
+            position = len(self._workouts)
+            self._positions[workout.id] = position
+            self._workouts.append(workout)
+            self._summaries.append(summary)
+            self._summary_json.append(_to_json(summary))
+            self._workout_json.append(_to_json(workout))
+            self._live |= 1 << position
+        elif self._workouts[position] == workout:
+            return False
+        else:
+            self._index(position, self._workouts[position], add=False)
+            self._digest ^= _entry_hash(position, self._workout_json[position])
+            self._workouts[position] = workout
+            self._summaries[position] = summary
+            self._summary_json[position] = _to_json(summary)
+            self._workout_json[position] = _to_json(workout)
+
+        self._index(position, workout, add=True)
+        self._digest ^= _entry_hash(position, self._workout_json[position])
+        return True
+
+    def _remove(self, workout_id: str) -> bool:
+        position = self._positions.pop(workout_id, None)
+        if position is None:
+            return False
+
+        self._index(position, self._workouts[position], add=False)
+        self._digest ^= _entry_hash(position, self._workout_json[position])
+        self._workouts[position] = None
+        self._workout_json[position] = None
+        self._live &= ~(1 << position)
+        self._holes += 1
+        return True
+
+    def _mask(
+        self,
+        category: Optional[WorkoutCategory],
+        intensity: Optional[IntensityLevel],
+        phase: Optional[CyclePhase],
+    ) -> int:
+        mask = self._live
+        if category:
+            mask &= self._by_category.get(category, 0)
+        if intensity:
+            mask &= self._by_intensity.get(intensity, 0)
+        if phase:
+            mask &= self._by_phase.get(phase, 0)
+        return mask
+
+    def _page(
+        self,
+        category: Optional[WorkoutCategory],
+        intensity: Optional[IntensityLevel],
+        phase: Optional[CyclePhase],
+        limit: int,
+        offset: int,
+        entries: list,
+    ) -> tuple[list, int]:
+        """Pick one page of ``entries`` (a per-position list); call with the lock held."""
+        mask = self._mask(category, intensity, phase)
+        total = mask.bit_count()
+        if limit <= 0 or offset >= total:
+            return [], total
+
+        if mask == self._live and not self._holes:
+            return entries[offset : offset + limit], total
+
+        page = []
+        for position in _iter_bits(mask, skip=offset):
+            page.append(entries[position])
+            if len(page) == limit:
+                break
+        return page, total
+
+    def filter(
+        self,
+        category: Optional[WorkoutCategory] = None,
+        intensity: Optional[IntensityLevel] = None,
+        phase: Optional[CyclePhase] = None,
+        limit: int = 20,
+        offset: int = 0,
+    ) -> tuple[list[WorkoutSummary], int]:
+        """
+        Filter and page the catalog.
+
+        Args:
+            category: Filter by workout category
+            intensity: Filter by intensity level
+            phase: Filter by recommended cycle phase
+            limit: Maximum results to return
+            offset: Pagination offset
+
+        Returns:
+            Tuple of (workout summaries in catalog order, total matches)
+        """
+        with self._lock:
+            return self._page(category, intensity, phase, limit, offset, self._summaries)
+
+    def filter_json(
+        self,
+        category: Optional[WorkoutCategory] = None,
+        intensity: Optional[IntensityLevel] = None,
+        phase: Optional[CyclePhase] = None,
+        limit: int = 20,
+        offset: int = 0,
+    ) -> tuple[list[bytes], int]:
+        """
+        Same as filter, but returns each summary's JSON encoding.
+
+        Returns:
+            Tuple of (encoded workout summaries in catalog order, total matches)
+        """
+        with self._lock:
+            return self._page(category, intensity, phase, limit, offset, self._summary_json)
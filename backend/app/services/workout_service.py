@@ -6,6 +6,8 @@ from datetime import datetime
 from typing import Optional
 import uuid
 
+from pydantic import ValidationError
+
 from app.config.firebase import get_firestore_client
 from app.models.workout import (
     CyclePhase,
@@ -15,9 +17,12 @@ from app.models.workout import (
     WorkoutHistory,
     WorkoutSummary,
 )
+from app.services.workout_catalog import WorkoutCatalog
+from app.utils.firestore import fetch_documents, set_document
 
 
-# Placeholder workouts - these would normally come from Firestore
+# Placeholder workouts - served until the Firestore workouts collection
+# has content (see load_workout_catalog)
 PLACEHOLDER_WORKOUTS: list[Workout] = [
     # Menstrual phase - low intensity
     Workout(
@@ -170,19 +175,132 @@ PLACEHOLDER_WORKOUTS: list[Workout] = [
 ]
 
 
-def _workout_to_summary(workout: Workout) -> WorkoutSummary:
-    """Convert Workout to WorkoutSummary."""
-    return WorkoutSummary(
-        id=workout.id,
-        title=workout.title,
-        category=workout.category,
-        duration_minutes=workout.duration_minutes,
-        intensity=workout.intensity,
-        thumbnail_url=workout.thumbnail_url,
-        is_premium=workout.is_premium,
+WORKOUTS_COLLECTION = "workouts"
+
+_catalog: Optional[WorkoutCatalog] = None
+# True while serving PLACEHOLDER_WORKOUTS because Firestore had none
+_catalog_is_placeholder = True
+_catalog_watch = None
+# The listener's first snapshot is a full listing; it also catches documents
+# deleted between the startup load and the subscription
+_awaiting_first_snapshot = False
+
+
+def get_workout_catalog() -> WorkoutCatalog:
+    """Get the indexed workout catalog, building it on first use."""
+    global _catalog
+    if _catalog is None:
+        _catalog = WorkoutCatalog(PLACEHOLDER_WORKOUTS)
+    return _catalog
+
+
+def catalog_is_placeholder() -> bool:
+    """Whether the catalog is PLACEHOLDER_WORKOUTS rather than the Firestore library."""
+    return _catalog_is_placeholder
+
+
+def _workout_from_snapshot(doc) -> Optional[Workout]:
+    """Parse a workouts document, skipping (and logging) invalid ones."""
+    data = doc.to_dict() or {}
+    # Without a stored created_at every parse would get a fresh default,
+    # making unchanged documents look modified
+    if "created_at" not in data and getattr(doc, "create_time", None) is not None:
+        data["created_at"] = doc.create_time
+    data.pop("id", None)
+
+    try:
+        return Workout(id=doc.id, **data)
+    except ValidationError as e:
+        print(f"Warning: skipping invalid workout {doc.id}: {e}")
+        return None
+
+
+def _replace_catalog(workouts: list[Workout], is_placeholder: bool) -> WorkoutCatalog:
+    global _catalog, _catalog_is_placeholder
+    previous = _catalog
+    # Keep versions increasing across swaps so catalog ETags never repeat
+    version = previous.version + 1 if previous is not None else 0
+    _catalog = WorkoutCatalog(workouts, version=version)
+    _catalog_is_placeholder = is_placeholder
+    return _catalog
+
+
+async def load_workout_catalog() -> WorkoutCatalog:
+    """
+    Load the workout library from Firestore (called from the app lifespan).
+
+    Falls back to PLACEHOLDER_WORKOUTS when the collection is empty or
+    cannot be read.
+
+    Returns:
+        The loaded catalog
+    """
+    db = get_firestore_client()
+    try:
+        docs = await fetch_documents(db.collection(WORKOUTS_COLLECTION))
+    except Exception as e:
+        print(f"Warning: could not load workouts from Firestore: {e}")
+        docs = []
+
+    workouts = [w for w in map(_workout_from_snapshot, docs) if w is not None]
+    if not workouts:
+        print("No workouts in Firestore, using placeholder catalog")
+        return _replace_catalog(PLACEHOLDER_WORKOUTS, is_placeholder=True)
+
+    print(f"Loaded {len(workouts)} workouts from Firestore")
+    return _replace_catalog(workouts, is_placeholder=False)
+
+
+def _on_workouts_snapshot(docs, changes, read_time) -> None:
+    """Apply workout edits pushed by the Firestore listener (listener thread)."""
+    global _awaiting_first_snapshot
+    first_snapshot, _awaiting_first_snapshot = _awaiting_first_snapshot, False
+
+    if _catalog_is_placeholder:
+        workouts = [w for w in map(_workout_from_snapshot, docs) if w is not None]
+        if workouts:
+            _replace_catalog(workouts, is_placeholder=False)
+        return
+
+    upserts = []
+    removals = []
+    for change in changes:
+        if change.type.name == "REMOVED":
+            removals.append(change.document.id)
+        else:
+            workout = _workout_from_snapshot(change.document)
+            if workout is not None:
+                upserts.append(workout)
+
+    if first_snapshot:
+        listed = {doc.id for doc in docs}
+        removals.extend(w.id for w in get_workout_catalog().workouts if w.id not in listed)
+
+    if get_workout_catalog().apply_changes(upserts, removals):
+        print(
+            f"Workout catalog updated: {len(upserts)} upserted, "
+            f"{len(removals)} removed (version {get_workout_catalog().version})"
+        )
+
+
+def start_workout_catalog_listener() -> None:
+    """Subscribe to the workouts collection so edits apply without a redeploy."""
+    global _catalog_watch, _awaiting_first_snapshot
+    db = get_firestore_client()
+    _awaiting_first_snapshot = True
+    _catalog_watch = db.collection(WORKOUTS_COLLECTION).on_snapshot(
+        _on_workouts_snapshot
     )
 
 
+def stop_workout_catalog_listener() -> None:
+    """Unsubscribe the workouts listener, if running."""
+    global _catalog_watch
+    if _catalog_watch is not None:
+        _catalog_watch.unsubscribe()
+    _catalog_watch = None
+
+
 async def get_all_workouts(
     category: Optional[WorkoutCategory] = None,
     intensity: Optional[IntensityLevel] = None,
@@ -203,21 +321,13 @@ async def get_all_workouts(
     Returns:
         Tuple of (workout summaries, total count)
     """
-    filtered = PLACEHOLDER_WORKOUTS
-
-    if category:
-        filtered = [w for w in filtered if w.category == category]
-
-    if intensity:
-        filtered = [w for w in filtered if w.intensity == intensity]
-
-    if phase:
-        filtered = [w for w in filtered if phase in w.recommended_phases]
-
-    total = len(filtered)
-    paginated = filtered[offset : offset + limit]
-
-    return [_workout_to_summary(w) for w in paginated], total
+    return get_workout_catalog().filter(
+        category=category,
+        intensity=intensity,
+        phase=phase,
+        limit=limit,
+        offset=offset,
+    )
 
 
 async def get_workout_by_id(workout_id: str) -> Optional[Workout]:
@@ -230,10 +340,7 @@ async def get_workout_by_id(workout_id: str) -> Optional[Workout]:
     Returns:
         Workout or None if not found
     """
-    for workout in PLACEHOLDER_WORKOUTS:
-        if workout.id == workout_id:
-            return workout
-    return None
+    return get_workout_catalog().get(workout_id)
 
 
 async def get_recommended_workouts(
@@ -250,8 +357,54 @@ async def get_recommended_workouts(
     Returns:
         List of recommended workout summaries
     """
-    recommended = [w for w in PLACEHOLDER_WORKOUTS if phase in w.recommended_phases]
-    return [_workout_to_summary(w) for w in recommended[:limit]]
+    recommended, _ = get_workout_catalog().filter(phase=phase, limit=limit)
+    return recommended
+
+
+async def get_all_workouts_json(
+    category: Optional[WorkoutCategory] = None,
+    intensity: Optional[IntensityLevel] = None,
+    phase: Optional[CyclePhase] = None,
+    limit: int = 20,
+    offset: int = 0,
+) -> tuple[list[bytes], int]:
+    """
+    Same as get_all_workouts, but returns the catalog's pre-serialized summaries.
+
+    Returns:
+        Tuple of (JSON-encoded workout summaries, total count)
+    """
+    return get_workout_catalog().filter_json(
+        category=category,
+        intensity=intensity,
+        phase=phase,
+        limit=limit,
+        offset=offset,
+    )
+
+
+async def get_workout_json_by_id(workout_id: str) -> Optional[bytes]:
+    """
+    Same as get_workout_by_id, but returns the catalog's pre-serialized workout.
+
+    Returns:
+        JSON-encoded workout or None if not found
+    """
+    return get_workout_catalog().get_json(workout_id)
+
+
+async def get_recommended_workouts_json(
+    phase: CyclePhase,
+    limit: int = 4,
+) -> list[bytes]:
+    """
+    Same as get_recommended_workouts, but returns pre-serialized summaries.
+
+    Returns:
+        List of JSON-encoded workout summaries
+    """
+    recommended, _ = get_workout_catalog().filter_json(phase=phase, limit=limit)
+    return recommended
 
 
 async def log_workout_completion(
@@ -293,9 +446,16 @@ async def log_workout_completion(
         "notes": notes,
     }
 
-    db.collection("users").document(user_id).collection("workoutHistory").document(
-        history_id
-    ).set(history_data)
+    await set_document(
+        db.collection("users").document(user_id).collection("workoutHistory").document(
+            history_id
+        ),
+        history_data,
+    )
+
+    # Recent workouts feed the recommendation prompt
+    from app.services import recommendation_service
+    await recommendation_service.invalidate_user_recommendations(user_id)
 
     return WorkoutHistory(id=history_id, **history_data)
 
@@ -326,7 +486,7 @@ async def get_workout_history(
     history = []
     total_minutes = 0
 
-    for doc in history_ref.stream():
+    for doc in await fetch_documents(history_ref):
         data = doc.to_dict()
         history.append(
             WorkoutHistory(
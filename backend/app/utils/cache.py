@@ -0,0 +1,101 @@
+"""
+In-process caching utilities.
+"""
+
+import threading
+import time
+from collections import OrderedDict
+from typing import Callable, Generic, Hashable, Optional, TypeVar
+
+V = TypeVar("V")
+
+
+class TTLCache(Generic[V]):
+    """
+    Bounded LRU cache whose entries expire at a per-entry deadline.
+
+    Entries are evicted least-recently-used first once either ``maxsize``
+    entries or ``max_weight`` total weight is exceeded. Expired entries are
+    dropped lazily when read. Safe to share between threads.
+    """
+
+    def __init__(
+        self,
+        maxsize: int,
+        max_weight: Optional[int] = None,
+        clock: Callable[[], float] = time.time,
+    ):
+        self.maxsize = maxsize
+        self.max_weight = max_weight
+        self._clock = clock
+        self._entries: OrderedDict[Hashable, tuple[V, float, int]] = OrderedDict()
+        self._weight = 0
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    @property
+    def weight(self) -> int:
+        """Total weight of the entries currently held."""
+        return self._weight
+
+    def get(self, key: Hashable) -> Optional[V]:
+        """Return the cached value, or None if missing or expired."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+
+            value, expires_at, weight = entry
+            if expires_at <= self._clock():
+                del self._entries[key]
+                self._weight -= weight
+                return None
+
+            self._entries.move_to_end(key)
+            return value
+
+    def set(self, key: Hashable, value: V, expires_at: float, weight: int = 1) -> None:
+        """
+        Store a value until ``expires_at`` (same time base as the clock).
+
+        Args:
+            key: Cache key
+            value: Value to store
+            expires_at: Deadline after which the entry is treated as missing
+            weight: Relative size of the entry, counted against max_weight
+        """
+        if expires_at <= self._clock():
+            return
+        if self.max_weight is not None and weight > self.max_weight:
+            return
+
+        with self._lock:
+            previous = self._entries.pop(key, None)
+            if previous is not None:
+                self._weight -= previous[2]
+
+            self._entries[key] = (value, expires_at, weight)
+            self._weight += weight
+
+            while len(self._entries) > self.maxsize or (
+                self.max_weight is not None and self._weight > self.max_weight
+            ):
+                _, (_, _, evicted_weight) = self._entries.popitem(last=False)
+                self._weight -= evicted_weight
+
+    def pop(self, key: Hashable) -> Optional[V]:
+        """Remove an entry, returning its value if it was present."""
+        with self._lock:
+            entry = self._entries.pop(key, None)
+            if entry is None:
+                return None
+            self._weight -= entry[2]
+            return entry[0]
+
+    def clear(self) -> None:
+        """Remove all entries."""
+        with self._lock:
+            self._entries.clear()
+            self._weight = 0
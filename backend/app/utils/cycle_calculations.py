@@ -6,10 +6,107 @@ menstrual cycle phase based on the last period start date and cycle length.
 """
 
 from datetime import date, timedelta
-from typing import Literal, Optional
+from typing import Literal, NamedTuple, Optional
 import statistics
 
-from app.models.cycle import CycleInfo, CyclePhase, PhasePrediction
+from app.models.cycle import CycleInfo, CyclePhase, PhasePrediction, PhaseRun
+
+# Valid ranges for user cycle settings (see UserBase)
+MIN_CYCLE_LENGTH = 21
+MAX_CYCLE_LENGTH = 45
+MIN_PERIOD_LENGTH = 2
+MAX_PERIOD_LENGTH = 10
+
+
+class PhaseDay(NamedTuple):
+    """Precomputed phase information for one day of the cycle."""
+    phase: CyclePhase
+    days_until_next_phase: int
+    next_phase: CyclePhase
+
+
+def _compute_phase_day(
+    cycle_day: int,
+    average_cycle_length: int,
+    average_period_length: int,
+) -> PhaseDay:
+    """Work out the phase for one cycle day from the phase boundaries."""
+    # Calculate phase boundaries based on cycle length
+    # These ratios are based on typical cycle phase distributions
+    menstrual_end = average_period_length
+    follicular_end = round(average_cycle_length * 0.46)  # ~Day 13 for 28-day
+    ovulatory_end = round(average_cycle_length * 0.57)   # ~Day 16 for 28-day
+
+    if cycle_day <= menstrual_end:
+        return PhaseDay(CyclePhase.MENSTRUAL, menstrual_end - cycle_day + 1, CyclePhase.FOLLICULAR)
+    if cycle_day <= follicular_end:
+        return PhaseDay(CyclePhase.FOLLICULAR, follicular_end - cycle_day + 1, CyclePhase.OVULATORY)
+    if cycle_day <= ovulatory_end:
+        return PhaseDay(CyclePhase.OVULATORY, ovulatory_end - cycle_day + 1, CyclePhase.LUTEAL)
+    return PhaseDay(CyclePhase.LUTEAL, average_cycle_length - cycle_day + 1, CyclePhase.MENSTRUAL)
+
+
+def _build_phase_row(
+    average_cycle_length: int,
+    average_period_length: int,
+) -> tuple[Optional[PhaseDay], ...]:
+    """Build the per-cycle-day row for one (cycle length, period length) pair."""
+    # Index 0 is unused so the row can be indexed by 1-based cycle day
+    return (None,) + tuple(
+        _compute_phase_day(cycle_day, average_cycle_length, average_period_length)
+        for cycle_day in range(1, average_cycle_length + 1)
+    )
+
+
+# Every valid (cycle length, period length) pair -> row indexed by cycle day.
+# Built once at import: 25 x 9 rows, ~7,400 entries.
+_PHASE_TABLE: dict[tuple[int, int], tuple[Optional[PhaseDay], ...]] = {
+    (cycle_length, period_length): _build_phase_row(cycle_length, period_length)
+    for cycle_length in range(MIN_CYCLE_LENGTH, MAX_CYCLE_LENGTH + 1)
+    for period_length in range(MIN_PERIOD_LENGTH, MAX_PERIOD_LENGTH + 1)
+}
+
+
+def get_phase_row(
+    average_cycle_length: int = 28,
+    average_period_length: int = 5,
+) -> tuple[Optional[PhaseDay], ...]:
+    """
+    Get the precomputed phase row for a cycle configuration.
+
+    Settings outside the validated ranges (e.g. a median computed from
+    unusual onboarding dates) are computed on the fly.
+
+    Args:
+        average_cycle_length: User's average cycle length
+        average_period_length: User's average period length
+
+    Returns:
+        Tuple indexed by cycle day (1..cycle length); index 0 is None
+    """
+    row = _PHASE_TABLE.get((average_cycle_length, average_period_length))
+    if row is None:
+        row = _build_phase_row(average_cycle_length, average_period_length)
+    return row
+
+
+def phase_for_cycle_day(
+    cycle_day: int,
+    average_cycle_length: int = 28,
+    average_period_length: int = 5,
+) -> PhaseDay:
+    """
+    Determine the phase for a 1-indexed day of the cycle.
+
+    Args:
+        cycle_day: Day of the cycle (1 = first day of period)
+        average_cycle_length: User's average cycle length
+        average_period_length: User's average period length
+
+    Returns:
+        PhaseDay with the phase, days until next phase, and next phase
+    """
+    return get_phase_row(average_cycle_length, average_period_length)[cycle_day]
 
 
 def calculate_current_phase(
@@ -46,29 +143,10 @@ def calculate_current_phase(
     # Calculate cycle day (1-indexed, wraps around)
     cycle_day = (days_since_start % average_cycle_length) + 1
 
-    # Calculate phase boundaries based on cycle length
-    # These ratios are based on typical cycle phase distributions
-    menstrual_end = average_period_length
-    follicular_end = round(average_cycle_length * 0.46)  # ~Day 13 for 28-day
-    ovulatory_end = round(average_cycle_length * 0.57)   # ~Day 16 for 28-day
-
     # Determine current phase
-    if cycle_day <= menstrual_end:
-        phase = CyclePhase.MENSTRUAL
-        days_until_next = menstrual_end - cycle_day + 1
-        next_phase = CyclePhase.FOLLICULAR
-    elif cycle_day <= follicular_end:
-        phase = CyclePhase.FOLLICULAR
-        days_until_next = follicular_end - cycle_day + 1
-        next_phase = CyclePhase.OVULATORY
-    elif cycle_day <= ovulatory_end:
-        phase = CyclePhase.OVULATORY
-        days_until_next = ovulatory_end - cycle_day + 1
-        next_phase = CyclePhase.LUTEAL
-    else:
-        phase = CyclePhase.LUTEAL
-        days_until_next = average_cycle_length - cycle_day + 1
-        next_phase = CyclePhase.MENSTRUAL
+    phase, days_until_next, next_phase = phase_for_cycle_day(
+        cycle_day, average_cycle_length, average_period_length
+    )
 
     # Determine confidence based on data freshness
     # Higher confidence if we have recent period data
@@ -116,7 +194,39 @@ def predict_phases(
     Returns:
         List of phase predictions including full historical and future dates
     """
-    predictions = []
+    start_date, total_days = prediction_window(
+        last_period_start=last_period_start,
+        average_cycle_length=average_cycle_length,
+        average_period_length=average_period_length,
+        earliest_cycle_date=earliest_cycle_date,
+    )
+    return predict_phase_range(
+        last_period_start=last_period_start,
+        start_date=start_date,
+        total_days=total_days,
+        average_cycle_length=average_cycle_length,
+        average_period_length=average_period_length,
+    )
+
+
+def prediction_window(
+    last_period_start: date,
+    average_cycle_length: int = 28,
+    average_period_length: int = 5,
+    earliest_cycle_date: Optional[date] = None,
+) -> tuple[date, int]:
+    """
+    Work out the date range covered by predict_phases.
+
+    Args:
+        last_period_start: First day of the most recent period
+        average_cycle_length: User's average cycle length
+        average_period_length: User's average period length
+        earliest_cycle_date: Earliest logged cycle date (for full history)
+
+    Returns:
+        Tuple of (first date, number of days)
+    """
     today = date.today()
 
     # Calculate next period start date
@@ -144,28 +254,115 @@ def predict_phases(
         # Fallback: 90 days back if no cycle history available
         start_date = today - timedelta(days=90)
 
-    # Generate predictions from earliest date to future
+    # Predictions run from the earliest date to the end of the next period
     total_days = (today - start_date).days + effective_future_days
-    for i in range(total_days):
-        target_date = start_date + timedelta(days=i)
-        cycle_info = calculate_current_phase(
-            last_period_start=last_period_start,
-            average_cycle_length=average_cycle_length,
-            average_period_length=average_period_length,
-            reference_date=target_date,
-        )
+    return start_date, total_days
+
+
+def predict_phase_range(
+    last_period_start: date,
+    start_date: date,
+    total_days: int,
+    average_cycle_length: int = 28,
+    average_period_length: int = 5,
+) -> list[PhasePrediction]:
+    """
+    Compute the phase and cycle day for every day of a date range in one pass.
 
+    Gives the same result as calling calculate_current_phase for each day,
+    but reads phases straight from the precomputed phase table instead of
+    building (and discarding) a CycleInfo for every day.
+
+    Args:
+        last_period_start: First day of the most recent period
+        start_date: First date of the range
+        total_days: Number of consecutive days to predict
+        average_cycle_length: User's average cycle length
+        average_period_length: User's average period length
+
+    Returns:
+        One PhasePrediction per day, in date order
+    """
+    row = get_phase_row(average_cycle_length, average_period_length)
+
+    first_offset = (start_date - last_period_start).days
+    start_ordinal = start_date.toordinal()
+
+    predictions = []
+    for i in range(total_days):
+        # Dates before the period start clamp to cycle day 1
+        offset = first_offset + i
+        cycle_day = (offset % average_cycle_length) + 1 if offset > 0 else 1
         predictions.append(
             PhasePrediction(
-                date=target_date,
-                predicted_phase=cycle_info.current_phase,
-                cycle_day=cycle_info.cycle_day,
+                date=date.fromordinal(start_ordinal + i),
+                predicted_phase=row[cycle_day].phase,
+                cycle_day=cycle_day,
             )
         )
 
     return predictions
 
 
+def predict_phase_runs(
+    last_period_start: date,
+    start_date: date,
+    total_days: int,
+    average_cycle_length: int = 28,
+    average_period_length: int = 5,
+) -> list[PhaseRun]:
+    """
+    Compute the same calendar as predict_phase_range as run-length segments.
+
+    Works a phase at a time rather than a day at a time, so the cost grows
+    with the number of phase changes (about four per cycle), not days.
+
+    Args:
+        last_period_start: First day of the most recent period
+        start_date: First date of the range
+        total_days: Number of consecutive days to cover
+        average_cycle_length: User's average cycle length
+        average_period_length: User's average period length
+
+    Returns:
+        PhaseRun segments in date order, covering the range exactly
+    """
+    row = get_phase_row(average_cycle_length, average_period_length)
+
+    first_offset = (start_date - last_period_start).days
+    start_ordinal = start_date.toordinal()
+    runs = []
+
+    # Days before the period start all clamp to cycle day 1
+    i = min(total_days, max(0, -first_offset))
+    if i:
+        runs.append(
+            PhaseRun(
+                start_date=start_date,
+                phase=row[1].phase,
+                length=i,
+                start_cycle_day=1,
+                cycle_day_step=0,
+            )
+        )
+
+    while i < total_days:
+        cycle_day = (first_offset + i) % average_cycle_length + 1
+        phase_day = row[cycle_day]
+        length = min(phase_day.days_until_next_phase, total_days - i)
+        runs.append(
+            PhaseRun(
+                start_date=date.fromordinal(start_ordinal + i),
+                phase=phase_day.phase,
+                length=length,
+                start_cycle_day=cycle_day,
+            )
+        )
+        i += length
+
+    return runs
+
+
 def estimate_next_period(
     last_period_start: date,
     average_cycle_length: int = 28,
@@ -0,0 +1,289 @@
+"""
+Async data-access helpers for Firestore.
+
+The Firebase Admin SDK only ships a synchronous Firestore client, and every
+call on it is a blocking network round-trip. Services must never call it
+directly from an ``async def``: doing so stalls the event loop and every other
+request on the worker. Instead, all document reads and writes go through the
+helpers in this module, which run the blocking call on a bounded thread pool.
+
+Building references (``db.collection(...).document(...)``) does no I/O and
+can stay on the event loop.
+
+Each helper also records its latency, documents read or written and bytes
+read with the request metrics, so per-route Firestore usage is measured
+at this one choke point rather than by wrapping the client.
+"""
+
+import asyncio
+import time
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache, partial
+from typing import Any, Callable, TypeVar
+
+from google.api_core.exceptions import AlreadyExists
+from google.cloud.firestore_v1 import (
+    CollectionReference,
+    DocumentReference,
+    DocumentSnapshot,
+    Transaction,
+    WriteBatch,
+    transactional,
+)
+
+from app.config.settings import get_settings
+from app.middleware.request_metrics import document_size, record_firestore_call
+
+T = TypeVar("T")
+
+# Firestore's limit on writes in one batch or transaction
+MAX_BATCH_WRITES = 500
+
+
+@lru_cache
+def get_firestore_executor() -> ThreadPoolExecutor:
+    """Get the shared thread pool used for blocking Firestore calls."""
+    settings = get_settings()
+    return ThreadPoolExecutor(
+        max_workers=settings.firestore_max_workers,
+        thread_name_prefix="firestore",
+    )
+
+
+def shutdown_firestore_executor() -> None:
+    """Shut down the Firestore thread pool (called on app shutdown)."""
+    if get_firestore_executor.cache_info().currsize:
+        get_firestore_executor().shutdown(wait=False, cancel_futures=True)
+        get_firestore_executor.cache_clear()
+
+
+async def run_firestore(func: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+    """
+    Run a blocking Firestore call on the Firestore thread pool.
+
+    Args:
+        func: Blocking callable (e.g. ``doc_ref.get`` or ``batch.commit``)
+        *args: Positional arguments for the callable
+        **kwargs: Keyword arguments for the callable
+
+    Returns:
+        Whatever the callable returns
+    """
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(
+        get_firestore_executor(), partial(func, *args, **kwargs)
+    )
+
+
+async def _timed(func: Callable[..., T], *args: Any, **kwargs: Any) -> tuple[T, float]:
+    """run_firestore, also returning the call's wall time in seconds."""
+    started = time.perf_counter()
+    result = await run_firestore(func, *args, **kwargs)
+    return result, time.perf_counter() - started
+
+
+async def get_document(ref: DocumentReference) -> DocumentSnapshot:
+    """Read a single document."""
+    snapshot, seconds = await _timed(ref.get)
+    # A missing document is still a billed read
+    record_firestore_call("get", seconds, reads=1, bytes_read=document_size(snapshot))
+    return snapshot
+
+
+async def fetch_documents(query: Any) -> list[DocumentSnapshot]:
+    """
+    Run a query (or collection stream) and return all matching documents.
+
+    The stream is fully consumed on the worker thread, since iterating it
+    lazily would perform network I/O on the event loop.
+    """
+    docs, seconds = await _timed(lambda: list(query.stream()))
+    # Queries are billed at least one read, even with no results
+    record_firestore_call(
+        "query",
+        seconds,
+        reads=max(len(docs), 1),
+        bytes_read=sum(document_size(doc) for doc in docs),
+    )
+    return docs
+
+
+async def list_subcollections(ref: DocumentReference) -> list[CollectionReference]:
+    """
+    List a document's subcollections.
+
+    Subcollections outlive their parent, so this also finds those of a
+    deleted document.
+    """
+    collections, seconds = await _timed(lambda: list(ref.collections()))
+    record_firestore_call("list", seconds, reads=1)
+    return collections
+
+
+async def create_document(ref: DocumentReference, data: dict) -> bool:
+    """
+    Create a document unless it already exists.
+
+    Returns:
+        True if it was created, False if it already existed (nothing written)
+    """
+    started = time.perf_counter()
+    try:
+        await run_firestore(ref.create, data)
+    except AlreadyExists:
+        record_firestore_call("create", time.perf_counter() - started)
+        return False
+    record_firestore_call("create", time.perf_counter() - started, writes=1)
+    return True
+
+
+async def set_document(
+    ref: DocumentReference,
+    data: dict,
+    merge: bool = False,
+) -> None:
+    """Create or overwrite a document."""
+    _, seconds = await _timed(ref.set, data, merge=merge)
+    record_firestore_call("set", seconds, writes=1)
+
+
+async def update_document(ref: DocumentReference, data: dict) -> None:
+    """Update fields on an existing document."""
+    _, seconds = await _timed(ref.update, data)
+    record_firestore_call("update", seconds, writes=1)
+
+
+async def delete_document(ref: DocumentReference) -> None:
+    """Delete a document."""
+    _, seconds = await _timed(ref.delete)
+    record_firestore_call("delete", seconds, writes=1)
+
+
+async def commit_batch(batch: WriteBatch) -> None:
+    """
+    Commit a write batch: all of its writes apply atomically, in one round-trip.
+
+    A batch holds at most MAX_BATCH_WRITES writes.
+    """
+    # Counted before committing, which clears the batch
+    writes = len(batch)
+    _, seconds = await _timed(batch.commit)
+    record_firestore_call("batch", seconds, writes=writes)
+
+
+class BatchWriter:
+    """
+    Stages writes and commits them in batches of up to MAX_BATCH_WRITES.
+
+    For bulk writes with no atomicity requirement across the whole set:
+    each batch commits as soon as it is full, so only one batch is ever
+    held in memory. Call flush() after the last write.
+    """
+
+    def __init__(self, db: Any):
+        self._db = db
+        self._batch = db.batch()
+        self.committed = 0
+
+    async def set(self, ref: DocumentReference, data: dict, merge: bool = False) -> None:
+        self._batch.set(ref, data, merge=merge)
+        await self._flush_if_full()
+
+    async def update(self, ref: DocumentReference, data: dict) -> None:
+        self._batch.update(ref, data)
+        await self._flush_if_full()
+
+    async def delete(self, ref: DocumentReference) -> None:
+        self._batch.delete(ref)
+        await self._flush_if_full()
+
+    async def _flush_if_full(self) -> None:
+        if len(self._batch) >= MAX_BATCH_WRITES:
+            await self.flush()
+
+    async def flush(self) -> None:
+        """Commit any staged writes."""
+        writes = len(self._batch)
+        if not writes:
+            return
+        await commit_batch(self._batch)
+        self.committed += writes
+        # A committed batch can't be reused
+        self._batch = self._db.batch()
+
+
+class TransactionOps:
+    """
+    Reads and writes for a function run by run_transaction.
+
+    Reads are blocking calls, made on the worker thread running the
+    transaction; writes are staged and commit together when it returns.
+    Both are counted for the request metrics.
+    """
+
+    def __init__(self, transaction: Transaction):
+        self.transaction = transaction
+        self.reads = 0
+        self.bytes_read = 0
+        self.writes = 0
+
+    def get(self, ref: DocumentReference) -> DocumentSnapshot:
+        snapshot = ref.get(transaction=self.transaction)
+        self.reads += 1
+        self.bytes_read += document_size(snapshot)
+        return snapshot
+
+    def query(self, query: Any) -> list[DocumentSnapshot]:
+        docs = list(query.stream(transaction=self.transaction))
+        self.reads += max(len(docs), 1)
+        self.bytes_read += sum(document_size(doc) for doc in docs)
+        return docs
+
+    def set(self, ref: DocumentReference, data: dict, merge: bool = False) -> None:
+        self.transaction.set(ref, data, merge=merge)
+        self.writes += 1
+
+    def update(self, ref: DocumentReference, data: dict) -> None:
+        self.transaction.update(ref, data)
+        self.writes += 1
+
+    def delete(self, ref: DocumentReference) -> None:
+        self.transaction.delete(ref)
+        self.writes += 1
+
+
+async def run_transaction(db: Any, func: Callable[..., T], *args: Any) -> T:
+    """
+    Run ``func(ops, *args)`` as a Firestore transaction on the thread pool.
+
+    ``ops`` is a TransactionOps; every read must come before the first
+    write. If a document it read changes before the commit, Firestore
+    aborts the transaction and func runs again from the start, so it must
+    not have side effects of its own. Exceptions roll the transaction back.
+
+    Args:
+        db: Firestore client
+        func: Blocking callable run on the worker thread
+        *args: Further arguments for func
+
+    Returns:
+        Whatever func returns
+    """
+    attempts: list[TransactionOps] = []
+
+    @transactional
+    def attempt(transaction: Transaction) -> T:
+        ops = TransactionOps(transaction)
+        attempts.append(ops)
+        return func(ops, *args)
+
+    result, seconds = await _timed(attempt, db.transaction())
+    # Reads are billed on every attempt; only the last one's writes commit
+    record_firestore_call(
+        "transaction",
+        seconds,
+        reads=sum(ops.reads for ops in attempts),
+        writes=attempts[-1].writes,
+        bytes_read=sum(ops.bytes_read for ops in attempts),
+    )
+    return result
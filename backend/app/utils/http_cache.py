@@ -0,0 +1,69 @@
+"""
+HTTP validation caching helpers (ETag / If-None-Match).
+
+Routes compute a strong ETag from whatever versions their payload depends
+on (catalog digest, the user's calendar inputs, query parameters) before
+doing the expensive work. If the client already holds that version the
+route returns a bodiless 304, skipping the lookup and serialization.
+"""
+
+import hashlib
+import json
+from typing import Optional
+
+from fastapi import Request, Response, status
+
+# Catalog content is the same for every user and changes rarely; clients
+# may reuse it briefly, then revalidate with If-None-Match
+CATALOG_CACHE_CONTROL = "private, max-age=60"
+
+# Per-user calendar: always revalidate (a logged period changes it), but a
+# matching ETag makes that a cheap 304
+CALENDAR_CACHE_CONTROL = "private, no-cache"
+
+
+def make_etag(*parts) -> str:
+    """Build a quoted strong ETag from the values a response depends on."""
+    digest = hashlib.sha256(
+        json.dumps(parts, sort_keys=True, default=str).encode()
+    ).hexdigest()
+    return f'"{digest[:32]}"'
+
+
+def etag_matches(request: Request, etag: str) -> bool:
+    """Check If-None-Match (weak comparison, as RFC 9110 requires for it)."""
+    header = request.headers.get("if-none-match")
+    if not header:
+        return False
+    if header.strip() == "*":
+        return True
+    return any(
+        candidate.strip().removeprefix("W/") == etag
+        for candidate in header.split(",")
+    )
+
+
+def conditional_response(
+    request: Request,
+    response: Response,
+    etag: str,
+    cache_control: str,
+) -> Optional[Response]:
+    """
+    Apply caching headers and short-circuit unchanged resources.
+
+    Args:
+        request: Incoming request (read for If-None-Match)
+        response: The route's response, which gets ETag and Cache-Control
+        etag: Current ETag of the resource
+        cache_control: Cache-Control value for the route
+
+    Returns:
+        A 304 response to return as-is, or None to build the full response
+    """
+    headers = {"ETag": etag, "Cache-Control": cache_control}
+    if etag_matches(request, etag):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+
+    response.headers.update(headers)
+    return None
@@ -0,0 +1,154 @@
+"""
+Minimal in-process metrics registry with Prometheus text exposition.
+
+Metrics are process-local; with several workers, each scrape sees the
+worker that served it.
+"""
+
+import bisect
+import threading
+from typing import Callable
+
+_registry: list["Metric"] = []
+
+
+def _format_labels(label_names: tuple[str, ...], label_values: tuple[str, ...]) -> str:
+    if not label_names:
+        return ""
+    pairs = ",".join(
+        f'{name}="{value}"' for name, value in zip(label_names, label_values)
+    )
+    return "{" + pairs + "}"
+
+
+class Metric:
+    """Base class for registered metrics."""
+
+    type_name = "untyped"
+
+    def __init__(self, name: str, description: str):
+        self.name = name
+        self.description = description
+        _registry.append(self)
+
+    def samples(self) -> list[str]:
+        raise NotImplementedError
+
+    def render(self) -> str:
+        lines = [
+            f"# HELP {self.name} {self.description}",
+            f"# TYPE {self.name} {self.type_name}",
+        ]
+        lines.extend(self.samples())
+        return "\n".join(lines)
+
+
+class Counter(Metric):
+    """Monotonically increasing counter, optionally split by labels."""
+
+    type_name = "counter"
+
+    def __init__(self, name: str, description: str, labels: tuple[str, ...] = ()):
+        super().__init__(name, description)
+        self.label_names = labels
+        self._values: dict[tuple[str, ...], float] = {}
+        self._lock = threading.Lock()
+
+    def inc(self, amount: float = 1, **labels: str) -> None:
+        key = tuple(str(labels[name]) for name in self.label_names)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def value(self, **labels: str) -> float:
+        key = tuple(str(labels[name]) for name in self.label_names)
+        return self._values.get(key, 0)
+
+    def total(self) -> float:
+        """Sum across all label values."""
+        return sum(self._values.values())
+
+    def samples(self) -> list[str]:
+        with self._lock:
+            items = sorted(self._values.items())
+        return [
+            f"{self.name}{_format_labels(self.label_names, key)} {value:g}"
+            for key, value in items
+        ]
+
+
+class Histogram(Metric):
+    """Cumulative-bucket histogram, optionally split by labels."""
+
+    type_name = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        description: str,
+        buckets: tuple[float, ...],
+        labels: tuple[str, ...] = (),
+    ):
+        super().__init__(name, description)
+        self.label_names = labels
+        self.buckets = tuple(sorted(buckets))
+        # label values -> [per-bucket counts..., +Inf count, sum]
+        self._values: dict[tuple[str, ...], list[float]] = {}
+        self._lock = threading.Lock()
+
+    def observe(self, value: float, **labels: str) -> None:
+        key = tuple(str(labels[name]) for name in self.label_names)
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            counts = self._values.get(key)
+            if counts is None:
+                counts = self._values[key] = [0] * (len(self.buckets) + 2)
+            counts[index] += 1
+            counts[-1] += value
+
+    def count(self, **labels: str) -> int:
+        key = tuple(str(labels[name]) for name in self.label_names)
+        counts = self._values.get(key)
+        return int(sum(counts[:-1])) if counts else 0
+
+    def samples(self) -> list[str]:
+        with self._lock:
+            items = sorted((key, list(counts)) for key, counts in self._values.items())
+        lines = []
+        for key, counts in items:
+            cumulative = 0
+            for bound, count in zip((*self.buckets, float("inf")), counts):
+                cumulative += count
+                le = "+Inf" if bound == float("inf") else f"{bound:g}"
+                labels = _format_labels((*self.label_names, "le"), (*key, le))
+                lines.append(f"{self.name}_bucket{labels} {cumulative:g}")
+            labels = _format_labels(self.label_names, key)
+            lines.append(f"{self.name}_sum{labels} {counts[-1]:g}")
+            lines.append(f"{self.name}_count{labels} {cumulative:g}")
+        return lines
+
+
+class CallbackGauge(Metric):
+    """Gauge whose value is computed at scrape time."""
+
+    type_name = "gauge"
+
+    def __init__(self, name: str, description: str, func: Callable[[], float]):
+        super().__init__(name, description)
+        self._func = func
+
+    def samples(self) -> list[str]:
+        return [f"{self.name} {self._func():g}"]
+
+
+def ratio(numerator: float, denominator: float) -> float:
+    """Safe division for ratio gauges (0 before any traffic)."""
+    return numerator / denominator if denominator else 0.0
+
+
+# Latency buckets (seconds), from cache hits to slow Claude calls
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+
+def render_prometheus() -> str:
+    """Render every registered metric in Prometheus text format."""
+    return "\n".join(metric.render() for metric in _registry) + "\n"
@@ -0,0 +1,59 @@
+"""
+Responses assembled from pre-serialized JSON.
+
+FastAPI already serializes response models straight to JSON bytes through
+pydantic-core. Hot payloads that are identical across requests (catalog
+summaries, a cached phase calendar, the fallback messages) skip even that:
+they are serialized once, kept as bytes, and spliced into the response
+body here. Scalars around them are encoded with orjson.
+"""
+
+from typing import Any, Iterable, Mapping, Optional
+
+import orjson
+from fastapi import Response
+
+
+class RawJSONResponse(Response):
+    """Response whose content is already-encoded JSON bytes."""
+
+    media_type = "application/json"
+
+
+def json_array(fragments: Iterable[bytes]) -> bytes:
+    """Join pre-serialized JSON values into a JSON array."""
+    return b"[" + b",".join(fragments) + b"]"
+
+
+def json_object(fields: Mapping[str, Any]) -> bytes:
+    """
+    Build a JSON object from a mix of raw fragments and plain values.
+
+    Args:
+        fields: Field name -> value; ``bytes`` values are inserted verbatim as
+            pre-serialized JSON, anything else is encoded with orjson
+
+    Returns:
+        The encoded object
+    """
+    parts = [
+        orjson.dumps(name) + b":" + (value if isinstance(value, bytes) else orjson.dumps(value))
+        for name, value in fields.items()
+    ]
+    return b"{" + b",".join(parts) + b"}"
+
+
+def raw_json_response(body: bytes, response: Optional[Response] = None) -> RawJSONResponse:
+    """
+    Wrap a pre-serialized body.
+
+    Args:
+        body: Encoded JSON
+        response: The route's injected Response, whose headers (ETag,
+            Cache-Control, ...) are carried over
+
+    Returns:
+        Response to return from the route as-is
+    """
+    headers = response.headers if response is not None else None
+    return RawJSONResponse(body, headers=headers)
@@ -0,0 +1,151 @@
+"""
+Benchmark and check for account deletion (DELETE /api/v1/users/me).
+
+Seeds identical long-time users (``--years`` of cycles, energy logs and
+workouts, plus preferences) on the fake Firestore client and deletes them:
+- sequential: the previous implementation, one delete per document over
+  cycleData, workoutHistory and preferences
+- background: DELETE /users/me, then polling GET /users/me/deletion until
+  the purge completes
+
+Reports the DELETE response time, time until every document is gone and
+documents left behind. Then interrupts a purge after its first batch and
+checks that app.jobs.resume_account_deletions finishes it.
+
+Usage:
+    python -m benchmarks.account_deletion [--years 10] [--latency-ms 5]
+"""
+
+import argparse
+import asyncio
+import random
+import time
+from datetime import datetime
+
+import httpx
+
+from app.jobs import resume_account_deletions
+from app.main import app
+from app.middleware.auth import get_current_user
+from app.services import user_service, workout_service
+from app.utils.firestore import delete_document, fetch_documents, shutdown_firestore_executor
+from benchmarks.endpoints import USER_HEADER, _bench_user, _use_fake_firestore
+from benchmarks.fake_firestore import FakeFirestore
+from benchmarks.user_export import _seed_history
+
+PREFERENCES = 5
+
+
+def _seed_user(db: FakeFirestore, uid: str, years: int, seed: int) -> int:
+    """Seed a long-time user; returns the number of subcollection documents."""
+    counts = _seed_history(db, uid, years, random.Random(seed))
+    for i in range(PREFERENCES):
+        db.seed(f"users/{uid}/preferences/p{i}", {"value": i, "updated_at": datetime.utcnow()})
+    return sum(counts.values()) - counts["profile"] + PREFERENCES
+
+
+def _remaining(db: FakeFirestore, uid: str) -> int:
+    """Documents still stored under a user's document (or the document itself)."""
+    prefix = f"users/{uid}/"
+    left = 1 if uid in db._collections.get("users", {}) else 0
+    return left + sum(
+        len(docs) for path, docs in db._collections.items() if path.startswith(prefix)
+    )
+
+
+async def _sequential_delete(db: FakeFirestore, uid: str) -> None:
+    """The previous delete_user_profile: one document at a time."""
+    doc_ref = db.collection("users").document(uid)
+    for subcollection in ["cycleData", "workoutHistory", "preferences"]:
+        for doc in await fetch_documents(doc_ref.collection(subcollection)):
+            await delete_document(doc.reference)
+    await delete_document(doc_ref)
+
+
+async def _background_delete(http: httpx.AsyncClient, uid: str) -> tuple[float, float, dict]:
+    """(DELETE response seconds, seconds until the purge completed, final status)"""
+    headers = {USER_HEADER: uid}
+    started = time.perf_counter()
+    response = await http.delete("/api/v1/users/me", headers=headers)
+    assert response.status_code == 202, response.text
+    responded = time.perf_counter() - started
+
+    while True:
+        status = (await http.get(response.headers["location"], headers=headers)).json()
+        if status["status"] != "running":
+            return responded, time.perf_counter() - started, status
+        await asyncio.sleep(0.01)
+
+
+async def check_resume(db: FakeFirestore, years: int, seed: int) -> None:
+    """A purge cut off after its first batch is finished by the resume job."""
+    uid = "interrupted"
+    total = _seed_user(db, uid, years, seed)
+    await user_service.delete_user_profile(uid)
+
+    task = next(iter(user_service._purge_tasks))
+    while db.document(f"accountDeletions/{uid}").get().get("documents_deleted") == 0:
+        await asyncio.sleep(0.001)
+    task.cancel()
+    await asyncio.gather(task, return_exceptions=True)
+    # Cancelling doesn't stop a commit already running on the thread pool
+    await asyncio.sleep(0.1)
+    left = _remaining(db, uid)
+    assert 0 < left < total, left
+
+    resumed = await resume_account_deletions.run(stale_minutes=0, dry_run=False)
+    record = db.document(f"accountDeletions/{uid}").get().to_dict()
+    assert resumed == 1 and record["status"] == "completed", record
+    assert record["documents_deleted"] == total, record
+    assert _remaining(db, uid) == 0
+    print(f"verified an interrupted purge ({total - left} of {total} deleted) "
+          "is finished by resume_account_deletions")
+
+
+async def run(args: argparse.Namespace) -> None:
+    db = FakeFirestore(latency=args.latency_ms / 1000)
+    _use_fake_firestore(db)
+    resume_account_deletions.get_firestore_client = lambda: db
+    await workout_service.load_workout_catalog()
+    app.dependency_overrides[get_current_user] = _bench_user
+
+    total = _seed_user(db, "sequential", args.years, args.seed)
+    _seed_user(db, "background", args.years, args.seed)
+    print(f"{args.years}-year user: {total} documents under the profile, "
+          f"{args.latency_ms:g}ms Firestore round trip\n")
+
+    started = time.perf_counter()
+    await _sequential_delete(db, "sequential")
+    sequential = time.perf_counter() - started
+
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as http:
+        responded, purged, status = await _background_delete(http, "background")
+
+    print(f"{'':<11} {'response':>9} {'all deleted':>12} {'left behind':>12}")
+    print(f"{'sequential':<11} {sequential:>8.2f}s {sequential:>11.2f}s "
+          f"{_remaining(db, 'sequential'):>12}")
+    print(f"{'background':<11} {responded:>8.2f}s {purged:>11.2f}s "
+          f"{_remaining(db, 'background'):>12}")
+
+    assert status["status"] == "completed", status
+    assert status["documents_deleted"] == total, status
+    assert _remaining(db, "background") == 0
+    print(f"\nverified every document is deleted and counted ({status['documents_deleted']})")
+
+    await check_resume(db, args.years, args.seed)
+
+    app.dependency_overrides.clear()
+    shutdown_firestore_executor()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("--years", type=int, default=10)
+    parser.add_argument("--latency-ms", type=float, default=5.0)
+    parser.add_argument("--seed", type=int, default=7)
+    asyncio.run(run(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,189 @@
+"""
+Benchmark for the bulk history import (POST /api/v1/users/me/import).
+
+Generates ``--years`` of history (a period every 25-32 days, an energy
+log on ~70% of days) and loads it into a fresh profile two ways, through
+the app against the fake Firestore client:
+- per row: a POST /energy/log per day (``--concurrency`` at a time) and
+  a POST /cycle/log-period per period, in order, as a migration script
+  would have to today
+- upload: one streamed NDJSON import of the same rows
+
+Reports wall time, requests and Firestore reads/writes for each, then
+checks both leave the same energy logs and cycle history behind.
+
+Usage:
+    python -m benchmarks.bulk_import [--years 5] [--latency-ms 5]
+        [--concurrency 8]
+"""
+
+import argparse
+import asyncio
+import json
+import random
+import time
+from datetime import date, datetime, timedelta
+
+import httpx
+
+from app.main import app
+from app.middleware.auth import get_current_user
+from app.utils.firestore import shutdown_firestore_executor
+from benchmarks.endpoints import USER_HEADER, _SERVER_TIMING, _bench_user, _use_fake_firestore
+from benchmarks.fake_firestore import FakeFirestore
+
+
+def _history(years: int, rng: random.Random) -> tuple[list[dict], list[dict]]:
+    """(period rows, energy rows) ending today, oldest first."""
+    today = date.today()
+    first = today - timedelta(days=365 * years)
+
+    periods = []
+    start = first
+    while start <= today:
+        periods.append({"type": "period", "start_date": start.isoformat()})
+        start += timedelta(days=rng.randint(25, 32))
+
+    energy = [
+        {
+            "type": "energy",
+            "date": (first + timedelta(days=i)).isoformat(),
+            "score": rng.randint(1, 10),
+        }
+        for i in range((today - first).days + 1)
+        if rng.random() < 0.7
+    ]
+    return periods, energy
+
+
+def _seed_profile(db: FakeFirestore, uid: str) -> None:
+    now = datetime.utcnow()
+    db.seed(f"users/{uid}", {
+        "email": f"{uid}@example.com",
+        "goals": [],
+        "average_cycle_length": 28,
+        "average_period_length": 5,
+        "cycle_tracking_enabled": True,
+        "notifications_enabled": True,
+        "last_period_start_date": None,
+        "created_at": now,
+        "updated_at": now,
+    })
+
+
+class _Totals:
+    def __init__(self):
+        self.requests = 0
+        self.reads = 0
+        self.writes = 0
+
+    def add(self, response: httpx.Response) -> None:
+        response.raise_for_status()
+        self.requests += 1
+        timing = _SERVER_TIMING.search(response.headers.get("server-timing", ""))
+        if timing:
+            self.reads += int(timing.group(1))
+            self.writes += int(timing.group(2))
+
+
+async def _per_row(
+    http: httpx.AsyncClient, uid: str, periods: list[dict], energy: list[dict], concurrency: int
+) -> _Totals:
+    totals = _Totals()
+    headers = {USER_HEADER: uid}
+
+    # Each period closes the previous one, so these go in order
+    for row in periods:
+        body = {"start_date": row["start_date"]}
+        totals.add(await http.post("/api/v1/cycle/log-period", json=body, headers=headers))
+
+    queue = iter(energy)
+
+    async def worker() -> None:
+        for row in queue:
+            body = {"date": row["date"], "score": row["score"]}
+            totals.add(await http.post("/api/v1/energy/log", json=body, headers=headers))
+
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    return totals
+
+
+async def _upload(http: httpx.AsyncClient, uid: str, rows: list[dict]) -> tuple[_Totals, dict]:
+    async def body():
+        # One chunk per ~100 rows, like a client streaming from disk
+        for i in range(0, len(rows), 100):
+            yield "".join(json.dumps(row) + "\n" for row in rows[i:i + 100]).encode()
+
+    totals = _Totals()
+    response = await http.post(
+        "/api/v1/users/me/import",
+        content=body(),
+        headers={USER_HEADER: uid, "content-type": "application/x-ndjson"},
+    )
+    totals.add(response)
+    return totals, response.json()
+
+
+def _state(db: FakeFirestore, uid: str) -> tuple[dict, list[tuple]]:
+    """A user's energy scores by date and (start, end, length) of each cycle."""
+    energy = {
+        key: data["score"]
+        for key, data in db._collections.get(f"users/{uid}/energy_logs", {}).items()
+    }
+    cycles = sorted(
+        (data["start_date"], data["end_date"], data["cycle_length"])
+        for data in db._collections.get(f"users/{uid}/cycleData", {}).values()
+    )
+    return energy, cycles
+
+
+async def run(args: argparse.Namespace) -> None:
+    db = FakeFirestore(latency=args.latency_ms / 1000)
+    _use_fake_firestore(db)
+    app.dependency_overrides[get_current_user] = _bench_user
+    for uid in ("per-row", "upload"):
+        _seed_profile(db, uid)
+
+    periods, energy = _history(args.years, random.Random(args.seed))
+    print(f"{args.years} years: {len(periods)} periods, {len(energy)} energy logs, "
+          f"{args.latency_ms:g}ms Firestore round trip\n")
+
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench", timeout=None) as http:
+        started = time.perf_counter()
+        per_row = await _per_row(http, "per-row", periods, energy, args.concurrency)
+        per_row_seconds = time.perf_counter() - started
+
+        started = time.perf_counter()
+        upload, result = await _upload(http, "upload", periods + energy)
+        upload_seconds = time.perf_counter() - started
+
+    print(f"{'':<8} {'wall':>9} {'requests':>9} {'reads':>7} {'writes':>7}")
+    for name, totals, seconds in (
+        ("per row", per_row, per_row_seconds),
+        ("upload", upload, upload_seconds),
+    ):
+        print(f"{name:<8} {seconds:>8.2f}s {totals.requests:>9} {totals.reads:>7} {totals.writes:>7}")
+    print(f"\nupload is {per_row_seconds / upload_seconds:.1f}x faster")
+
+    assert result["rows_rejected"] == 0 and result["complete"], result
+    assert result["periods_imported"] == len(periods), result
+    assert result["energy_logs_imported"] == len(energy), result
+    assert _state(db, "per-row") == _state(db, "upload"), "imported history differs"
+    print("verified both leave the same energy logs and cycle history")
+
+    app.dependency_overrides.clear()
+    shutdown_firestore_executor()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("--years", type=int, default=5)
+    parser.add_argument("--latency-ms", type=float, default=5.0)
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--seed", type=int, default=7)
+    asyncio.run(run(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
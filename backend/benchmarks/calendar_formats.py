@@ -0,0 +1,87 @@
+"""
+Benchmark for the per-day vs. run-length phase calendar formats.
+
+Checks that expanding predict_phase_runs reproduces predict_phase_range for
+random settings and ranges, then compares payload size and generate +
+encode time of CyclePredictionsResponse and CyclePredictionRunsResponse for
+two kinds of calendar:
+- history: years of logged history before a recent period (the days before
+  the last period collapse into one run)
+- stale: the last logged period is years old, so the calendar keeps
+  cycling through all four phases
+
+Usage:
+    python -m benchmarks.calendar_formats [--number 20]
+"""
+
+import argparse
+import random
+import timeit
+from datetime import date, timedelta
+
+from app.models.cycle import CyclePredictionRunsResponse, CyclePredictionsResponse
+from app.utils.cycle_calculations import predict_phase_range, predict_phase_runs
+
+
+def verify(cases: int = 3000) -> None:
+    rng = random.Random(0)
+    for _ in range(cases):
+        cycle_length, period_length = rng.randint(21, 45), rng.randint(2, 10)
+        last_period = date(2026, 1, 1) + timedelta(days=rng.randint(-400, 400))
+        start = date(2026, 1, 1) + timedelta(days=rng.randint(-800, 100))
+        total = rng.randint(0, 1500)
+
+        expanded = [
+            (run.start_date + timedelta(days=k), run.phase, run.start_cycle_day + k * run.cycle_day_step)
+            for run in predict_phase_runs(last_period, start, total, cycle_length, period_length)
+            for k in range(run.length)
+        ]
+        expected = [
+            (p.date, p.predicted_phase, p.cycle_day)
+            for p in predict_phase_range(last_period, start, total, cycle_length, period_length)
+        ]
+        assert expanded == expected, (last_period, start, total, cycle_length, period_length)
+    print(f"verified {cases} random ranges: runs expand to the per-day predictions")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("--number", type=int, default=20)
+    args = parser.parse_args()
+
+    verify()
+
+    today = date(2026, 6, 1)
+    next_period = today + timedelta(days=18)
+    print(f"\n{'calendar':>11}  {'days':>5}  {'per-day':>20}  {'runs':>18}  {'smaller':>7}  {'faster':>6}")
+    for kind in ("history", "stale"):
+        for years in (1, 5, 10):
+            start = today - timedelta(days=365 * years)
+            last_period = today - timedelta(days=10) if kind == "history" else start
+            total = (today - start).days + 23
+
+            def days_payload() -> bytes:
+                return CyclePredictionsResponse(
+                    predictions=predict_phase_range(last_period, start, total, 28, 5),
+                    next_period_start=next_period,
+                ).model_dump_json().encode()
+
+            def runs_payload() -> bytes:
+                return CyclePredictionRunsResponse(
+                    runs=predict_phase_runs(last_period, start, total, 28, 5),
+                    next_period_start=next_period,
+                ).model_dump_json().encode()
+
+            days_bytes, runs_bytes = len(days_payload()), len(runs_payload())
+            days_time = timeit.timeit(days_payload, number=args.number) / args.number
+            runs_time = timeit.timeit(runs_payload, number=args.number) / args.number
+            print(
+                f"{kind + ' ' + str(years) + 'y':>11}  {total:>5}  "
+                f"{days_bytes / 1024:7.1f}KB {days_time * 1000:7.2f}ms  "
+                f"{runs_bytes / 1024:6.1f}KB {runs_time * 1000:6.2f}ms  "
+                f"{days_bytes / runs_bytes:6.0f}x  {days_time / runs_time:5.0f}x"
+            )
+
+
+if __name__ == "__main__":
+    main()
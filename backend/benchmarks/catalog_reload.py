@@ -0,0 +1,159 @@
+"""
+Check and benchmark for the Firestore-backed workout catalog.
+
+Runs workout_service's startup load and snapshot listener against the fake
+Firestore client:
+- an empty collection falls back to the placeholder workouts, and the first
+  documents written replace them
+- added, modified and removed documents show up in get_all_workouts,
+  get_workout_by_id and get_recommended_workouts, and bump the version
+- after a run of random edits the catalog matches one rebuilt from scratch
+
+Then times applying a single edit in place vs. rebuilding the whole
+catalog, for a library of ``--size`` workouts.
+
+Usage:
+    python -m benchmarks.catalog_reload [--size 10000] [--edits 200]
+"""
+
+import argparse
+import asyncio
+import contextlib
+import io
+import itertools
+import random
+import time
+
+from app.models.workout import CyclePhase, IntensityLevel, WorkoutCategory
+from app.services import workout_service
+from app.services.workout_catalog import WorkoutCatalog
+from benchmarks.fake_firestore import FakeFirestore
+from benchmarks.stats import percentile
+from benchmarks.workout_catalog import synthetic_workouts
+
+
+def _document(workout) -> dict:
+    return workout.model_dump(mode="json", exclude={"id", "created_at"})
+
+
+async def check_placeholder_fallback() -> None:
+    db = FakeFirestore()
+    workout_service.get_firestore_client = lambda: db
+
+    catalog = await workout_service.load_workout_catalog()
+    assert len(catalog) == len(workout_service.PLACEHOLDER_WORKOUTS)
+    workout_service.start_workout_catalog_listener()
+
+    workout = synthetic_workouts(1)[0]
+    db.collection("workouts").document("fs1").set(_document(workout))
+    workouts, total = await workout_service.get_all_workouts()
+    assert total == 1 and workouts[0].id == "fs1", workouts
+    assert await workout_service.get_workout_by_id("w1") is None
+
+    workout_service.stop_workout_catalog_listener()
+    print("verified placeholder fallback and first-document switchover")
+
+
+async def check_incremental(size: int, edits: int) -> None:
+    db = FakeFirestore()
+    workout_service.get_firestore_client = lambda: db
+    collection = db.collection("workouts")
+    for workout in synthetic_workouts(size):
+        db.seed(f"workouts/{workout.id}", _document(workout))
+
+    catalog = await workout_service.load_workout_catalog()
+    assert len(catalog) == size
+    workout_service.start_workout_catalog_listener()
+    version = workout_service.get_workout_catalog().version
+
+    # Targeted edits visible through every service function
+    first = await workout_service.get_workout_by_id("w0")
+    collection.document("w0").update({"title": "Renamed"})
+    assert (await workout_service.get_workout_by_id("w0")).title == "Renamed"
+    assert workout_service.get_workout_catalog().version == version + 1
+
+    phases = [p.value for p in CyclePhase if p not in first.recommended_phases]
+    collection.document("w0").update({"recommended_phases": phases})
+    recommended = await workout_service.get_recommended_workouts(
+        CyclePhase(phases[0]), limit=size
+    )
+    assert "w0" in {w.id for w in recommended}
+
+    collection.document("w0").delete()
+    assert await workout_service.get_workout_by_id("w0") is None
+    _, total = await workout_service.get_all_workouts()
+    assert total == size - 1
+
+    # Random edits, then compare against a full rebuild
+    rng = random.Random(3)
+    new_ids = itertools.count(size)
+    live_ids = [f"w{i}" for i in range(1, size)]
+    # Silence the per-edit "catalog updated" log lines
+    with contextlib.redirect_stdout(io.StringIO()):
+        for _ in range(edits):
+            action = rng.random()
+            if action < 0.4:
+                workout = synthetic_workouts(1, seed=rng.random())[0]
+                live_ids.append(f"w{next(new_ids)}")
+                collection.document(live_ids[-1]).set(_document(workout))
+            elif action < 0.8:
+                collection.document(rng.choice(live_ids)).set(
+                    {"intensity": rng.choice(list(IntensityLevel)).value}, merge=True
+                )
+            else:
+                removed = live_ids.pop(rng.randrange(len(live_ids)))
+                collection.document(removed).delete()
+
+    live = workout_service.get_workout_catalog()
+    rebuilt = WorkoutCatalog(
+        workout_service._workout_from_snapshot(doc) for doc in collection.stream()
+    )
+    assert len(live) == len(rebuilt)
+    for category, intensity, phase in itertools.product(
+        [None, *WorkoutCategory], [None, *IntensityLevel], [None, *CyclePhase]
+    ):
+        live_page, live_total = live.filter(category, intensity, phase, limit=len(live))
+        rebuilt_page, rebuilt_total = rebuilt.filter(
+            category, intensity, phase, limit=len(rebuilt)
+        )
+        assert live_total == rebuilt_total
+        # Position order differs after removals, membership must not
+        assert {w.id for w in live_page} == {w.id for w in rebuilt_page}
+    print(f"verified {edits} random listener edits against a full rebuild")
+
+    workout_service.stop_workout_catalog_listener()
+
+    # Timing: applying one edit in place vs. rebuilding the catalog
+    # (the fake's own listing work on each notification is left out)
+    original = live.get(live_ids[0])
+    variants = [
+        original.model_copy(update={"duration_minutes": minutes}) for minutes in (10, 15)
+    ]
+    samples = []
+    for i in range(200):
+        started = time.perf_counter()
+        live.apply_changes([variants[i % 2]])
+        samples.append(time.perf_counter() - started)
+    workouts = live.workouts
+    started = time.perf_counter()
+    WorkoutCatalog(workouts)
+    rebuild = time.perf_counter() - started
+
+    print(
+        f"{len(workouts)} workouts: apply one edit "
+        f"{percentile(samples, 50) * 1e6:.0f}us, full rebuild {rebuild * 1000:.0f}ms"
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("--size", type=int, default=10000)
+    parser.add_argument("--edits", type=int, default=200)
+    args = parser.parse_args()
+
+    asyncio.run(check_placeholder_fallback())
+    asyncio.run(check_incremental(args.size, args.edits))
+
+
+if __name__ == "__main__":
+    main()
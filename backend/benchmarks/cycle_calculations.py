@@ -0,0 +1,304 @@
+"""
+Microbenchmarks for the cycle engine in app/utils/cycle_calculations.py.
+
+Sweeps cycle lengths 21-45, history depths 0-24 cycles and prediction
+windows 7-90 days through:
+- calculate_current_phase (every day of the first three cycles)
+- predict_phases (history depth as the earliest logged cycle)
+- predict_phase_range / predict_phase_runs (the windowed engines behind
+  /cycle/predictions; predict_phases itself ignores days_ahead)
+- estimate_next_period (0-24 cycles since the last log)
+- calculate_median and calculate_confidence_from_history (0-24 lengths)
+
+Each timing is the best of several repeats, and every timed pass loops
+its cases for at least a few milliseconds, so timer resolution and
+scheduler hiccups don't dominate the fast sweeps. A short pure-Python
+calibration loop runs between groups, and each group is also recorded
+relative to the calibration passes either side of it (median over
+repeats); --normalize compares those relative totals, so a baseline
+recorded on one machine can gate runs on another, and a CPU changing
+speed mid-run cancels out. With --compare the exit status is non-zero
+if any function's sweep total regresses beyond --tolerance, both in
+milliseconds and relative to the calibration loop, and by more than
+--noise-floor-ms.
+
+Usage:
+    python -m benchmarks.cycle_calculations [--repeat 15] [--save-baseline]
+        [--compare [--normalize] [--tolerance 0.2] [--noise-floor-ms 1]]
+"""
+
+import argparse
+import json
+import random
+import statistics
+import sys
+import time
+from datetime import date, timedelta
+from pathlib import Path
+from typing import Callable
+
+from app.utils import cycle_calculations as cc
+
+DEFAULT_BASELINE = Path(__file__).parent / "baselines" / "cycle_calculations.json"
+
+CYCLE_LENGTHS = range(21, 46)
+HISTORY_DEPTHS = range(0, 25)
+WINDOWS = (7, 14, 21, 30, 45, 60, 75, 90)
+PERIOD_LENGTH = 5
+DAYS_SINCE_LOG = (0, 20, 40, 80, 200)
+# Minimum duration of one timed pass; faster groups loop their cases more
+MIN_PASS_SECONDS = 0.002
+# Sweep totals this close to the baseline are noise, whatever the ratio
+NOISE_FLOOR_MS = 1.0
+# Short enough to run between every pair of groups
+CALIBRATION_LOOPS = 25_000
+
+# (function name, dimension name, {dimension value: [argument tuples]})
+Sweep = tuple[str, str, dict[int, list[tuple]]]
+
+
+def _sweeps(seed: int = 7) -> list[Sweep]:
+    rng = random.Random(seed)
+    today = date.today()
+    last_period = today - timedelta(days=10)
+
+    current_phase = {
+        length: [
+            (last_period, length, PERIOD_LENGTH, last_period + timedelta(days=offset))
+            for offset in range(3 * length)
+        ]
+        for length in CYCLE_LENGTHS
+    }
+
+    phases = {
+        depth: [
+            (
+                last_period,
+                length,
+                PERIOD_LENGTH,
+                30,
+                last_period - timedelta(days=length * depth) if depth else None,
+            )
+            for length in CYCLE_LENGTHS
+        ]
+        for depth in HISTORY_DEPTHS
+    }
+
+    windows = {
+        window: [
+            (last_period, today, window, length, PERIOD_LENGTH) for length in CYCLE_LENGTHS
+        ]
+        for window in WINDOWS
+    }
+
+    next_period = {
+        depth: [
+            (today - timedelta(days=length * depth + rng.randrange(length)), length)
+            for length in CYCLE_LENGTHS
+        ]
+        for depth in HISTORY_DEPTHS
+    }
+
+    histories = {
+        depth: [
+            [rng.randint(length - 3, length + 3) for _ in range(depth)]
+            for length in CYCLE_LENGTHS
+        ]
+        for depth in HISTORY_DEPTHS
+    }
+    medians = {depth: [(lengths,) for lengths in rows] for depth, rows in histories.items()}
+    confidence = {
+        depth: [
+            (depth, lengths, days) for lengths in rows for days in DAYS_SINCE_LOG
+        ]
+        for depth, rows in histories.items()
+    }
+
+    return [
+        ("calculate_current_phase", "cycle_length", current_phase),
+        ("predict_phases", "history_depth", phases),
+        ("predict_phase_range", "window", windows),
+        ("predict_phase_runs", "window", windows),
+        ("estimate_next_period", "cycles_since_log", next_period),
+        ("calculate_median", "history_depth", medians),
+        ("calculate_confidence_from_history", "history_depth", confidence),
+    ]
+
+
+def _time_pass(func: Callable, cases: list[tuple], inner: int) -> float:
+    """Time in seconds for one pass over ``cases`` (averaged over ``inner`` passes)."""
+    started = time.perf_counter()
+    for _ in range(inner):
+        for args in cases:
+            func(*args)
+    return (time.perf_counter() - started) / inner
+
+
+def _inner_loops(func: Callable, cases: list[tuple]) -> int:
+    """Passes over ``cases`` needed for one timing to last MIN_PASS_SECONDS."""
+    inner = 1
+    while True:
+        seconds = _time_pass(func, cases, inner) * inner
+        if seconds >= MIN_PASS_SECONDS:
+            return inner
+        inner = max(inner * 2, int(inner * MIN_PASS_SECONDS / max(seconds, 1e-9)) + 1)
+
+
+def _calibration_pass() -> float:
+    """Time a fixed pure-Python workload, as a yardstick for machine speed."""
+    started = time.perf_counter()
+    total = 0
+    for i in range(CALIBRATION_LOOPS):
+        total += (i * 7) % 13
+    return time.perf_counter() - started
+
+
+def run(repeat: int) -> dict:
+    # Warm the phase-table cache so every sweep measures the steady state
+    for length in CYCLE_LENGTHS:
+        cc.get_phase_row(length, PERIOD_LENGTH)
+
+    sweeps = _sweeps()
+    inner = {
+        (name, str(value)): _inner_loops(getattr(cc, name), cases)
+        for name, _, groups in sweeps
+        for value, cases in groups.items()
+    }
+    best: dict[tuple[str, str], float] = {}
+    relative: dict[tuple[str, str], list[float]] = {}
+    calibrations = [_calibration_pass()]
+    # Each repeat runs every sweep once, and every group keeps its best
+    # time: spreading a group's samples over the whole run rides out a
+    # shared CPU changing speed, where back-to-back samples would not
+    for _ in range(repeat):
+        for name, _, groups in sweeps:
+            func = getattr(cc, name)
+            for value, cases in groups.items():
+                key = (name, str(value))
+                seconds = _time_pass(func, cases, inner[key])
+                best[key] = min(best.get(key, float("inf")), seconds)
+                calibrations.append(_calibration_pass())
+                yardstick = (calibrations[-2] + calibrations[-1]) / 2
+                relative.setdefault(key, []).append(seconds / yardstick)
+
+    results = {}
+    for name, dimension, groups in sweeps:
+        results[name] = {
+            "dimension": dimension,
+            "calls": sum(len(cases) for cases in groups.values()),
+            "total_ms": round(sum(best[(name, str(v))] for v in groups) * 1000, 3),
+            # Sweep total in calibration passes, comparable across machines
+            "relative_total": round(
+                sum(statistics.median(relative[(name, str(v))]) for v in groups), 4
+            ),
+            "per_call_us": {
+                str(value): round(best[(name, str(value))] / len(cases) * 1e6, 3)
+                for value, cases in groups.items()
+            },
+        }
+
+    return {
+        "calibration_ms": round(statistics.median(calibrations) * 1000, 3),
+        "functions": results,
+    }
+
+
+def _print_results(results: dict) -> None:
+    print(f"calibration loop: {results['calibration_ms']:.2f}ms\n")
+    print(f"{'function':<34} {'calls':>6} {'sweep':>10}  per call (us) by dimension")
+    for name, row in results["functions"].items():
+        values = list(row["per_call_us"].items())
+        shown = [values[0], values[len(values) // 2], values[-1]]
+        spread = "  ".join(f"{row['dimension']}={k}: {v:.2f}" for k, v in shown)
+        print(f"{name:<34} {row['calls']:>6} {row['total_ms']:>8.2f}ms  {spread}")
+
+
+def compare(
+    results: dict,
+    baseline: dict,
+    tolerance: float,
+    normalize: bool,
+    noise_floor_ms: float = NOISE_FLOOR_MS,
+) -> list[str]:
+    """
+    Compare sweep totals against a baseline.
+
+    Args:
+        results: This run's results
+        baseline: Saved results
+        tolerance: Allowed relative slowdown of a sweep total, which must
+            also be exceeded relative to the calibration loop
+        normalize: Compare sweep totals relative to the calibration
+            loop, for a baseline recorded on a different machine
+        noise_floor_ms: Slowdowns smaller than this never count, so
+            sweeps of a few milliseconds don't fail on jitter
+
+    Returns:
+        Regressions found (empty if none)
+    """
+    scale = results["calibration_ms"] / baseline["calibration_ms"]
+    print(f"\nmachine speed vs. baseline: {1 / scale:.2f}x (calibration loop)")
+
+    regressions = []
+    for name, row in results["functions"].items():
+        old = baseline["functions"].get(name)
+        if old is None:
+            print(f"{name:<34} (new)")
+            continue
+        relative_change = row["relative_total"] / old["relative_total"] - 1
+        if normalize:
+            # Relative totals, shown in milliseconds at this run's speed
+            expected = old["relative_total"] * results["calibration_ms"]
+            actual = row["relative_total"] * results["calibration_ms"]
+        else:
+            expected, actual = old["total_ms"], row["total_ms"]
+        change = actual / expected - 1
+        print(f"{name:<34} {expected:>8.2f}ms -> {actual:>8.2f}ms ({change:+.0%})")
+        # A slower sweep that kept pace with the calibration loop means a
+        # slower machine, not slower code
+        if (
+            change > tolerance
+            and relative_change > tolerance
+            and actual - expected > noise_floor_ms
+        ):
+            regressions.append(f"{name} sweep {expected:.2f}ms -> {actual:.2f}ms")
+    return regressions
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("--repeat", type=int, default=15)
+    parser.add_argument("--baseline", type=Path, default=DEFAULT_BASELINE)
+    parser.add_argument("--save-baseline", action="store_true")
+    parser.add_argument("--compare", action="store_true")
+    parser.add_argument("--tolerance", type=float, default=0.2,
+                        help="allowed relative slowdown of a sweep total")
+    parser.add_argument("--noise-floor-ms", type=float, default=NOISE_FLOOR_MS,
+                        help="ignore sweep slowdowns smaller than this")
+    parser.add_argument("--normalize", action="store_true",
+                        help="compare relative to the calibration loop (baseline from another machine)")
+    args = parser.parse_args()
+
+    results = run(args.repeat)
+    _print_results(results)
+
+    if args.compare:
+        regressions = compare(
+            results,
+            json.loads(args.baseline.read_text()),
+            args.tolerance,
+            args.normalize,
+            args.noise_floor_ms,
+        )
+        for regression in regressions:
+            print(f"REGRESSION: {regression}")
+        if regressions:
+            sys.exit(1)
+    if args.save_baseline:
+        args.baseline.parent.mkdir(parents=True, exist_ok=True)
+        args.baseline.write_text(json.dumps(results, indent=2) + "\n")
+        print(f"baseline saved to {args.baseline}")
+
+
+if __name__ == "__main__":
+    main()
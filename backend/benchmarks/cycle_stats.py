@@ -0,0 +1,314 @@
+"""
+Benchmark and check for the materialized cycle stats (users/{uid}/cycleStats).
+
+Seeds identical users with ``--years`` of history on the fake Firestore
+client and runs each cycle read the stats replace two ways:
+- previous: the code before the stats document (re-reading the newest
+  12 or 24 cycles, or streaming all of them to count them)
+- stats: the same operation on the stats document
+
+Reports Firestore reads and wall time for each, and checks both give the
+same averages, calendar start and remaining history.
+
+Then applies ``--operations`` random cycle writes (onboarding, logged
+periods in and out of order, edited start dates, deletions and imports)
+and checks after each that the stats document matches one rebuilt from
+every cycle (its newest cycles the same as GET /cycle/history's query),
+and that users logged before it existed get it built on first use or by
+app.jobs.backfill_cycle_stats.
+
+Usage:
+    python -m benchmarks.cycle_stats [--years 10] [--latency-ms 5]
+        [--operations 300]
+"""
+
+import argparse
+import asyncio
+import random
+import time
+from datetime import date, datetime, timedelta
+from typing import Awaitable
+
+from app.jobs import backfill_cycle_stats
+from app.middleware import request_metrics
+from app.models.cycle import CycleStats, LogPeriodRequest, UpdateCycleRequest
+from app.services import cycle_service, user_service
+from app.utils.cycle_calculations import calculate_median
+from app.utils.firestore import (
+    delete_document,
+    fetch_documents,
+    get_document,
+    shutdown_firestore_executor,
+    update_document,
+)
+from benchmarks.bulk_import import _seed_profile
+from benchmarks.endpoints import _use_fake_firestore
+from benchmarks.fake_firestore import FakeFirestore
+from benchmarks.user_export import _seed_history
+
+
+async def _measure(operation: Awaitable) -> tuple[object, int, float]:
+    """(result, Firestore reads, seconds) of one operation."""
+
+    async def counted():
+        stats = request_metrics.RequestStats()
+        request_metrics._request_stats.set(stats)
+        started = time.perf_counter()
+        result = await operation
+        return result, stats.firestore_reads, time.perf_counter() - started
+
+    # A task of its own, so the counters don't leak into the caller's context
+    return await asyncio.create_task(counted())
+
+
+# ---------------------------------------------------------------------------
+# The previous implementations
+
+
+async def _previous_averages(uid: str) -> int:
+    """recalculate_and_update_averages: the newest 12 cycles."""
+    cycles = await cycle_service.get_cycle_history(uid, limit=12)
+    lengths = [c.cycle_length for c in cycles if c.cycle_length is not None]
+    average = calculate_median(lengths) if lengths else 28
+    db = cycle_service.get_firestore_client()
+    await update_document(db.collection("users").document(uid), {
+        "average_cycle_length": average,
+        "average_period_length": 5,
+        "updated_at": datetime.utcnow(),
+    })
+    user_service.invalidate_cached_profile(uid)
+    return average
+
+
+async def _previous_calendar_start(uid: str) -> date:
+    """_get_phase_calendar: the newest 24 cycles."""
+    cycles = await cycle_service.get_cycle_history(uid, limit=24)
+    return min(cycle.start_date for cycle in cycles)
+
+
+async def _previous_count(uid: str) -> int:
+    """delete_cycle_entry's check: every cycle."""
+    db = cycle_service.get_firestore_client()
+    cycles_ref = db.collection("users").document(uid).collection("cycleData")
+    return len(await fetch_documents(cycles_ref))
+
+
+async def _previous_delete(uid: str, cycle_id: str) -> None:
+    """delete_cycle_entry: count every cycle, delete, then fix up the profile."""
+    db = cycle_service.get_firestore_client()
+    user_ref = db.collection("users").document(uid)
+    cycle_ref = user_ref.collection("cycleData").document(cycle_id)
+    if not (await get_document(cycle_ref)).exists:
+        raise ValueError("Cycle not found")
+    if await _previous_count(uid) <= 1:
+        raise ValueError("Cannot delete the only cycle")
+    await delete_document(cycle_ref)
+    await _previous_averages(uid)
+    latest = (await cycle_service.get_cycle_history(uid, limit=1))[0]
+    await update_document(user_ref, {
+        "last_period_start_date": datetime.combine(latest.start_date, datetime.min.time()),
+        "updated_at": datetime.utcnow(),
+    })
+    user_service.invalidate_cached_profile(uid)
+
+
+async def _stats_calendar_start(uid: str) -> date:
+    return (await cycle_service.get_cycle_stats(uid)).recent[-1].start_date
+
+
+async def _stats_count(uid: str) -> int:
+    return (await cycle_service.get_cycle_stats(uid)).count
+
+
+async def _stats_averages(uid: str) -> int:
+    return (await cycle_service.recalculate_and_update_averages(uid))[0]
+
+
+# ---------------------------------------------------------------------------
+# Checks
+
+
+def _cycles(db: FakeFirestore, uid: str) -> dict[str, dict]:
+    return db._collections.get(f"users/{uid}/cycleData", {})
+
+
+def _expected_stats(db: FakeFirestore, uid: str):
+    """The stats rebuilt from every stored cycle."""
+    cycles = {
+        cycle_id: cycle_service._cycle_fields(data)
+        for cycle_id, data in _cycles(db, uid).items()
+    }
+    stats = cycle_service._build_stats(len(cycles), cycles, cycle_service._earliest(cycles))
+    return cycle_service._parse_stats(stats, uid)
+
+
+def _stored_stats(db: FakeFirestore, uid: str):
+    data = db._collections.get(f"users/{uid}/cycleStats", {}).get("summary")
+    return cycle_service._parse_stats(data, uid) if data else None
+
+
+def _profile(db: FakeFirestore, uid: str) -> dict:
+    return db._collections["users"][uid]
+
+
+async def random_write(db: FakeFirestore, uid: str, rng: random.Random, used: set[date]) -> str:
+    """
+    Apply one random cycle write: log a period, edit or delete a cycle, or
+    import periods. Also drives the tests' random histories.
+
+    Args:
+        db: Fake Firestore holding the user's cycles
+        uid: User to write for
+        rng: Source of the write and its dates
+        used: Start dates already taken; the new ones are added
+
+    Returns:
+        Name of the write
+    """
+
+    def unused_date(low: date, high: date) -> date:
+        # Distinct start dates, so the newest cycles have one order
+        while True:
+            day = low + timedelta(days=rng.randint(0, (high - low).days))
+            if day not in used:
+                used.add(day)
+                return day
+
+    starts = sorted(data["start_date"].date() for data in _cycles(db, uid).values())
+    latest = starts[-1]
+    roll = rng.random()
+
+    if roll < 0.45:
+        start = unused_date(latest + timedelta(days=21), latest + timedelta(days=40))
+        await cycle_service.log_period(uid, LogPeriodRequest(start_date=start))
+        return "log period"
+    if roll < 0.5:
+        start = unused_date(starts[0] - timedelta(days=60), latest - timedelta(days=1))
+        await cycle_service.log_period(uid, LogPeriodRequest(start_date=start))
+        return "log earlier period"
+    if roll < 0.7:
+        cycle_id = rng.choice(list(_cycles(db, uid)))
+        if rng.random() < 0.3:
+            data = UpdateCycleRequest(notes="edited")
+        else:
+            data = UpdateCycleRequest(
+                start_date=unused_date(starts[0] - timedelta(days=60), latest + timedelta(days=30))
+            )
+        await cycle_service.update_cycle_entry(uid, cycle_id, data)
+        return "edit cycle"
+    if roll < 0.92:
+        if len(starts) > 1:
+            cycle_id = rng.choice(list(_cycles(db, uid)))
+            await cycle_service.delete_cycle_entry(uid, cycle_id)
+        return "delete cycle"
+
+    periods = {
+        unused_date(starts[0] - timedelta(days=400), latest + timedelta(days=60)): None
+        for _ in range(rng.randint(1, 30))
+    }
+    await cycle_service.merge_imported_periods(uid, periods)
+    user_service.invalidate_cached_profile(uid)
+    return "import periods"
+
+
+async def check_random_writes(db: FakeFirestore, operations: int, seed: int) -> None:
+    """The stats document always matches one rebuilt from every cycle."""
+    rng = random.Random(seed)
+    uid = "checked"
+    _seed_profile(db, uid)
+    first = date.today() - timedelta(days=365 * 20)
+    onboarding = [first, first + timedelta(days=27), first + timedelta(days=56)]
+    await cycle_service.initialize_cycle_tracking(uid, onboarding)
+    used = set(onboarding)
+
+    counts: dict[str, int] = {}
+    for i in range(operations):
+        name = await random_write(db, uid, rng, used)
+        counts[name] = counts.get(name, 0) + 1
+        stored, expected = _stored_stats(db, uid), _expected_stats(db, uid)
+        assert stored == expected, (i, name, stored, expected)
+        history = await cycle_service.get_cycle_history(uid, limit=cycle_service.STATS_RECENT)
+        assert stored.recent == history, (i, name)
+        average = _profile(db, uid)["average_cycle_length"]
+        if name in ("edit cycle", "delete cycle"):
+            assert average == min(max(expected.median or 28, 21), 45), (i, name, average, expected)
+
+    summary = ", ".join(f"{count} {name}" for name, count in sorted(counts.items()))
+    print(f"verified the stats after each of {operations} random writes ({summary})")
+
+    # Histories logged before the stats document existed
+    _seed_history(db, "no-stats", 3, rng)
+    assert _stored_stats(db, "no-stats") is None
+    built = await cycle_service.get_cycle_stats("no-stats")
+    assert built == _stored_stats(db, "no-stats") == _expected_stats(db, "no-stats")
+    print("verified stats are built on first use for histories without them")
+
+    # No stats are left behind for users without a profile
+    assert await cycle_service.get_cycle_stats("never-created") == CycleStats()
+    assert "users/never-created/cycleStats" not in db._collections
+
+    _seed_history(db, "backfilled", 3, rng)
+    missing = [uid for uid in db._collections["users"] if _stored_stats(db, uid) is None]
+    backfill_cycle_stats.get_firestore_client = lambda: db
+    assert (await backfill_cycle_stats.run(page_size=2, dry_run=True))[1] == len(missing)
+    assert _stored_stats(db, "backfilled") is None
+    assert (await backfill_cycle_stats.run(page_size=2, dry_run=False))[1] == len(missing)
+    assert (await backfill_cycle_stats.run(page_size=2, dry_run=False))[1] == 0
+    for uid in missing:
+        assert _stored_stats(db, uid) == _expected_stats(db, uid), uid
+    print("verified app.jobs.backfill_cycle_stats builds only missing stats")
+
+
+async def run(args: argparse.Namespace) -> None:
+    db = FakeFirestore(latency=args.latency_ms / 1000)
+    _use_fake_firestore(db)
+
+    for uid in ("previous", "stats"):
+        _seed_history(db, uid, args.years, random.Random(args.seed))
+    # Built once, as the first read of the stats does for existing histories
+    _, build_reads, build_seconds = await _measure(cycle_service.get_cycle_stats("stats"))
+
+    cycle_id = sorted(_cycles(db, "previous"))[-5]
+    cases = (
+        ("averages", _previous_averages("previous"), _stats_averages("stats")),
+        ("calendar start", _previous_calendar_start("previous"), _stats_calendar_start("stats")),
+        ("cycle count", _previous_count("previous"), _stats_count("stats")),
+        ("delete cycle", _previous_delete("previous", cycle_id),
+         cycle_service.delete_cycle_entry("stats", cycle_id)),
+    )
+
+    print(f"{args.years}-year user: {len(_cycles(db, 'previous'))} cycles, "
+          f"{args.latency_ms:g}ms Firestore round trip\n")
+    print(f"{'':<15} {'previous':>18} {'stats':>18}")
+    for name, previous, stats in cases:
+        old_result, old_reads, old_seconds = await _measure(previous)
+        new_result, new_reads, new_seconds = await _measure(stats)
+        print(f"{name:<15} {old_reads:>6} reads {old_seconds * 1000:>5.0f}ms "
+              f"{new_reads:>6} reads {new_seconds * 1000:>5.0f}ms")
+        assert old_result == new_result or name == "delete cycle", (name, old_result, new_result)
+    print(f"(building the stats once for an existing history: {build_reads} reads, "
+          f"{build_seconds * 1000:.0f}ms)")
+
+    assert _profile(db, "previous")["average_cycle_length"] == _profile(db, "stats")["average_cycle_length"]
+    assert _profile(db, "previous")["last_period_start_date"] == _profile(db, "stats")["last_period_start_date"]
+    assert _cycles(db, "previous").keys() == _cycles(db, "stats").keys()
+    assert _stored_stats(db, "stats") == _expected_stats(db, "stats")
+    print("\nverified both give the same averages, calendar start, count and history\n")
+
+    db.latency = 0
+    await check_random_writes(db, args.operations, args.seed)
+
+    shutdown_firestore_executor()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("--years", type=int, default=10)
+    parser.add_argument("--latency-ms", type=float, default=5.0)
+    parser.add_argument("--operations", type=int, default=300)
+    parser.add_argument("--seed", type=int, default=7)
+    asyncio.run(run(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,646 @@
+"""
+End-to-end load benchmark for the API.
+
+Boots the app in-process against the in-memory Firestore stand-in (with
+simulated round-trip latency) and a stub Claude backend, seeds synthetic
+users with cycle, energy and workout histories, then drives a weighted mix
+of requests across every router from concurrent clients. Reports
+throughput, status codes, Firestore reads/writes per request (from the
+Server-Timing header) and p50/p95/p99 latency per endpoint, each the
+median over several rounds.
+
+Runs can be saved as a JSON baseline and compared against it later; with
+--compare the exit status is non-zero if an endpoint's p95 or the overall
+throughput regresses beyond --tolerance, or an endpoint starts failing.
+Nothing touches the network, so it runs offline.
+
+Usage:
+    python -m benchmarks.endpoints [--users 200] [--requests 4000]
+        [--rounds 3] [--concurrency 32] [--latency-ms 5] [--llm-latency-ms 400]
+        [--save-baseline] [--compare] [--baseline PATH]
+"""
+
+import argparse
+import asyncio
+import contextlib
+import io
+import json
+import os
+import random
+import re
+import statistics
+import sys
+import time
+from collections import defaultdict
+from dataclasses import dataclass, field
+from datetime import date, datetime, timedelta
+from pathlib import Path
+from typing import Any, Callable, Optional
+
+import httpx
+from anthropic.types import Message
+from fastapi import Request
+
+from app.ai import client as ai_client
+from app.config.settings import get_settings
+from app.main import app
+from app.middleware.auth import AuthenticatedUser, get_current_user
+from app.models.user import FitnessGoal, FitnessLevel
+from app.services import (
+    cycle_service,
+    energy_service,
+    export_service,
+    import_service,
+    recommendation_cache,
+    user_service,
+    workout_service,
+)
+from app.utils.firestore import shutdown_firestore_executor
+from benchmarks.fake_firestore import FakeFirestore
+from benchmarks.stats import percentile
+from benchmarks.workout_catalog import synthetic_workouts
+
+DEFAULT_BASELINE = Path(__file__).parent / "baselines" / "endpoints.json"
+USER_HEADER = "x-bench-user"
+METRICS_TOKEN = "bench-metrics-token"
+WORKOUTS = 200
+# Differences below this are scheduling noise, whatever the ratio
+NOISE_FLOOR_MS = 2.0
+# Rarely hit endpoints are reported but their tail is too noisy to gate on
+MIN_GATED_SAMPLES = 200
+
+_SERVER_TIMING = re.compile(r'firestore;dur=[\d.]+;desc="(\d+) reads, (\d+) writes')
+
+
+@dataclass
+class BenchUser:
+    uid: str
+    cycle_length: int
+    last_period: Optional[date]
+    cycle_ids: list[str]
+    energy_ids: list[str]
+
+
+@dataclass
+class Call:
+    """One HTTP request of a scenario, labelled with its route template."""
+
+    label: str
+    method: str
+    path: str
+    params: Optional[dict] = None
+    body: Optional[dict] = None
+    headers: Optional[dict] = None
+
+
+@dataclass
+class EndpointStats:
+    latencies: list[float] = field(default_factory=list)
+    statuses: dict[int, int] = field(default_factory=lambda: defaultdict(int))
+    reads: int = 0
+    writes: int = 0
+    first_error: Optional[str] = None
+
+
+# ---------------------------------------------------------------------------
+# Seed data
+
+
+def _seed(db: FakeFirestore, users: int, rng: random.Random) -> list[BenchUser]:
+    """Seed the workout library and users with months to years of history."""
+    for workout in synthetic_workouts(WORKOUTS):
+        db.seed(
+            f"workouts/{workout.id}",
+            workout.model_dump(mode="json", exclude={"id", "created_at"}),
+        )
+
+    now = datetime.utcnow()
+    today = date.today()
+    seeded = []
+    for i in range(users):
+        uid = f"bench-{i}"
+        cycle_length = rng.randint(24, 34)
+        # A few new users who haven't logged a period yet
+        depth = 0 if rng.random() < 0.05 else rng.randint(1, 24)
+
+        cycle_ids = []
+        cycles = {}
+        start = today - timedelta(days=rng.randint(0, cycle_length - 1))
+        starts = []
+        for _ in range(depth):
+            starts.append(start)
+            start -= timedelta(days=cycle_length + rng.randint(-2, 2))
+        starts.reverse()
+        for k, cycle_start in enumerate(starts):
+            cycle_id = f"c{k:02d}"
+            cycle_end = starts[k + 1] if k + 1 < len(starts) else None
+            data = {
+                "user_id": uid,
+                "start_date": datetime.combine(cycle_start, datetime.min.time()),
+                "end_date": datetime.combine(cycle_end, datetime.min.time()) if cycle_end else None,
+                "cycle_length": (cycle_end - cycle_start).days if cycle_end else None,
+                "notes": None,
+                "created_at": now,
+            }
+            db.seed(f"users/{uid}/cycleData/{cycle_id}", data)
+            cycle_ids.append(cycle_id)
+            cycles[cycle_id] = cycle_service._cycle_fields(data)
+        # As app.jobs.backfill_cycle_stats leaves existing users
+        db.seed(f"users/{uid}/cycleStats/summary",
+                cycle_service._build_stats(len(starts), cycles, starts[0] if starts else None))
+
+        db.seed(f"users/{uid}", {
+            "email": f"{uid}@example.com",
+            "display_name": f"Bench {i}",
+            "fitness_level": rng.choice(list(FitnessLevel)).value,
+            "goals": [g.value for g in rng.sample(list(FitnessGoal), 2)],
+            "average_cycle_length": cycle_length,
+            "average_period_length": rng.randint(3, 7),
+            "cycle_tracking_enabled": True,
+            "notifications_enabled": True,
+            "timezone": rng.choice([None, "America/New_York", "Europe/London"]),
+            "last_period_start_date": (
+                datetime.combine(starts[-1], datetime.min.time()) if starts else None
+            ),
+            "subscription_status": "active",
+            "onboarding_completed": True,
+            "created_at": now,
+            "updated_at": now,
+        })
+
+        # Energy logged on most of the last 90 days
+        energy_ids = []
+        for day in range(90):
+            if rng.random() < 0.7:
+                log_date = today - timedelta(days=day)
+                log_id = energy_service.energy_log_id(log_date)
+                logged = datetime.combine(log_date, datetime.min.time())
+                db.seed(f"users/{uid}/energy_logs/{log_id}", {
+                    "user_id": uid,
+                    "date": logged,
+                    "score": rng.randint(1, 10),
+                    "notes": None,
+                    "created_at": logged,
+                    "updated_at": logged,
+                })
+                energy_ids.append(log_id)
+
+        for k in range(rng.randint(0, 60)):
+            workout = f"w{rng.randrange(WORKOUTS)}"
+            db.seed(f"users/{uid}/workoutHistory/h{k:03d}", {
+                "user_id": uid,
+                "workout_id": workout,
+                "workout_title": f"Workout {workout}",
+                "duration_minutes": rng.choice([20, 30, 45]),
+                "completed_at": now - timedelta(days=k * 2, hours=rng.randint(0, 12)),
+                "calories_burned": rng.randint(80, 400),
+                "notes": None,
+            })
+
+        seeded.append(BenchUser(
+            uid, cycle_length, starts[-1] if starts else None, cycle_ids, energy_ids
+        ))
+    return seeded
+
+
+# ---------------------------------------------------------------------------
+# Request mix
+
+
+def _scenarios(users: list[BenchUser]) -> list[tuple[float, Callable]]:
+    """Weighted scenarios; each returns (uid, calls run in order)."""
+    today = date.today()
+    phases = ["menstrual", "follicular", "ovulatory", "luteal"]
+    signups = iter(range(10**9))
+
+    def single(label: str, method: str, path: str = None, **kwargs) -> Callable:
+        def build(rng: random.Random, user: BenchUser):
+            return user.uid, [Call(label, method, path or label, **kwargs)]
+        return build
+
+    def log_period(rng, user):
+        # About a cycle after the last one (even if that is in the future):
+        # closing a cycle only days long would drag the user's median cycle
+        # length below the valid range
+        if user.last_period is None:
+            start = today - timedelta(days=rng.randint(0, 3))
+        else:
+            start = user.last_period + timedelta(days=user.cycle_length + rng.randint(-2, 2))
+        user.last_period = start
+        return user.uid, [Call("/api/v1/cycle/log-period", "POST", "/api/v1/cycle/log-period",
+                               body={"start_date": start.isoformat()})]
+
+    def edit_cycle(rng, user):
+        cycle_id = rng.choice(user.cycle_ids) if user.cycle_ids else "missing"
+        return user.uid, [Call("/api/v1/cycle/history/{cycle_id}", "PATCH",
+                               f"/api/v1/cycle/history/{cycle_id}", body={"notes": "edited"})]
+
+    def delete_cycle(rng, user):
+        cycle_id = user.cycle_ids[0] if user.cycle_ids else "missing"
+        return user.uid, [Call("/api/v1/cycle/history/{cycle_id}", "DELETE",
+                               f"/api/v1/cycle/history/{cycle_id}")]
+
+    def log_energy(rng, user):
+        logged = (today - timedelta(days=rng.randint(0, 6))).isoformat()
+        return user.uid, [Call("/api/v1/energy/log", "POST", "/api/v1/energy/log",
+                               body={"date": logged, "score": rng.randint(1, 10)})]
+
+    def delete_energy(rng, user):
+        log_id = rng.choice(user.energy_ids) if user.energy_ids else "missing"
+        return user.uid, [Call("/api/v1/energy/{log_id}", "DELETE", f"/api/v1/energy/{log_id}")]
+
+    def workout_detail(rng, user):
+        workout_id = f"w{rng.randrange(WORKOUTS)}"
+        return user.uid, [Call("/api/v1/workouts/{workout_id}", "GET",
+                               f"/api/v1/workouts/{workout_id}")]
+
+    def recommended_workouts(rng, user):
+        return user.uid, [Call("/api/v1/workouts/recommended", "GET", "/api/v1/workouts/recommended",
+                               params={"phase": rng.choice(phases)})]
+
+    def log_workout(rng, user):
+        return user.uid, [Call("/api/v1/workouts/history", "POST", "/api/v1/workouts/history",
+                               body={"workout_id": f"w{rng.randrange(WORKOUTS)}"})]
+
+    def phase_recommendations(rng, user):
+        phase = rng.choice(phases)
+        return user.uid, [Call("/api/v1/recommendations/phase/{phase}", "GET",
+                               f"/api/v1/recommendations/phase/{phase}",
+                               params={"cycle_day": rng.randint(1, 28)})]
+
+    def signup_and_delete(rng, user):
+        uid = f"signup-{next(signups)}"
+        first = today - timedelta(days=rng.randint(0, 27))
+        profile = {
+            "display_name": "New user",
+            "fitness_level": "beginner",
+            "goals": ["consistency"],
+            "initial_cycle_dates": [
+                (first - timedelta(days=28 * k)).isoformat() for k in range(3)
+            ],
+        }
+        return uid, [
+            Call("/api/v1/users/me", "POST", "/api/v1/users/me", body=profile),
+            Call("/api/v1/users/me", "DELETE", "/api/v1/users/me"),
+        ]
+
+    return [
+        (1, single("/api/health", "GET")),
+        (1, single("/metrics", "GET",
+                   headers={"Authorization": f"Bearer {METRICS_TOKEN}"})),
+        (10, single("/api/v1/users/me", "GET")),
+        (2, single("/api/v1/users/me", "PATCH", body={"notifications_enabled": False})),
+        (1, signup_and_delete),
+        (10, single("/api/v1/cycle/current", "GET")),
+        (6, single("/api/v1/cycle/predictions", "GET")),
+        (3, single("/api/v1/cycle/predictions", "GET", params={"format": "runs", "days": 90})),
+        (5, single("/api/v1/cycle/history", "GET")),
+        (1, log_period),
+        (1, edit_cycle),
+        (0.3, delete_cycle),
+        (4, log_energy),
+        (4, single("/api/v1/energy/today", "GET")),
+        (4, single("/api/v1/energy/history", "GET")),
+        (0.5, delete_energy),
+        (8, single("/api/v1/workouts", "GET", params={"limit": 20})),
+        (3, recommended_workouts),
+        (5, workout_detail),
+        (2, log_workout),
+        (4, single("/api/v1/workouts/history/me", "GET")),
+        (6, single("/api/v1/recommendations/today", "GET")),
+        (2, phase_recommendations),
+    ]
+
+
+def _plan(users: list[BenchUser], count: int, rng: random.Random) -> list:
+    scenarios = _scenarios(users)
+    weights = [weight for weight, _ in scenarios]
+    builders = [build for _, build in scenarios]
+    return [
+        builder(rng, rng.choice(users))
+        for builder in rng.choices(builders, weights=weights, k=count)
+    ]
+
+
+# ---------------------------------------------------------------------------
+# Stubs
+
+
+async def _bench_user(request: Request) -> AuthenticatedUser:
+    uid = request.headers[USER_HEADER]
+    return AuthenticatedUser(uid=uid, email=f"{uid}@example.com", token_data={})
+
+
+class _StubMessages:
+    def __init__(self, latency: float):
+        self.latency = latency
+
+    async def create(self, *, model: str, messages: list[dict], **kwargs: Any) -> Message:
+        await asyncio.sleep(self.latency)
+        text = json.dumps({
+            "daily_message": "Move in a way that feels good today.",
+            "recommendations": [
+                {"workout_title": "Workout w1", "reason": "Matches your energy"},
+                {"workout_title": "Workout w2", "reason": "Builds on last week"},
+            ],
+            "self_care_tip": "Drink some water.",
+        })
+        return Message.model_validate({
+            "id": "msg_bench",
+            "type": "message",
+            "role": "assistant",
+            "model": model,
+            "content": [{"type": "text", "text": text}],
+            "stop_reason": "end_turn",
+            "stop_sequence": None,
+            "usage": {
+                "input_tokens": len(messages[0]["content"]) // 4,
+                "output_tokens": len(text) // 4,
+            },
+        })
+
+
+class _StubClaude:
+    """Stands in for AsyncAnthropic: answers after a fixed delay."""
+
+    def __init__(self, latency: float):
+        self.messages = _StubMessages(latency)
+
+    async def close(self) -> None:
+        pass
+
+
+def _stub_claude(latency: float) -> None:
+    ai_client._client = _StubClaude(latency)
+    ai_client._semaphore = asyncio.Semaphore(get_settings().anthropic_max_concurrency)
+
+
+def _use_fake_firestore(db: FakeFirestore) -> None:
+    for module in (user_service, cycle_service, energy_service, export_service,
+                   import_service, workout_service, recommendation_cache):
+        module.get_firestore_client = lambda: db
+
+
+# ---------------------------------------------------------------------------
+# Driver
+
+
+def _recording_app(errors: dict[str, str]):
+    """Wrap the app to keep the first exception behind each route's 500s."""
+
+    async def wrapped(scope, receive, send):
+        try:
+            await app(scope, receive, send)
+        except Exception as e:
+            route = getattr(scope.get("route"), "path", scope.get("path"))
+            key = f"{scope.get('method')} {route}"
+            errors.setdefault(key, f"{type(e).__name__}: {e}"[:160])
+
+    return wrapped
+
+
+async def _drive(plan: list, concurrency: int, stats: dict[str, EndpointStats]) -> float:
+    errors: dict[str, str] = {}
+    transport = httpx.ASGITransport(app=_recording_app(errors), raise_app_exceptions=False)
+    queue = iter(plan)
+
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as http:
+
+        async def worker() -> None:
+            for uid, calls in queue:
+                for call in calls:
+                    started = time.perf_counter()
+                    response = await http.request(
+                        call.method, call.path, params=call.params, json=call.body,
+                        headers={USER_HEADER: uid, **(call.headers or {})},
+                    )
+                    elapsed = time.perf_counter() - started
+                    entry = stats[f"{call.method} {call.label}"]
+                    entry.latencies.append(elapsed)
+                    entry.statuses[response.status_code] += 1
+                    timing = _SERVER_TIMING.search(response.headers.get("server-timing", ""))
+                    if timing:
+                        entry.reads += int(timing.group(1))
+                        entry.writes += int(timing.group(2))
+
+        started = time.perf_counter()
+        await asyncio.gather(*(worker() for _ in range(concurrency)))
+        wall = time.perf_counter() - started
+
+    for key, message in errors.items():
+        if key in stats:
+            stats[key].first_error = message
+    return wall
+
+
+def _summary(stats: dict[str, EndpointStats], wall: float) -> dict:
+    endpoints = {}
+    for key in sorted(stats):
+        entry = stats[key]
+        count = len(entry.latencies)
+        endpoints[key] = {
+            "count": count,
+            "statuses": {str(code): n for code, n in sorted(entry.statuses.items())},
+            "rps": round(count / wall, 2),
+            "reads_per_request": round(entry.reads / count, 2),
+            "writes_per_request": round(entry.writes / count, 2),
+            "p50_ms": round(percentile(entry.latencies, 50) * 1000, 2),
+            "p95_ms": round(percentile(entry.latencies, 95) * 1000, 2),
+            "p99_ms": round(percentile(entry.latencies, 99) * 1000, 2),
+        }
+        if entry.first_error:
+            endpoints[key]["first_error"] = entry.first_error
+    everything = [latency for entry in stats.values() for latency in entry.latencies]
+    return {
+        "overall": {
+            "requests": len(everything),
+            "rps": round(len(everything) / wall, 2),
+            "p50_ms": round(percentile(everything, 50) * 1000, 2),
+            "p95_ms": round(percentile(everything, 95) * 1000, 2),
+            "p99_ms": round(percentile(everything, 99) * 1000, 2),
+        },
+        "endpoints": endpoints,
+    }
+
+
+def _median_of_rounds(rounds: list[dict]) -> dict:
+    """Combine rounds: counts and statuses summed, rates and latencies medians."""
+
+    def combine(rows: list[dict]) -> dict:
+        combined = {}
+        for key in dict.fromkeys(key for row in rows for key in row):
+            values = [row[key] for row in rows if key in row]
+            if key in ("count", "requests"):
+                combined[key] = sum(values)
+            elif key == "statuses":
+                statuses: dict[str, int] = defaultdict(int)
+                for value in values:
+                    for code, n in value.items():
+                        statuses[code] += n
+                combined[key] = dict(sorted(statuses.items()))
+            elif key == "first_error":
+                combined[key] = values[0]
+            else:
+                combined[key] = statistics.median(values)
+        return combined
+
+    keys = sorted({key for summary in rounds for key in summary["endpoints"]})
+    return {
+        "overall": combine([summary["overall"] for summary in rounds]),
+        "endpoints": {
+            key: combine([s["endpoints"][key] for s in rounds if key in s["endpoints"]])
+            for key in keys
+        },
+    }
+
+
+def _print_summary(summary: dict) -> None:
+    print(
+        f"\n{'endpoint':<46} {'n':>5} {'statuses':<16} {'req/s':>7} {'reads':>6} "
+        f"{'writes':>6} {'p50':>8} {'p95':>8} {'p99':>8}"
+    )
+    for key, row in summary["endpoints"].items():
+        statuses = " ".join(f"{code}:{n}" for code, n in row["statuses"].items())
+        print(
+            f"{key:<46} {row['count']:>5} {statuses:<16} {row['rps']:>7.1f} "
+            f"{row['reads_per_request']:>6.1f} {row['writes_per_request']:>6.1f} "
+            f"{row['p50_ms']:>6.1f}ms {row['p95_ms']:>6.1f}ms {row['p99_ms']:>6.1f}ms"
+        )
+    overall = summary["overall"]
+    print(
+        f"\n{overall['requests']} requests, {overall['rps']:.1f} req/s, "
+        f"p50={overall['p50_ms']:.1f}ms p95={overall['p95_ms']:.1f}ms "
+        f"p99={overall['p99_ms']:.1f}ms"
+    )
+    failing = {k: r["first_error"] for k, r in summary["endpoints"].items() if "first_error" in r}
+    for key, error in failing.items():
+        print(f"  5xx {key}: {error}")
+
+
+def _error_rate(row: dict) -> float:
+    failed = sum(n for code, n in row["statuses"].items() if code.startswith("5"))
+    return failed / row["count"] if row["count"] else 0.0
+
+
+def compare(summary: dict, baseline: dict, tolerance: float) -> list[str]:
+    """
+    Compare a run against a saved baseline.
+
+    Returns:
+        Regressions found (empty if none)
+    """
+    if summary["config"] != baseline["config"]:
+        print(f"Warning: baseline was recorded with {baseline['config']}")
+
+    regressions = []
+    old_rps, new_rps = baseline["overall"]["rps"], summary["overall"]["rps"]
+    print(f"\noverall req/s {old_rps:.1f} -> {new_rps:.1f} ({new_rps / old_rps - 1:+.0%})")
+    if new_rps < old_rps * (1 - tolerance):
+        regressions.append(f"overall throughput {old_rps:.1f} -> {new_rps:.1f} req/s")
+
+    for key, row in summary["endpoints"].items():
+        old = baseline["endpoints"].get(key)
+        if old is None:
+            print(f"{key:<46} (new)")
+            continue
+        print(
+            f"{key:<46} p95 {old['p95_ms']:>7.1f} -> {row['p95_ms']:>7.1f}ms  "
+            f"reads {old['reads_per_request']:>5.1f} -> {row['reads_per_request']:>5.1f}  "
+            f"writes {old['writes_per_request']:>5.1f} -> {row['writes_per_request']:>5.1f}"
+        )
+        if _error_rate(old) > 0.5:
+            # Failing fast isn't a latency target
+            print(f"{'':<46} (was mostly failing, latency not compared)")
+        elif (
+            old["count"] >= MIN_GATED_SAMPLES
+            and row["p95_ms"] > old["p95_ms"] * (1 + tolerance)
+            and row["p95_ms"] - old["p95_ms"] > NOISE_FLOOR_MS
+        ):
+            regressions.append(f"{key} p95 {old['p95_ms']:.1f} -> {row['p95_ms']:.1f}ms")
+        if _error_rate(row) > _error_rate(old):
+            regressions.append(
+                f"{key} 5xx rate {_error_rate(old):.1%} -> {_error_rate(row):.1%}"
+            )
+    return regressions
+
+
+async def run(args: argparse.Namespace) -> dict:
+    rng = random.Random(args.seed)
+    db = FakeFirestore(latency=args.latency_ms / 1000)
+    users = _seed(db, args.users, rng)
+    _use_fake_firestore(db)
+    _stub_claude(args.llm_latency_ms / 1000)
+    os.environ["METRICS_TOKEN"] = METRICS_TOKEN
+    get_settings.cache_clear()
+    app.dependency_overrides[get_current_user] = _bench_user
+
+    with contextlib.redirect_stdout(io.StringIO()):
+        await workout_service.load_workout_catalog()
+    print(
+        f"seeded {args.users} users ({db.document_count()} documents); "
+        f"{args.rounds} rounds of {args.requests} requests from {args.concurrency} clients, "
+        f"{args.latency_ms:g} ms per Firestore round-trip, "
+        f"{args.llm_latency_ms:g} ms per Claude call"
+    )
+
+    # Service log lines (fallbacks, cache updates) would swamp the report
+    log = io.StringIO()
+    try:
+        with contextlib.redirect_stdout(log):
+            await _drive(_plan(users, args.warmup, rng), args.concurrency,
+                         defaultdict(EndpointStats))
+            rounds = []
+            for _ in range(args.rounds):
+                stats: dict[str, EndpointStats] = defaultdict(EndpointStats)
+                wall = await _drive(_plan(users, args.requests, rng), args.concurrency, stats)
+                rounds.append(_summary(stats, wall))
+    finally:
+        await ai_client.close_anthropic_client()
+        shutdown_firestore_executor()
+    if args.verbose:
+        print(log.getvalue())
+
+    config = {
+        key: getattr(args, key)
+        for key in ("users", "requests", "rounds", "concurrency", "latency_ms",
+                    "llm_latency_ms", "seed")
+    }
+    return {"config": config, **_median_of_rounds(rounds)}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("--users", type=int, default=200)
+    parser.add_argument("--requests", type=int, default=4000)
+    parser.add_argument("--rounds", type=int, default=3,
+                        help="measured rounds; latencies are the median across rounds")
+    parser.add_argument("--warmup", type=int, default=400)
+    parser.add_argument("--concurrency", type=int, default=32)
+    parser.add_argument("--latency-ms", type=float, default=5.0)
+    parser.add_argument("--llm-latency-ms", type=float, default=400.0)
+    parser.add_argument("--seed", type=int, default=7)
+    parser.add_argument("--baseline", type=Path, default=DEFAULT_BASELINE)
+    parser.add_argument("--save-baseline", action="store_true")
+    parser.add_argument("--compare", action="store_true")
+    parser.add_argument("--tolerance", type=float, default=0.35,
+                        help="allowed relative p95/throughput regression")
+    parser.add_argument("--verbose", action="store_true", help="print service log output")
+    args = parser.parse_args()
+
+    summary = asyncio.run(run(args))
+    _print_summary(summary)
+
+    if args.compare:
+        regressions = compare(summary, json.loads(args.baseline.read_text()), args.tolerance)
+        for regression in regressions:
+            print(f"REGRESSION: {regression}")
+        if regressions:
+            sys.exit(1)
+    if args.save_baseline:
+        args.baseline.parent.mkdir(parents=True, exist_ok=True)
+        args.baseline.write_text(json.dumps(summary, indent=2) + "\n")
+        print(f"baseline saved to {args.baseline}")
+
+
+if __name__ == "__main__":
+    main()
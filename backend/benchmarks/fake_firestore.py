@@ -0,0 +1,741 @@
+"""
+In-memory stand-in for the synchronous Firestore client.
+
+Implements the slice of the ``google.cloud.firestore`` API the services use,
+backed by per-collection dicts of documents:
+- document get/set (with merge)/update/delete, including the DELETE_FIELD,
+  SERVER_TIMESTAMP, Increment, ArrayUnion and ArrayRemove transforms
+- queries: where (positional or ``filter=FieldFilter``), order_by, limit,
+  offset, start_after, select, recursive (all descendants), stream/get,
+  with Firestore's rules for missing fields, cross-type ordering and the
+  implicit ``__name__`` order
+- write batches (500 writes max, applied atomically on commit)
+- transactions usable with ``firestore.transactional``: reads record the
+  documents' versions and commit raises Aborted (so the decorator retries)
+  if any of them changed meanwhile
+
+Written values are type-checked like the real client, which rejects
+anything it can't encode (e.g. ``datetime.date``) with a TypeError, and
+datetimes come back timezone-aware (naive ones are taken as UTC).
+
+Every network operation sleeps for ``latency`` seconds (blocking, like the
+real client) so benchmarks can model Firestore round-trips without network
+access. Collection listeners (``on_snapshot``) are notified synchronously
+by the thread that made the write, rather than from a background stream.
+"""
+
+import copy
+import functools
+import itertools
+import threading
+import time
+import uuid
+from datetime import datetime, timezone
+from typing import Any, Callable, Iterable, Optional
+
+from google.api_core.exceptions import Aborted, AlreadyExists
+from google.cloud.firestore_v1 import transforms
+from google.cloud.firestore_v1.watch import ChangeType
+
+MAX_BATCH_WRITES = 500
+
+_MISSING = object()
+_EQUALITY_OPS = {"==", "in", "array-contains", "array-contains-any"}
+_RANGE_OPS = {"<", "<=", ">", ">=", "!=", "not-in"}
+
+
+def _check_value(value: Any) -> None:
+    """Raise TypeError for values the real client can't encode."""
+    if value is None or isinstance(value, (bool, int, float, str, bytes, datetime)):
+        return
+    if isinstance(value, dict):
+        for key, item in value.items():
+            if not isinstance(key, str):
+                raise TypeError("Cannot convert to a Firestore Value", key, "Invalid type", type(key))
+            _check_value(item)
+        return
+    if isinstance(value, (list, tuple)):
+        for item in value:
+            _check_value(item)
+        return
+    if isinstance(value, (FakeDocumentReference, transforms.Sentinel, transforms._ValueList,
+                          transforms._NumericValue)):
+        return
+    if hasattr(value, "latitude") and hasattr(value, "longitude"):
+        return
+    raise TypeError("Cannot convert to a Firestore Value", value, "Invalid type", type(value))
+
+
+def _order_key(value: Any) -> tuple:
+    """Sort key following Firestore's cross-type value ordering."""
+    if value is None:
+        return (0,)
+    if isinstance(value, bool):
+        return (1, value)
+    if isinstance(value, (int, float)):
+        return (2, value)
+    if isinstance(value, datetime):
+        # Naive datetimes are treated as UTC, as the client does
+        return (3, value if value.tzinfo else value.replace(tzinfo=timezone.utc))
+    if isinstance(value, str):
+        return (4, value)
+    if isinstance(value, bytes):
+        return (5, value)
+    if isinstance(value, FakeDocumentReference):
+        return (6, value.path)
+    if isinstance(value, (list, tuple)):
+        return (8, tuple(_order_key(v) for v in value))
+    if isinstance(value, dict):
+        return (9, tuple((k, _order_key(v)) for k, v in sorted(value.items())))
+    return (7, (getattr(value, "latitude", 0), getattr(value, "longitude", 0)))
+
+
+def _get_field(data: dict, field_path: str) -> Any:
+    current: Any = data
+    for part in field_path.split("."):
+        if not isinstance(current, dict) or part not in current:
+            return _MISSING
+        current = current[part]
+    return current
+
+
+def _transformed(value: Any, current: Any) -> Any:
+    if isinstance(value, datetime):
+        # Stored as UTC instants and read back timezone-aware
+        return value if value.tzinfo else value.replace(tzinfo=timezone.utc)
+    if value is transforms.SERVER_TIMESTAMP:
+        return datetime.now(timezone.utc)
+    if isinstance(value, transforms.Increment):
+        return (current if isinstance(current, (int, float)) else 0) + value.value
+    if isinstance(value, transforms.ArrayUnion):
+        existing = list(current) if isinstance(current, list) else []
+        return existing + [v for v in value.values if v not in existing]
+    if isinstance(value, transforms.ArrayRemove):
+        existing = list(current) if isinstance(current, list) else []
+        return [v for v in existing if v not in value.values]
+    if isinstance(value, dict):
+        base = current if isinstance(current, dict) else {}
+        return {k: _transformed(v, base.get(k)) for k, v in value.items()
+                if v is not transforms.DELETE_FIELD}
+    if isinstance(value, (list, tuple)):
+        return [_transformed(v, None) for v in value]
+    return copy.deepcopy(value)
+
+
+def _set_path(data: dict, field_path: str, value: Any) -> None:
+    parts = field_path.split(".")
+    target = data
+    for part in parts[:-1]:
+        if not isinstance(target.get(part), dict):
+            target[part] = {}
+        target = target[part]
+    if value is transforms.DELETE_FIELD:
+        target.pop(parts[-1], None)
+    else:
+        target[parts[-1]] = _transformed(value, target.get(parts[-1]))
+
+
+def _merge(existing: dict, data: dict) -> None:
+    """Deep-merge ``data`` into ``existing``, as set(merge=True) does."""
+    for key, value in data.items():
+        if isinstance(value, dict) and isinstance(existing.get(key), dict):
+            _merge(existing[key], value)
+        elif value is transforms.DELETE_FIELD:
+            existing.pop(key, None)
+        else:
+            existing[key] = _transformed(value, existing.get(key))
+
+
+class FakeDocumentSnapshot:
+    """Snapshot of a single fake document."""
+
+    def __init__(
+        self,
+        reference: "FakeDocumentReference",
+        data: Optional[dict],
+        version: int = 0,
+    ):
+        self.reference = reference
+        self.id = reference.id
+        self._data = data
+        self._version = version
+        self.create_time = reference._client._create_times.get(reference.path)
+
+    @property
+    def exists(self) -> bool:
+        return self._data is not None
+
+    def to_dict(self) -> Optional[dict]:
+        return copy.deepcopy(self._data) if self._data is not None else None
+
+    def get(self, field_path: str) -> Any:
+        value = _get_field(self._data or {}, field_path)
+        if value is _MISSING:
+            raise KeyError(field_path)
+        return copy.deepcopy(value)
+
+
+class FakeDocumentReference:
+    """Reference to a fake document."""
+
+    def __init__(self, client: "FakeFirestore", path: str):
+        self._client = client
+        self.path = path
+        self.id = path.rsplit("/", 1)[-1]
+
+    def __eq__(self, other: object) -> bool:
+        return isinstance(other, FakeDocumentReference) and other.path == self.path
+
+    def __hash__(self) -> int:
+        return hash(self.path)
+
+    @property
+    def parent(self) -> "FakeCollectionReference":
+        return FakeCollectionReference(self._client, self.path.rsplit("/", 1)[0])
+
+    def collection(self, name: str) -> "FakeCollectionReference":
+        return FakeCollectionReference(self._client, f"{self.path}/{name}")
+
+    def collections(self) -> list["FakeCollectionReference"]:
+        """Subcollections with documents, or missing documents above some."""
+        self._client._round_trip()
+        prefix = f"{self.path}/"
+        with self._client._lock:
+            names = dict.fromkeys(
+                path[len(prefix):].split("/", 1)[0]
+                for path, docs in self._client._collections.items()
+                if docs and path.startswith(prefix)
+            )
+        return [self.collection(name) for name in names]
+
+    def get(self, field_paths: Optional[Iterable[str]] = None, transaction=None) -> FakeDocumentSnapshot:
+        self._client._round_trip()
+        snapshot = self._client._snapshot(self)
+        if transaction is not None:
+            transaction._record_read(snapshot)
+        return snapshot
+
+    def create(self, document_data: dict) -> None:
+        self._client._round_trip()
+        self._client._commit([("create", self, document_data, None)])
+
+    def set(self, document_data: dict, merge: bool = False) -> None:
+        self._client._round_trip()
+        self._client._commit([("set", self, document_data, merge)])
+
+    def update(self, field_updates: dict) -> None:
+        self._client._round_trip()
+        self._client._commit([("update", self, field_updates, None)])
+
+    def delete(self) -> None:
+        self._client._round_trip()
+        self._client._commit([("delete", self, None, None)])
+
+
+class FakeQuery:
+    """Immutable query over one collection."""
+
+    def __init__(
+        self,
+        client: "FakeFirestore",
+        path: str,
+        filters: tuple = (),
+        orders: tuple = (),
+        limit: Optional[int] = None,
+        offset: int = 0,
+        cursor: Any = None,
+        projection: Optional[tuple[str, ...]] = None,
+        recursive: bool = False,
+    ):
+        self._client = client
+        self.path = path
+        self._filters = filters
+        self._orders = orders
+        self._limit = limit
+        self._offset = offset
+        self._cursor = cursor
+        self._projection = projection
+        # Also match documents in every subcollection below the collection,
+        # ordered by full path
+        self._recursive = recursive
+
+    def _copy(self, **changes: Any) -> "FakeQuery":
+        fields = {
+            "filters": self._filters,
+            "orders": self._orders,
+            "limit": self._limit,
+            "offset": self._offset,
+            "cursor": self._cursor,
+            "projection": self._projection,
+            "recursive": self._recursive,
+        }
+        fields.update(changes)
+        return FakeQuery(self._client, self.path, **fields)
+
+    def where(self, field_path: Optional[str] = None, op_string: Optional[str] = None,
+              value: Any = None, *, filter=None) -> "FakeQuery":
+        if filter is not None:
+            field_path, op_string, value = filter.field_path, filter.op_string, filter.value
+        if op_string not in _EQUALITY_OPS | _RANGE_OPS:
+            raise ValueError(f"Unsupported operator: {op_string}")
+        _check_value(value)
+        return self._copy(filters=(*self._filters, (field_path, op_string, value)))
+
+    def order_by(self, field_path: str, direction: str = "ASCENDING") -> "FakeQuery":
+        if direction not in ("ASCENDING", "DESCENDING"):
+            raise ValueError(f"Invalid direction: {direction}")
+        return self._copy(orders=(*self._orders, (field_path, direction)))
+
+    def limit(self, count: int) -> "FakeQuery":
+        return self._copy(limit=count)
+
+    def offset(self, num_to_skip: int) -> "FakeQuery":
+        return self._copy(offset=num_to_skip)
+
+    def start_after(self, document_fields_or_snapshot: Any) -> "FakeQuery":
+        return self._copy(cursor=document_fields_or_snapshot)
+
+    def select(self, field_paths: Iterable[str]) -> "FakeQuery":
+        return self._copy(projection=tuple(field_paths))
+
+    def recursive(self) -> "FakeQuery":
+        return self._copy(recursive=True)
+
+    def _effective_orders(self) -> list[tuple[str, str]]:
+        orders = list(self._orders)
+        if not orders:
+            # Firestore orders by the inequality field first when there is one
+            for field_path, op_string, _ in self._filters:
+                if op_string in _RANGE_OPS:
+                    orders.append((field_path, "ASCENDING"))
+                    break
+        if not any(field == "__name__" for field, _ in orders):
+            direction = orders[-1][1] if orders else "ASCENDING"
+            orders.append(("__name__", direction))
+        return orders
+
+    @staticmethod
+    def _value(doc_id: str, data: dict, field_path: str) -> Any:
+        return doc_id if field_path == "__name__" else _get_field(data, field_path)
+
+    def _matches(self, doc_id: str, data: dict) -> bool:
+        for field_path, op_string, expected in self._filters:
+            actual = self._value(doc_id, data, field_path)
+            if actual is _MISSING:
+                return False
+            if op_string == "array-contains":
+                if not isinstance(actual, list) or expected not in actual:
+                    return False
+                continue
+            if op_string == "array-contains-any":
+                if not isinstance(actual, list) or not any(v in actual for v in expected):
+                    return False
+                continue
+            key = _order_key(actual)
+            if op_string == "in":
+                if key not in [_order_key(v) for v in expected]:
+                    return False
+                continue
+            if op_string == "not-in":
+                if actual is None or key in [_order_key(v) for v in expected]:
+                    return False
+                continue
+            target = _order_key(expected)
+            if op_string == "==":
+                ok = key == target
+            elif op_string == "!=":
+                ok = actual is not None and key != target
+            elif key[0] != target[0]:
+                # Range filters only match values of the same type
+                ok = False
+            elif op_string == "<":
+                ok = key < target
+            elif op_string == "<=":
+                ok = key <= target
+            elif op_string == ">":
+                ok = key > target
+            else:
+                ok = key >= target
+            if not ok:
+                return False
+        return True
+
+    def _cursor_values(self, orders: list[tuple[str, str]]) -> list[tuple]:
+        cursor = self._cursor
+        if isinstance(cursor, FakeDocumentSnapshot):
+            return [
+                _order_key(self._value(cursor.id, cursor._data or {}, field))
+                for field, _ in orders
+            ]
+        values = []
+        for field, _ in orders:
+            if field not in cursor:
+                break
+            value = cursor[field]
+            if field == "__name__" and isinstance(value, FakeDocumentReference):
+                value = value.id
+            values.append(_order_key(value))
+        return values
+
+    def _run(self) -> list[FakeDocumentSnapshot]:
+        orders = self._effective_orders()
+        rows = []
+        # Stored documents are replaced on write, never changed in place, so
+        # they can be filtered uncopied; only the returned page is copied
+        documents = self._client._collection_documents(
+            self.path, copy_data=False, descendants=self._recursive
+        )
+        for reference, data, version in documents:
+            name = reference.path if self._recursive else reference.id
+            if not self._matches(name, data):
+                continue
+            key = [_order_key(self._value(name, data, f)) for f, _ in orders]
+            if any(self._value(name, data, f) is _MISSING for f, _ in orders):
+                # Ordering by a field excludes documents without it
+                continue
+            rows.append((key, reference, data, version))
+
+        def compare(a: list, b: list) -> int:
+            for (_, direction), x, y in zip(orders, a, b):
+                if x != y:
+                    result = -1 if x < y else 1
+                    return -result if direction == "DESCENDING" else result
+            return 0
+
+        rows.sort(key=functools.cmp_to_key(lambda a, b: compare(a[0], b[0])))
+        if self._cursor is not None:
+            cursor = self._cursor_values(orders)
+            rows = [row for row in rows if compare(row[0][: len(cursor)], cursor) > 0]
+        rows = rows[self._offset:]
+        if self._limit is not None:
+            rows = rows[: self._limit]
+
+        snapshots = []
+        for _, reference, data, version in rows:
+            data = copy.deepcopy(data)
+            if self._projection is not None:
+                data = {
+                    field: value
+                    for field in self._projection
+                    if (value := _get_field(data, field)) is not _MISSING
+                }
+            snapshots.append(FakeDocumentSnapshot(reference, data, version))
+        return snapshots
+
+    def stream(self, transaction=None):
+        self._client._round_trip()
+        snapshots = self._run()
+        if transaction is not None:
+            for snapshot in snapshots:
+                transaction._record_read(snapshot)
+        yield from snapshots
+
+    def get(self, transaction=None) -> list[FakeDocumentSnapshot]:
+        return list(self.stream(transaction=transaction))
+
+
+class FakeCollectionReference(FakeQuery):
+    """Reference to a fake collection (and the query over all of it)."""
+
+    def __init__(self, client: "FakeFirestore", path: str):
+        super().__init__(client, path)
+        self.id = path.rsplit("/", 1)[-1]
+
+    def document(self, document_id: Optional[str] = None) -> FakeDocumentReference:
+        return FakeDocumentReference(
+            self._client, f"{self.path}/{document_id or uuid.uuid4().hex}"
+        )
+
+    def list_documents(self, page_size: Optional[int] = None) -> list[FakeDocumentReference]:
+        """Every document, including missing ones that only have subcollections."""
+        self._client._round_trip()
+        prefix = f"{self.path}/"
+        with self._client._lock:
+            ids = dict.fromkeys(self._client._collections.get(self.path, {}))
+            for path, docs in self._client._collections.items():
+                if docs and path.startswith(prefix):
+                    ids.setdefault(path[len(prefix):].split("/", 1)[0])
+        return [self.document(doc_id) for doc_id in ids]
+
+    def _documents(self) -> list[FakeDocumentSnapshot]:
+        return [
+            FakeDocumentSnapshot(reference, data, version)
+            for reference, data, version in self._client._collection_documents(self.path)
+        ]
+
+    def on_snapshot(self, callback: Callable) -> "FakeWatch":
+        """Listen to this collection; the first call lists every document."""
+        watch = FakeWatch(self, callback)
+        self._client._watches.append(watch)
+        docs = self._documents()
+        callback(
+            docs,
+            [FakeDocumentChange(ChangeType.ADDED, doc) for doc in docs],
+            datetime.now(timezone.utc),
+        )
+        return watch
+
+
+class FakeWriteBatch:
+    """Writes applied together, with one round trip, on commit."""
+
+    def __init__(self, client: "FakeFirestore"):
+        self._client = client
+        self._writes: list[tuple] = []
+
+    def __len__(self) -> int:
+        return len(self._writes)
+
+    def _add(self, write: tuple) -> None:
+        if len(self._writes) >= MAX_BATCH_WRITES:
+            raise ValueError(f"A batch can contain at most {MAX_BATCH_WRITES} writes")
+        self._writes.append(write)
+
+    def create(self, reference: FakeDocumentReference, document_data: dict) -> None:
+        self._add(("create", reference, document_data, None))
+
+    def set(self, reference: FakeDocumentReference, document_data: dict, merge: bool = False) -> None:
+        self._add(("set", reference, document_data, merge))
+
+    def update(self, reference: FakeDocumentReference, field_updates: dict) -> None:
+        self._add(("update", reference, field_updates, None))
+
+    def delete(self, reference: FakeDocumentReference) -> None:
+        self._add(("delete", reference, None, None))
+
+    def commit(self) -> list:
+        self._client._round_trip()
+        writes, self._writes = self._writes, []
+        self._client._commit(writes)
+        return [None] * len(writes)
+
+
+class FakeTransaction(FakeWriteBatch):
+    """Transaction compatible with ``google.cloud.firestore.transactional``."""
+
+    _ids = itertools.count(1)
+
+    def __init__(self, client: "FakeFirestore", max_attempts: int = 5, read_only: bool = False):
+        super().__init__(client)
+        self._max_attempts = max_attempts
+        self._read_only = read_only
+        self._id: Optional[bytes] = None
+        self._reads: dict[str, int] = {}
+
+    @property
+    def in_progress(self) -> bool:
+        return self._id is not None
+
+    def _begin(self, retry_id: Optional[bytes] = None) -> None:
+        if self._id is not None:
+            raise ValueError("Transaction already in progress")
+        self._id = str(next(self._ids)).encode()
+
+    def _clean_up(self) -> None:
+        self._writes = []
+        self._reads = {}
+        self._id = None
+
+    def _rollback(self) -> None:
+        self._clean_up()
+
+    def _record_read(self, snapshot: FakeDocumentSnapshot) -> None:
+        self._reads.setdefault(snapshot.reference.path, snapshot._version)
+
+    def get(self, ref_or_query):
+        if isinstance(ref_or_query, FakeDocumentReference):
+            return iter([ref_or_query.get(transaction=self)])
+        return ref_or_query.stream(transaction=self)
+
+    def _commit(self) -> list:
+        if self._id is None:
+            raise ValueError("Transaction not in progress")
+        self._client._round_trip()
+        writes = self._writes
+        try:
+            self._client._commit(writes, expected_versions=self._reads)
+        finally:
+            self._clean_up()
+        return [None] * len(writes)
+
+    def commit(self) -> list:
+        return self._commit()
+
+
+class FakeDocumentChange:
+    """One entry of the ``changes`` list passed to snapshot listeners."""
+
+    def __init__(self, change_type: ChangeType, document: FakeDocumentSnapshot):
+        self.type = change_type
+        self.document = document
+
+
+class FakeWatch:
+    """Handle returned by ``on_snapshot``."""
+
+    def __init__(self, collection: FakeCollectionReference, callback: Callable):
+        self.collection = collection
+        self.callback = callback
+        self._known = {doc.id for doc in collection._documents()}
+
+    def unsubscribe(self) -> None:
+        watches = self.collection._client._watches
+        if self in watches:
+            watches.remove(self)
+
+    def _changed(self, document_id: str, data: Optional[dict]) -> None:
+        if data is None:
+            if document_id not in self._known:
+                return
+            self._known.discard(document_id)
+            change_type = ChangeType.REMOVED
+        elif document_id in self._known:
+            change_type = ChangeType.MODIFIED
+        else:
+            self._known.add(document_id)
+            change_type = ChangeType.ADDED
+
+        reference = self.collection.document(document_id)
+        change = FakeDocumentChange(change_type, FakeDocumentSnapshot(reference, data))
+        self.callback(
+            self.collection._documents(), [change], datetime.now(timezone.utc)
+        )
+
+
+class FakeFirestore:
+    """Dict-backed Firestore client with simulated round-trip latency."""
+
+    def __init__(self, latency: float = 0.0):
+        self.latency = latency
+        # collection path -> document id -> data
+        self._collections: dict[str, dict[str, dict[str, Any]]] = {}
+        self._versions: dict[str, int] = {}
+        self._create_times: dict[str, datetime] = {}
+        self._watches: list[FakeWatch] = []
+        self._lock = threading.RLock()
+        self._clock = itertools.count(1)
+
+    def _round_trip(self) -> None:
+        if self.latency:
+            time.sleep(self.latency)
+
+    def collection(self, name: str) -> FakeCollectionReference:
+        return FakeCollectionReference(self, name)
+
+    def document(self, path: str) -> FakeDocumentReference:
+        return FakeDocumentReference(self, path)
+
+    def batch(self) -> FakeWriteBatch:
+        return FakeWriteBatch(self)
+
+    def transaction(self, max_attempts: int = 5, read_only: bool = False) -> FakeTransaction:
+        return FakeTransaction(self, max_attempts=max_attempts, read_only=read_only)
+
+    def get_all(self, references: Iterable[FakeDocumentReference], transaction=None):
+        self._round_trip()
+        for reference in references:
+            snapshot = self._snapshot(reference)
+            if transaction is not None:
+                transaction._record_read(snapshot)
+            yield snapshot
+
+    def _snapshot(self, reference: FakeDocumentReference) -> FakeDocumentSnapshot:
+        collection_path, document_id = reference.path.rsplit("/", 1)
+        with self._lock:
+            data = self._collections.get(collection_path, {}).get(document_id)
+            return FakeDocumentSnapshot(
+                reference,
+                copy.deepcopy(data),
+                self._versions.get(reference.path, 0),
+            )
+
+    def _collection_documents(
+        self, path: str, copy_data: bool = True, descendants: bool = False
+    ) -> list[tuple[FakeDocumentReference, dict, int]]:
+        with self._lock:
+            paths = [path]
+            if descendants:
+                paths.extend(p for p in self._collections if p.startswith(f"{path}/"))
+            return [
+                (FakeDocumentReference(self, f"{collection_path}/{doc_id}"),
+                 copy.deepcopy(data) if copy_data else data,
+                 self._versions.get(f"{collection_path}/{doc_id}", 0))
+                for collection_path in paths
+                for doc_id, data in self._collections.get(collection_path, {}).items()
+            ]
+
+    def _write(self, path: str, data: Optional[dict]) -> None:
+        collection_path, document_id = path.rsplit("/", 1)
+        docs = self._collections.setdefault(collection_path, {})
+        if data is None:
+            docs.pop(document_id, None)
+            self._create_times.pop(path, None)
+        else:
+            docs[document_id] = data
+            self._create_times.setdefault(path, datetime.now(timezone.utc))
+        self._versions[path] = next(self._clock)
+
+    def _commit(self, writes: list[tuple], expected_versions: Optional[dict] = None) -> None:
+        """Apply writes atomically: validate everything first, then write."""
+        for kind, _, data, _ in writes:
+            if data is not None:
+                _check_value(data)
+
+        with self._lock:
+            for path, version in (expected_versions or {}).items():
+                if self._versions.get(path, 0) != version:
+                    raise Aborted(f"Transaction contention on {path}")
+
+            staged: dict[str, Optional[dict]] = {}
+
+            def current(path: str) -> Optional[dict]:
+                if path in staged:
+                    return staged[path]
+                collection_path, document_id = path.rsplit("/", 1)
+                return self._collections.get(collection_path, {}).get(document_id)
+
+            for kind, reference, data, merge in writes:
+                existing = current(reference.path)
+                if kind == "create":
+                    if existing is not None:
+                        raise AlreadyExists(f"Document already exists: {reference.path}")
+                    staged[reference.path] = _transformed(data, None)
+                elif kind == "set":
+                    if merge and existing is not None:
+                        merged = copy.deepcopy(existing)
+                        _merge(merged, data)
+                        staged[reference.path] = merged
+                    else:
+                        staged[reference.path] = _transformed(data, None)
+                elif kind == "update":
+                    if existing is None:
+                        raise KeyError(f"No document to update: {reference.path}")
+                    updated = copy.deepcopy(existing)
+                    for field_path, value in data.items():
+                        _set_path(updated, field_path, value)
+                    staged[reference.path] = updated
+                else:
+                    staged[reference.path] = None
+
+            for path, data in staged.items():
+                self._write(path, data)
+
+        for path in staged:
+            self._notify(path)
+
+    def _notify(self, path: str) -> None:
+        collection_path, document_id = path.rsplit("/", 1)
+        for watch in list(self._watches):
+            if watch.collection.path == collection_path:
+                data = self._collections.get(collection_path, {}).get(document_id)
+                watch._changed(document_id, copy.deepcopy(data))
+
+    def seed(self, path: str, data: dict) -> None:
+        """Write a document directly, without simulated latency or listeners."""
+        _check_value(data)
+        with self._lock:
+            self._write(path, _transformed(data, None))
+
+    def document_count(self) -> int:
+        """Total number of stored documents."""
+        return sum(len(docs) for docs in self._collections.values())
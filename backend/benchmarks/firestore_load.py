@@ -0,0 +1,86 @@
+"""
+Load benchmark for the async Firestore data-access layer.
+
+Fires N concurrent profile lookups against the in-memory Firestore stand-in
+(with simulated round-trip latency) and compares per-request latency when
+the blocking client is called directly on the event loop versus through
+``app.utils.firestore``.
+
+Usage:
+    python -m benchmarks.firestore_load [--concurrency 200] [--latency-ms 20]
+"""
+
+import argparse
+import asyncio
+import time
+from datetime import datetime
+
+from app.services import user_service
+from app.utils.firestore import get_firestore_executor
+from benchmarks.fake_firestore import FakeFirestore
+from benchmarks.stats import format_latency_row
+
+READS_PER_REQUEST = 3
+
+
+def _seed(db: FakeFirestore, users: int) -> None:
+    now = datetime.utcnow()
+    for i in range(users):
+        db.seed(f"users/user-{i}", {
+            "email": f"user-{i}@example.com",
+            "display_name": f"User {i}",
+            "fitness_level": "intermediate",
+            "goals": ["build_strength"],
+            "created_at": now,
+            "updated_at": now,
+        })
+
+
+async def _blocking_request(db: FakeFirestore, user_id: str) -> None:
+    """Pre-async behaviour: synchronous client calls inside the coroutine."""
+    for _ in range(READS_PER_REQUEST):
+        doc = db.collection("users").document(user_id).get()
+        user_service._doc_to_user_profile(doc, user_id)
+
+
+async def _async_request(db: FakeFirestore, user_id: str) -> None:
+    for _ in range(READS_PER_REQUEST):
+        await user_service.get_user_profile(user_id)
+
+
+async def _run(handler, db: FakeFirestore, concurrency: int) -> tuple[list[float], float]:
+    # All requests arrive at once, so latency is measured from the burst
+    # start: with a blocking client, later requests queue behind earlier ones.
+    latencies: list[float] = []
+    start = time.perf_counter()
+
+    async def one(i: int) -> None:
+        await handler(db, f"user-{i}")
+        latencies.append(time.perf_counter() - start)
+
+    await asyncio.gather(*(one(i) for i in range(concurrency)))
+    return latencies, time.perf_counter() - start
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("--concurrency", type=int, default=200)
+    parser.add_argument("--latency-ms", type=float, default=20.0)
+    args = parser.parse_args()
+
+    db = FakeFirestore(latency=args.latency_ms / 1000)
+    _seed(db, args.concurrency)
+    user_service.get_firestore_client = lambda: db
+
+    workers = get_firestore_executor()._max_workers
+    print(
+        f"{args.concurrency} concurrent requests, {READS_PER_REQUEST} reads each, "
+        f"{args.latency_ms:.0f} ms per round-trip, {workers} Firestore workers"
+    )
+    for name, handler in (("blocking", _blocking_request), ("executor", _async_request)):
+        latencies, wall = asyncio.run(_run(handler, db, args.concurrency))
+        print(f"{format_latency_row(name, latencies)}  wall={wall:.2f}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,87 @@
+"""
+Benchmark and equivalence check for the batch phase-prediction engine.
+
+Compares predict_phases against the previous implementation, which called
+calculate_current_phase (and built a full CycleInfo) once per day.
+
+Usage:
+    python -m benchmarks.phase_predictions [--repeat 50] [--skip-verify]
+"""
+
+import argparse
+import random
+import time
+from datetime import date, timedelta
+
+from app.utils.cycle_calculations import predict_phase_range
+from benchmarks import reference_cycle
+
+HISTORY_DEPTHS = (1, 12, 24)
+
+
+def verify(samples: int = 2000, seed: int = 7) -> None:
+    """Randomized check that the batch engine matches the per-day loop."""
+    rng = random.Random(seed)
+    today = date.today()
+    for _ in range(samples):
+        cycle_length = rng.randint(21, 45)
+        period_length = rng.randint(2, 10)
+        last_period = today - timedelta(days=rng.randint(-40, 400))
+        start = last_period - timedelta(days=rng.randint(-60, 24 * 45))
+        total_days = rng.randint(0, 400)
+
+        expected = reference_cycle.predict_phase_range(
+            last_period, start, total_days, cycle_length, period_length
+        )
+        actual = predict_phase_range(
+            last_period, start, total_days, cycle_length, period_length
+        )
+        assert [p.model_dump() for p in actual] == [p.model_dump() for p in expected], (
+            cycle_length, period_length, last_period, start, total_days
+        )
+    print(f"verified {samples} random ranges against the per-day loop")
+
+
+def _time(func, repeat: int) -> float:
+    start = time.perf_counter()
+    for _ in range(repeat):
+        func()
+    return (time.perf_counter() - start) / repeat
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("--repeat", type=int, default=50)
+    parser.add_argument("--skip-verify", action="store_true")
+    args = parser.parse_args()
+
+    if not args.skip_verify:
+        verify()
+
+    cycle_length, period_length = 28, 5
+    last_period = date.today() - timedelta(days=10)
+    for cycles in HISTORY_DEPTHS:
+        earliest = last_period - timedelta(days=cycle_length * (cycles - 1))
+        total_days = (date.today() - earliest).days + cycle_length
+
+        legacy = _time(
+            lambda: reference_cycle.predict_phase_range(
+                last_period, earliest, total_days, cycle_length, period_length
+            ),
+            args.repeat,
+        )
+        batch = _time(
+            lambda: predict_phase_range(
+                last_period, earliest, total_days, cycle_length, period_length
+            ),
+            args.repeat,
+        )
+        print(
+            f"{cycles:>2} cycles ({total_days:>3} days)  "
+            f"per-day={legacy * 1000:7.2f}ms  batch={batch * 1000:6.2f}ms  "
+            f"speedup={legacy / batch:5.1f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
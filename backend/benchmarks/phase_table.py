@@ -0,0 +1,77 @@
+"""
+Microbenchmark and equivalence check for the precomputed phase table.
+
+Checks calculate_current_phase against the original implementation for
+every valid cycle/period length, then times a single phase lookup and a
+full calculate_current_phase call with and without the table.
+
+Usage:
+    python -m benchmarks.phase_table [--number 200000]
+"""
+
+import argparse
+import timeit
+from datetime import date, timedelta
+
+from app.utils.cycle_calculations import (
+    MAX_CYCLE_LENGTH,
+    MAX_PERIOD_LENGTH,
+    MIN_CYCLE_LENGTH,
+    MIN_PERIOD_LENGTH,
+    _compute_phase_day,
+    calculate_current_phase,
+    phase_for_cycle_day,
+)
+from benchmarks import reference_cycle
+
+
+def verify() -> None:
+    """Exhaustive check over valid settings and a spread of offsets."""
+    today = date.today()
+    checked = 0
+    for cycle_length in range(MIN_CYCLE_LENGTH, MAX_CYCLE_LENGTH + 1):
+        for period_length in range(MIN_PERIOD_LENGTH, MAX_PERIOD_LENGTH + 1):
+            for offset in range(-10, 3 * cycle_length):
+                last_period = today - timedelta(days=offset)
+                assert calculate_current_phase(
+                    last_period, cycle_length, period_length
+                ) == reference_cycle.calculate_current_phase(
+                    last_period, cycle_length, period_length
+                ), (cycle_length, period_length, offset)
+                checked += 1
+    print(f"verified {checked} phase lookups against the original formula")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("--number", type=int, default=200000)
+    args = parser.parse_args()
+
+    verify()
+
+    last_period, reference_date = date(2026, 1, 3), date(2026, 2, 1)
+    cases = [
+        (
+            "phase lookup",
+            lambda: _compute_phase_day(17, 29, 6),
+            lambda: phase_for_cycle_day(17, 29, 6),
+        ),
+        (
+            "current phase",
+            lambda: reference_cycle.calculate_current_phase(
+                last_period, 29, 6, reference_date
+            ),
+            lambda: calculate_current_phase(last_period, 29, 6, reference_date),
+        ),
+    ]
+    for name, computed, table in cases:
+        before = timeit.timeit(computed, number=args.number) / args.number
+        after = timeit.timeit(table, number=args.number) / args.number
+        print(
+            f"{name:>13}  computed={before * 1e9:7.0f}ns  "
+            f"table={after * 1e9:7.0f}ns  speedup={before / after:4.1f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,93 @@
+"""
+Reference (pre-optimization) cycle calculations.
+
+Straight copies of the original per-call implementations, kept as an
+independent oracle for the equivalence checks in the cycle benchmarks.
+"""
+
+from datetime import date, timedelta
+from typing import Literal, Optional
+
+from app.models.cycle import CycleInfo, CyclePhase, PhasePrediction
+
+
+def calculate_current_phase(
+    last_period_start: date,
+    average_cycle_length: int = 28,
+    average_period_length: int = 5,
+    reference_date: Optional[date] = None,
+) -> CycleInfo:
+    today = reference_date or date.today()
+    days_since_start = (today - last_period_start).days
+    if days_since_start < 0:
+        days_since_start = 0
+
+    cycle_day = (days_since_start % average_cycle_length) + 1
+
+    menstrual_end = average_period_length
+    follicular_end = round(average_cycle_length * 0.46)
+    ovulatory_end = round(average_cycle_length * 0.57)
+
+    if cycle_day <= menstrual_end:
+        phase = CyclePhase.MENSTRUAL
+        days_until_next = menstrual_end - cycle_day + 1
+        next_phase = CyclePhase.FOLLICULAR
+    elif cycle_day <= follicular_end:
+        phase = CyclePhase.FOLLICULAR
+        days_until_next = follicular_end - cycle_day + 1
+        next_phase = CyclePhase.OVULATORY
+    elif cycle_day <= ovulatory_end:
+        phase = CyclePhase.OVULATORY
+        days_until_next = ovulatory_end - cycle_day + 1
+        next_phase = CyclePhase.LUTEAL
+    else:
+        phase = CyclePhase.LUTEAL
+        days_until_next = average_cycle_length - cycle_day + 1
+        next_phase = CyclePhase.MENSTRUAL
+
+    cycles_since_last_log = days_since_start // average_cycle_length
+    if cycles_since_last_log == 0:
+        confidence: Literal["high", "medium", "low"] = "high"
+    elif cycles_since_last_log <= 2:
+        confidence = "medium"
+    else:
+        confidence = "low"
+
+    return CycleInfo(
+        current_phase=phase,
+        cycle_day=cycle_day,
+        days_until_next_phase=days_until_next,
+        next_phase=next_phase,
+        confidence=confidence,
+        phase_display_name=phase.display_name,
+        phase_description=phase.description,
+        recommended_intensity=phase.recommended_intensity,
+    )
+
+
+def predict_phase_range(
+    last_period_start: date,
+    start_date: date,
+    total_days: int,
+    average_cycle_length: int = 28,
+    average_period_length: int = 5,
+) -> list[PhasePrediction]:
+    """The original predict_phases loop: one calculate_current_phase per day."""
+    predictions = []
+    for i in range(total_days):
+        target_date = start_date + timedelta(days=i)
+        cycle_info = calculate_current_phase(
+            last_period_start=last_period_start,
+            average_cycle_length=average_cycle_length,
+            average_period_length=average_period_length,
+            reference_date=target_date,
+        )
+        predictions.append(
+            PhasePrediction(
+                date=target_date,
+                predicted_phase=cycle_info.current_phase,
+                cycle_day=cycle_info.cycle_day,
+            )
+        )
+    return predictions
+
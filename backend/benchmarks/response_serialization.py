@@ -0,0 +1,330 @@
+"""
+Benchmark for response serialization on the hot read endpoints.
+
+Drives the app in-process over ASGI (auth overridden, services stubbed with
+in-memory data) and compares per-request CPU time of:
+- routes: the app's routes, which splice pre-serialized catalog summaries,
+  cached calendar JSON and encoded fallback messages into the body
+- models: the same handlers returning response models, serialized by
+  FastAPI's default pydantic-core path (what the routes did before)
+- orjson: the models handlers with ORJSONResponse as default_response_class
+
+First checks that every pre-serialized route returns the same bytes as its
+response model would.
+
+Usage:
+    python -m benchmarks.response_serialization [--requests 500]
+"""
+
+import argparse
+import asyncio
+import contextlib
+import io
+import time
+import warnings
+from datetime import date, datetime, timedelta
+from typing import Literal, Optional, Union
+
+from fastapi import APIRouter, FastAPI, Query, Request, Response
+from fastapi.responses import ORJSONResponse
+
+from app.main import app
+from app.middleware.auth import AuthenticatedUser, CurrentUser, get_current_user
+from app.models.cycle import (
+    CyclePredictionRunsResponse,
+    CyclePredictionsResponse,
+)
+from app.models.energy import EnergyHistoryResponse, EnergyLog
+from app.models.workout import (
+    CyclePhase,
+    IntensityLevel,
+    WorkoutCategory,
+    WorkoutDetailResponse,
+    WorkoutListResponse,
+)
+from app.routers import cycle, energy, health, metrics, recommendations, users, workouts
+from app.routers.recommendations import DailyRecommendationResponse, WorkoutRecommendation
+from app.services import cycle_service, energy_service, recommendation_service, workout_service
+from app.utils.cycle_calculations import prediction_window
+from app.utils.http_cache import (
+    CALENDAR_CACHE_CONTROL,
+    CATALOG_CACHE_CONTROL,
+    conditional_response,
+    make_etag,
+)
+from benchmarks.workout_catalog import synthetic_workouts
+
+TODAY = date(2026, 6, 1)
+LAST_PERIOD = TODAY - timedelta(days=10)
+
+
+async def _current_user() -> AuthenticatedUser:
+    return AuthenticatedUser(uid="bench-user", email=None, token_data={})
+
+
+def _stub_services() -> None:
+    with contextlib.redirect_stdout(io.StringIO()):
+        workout_service._replace_catalog(synthetic_workouts(1000), is_placeholder=False)
+
+    # A year of history before the last period, like a long-time user
+    start, total = prediction_window(LAST_PERIOD, 28, 5, TODAY - timedelta(days=365))
+    calendar = cycle_service._PhaseCalendar(
+        LAST_PERIOD, 28, 5, start, total + 30, LAST_PERIOD + timedelta(days=28)
+    )
+
+    async def get_calendar_version(user_id):
+        return (user_id, LAST_PERIOD, 28, 5, None, TODAY)
+
+    async def get_phase_calendar(user_id, days_ahead):
+        return calendar
+
+    logs = [
+        EnergyLog(
+            id=f"e{i}",
+            user_id="bench-user",
+            date=TODAY - timedelta(days=i),
+            score=1 + i % 10,
+            notes="felt ok",
+            created_at=datetime(2026, 1, 1),
+            updated_at=datetime(2026, 1, 1),
+        )
+        for i in range(90)
+    ]
+
+    async def get_energy_history(user_id, days=30):
+        return logs[:days]
+
+    async def get_daily_recommendations(user_id, phase, cycle_day, days_ahead=0):
+        workouts, _ = workout_service.get_workout_catalog().filter(limit=3)
+        return recommendation_service._get_fallback_recommendations(
+            phase,
+            [
+                {
+                    "id": w.id,
+                    "title": w.title,
+                    "category": w.category.value,
+                    "intensity": w.intensity.value,
+                }
+                for w in workouts
+            ],
+        )
+
+    cycle_service.get_calendar_version = get_calendar_version
+    cycle_service._get_phase_calendar = get_phase_calendar
+    energy_service.get_energy_history = get_energy_history
+    recommendation_service.get_daily_recommendations = get_daily_recommendations
+
+
+def _models_app(**kwargs) -> FastAPI:
+    """
+    The app with the hot routes as they were: handlers returning response models.
+
+    Middleware and the other routes are the app's; the handlers below are
+    matched first, which if anything flatters them slightly.
+    """
+    handlers = APIRouter(**kwargs)
+
+    @handlers.get("/api/v1/workouts", response_model=WorkoutListResponse)
+    async def get_workouts(
+        request: Request,
+        response: Response,
+        user: CurrentUser,
+        category: Optional[WorkoutCategory] = Query(default=None),
+        intensity: Optional[IntensityLevel] = Query(default=None),
+        phase: Optional[CyclePhase] = Query(default=None),
+        limit: int = Query(default=20, ge=1, le=50),
+        offset: int = Query(default=0, ge=0),
+    ):
+        etag = make_etag(
+            "workouts",
+            workout_service.get_workout_catalog().digest,
+            category,
+            intensity,
+            phase,
+            limit,
+            offset,
+        )
+        not_modified = conditional_response(request, response, etag, CATALOG_CACHE_CONTROL)
+        if not_modified is not None:
+            return not_modified
+        workouts, total = await workout_service.get_all_workouts(
+            category=category, intensity=intensity, phase=phase, limit=limit, offset=offset
+        )
+        return WorkoutListResponse(
+            workouts=workouts, total=total, has_more=(offset + len(workouts)) < total
+        )
+
+    @handlers.get("/api/v1/workouts/{workout_id}", response_model=WorkoutDetailResponse)
+    async def get_workout(request: Request, response: Response, user: CurrentUser, workout_id: str):
+        etag = make_etag("workout", workout_service.get_workout_catalog().digest, workout_id)
+        not_modified = conditional_response(request, response, etag, CATALOG_CACHE_CONTROL)
+        if not_modified is not None:
+            return not_modified
+        return WorkoutDetailResponse(workout=await workout_service.get_workout_by_id(workout_id))
+
+    @handlers.get(
+        "/api/v1/cycle/predictions",
+        response_model=Union[CyclePredictionsResponse, CyclePredictionRunsResponse],
+    )
+    async def get_cycle_predictions(
+        request: Request,
+        response: Response,
+        user: CurrentUser,
+        days: int = Query(default=30, ge=7, le=90),
+        response_format: Literal["days", "runs"] = Query(default="days", alias="format"),
+        since: Optional[date] = Query(default=None),
+    ):
+        version = await cycle_service.get_calendar_version(user.uid)
+        etag = make_etag("predictions", *version, days, response_format, since)
+        not_modified = conditional_response(request, response, etag, CALENDAR_CACHE_CONTROL)
+        if not_modified is not None:
+            return not_modified
+        if response_format == "runs":
+            runs, next_period = await cycle_service.get_cycle_prediction_runs(
+                user.uid, days_ahead=days, since=since
+            )
+            return CyclePredictionRunsResponse(runs=runs, next_period_start=next_period)
+        predictions, next_period = await cycle_service.get_cycle_predictions(
+            user.uid, days_ahead=days, since=since
+        )
+        return CyclePredictionsResponse(predictions=predictions, next_period_start=next_period)
+
+    @handlers.get(
+        "/api/v1/recommendations/phase/{phase}",
+        response_model=DailyRecommendationResponse,
+    )
+    async def get_phase_recommendations(
+        user: CurrentUser,
+        phase: str,
+        cycle_day: int = Query(default=1, ge=1, le=45),
+    ):
+        result = await recommendation_service.get_daily_recommendations(
+            user_id=user.uid, phase=phase, cycle_day=cycle_day
+        )
+        return DailyRecommendationResponse(
+            daily_message=result.daily_message,
+            recommendations=[
+                WorkoutRecommendation(
+                    workout_title=rec.get("workout_title", ""),
+                    workout_id=result.workout_ids[i] if i < len(result.workout_ids) else None,
+                    reason=rec.get("reason", ""),
+                )
+                for i, rec in enumerate(result.recommendations)
+            ],
+            self_care_tip=result.self_care_tip,
+            phase=phase,
+            cycle_day=cycle_day,
+        )
+
+    # Unchanged (already returns its response model); re-registered so the
+    # orjson variant applies to it too
+    handlers.add_api_route(
+        "/api/v1/energy/history",
+        energy.get_energy_history,
+        response_model=EnergyHistoryResponse,
+    )
+
+    models = FastAPI(middleware=app.user_middleware)
+    models.include_router(handlers)
+    for router in (health, metrics, users, cycle, energy, workouts, recommendations):
+        models.include_router(router.router)
+    models.dependency_overrides[get_current_user] = _current_user
+    return models
+
+
+async def _get(target: FastAPI, path: str, query: str = "") -> tuple[int, bytes]:
+    scope = {
+        "type": "http",
+        "method": "GET",
+        "path": path,
+        "raw_path": path.encode(),
+        "query_string": query.encode(),
+        "headers": [],
+        "http_version": "1.1",
+        "scheme": "http",
+        "server": ("bench", 80),
+        "client": ("bench", 1),
+        "root_path": "",
+        "app": target,
+    }
+    messages = []
+
+    async def receive():
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def send(message):
+        messages.append(message)
+
+    await target(scope, receive, send)
+    return messages[0]["status"], b"".join(m.get("body", b"") for m in messages[1:])
+
+
+CASES = [
+    ("/api/v1/workouts", "limit=50"),
+    ("/api/v1/workouts", "limit=50&offset=500"),
+    ("/api/v1/workouts/w7", ""),
+    ("/api/v1/cycle/predictions", ""),
+    ("/api/v1/cycle/predictions", f"since={TODAY}"),
+    ("/api/v1/cycle/predictions", "format=runs"),
+    ("/api/v1/cycle/predictions", f"format=runs&since={TODAY}"),
+    ("/api/v1/recommendations/phase/luteal", "cycle_day=20"),
+]
+
+TIMED = [
+    ("/api/v1/workouts", "limit=50"),
+    ("/api/v1/cycle/predictions", ""),
+    ("/api/v1/energy/history", "days=90"),
+]
+
+
+async def verify(models: FastAPI) -> None:
+    for path, query in CASES:
+        expected = await _get(models, path, query)
+        actual = await _get(app, path, query)
+        assert expected[0] == actual[0] == 200, (path, query, expected[0], actual[0])
+        assert actual[1] == expected[1], (path, query)
+    print(f"verified {len(CASES)} pre-serialized responses match the response models")
+
+
+async def _cpu_per_request(target: FastAPI, path: str, query: str, requests: int) -> float:
+    await _get(target, path, query)
+    started = time.process_time()
+    for _ in range(requests):
+        await _get(target, path, query)
+    return (time.process_time() - started) / requests
+
+
+async def run(requests: int) -> None:
+    app.dependency_overrides[get_current_user] = _current_user
+    _stub_services()
+    models = _models_app()
+    with warnings.catch_warnings():
+        # ORJSONResponse is deprecated in recent FastAPI releases
+        warnings.simplefilter("ignore")
+        orjson_models = _models_app(default_response_class=ORJSONResponse)
+
+    await verify(models)
+
+    print(f"\n{'endpoint':>44}  {'routes':>8}  {'models':>8}  {'orjson':>8}  {'bytes':>6}")
+    for path, query in TIMED:
+        _, body = await _get(app, path, query)
+        timings = [
+            await _cpu_per_request(target, path, query, requests)
+            for target in (app, models, orjson_models)
+        ]
+        print(
+            f"{path + '?' + query:>44}  "
+            + "  ".join(f"{t * 1e6:6.0f}us" for t in timings)
+            + f"  {len(body):>6}"
+        )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("--requests", type=int, default=500)
+    args = parser.parse_args()
+    asyncio.run(run(args.requests))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,24 @@
+"""
+Small statistics helpers shared by the benchmarks.
+"""
+
+import math
+
+
+def percentile(samples: list[float], pct: float) -> float:
+    """Nearest-rank percentile of a list of samples."""
+    if not samples:
+        return 0.0
+    ordered = sorted(samples)
+    rank = max(1, math.ceil(pct / 100 * len(ordered)))
+    return ordered[rank - 1]
+
+
+def format_latency_row(name: str, samples: list[float]) -> str:
+    """Format p50/p95/p99 of latency samples (in seconds) as milliseconds."""
+    return (
+        f"{name:>10}  "
+        f"p50={percentile(samples, 50) * 1000:8.1f}ms  "
+        f"p95={percentile(samples, 95) * 1000:8.1f}ms  "
+        f"p99={percentile(samples, 99) * 1000:8.1f}ms"
+    )
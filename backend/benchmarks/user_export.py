@@ -0,0 +1,251 @@
+"""
+Benchmark for the streaming data export (GET /api/v1/users/me/export).
+
+Seeds synthetic users with half and all of ``--years`` years of history (a period
+every 25-32 days, an energy log on ~70% of days, ~3 workouts a week) and
+downloads each as NDJSON and as a zip of CSVs through the app against the
+fake Firestore client. Reports time to first byte, total time, size and
+the most memory the app holds while streaming (tracemalloc, on a separate
+run so tracing doesn't skew the timings), which should not grow with
+history.
+
+Also checks that every document is exported in both formats, and that
+importing the NDJSON export into an empty profile rebuilds the same
+energy logs and cycle history.
+
+Usage:
+    python -m benchmarks.user_export [--years 10] [--latency-ms 5]
+"""
+
+import argparse
+import asyncio
+import csv
+import io
+import json
+import random
+import time
+import tracemalloc
+import zipfile
+from datetime import date, datetime, time as dt_time, timedelta
+from typing import Callable
+
+import httpx
+
+from app.main import app
+from app.middleware.auth import get_current_user
+from app.services import workout_service
+from app.utils.firestore import shutdown_firestore_executor
+from benchmarks.bulk_import import _seed_profile, _state
+from benchmarks.endpoints import USER_HEADER, _bench_user, _use_fake_firestore
+from benchmarks import fake_firestore
+from benchmarks.fake_firestore import FakeFirestore
+
+
+def _seed_history(db: FakeFirestore, uid: str, years: int, rng: random.Random) -> dict[str, int]:
+    """Seed a profile and ``years`` of history; returns documents per row type."""
+    _seed_profile(db, uid)
+    today = date.today()
+    first = today - timedelta(days=365 * years)
+    midnight = lambda day: datetime.combine(day, dt_time.min)
+
+    starts = []
+    start = first
+    while start <= today:
+        starts.append(start)
+        start += timedelta(days=rng.randint(25, 32))
+    for i, start in enumerate(starts):
+        end = starts[i + 1] if i + 1 < len(starts) else None
+        db.seed(f"users/{uid}/cycleData/c{i:04d}", {
+            "user_id": uid,
+            "start_date": midnight(start),
+            "end_date": midnight(end) if end else None,
+            "cycle_length": (end - start).days if end else None,
+            "notes": None,
+            "created_at": midnight(start),
+        })
+    db.document(f"users/{uid}").update({"last_period_start_date": midnight(starts[-1])})
+
+    energy = workouts = 0
+    for offset in range((today - first).days + 1):
+        day = first + timedelta(days=offset)
+        if rng.random() < 0.7:
+            db.seed(f"users/{uid}/energy_logs/{day.isoformat()}", {
+                "user_id": uid,
+                "date": midnight(day),
+                "score": rng.randint(1, 10),
+                "notes": None,
+                "updated_at": midnight(day),
+            })
+            energy += 1
+        if rng.random() < 3 / 7:
+            workout = rng.choice(workout_service.PLACEHOLDER_WORKOUTS)
+            db.seed(f"users/{uid}/workoutHistory/h{workouts:05d}", {
+                "user_id": uid,
+                "workout_id": workout.id,
+                "workout_title": workout.title,
+                "duration_minutes": workout.duration_minutes,
+                "completed_at": midnight(day) + timedelta(hours=18),
+                "calories_burned": workout.calories_estimate,
+                "notes": None,
+            })
+            workouts += 1
+
+    return {"profile": 1, "period": len(starts), "energy": energy, "workout": workouts}
+
+
+async def _stream(uid: str, export_format: str, on_chunk: Callable[[bytes], None]) -> None:
+    """
+    GET the export straight through the ASGI app, passing each body chunk
+    to ``on_chunk`` as it is sent (httpx's ASGI transport would buffer it).
+    """
+    scope = {
+        "type": "http",
+        "asgi": {"version": "3.0"},
+        "http_version": "1.1",
+        "method": "GET",
+        "scheme": "http",
+        "server": ("bench", 80),
+        "client": ("bench", 1234),
+        "root_path": "",
+        "path": "/api/v1/users/me/export",
+        "raw_path": b"/api/v1/users/me/export",
+        "query_string": f"format={export_format}".encode(),
+        "headers": [(USER_HEADER.encode(), uid.encode())],
+    }
+    done = asyncio.Event()
+
+    async def receive() -> dict:
+        await done.wait()
+        return {"type": "http.disconnect"}
+
+    async def send(message: dict) -> None:
+        if message["type"] == "http.response.start":
+            assert message["status"] == 200, message
+        elif message["type"] == "http.response.body":
+            if message.get("body"):
+                on_chunk(message["body"])
+            if not message.get("more_body"):
+                done.set()
+
+    await app(scope, receive, send)
+
+
+async def _download(uid: str, export_format: str) -> tuple[float, float, bytes]:
+    """(seconds to first byte, total seconds, body)"""
+    started = time.perf_counter()
+    first_byte = None
+    chunks = []
+
+    def on_chunk(chunk: bytes) -> None:
+        nonlocal first_byte
+        if first_byte is None:
+            first_byte = time.perf_counter() - started
+        chunks.append(chunk)
+
+    await _stream(uid, export_format, on_chunk)
+    return first_byte or 0.0, time.perf_counter() - started, b"".join(chunks)
+
+
+async def _held_memory(uid: str, export_format: str) -> int:
+    """
+    Most memory held by the app as any chunk is sent, with each chunk
+    discarded on arrival.
+
+    Allocations made in the fake client itself are left out: its queries
+    scan the whole collection, which Firestore does server-side. The
+    pages it returns are copied outside it, so they still count.
+    """
+    fake_client = tracemalloc.Filter(False, fake_firestore.__file__)
+    held = 0
+
+    def on_chunk(chunk: bytes) -> None:
+        nonlocal held
+        snapshot = tracemalloc.take_snapshot().filter_traces([fake_client])
+        held = max(held, sum(stat.size for stat in snapshot.statistics("filename")))
+
+    tracemalloc.start()
+    try:
+        await _stream(uid, export_format, on_chunk)
+    finally:
+        tracemalloc.stop()
+    return held
+
+
+def _counts(body: bytes, export_format: str) -> dict[str, int]:
+    """Exported rows per type."""
+    counts: dict[str, int] = {}
+    if export_format == "ndjson":
+        rows = [json.loads(line) for line in body.splitlines()]
+    else:
+        with zipfile.ZipFile(io.BytesIO(body)) as archive:
+            rows = [
+                row
+                for name in archive.namelist()
+                for row in csv.DictReader(io.TextIOWrapper(archive.open(name), "utf-8"))
+            ]
+    for row in rows:
+        counts[row["type"]] = counts.get(row["type"], 0) + 1
+    return counts
+
+
+async def run(args: argparse.Namespace) -> None:
+    db = FakeFirestore(latency=args.latency_ms / 1000)
+    _use_fake_firestore(db)
+    await workout_service.load_workout_catalog()
+    app.dependency_overrides[get_current_user] = _bench_user
+
+    rng = random.Random(args.seed)
+    # Both past a page per subcollection, so any growth in memory shows
+    sizes = (max(args.years // 2, 1), args.years)
+    users = {years: _seed_history(db, f"export-{years}y", years, rng) for years in sizes}
+    print(f"{args.latency_ms:g}ms Firestore round trip\n")
+    print(f"{'user':<6} {'format':<7} {'documents':>9} {'first byte':>11} {'total':>9} "
+          f"{'size':>10} {'held memory':>12}")
+
+    peaks: dict[str, list[int]] = {}
+    ndjson_body = b""
+    for years, expected in users.items():
+        uid = f"export-{years}y"
+        for export_format in ("ndjson", "csv"):
+            first_byte, total, body = await _download(uid, export_format)
+            held = await _held_memory(uid, export_format)
+            peaks.setdefault(export_format, []).append(held)
+            print(f"{years:>4}y  {export_format:<7} {sum(expected.values()):>9} "
+                  f"{first_byte * 1000:>9.1f}ms {total * 1000:>7.0f}ms "
+                  f"{len(body) / 1024:>8.0f}KB {held / 1024:>10.0f}KB")
+            assert _counts(body, export_format) == expected, (export_format, expected)
+            if export_format == "ndjson":
+                ndjson_body = body
+
+    # The largest export, imported into an empty profile
+    _seed_profile(db, "reimported")
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench", timeout=None) as http:
+        response = await http.post(
+            "/api/v1/users/me/import",
+            content=ndjson_body,
+            headers={USER_HEADER: "reimported", "content-type": "application/x-ndjson"},
+        )
+        response.raise_for_status()
+
+    print()
+    for export_format, (small, large) in peaks.items():
+        print(f"{export_format}: held memory {sizes[1]}y / {sizes[0]}y = {large / small:.2f}x")
+    print("verified every document is exported in both formats")
+    assert _state(db, "reimported") == _state(db, f"export-{args.years}y"), "re-import differs"
+    print("verified the NDJSON export re-imports to the same energy logs and cycles")
+
+    app.dependency_overrides.clear()
+    shutdown_firestore_executor()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("--years", type=int, default=10)
+    parser.add_argument("--latency-ms", type=float, default=5.0)
+    parser.add_argument("--seed", type=int, default=7)
+    asyncio.run(run(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,147 @@
+"""
+Benchmark for the indexed workout catalog.
+
+Builds synthetic libraries of 10k and 100k workouts, checks that
+WorkoutCatalog returns exactly what the original list scans returned for
+every filter combination, then times id lookups, filtered pages and deep
+paging with the scans vs. the catalog indexes.
+
+Usage:
+    python -m benchmarks.workout_catalog [--sizes 10000 100000] [--number 200]
+"""
+
+import argparse
+import itertools
+import random
+import time
+import timeit
+from typing import Optional
+
+from app.models.workout import (
+    CyclePhase,
+    IntensityLevel,
+    Workout,
+    WorkoutCategory,
+    WorkoutSummary,
+)
+from app.services.workout_catalog import WorkoutCatalog, _workout_to_summary
+
+
+def synthetic_workouts(count: int, seed: int = 7) -> list[Workout]:
+    """Random workouts with a realistic spread of categories and phases."""
+    rng = random.Random(seed)
+    phases = list(CyclePhase)
+    return [
+        Workout(
+            id=f"w{i}",
+            title=f"Workout {i}",
+            description="Synthetic benchmark workout.",
+            category=rng.choice(list(WorkoutCategory)),
+            duration_minutes=rng.randrange(10, 61, 5),
+            intensity=rng.choice(list(IntensityLevel)),
+            recommended_phases=rng.sample(phases, rng.randint(1, 2)),
+        )
+        for i in range(count)
+    ]
+
+
+def scan_filter(
+    workouts: list[Workout],
+    category: Optional[WorkoutCategory] = None,
+    intensity: Optional[IntensityLevel] = None,
+    phase: Optional[CyclePhase] = None,
+    limit: int = 20,
+    offset: int = 0,
+) -> tuple[list[WorkoutSummary], int]:
+    """The original get_all_workouts list scans."""
+    filtered = workouts
+    if category:
+        filtered = [w for w in filtered if w.category == category]
+    if intensity:
+        filtered = [w for w in filtered if w.intensity == intensity]
+    if phase:
+        filtered = [w for w in filtered if phase in w.recommended_phases]
+    total = len(filtered)
+    return [_workout_to_summary(w) for w in filtered[offset : offset + limit]], total
+
+
+def scan_get(workouts: list[Workout], workout_id: str) -> Optional[Workout]:
+    """The original get_workout_by_id linear scan."""
+    for workout in workouts:
+        if workout.id == workout_id:
+            return workout
+    return None
+
+
+def verify(workouts: list[Workout], catalog: WorkoutCatalog) -> None:
+    """Compare every filter combination at a few offsets."""
+    options = (
+        [None, *WorkoutCategory],
+        [None, *IntensityLevel],
+        [None, *CyclePhase],
+    )
+    checked = 0
+    for category, intensity, phase in itertools.product(*options):
+        for offset in (0, 7, len(workouts) // 3, len(workouts)):
+            expected = scan_filter(workouts, category, intensity, phase, 20, offset)
+            assert catalog.filter(category, intensity, phase, 20, offset) == expected, (
+                category, intensity, phase, offset
+            )
+            checked += 1
+    for workout in random.Random(1).sample(workouts, 100):
+        assert catalog.get(workout.id) is scan_get(workouts, workout.id)
+    assert catalog.get("missing") is None
+    print(f"verified {checked} filtered pages and 100 id lookups")
+
+
+def bench_size(size: int, number: int) -> None:
+    workouts = synthetic_workouts(size)
+    started = time.perf_counter()
+    catalog = WorkoutCatalog(workouts)
+    print(f"\n{size} workouts  (catalog built in {(time.perf_counter() - started) * 1000:.0f}ms)")
+    verify(workouts, catalog)
+
+    last_id = workouts[-1].id
+    cases = [
+        ("get by id", lambda: scan_get(workouts, last_id), lambda: catalog.get(last_id)),
+        (
+            "phase page",
+            lambda: scan_filter(workouts, phase=CyclePhase.LUTEAL),
+            lambda: catalog.filter(phase=CyclePhase.LUTEAL),
+        ),
+        (
+            "3-filter page",
+            lambda: scan_filter(
+                workouts, WorkoutCategory.YOGA, IntensityLevel.LOW, CyclePhase.MENSTRUAL
+            ),
+            lambda: catalog.filter(
+                WorkoutCategory.YOGA, IntensityLevel.LOW, CyclePhase.MENSTRUAL
+            ),
+        ),
+        (
+            "deep page",
+            lambda: scan_filter(workouts, phase=CyclePhase.OVULATORY, offset=size // 10),
+            lambda: catalog.filter(phase=CyclePhase.OVULATORY, offset=size // 10),
+        ),
+    ]
+    for name, scan, indexed in cases:
+        before = timeit.timeit(scan, number=number) / number
+        after = timeit.timeit(indexed, number=number) / number
+        print(
+            f"{name:>13}  scan={before * 1e6:9.1f}us  "
+            f"catalog={after * 1e6:7.1f}us  speedup={before / after:6.0f}x"
+        )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10000, 100000])
+    parser.add_argument("--number", type=int, default=200)
+    args = parser.parse_args()
+
+    for size in args.sizes:
+        bench_size(size, args.number)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,124 @@
+"""
+Shared fixtures: the services and API against the in-memory Firestore
+stand-in from benchmarks/fake_firestore.py.
+"""
+
+import json
+from datetime import datetime
+from types import SimpleNamespace
+
+import httpx
+import pytest
+import pytest_asyncio
+from fastapi import Request
+
+from app.main import app
+from app.middleware.auth import AuthenticatedUser, get_current_user
+from app.services import (
+    cycle_service,
+    energy_service,
+    export_service,
+    import_service,
+    recommendation_cache,
+    recommendation_service,
+    user_service,
+    workout_service,
+)
+from app.services.recommendation_cache import get_recommendation_cache
+from app.services.workout_catalog import WorkoutCatalog
+from benchmarks.fake_firestore import FakeFirestore
+from benchmarks.workout_catalog import synthetic_workouts
+
+USER_HEADER = "x-test-user"
+
+_FIRESTORE_MODULES = (
+    cycle_service,
+    energy_service,
+    export_service,
+    import_service,
+    recommendation_cache,
+    user_service,
+    workout_service,
+)
+
+
+@pytest.fixture
+def db(monkeypatch) -> FakeFirestore:
+    """A fresh fake Firestore used by every service."""
+    fake = FakeFirestore()
+    for module in _FIRESTORE_MODULES:
+        monkeypatch.setattr(module, "get_firestore_client", lambda: fake)
+    yield fake
+    cycle_service._get_calendar_cache().clear()
+
+
+@pytest.fixture
+def seed_profile(db):
+    """Seed a user profile with no cycles logged; returns its document."""
+
+    def seed(uid: str, **fields) -> dict:
+        now = datetime.utcnow()
+        data = {
+            "email": f"{uid}@example.com",
+            "goals": [],
+            "average_cycle_length": 28,
+            "average_period_length": 5,
+            "cycle_tracking_enabled": True,
+            "notifications_enabled": True,
+            "last_period_start_date": None,
+            "created_at": now,
+            "updated_at": now,
+            **fields,
+        }
+        db.seed(f"users/{uid}", data)
+        return data
+
+    return seed
+
+
+@pytest.fixture
+def catalog(monkeypatch) -> WorkoutCatalog:
+    """A 40-workout catalog in place of the process-wide one."""
+    loaded = WorkoutCatalog(synthetic_workouts(40))
+    monkeypatch.setattr(workout_service, "_catalog", loaded)
+    monkeypatch.setattr(workout_service, "_catalog_is_placeholder", False)
+    return loaded
+
+
+@pytest.fixture
+def claude(monkeypatch):
+    """A stub Claude; returns the list of prompts it was sent."""
+    prompts = []
+
+    async def create_message(**kwargs):
+        prompts.append(kwargs["messages"][0]["content"])
+        text = json.dumps({
+            "daily_message": "Stub message",
+            "recommendations": [],
+            "self_care_tip": "Stub tip",
+        })
+        return SimpleNamespace(
+            content=[SimpleNamespace(text=text)],
+            usage=SimpleNamespace(input_tokens=10, output_tokens=5),
+        )
+
+    monkeypatch.setattr(recommendation_service, "get_anthropic_client", lambda: object())
+    monkeypatch.setattr(recommendation_service, "create_message", create_message)
+    get_recommendation_cache.cache_clear()
+    yield prompts
+    get_recommendation_cache.cache_clear()
+
+
+async def _test_user(request: Request) -> AuthenticatedUser:
+    uid = request.headers[USER_HEADER]
+    return AuthenticatedUser(uid=uid, email=f"{uid}@example.com", token_data={})
+
+
+@pytest_asyncio.fixture
+async def client(db):
+    """An HTTP client for the app, authenticated by the x-test-user header."""
+    app.dependency_overrides[get_current_user] = _test_user
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://test") as http:
+        yield http
+    app.dependency_overrides.clear()
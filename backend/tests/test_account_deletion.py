@@ -0,0 +1,157 @@
+"""
+Tests for DELETE /users/me and the background purge of an account's data.
+"""
+
+import asyncio
+from datetime import datetime, timedelta
+
+import pytest
+
+from app.jobs import resume_account_deletions
+from app.services import user_service
+from tests.conftest import USER_HEADER
+
+HEADERS = {USER_HEADER: "alex"}
+
+# Documents under users/alex: nested subcollections at several depths, and
+# a subcollection under "missing", a document with no fields of its own
+NESTED = [
+    "cycleData/c1",
+    "cycleData/c2",
+    "cycleData/c1/symptoms/s1",
+    "cycleData/c1/symptoms/s2",
+    "energy_logs/2024-03-01",
+    "energy_logs/2024-03-01/readings/r1/samples/x1",
+    "energy_logs/2024-03-01/readings/r1/samples/x2",
+    "workoutHistory/missing/attachments/a1",
+    "preferences/settings",
+]
+
+
+def _paths_under(db, prefix: str) -> list[str]:
+    return sorted(
+        f"{path}/{doc_id}"
+        for path, docs in db._collections.items()
+        if path.startswith(prefix)
+        for doc_id in docs
+    )
+
+
+@pytest.fixture
+def account(db, seed_profile):
+    seed_profile("alex")
+    seed_profile("sam")
+    for path in NESTED:
+        db.seed(f"users/alex/{path}", {"value": 1})
+    db.seed("users/sam/cycleData/c1", {"value": 1})
+    db.seed("users/sam/cycleData/c1/symptoms/s1", {"value": 1})
+
+
+@pytest.mark.asyncio
+async def test_delete_purges_nested_subcollections(client, db, account):
+    response = await client.delete("/api/v1/users/me", headers=HEADERS)
+
+    assert response.status_code == 202
+    assert response.json()["status"] == "running"
+    assert response.headers["location"] == "/api/v1/users/me/deletion"
+    assert not db.document("users/alex").get().exists
+
+    await user_service.finish_purges(timeout=5)
+
+    assert _paths_under(db, "users/alex/") == []
+    deletion = (await client.get("/api/v1/users/me/deletion", headers=HEADERS)).json()
+    assert deletion["status"] == "completed"
+    assert deletion["documents_deleted"] == len(NESTED)
+    # Other accounts are untouched
+    assert _paths_under(db, "users/sam/") == [
+        "users/sam/cycleData/c1", "users/sam/cycleData/c1/symptoms/s1",
+    ]
+
+
+@pytest.mark.asyncio
+async def test_purge_deletes_pages_of_nested_documents(db, seed_profile, monkeypatch):
+    monkeypatch.setattr(user_service, "MAX_BATCH_WRITES", 4)
+    for k in range(10):
+        db.seed(f"users/alex/cycleData/c{k}", {"value": k})
+        for j in range(k % 4):
+            db.seed(f"users/alex/cycleData/c{k}/symptoms/s{j}", {"value": j})
+    seed_profile("alex")
+
+    await user_service.delete_user_profile("alex")
+    await user_service.finish_purges(timeout=5)
+
+    assert _paths_under(db, "users/alex/") == []
+    deletion = await user_service.get_account_deletion("alex")
+    assert (deletion.status, deletion.documents_deleted) == ("completed", 10 + 13)
+
+
+@pytest.mark.asyncio
+async def test_purge_makes_one_firestore_call_at_a_time(db, account, monkeypatch):
+    calls = []
+    in_flight = max_in_flight = 0
+
+    def tracked(name, func):
+        async def call(*args):
+            nonlocal in_flight, max_in_flight
+            calls.append(name)
+            in_flight += 1
+            max_in_flight = max(max_in_flight, in_flight)
+            try:
+                await asyncio.sleep(0.001)
+                return await func(*args)
+            finally:
+                in_flight -= 1
+        return call
+
+    for name in ("list_subcollections", "fetch_documents", "commit_batch", "update_document"):
+        monkeypatch.setattr(user_service, name, tracked(name, getattr(user_service, name)))
+
+    await user_service.delete_user_profile("alex")
+    await user_service.finish_purges(timeout=5)
+
+    assert max_in_flight == 1
+    # One listing for the account; nothing per deleted document
+    assert calls.count("list_subcollections") == 1
+    # cycleData, energy_logs, preferences and workoutHistory: one page each
+    assert calls.count("fetch_documents") == 4
+    deletion = await user_service.get_account_deletion("alex")
+    assert (deletion.status, deletion.documents_deleted) == ("completed", len(NESTED))
+
+
+@pytest.mark.asyncio
+async def test_delete_without_a_profile_is_404(client, db):
+    response = await client.delete("/api/v1/users/me", headers=HEADERS)
+    assert response.status_code == 404
+    assert (await client.get("/api/v1/users/me/deletion", headers=HEADERS)).status_code == 404
+
+
+@pytest.mark.asyncio
+async def test_failed_purge_is_resumed(db, account, monkeypatch):
+    commit_batch = user_service.commit_batch
+    commits = 0
+
+    async def failing_commit(batch):
+        nonlocal commits
+        commits += 1
+        if commits == 3:
+            raise RuntimeError("deadline exceeded")
+        await commit_batch(batch)
+
+    monkeypatch.setattr(user_service, "commit_batch", failing_commit)
+    await user_service.delete_user_profile("alex")
+    await user_service.finish_purges(timeout=5)
+
+    deletion = await user_service.get_account_deletion("alex")
+    assert (deletion.status, deletion.error) == ("failed", "deadline exceeded")
+    assert _paths_under(db, "users/alex/")
+
+    monkeypatch.setattr(user_service, "commit_batch", commit_batch)
+    monkeypatch.setattr(resume_account_deletions, "get_firestore_client", lambda: db)
+    db.document("accountDeletions/alex").update({
+        "updated_at": datetime.utcnow() - timedelta(hours=1),
+    })
+    assert await resume_account_deletions.run(stale_minutes=10, dry_run=False) == 1
+
+    assert _paths_under(db, "users/alex/") == []
+    deletion = await user_service.get_account_deletion("alex")
+    assert (deletion.status, deletion.documents_deleted) == ("completed", len(NESTED))
@@ -0,0 +1,175 @@
+"""
+Tests for the shared Anthropic client against a local stub Messages API.
+
+The stub is a threaded HTTP server on localhost; ANTHROPIC_BASE_URL points
+the client at it, so nothing leaves the machine.
+"""
+
+import asyncio
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import anthropic
+import pytest
+import pytest_asyncio
+
+from app.ai import client as ai_client
+from app.config.settings import get_settings
+from app.services import recommendation_service
+
+
+class _StubMessagesAPI(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self):
+        super().__init__(("127.0.0.1", 0), _StubHandler)
+        self.delay = 0.0
+        self.paths: list[str] = []
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self.lock = threading.Lock()
+
+    @property
+    def url(self) -> str:
+        return f"http://127.0.0.1:{self.server_address[1]}"
+
+
+class _StubHandler(BaseHTTPRequestHandler):
+    server: _StubMessagesAPI
+
+    def do_POST(self):
+        server = self.server
+        request = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+        with server.lock:
+            server.paths.append(self.path)
+            server.in_flight += 1
+            server.max_in_flight = max(server.max_in_flight, server.in_flight)
+        try:
+            time.sleep(server.delay)
+        finally:
+            with server.lock:
+                server.in_flight -= 1
+
+        body = json.dumps({
+            "id": "msg_stub",
+            "type": "message",
+            "role": "assistant",
+            "model": request["model"],
+            "content": [{"type": "text", "text": json.dumps({
+                "daily_message": "From the stub",
+                "recommendations": [],
+                "self_care_tip": "Rest",
+            })}],
+            "stop_reason": "end_turn",
+            "stop_sequence": None,
+            "usage": {"input_tokens": 10, "output_tokens": 5},
+        }).encode()
+        try:
+            self.send_response(200)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+        except (BrokenPipeError, ConnectionResetError):
+            # The client timed out and hung up
+            pass
+
+    def log_message(self, format, *args):
+        pass
+
+
+@pytest.fixture
+def stub_api():
+    server = _StubMessagesAPI()
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+@pytest_asyncio.fixture
+async def shared_client(stub_api, monkeypatch):
+    """Configure and start the shared client; returns a restart function."""
+
+    async def start(**settings):
+        await ai_client.close_anthropic_client()
+        monkeypatch.setenv("ANTHROPIC_API_KEY", "test-key")
+        monkeypatch.setenv("ANTHROPIC_BASE_URL", stub_api.url)
+        for name, value in settings.items():
+            monkeypatch.setenv(name.upper(), str(value))
+        get_settings.cache_clear()
+        return ai_client.init_anthropic_client()
+
+    yield start
+    await ai_client.close_anthropic_client()
+    monkeypatch.undo()
+    get_settings.cache_clear()
+
+
+def _message_kwargs() -> dict:
+    return {
+        "model": "claude-test",
+        "max_tokens": 64,
+        "messages": [{"role": "user", "content": "hello"}],
+    }
+
+
+@pytest.mark.asyncio
+async def test_requests_go_to_the_configured_base_url(stub_api, shared_client):
+    await shared_client()
+
+    message = await ai_client.create_message(**_message_kwargs())
+
+    assert stub_api.paths == ["/v1/messages"]
+    assert message.usage.output_tokens == 5
+    assert json.loads(message.content[0].text)["daily_message"] == "From the stub"
+
+
+@pytest.mark.asyncio
+async def test_timeout_falls_back(stub_api, shared_client):
+    await shared_client(anthropic_timeout_seconds=0.2, anthropic_max_retries=0)
+    stub_api.delay = 1.0
+
+    with pytest.raises(anthropic.APITimeoutError):
+        await ai_client.create_message(**_message_kwargs())
+
+    started = time.perf_counter()
+    result = await recommendation_service._generate_recommendations("luteal", "hello", [])
+    assert result is None  # served from FALLBACK_MESSAGES by the caller
+    assert time.perf_counter() - started < 0.9
+
+
+@pytest.mark.asyncio
+async def test_concurrency_is_capped(stub_api, shared_client):
+    await shared_client(anthropic_max_concurrency=2)
+    stub_api.delay = 0.1
+
+    await asyncio.gather(*(ai_client.create_message(**_message_kwargs()) for _ in range(6)))
+
+    assert len(stub_api.paths) == 6
+    assert stub_api.max_in_flight == 2
+
+
+@pytest.mark.asyncio
+async def test_waiting_for_a_slot_times_out_to_the_fallback(stub_api, shared_client):
+    await shared_client(anthropic_max_concurrency=1, anthropic_queue_timeout_seconds=0.1)
+    stub_api.delay = 0.5
+
+    holder = asyncio.create_task(ai_client.create_message(**_message_kwargs()))
+    await asyncio.sleep(0.05)
+
+    with pytest.raises(TimeoutError):
+        await ai_client.create_message(**_message_kwargs())
+    started = time.perf_counter()
+    result = await recommendation_service._generate_recommendations("luteal", "hello", [])
+    assert result is None  # served from FALLBACK_MESSAGES by the caller
+    assert time.perf_counter() - started < 0.3
+
+    await holder
+    # The timed-out waiters never took the slot, so it is free again
+    stub_api.delay = 0.0
+    await ai_client.create_message(**_message_kwargs())
+    assert len(stub_api.paths) == 2
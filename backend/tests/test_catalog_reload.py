@@ -0,0 +1,131 @@
+"""
+Tests for the Firestore-backed workout catalog and its snapshot-listener
+hot reload, against the fake Firestore client.
+"""
+
+import pytest
+import pytest_asyncio
+
+from app.models.workout import CyclePhase
+from app.services import workout_service
+from benchmarks.workout_catalog import synthetic_workouts
+
+
+def _document(workout) -> dict:
+    return workout.model_dump(exclude={"id"})
+
+
+@pytest.fixture(autouse=True)
+def fresh_catalog(monkeypatch):
+    """Start without a catalog, and leave the process-wide one as it was."""
+    monkeypatch.setattr(workout_service, "_catalog", None)
+    monkeypatch.setattr(workout_service, "_catalog_is_placeholder", True)
+    monkeypatch.setattr(workout_service, "_catalog_watch", None)
+    yield
+    workout_service.stop_workout_catalog_listener()
+
+
+@pytest_asyncio.fixture
+async def listening(db):
+    """A catalog of 20 workouts loaded from Firestore, with the listener running."""
+    workouts = synthetic_workouts(20)
+    for workout in workouts:
+        db.seed(f"workouts/{workout.id}", _document(workout))
+    await workout_service.load_workout_catalog()
+    workout_service.start_workout_catalog_listener()
+    return workouts
+
+
+@pytest.mark.asyncio
+async def test_empty_collection_falls_back_to_placeholders(db):
+    catalog = await workout_service.load_workout_catalog()
+    assert len(catalog) == len(workout_service.PLACEHOLDER_WORKOUTS)
+    workout_service.start_workout_catalog_listener()
+
+    workout = synthetic_workouts(1)[0]
+    db.collection("workouts").document("fs1").set(_document(workout))
+
+    workouts, total = await workout_service.get_all_workouts()
+    assert total == 1 and workouts[0].id == "fs1"
+    placeholder_id = workout_service.PLACEHOLDER_WORKOUTS[0].id
+    assert await workout_service.get_workout_by_id(placeholder_id) is None
+
+
+@pytest.mark.asyncio
+async def test_added_document_is_served(db, listening):
+    catalog = workout_service.get_workout_catalog()
+    version, digest = catalog.version, catalog.digest
+
+    added = synthetic_workouts(21)[20].model_copy(
+        update={"recommended_phases": [CyclePhase.LUTEAL]}
+    )
+    db.collection("workouts").document(added.id).set(_document(added))
+
+    assert (await workout_service.get_workout_by_id(added.id)).title == added.title
+    _, total = await workout_service.get_all_workouts(limit=100)
+    assert total == 21
+    recommended = await workout_service.get_recommended_workouts(CyclePhase.LUTEAL, limit=100)
+    assert added.id in {w.id for w in recommended}
+    assert catalog.version == version + 1
+    assert catalog.digest != digest
+
+
+@pytest.mark.asyncio
+async def test_modified_document_is_served(db, listening):
+    catalog = workout_service.get_workout_catalog()
+    version, digest = catalog.version, catalog.digest
+    original = listening[3]
+
+    db.collection("workouts").document(original.id).update({"title": "Renamed"})
+
+    assert (await workout_service.get_workout_by_id(original.id)).title == "Renamed"
+    assert catalog.version == version + 1
+    assert catalog.digest != digest
+
+    # The digest identifies content, so undoing the edit restores it
+    db.collection("workouts").document(original.id).update({"title": original.title})
+    assert catalog.version == version + 2
+    assert catalog.digest == digest
+
+
+@pytest.mark.asyncio
+async def test_removed_document_is_dropped(db, listening):
+    catalog = workout_service.get_workout_catalog()
+    version, digest = catalog.version, catalog.digest
+    removed = listening[5]
+
+    db.collection("workouts").document(removed.id).delete()
+
+    assert await workout_service.get_workout_by_id(removed.id) is None
+    workouts, total = await workout_service.get_all_workouts(limit=100)
+    assert total == 19 and removed.id not in {w.id for w in workouts}
+    for phase in removed.recommended_phases:
+        recommended = await workout_service.get_recommended_workouts(phase, limit=100)
+        assert removed.id not in {w.id for w in recommended}
+    assert catalog.version == version + 1
+    assert catalog.digest != digest
+
+
+@pytest.mark.asyncio
+async def test_unchanged_write_keeps_version(db, listening):
+    catalog = workout_service.get_workout_catalog()
+    version, digest = catalog.version, catalog.digest
+    workout = listening[0]
+
+    db.collection("workouts").document(workout.id).set(_document(workout))
+
+    assert (catalog.version, catalog.digest) == (version, digest)
+
+
+@pytest.mark.asyncio
+async def test_first_snapshot_drops_documents_deleted_after_load(db):
+    workouts = synthetic_workouts(5)
+    for workout in workouts:
+        db.seed(f"workouts/{workout.id}", _document(workout))
+    await workout_service.load_workout_catalog()
+
+    db.collection("workouts").document(workouts[0].id).delete()
+    workout_service.start_workout_catalog_listener()
+
+    assert await workout_service.get_workout_by_id(workouts[0].id) is None
+    assert len(workout_service.get_workout_catalog()) == 4
@@ -0,0 +1,203 @@
+"""
+Tests for the cycle stats summary (users/{uid}/cycleStats/summary) and
+GET /cycle/history, which is served from it.
+"""
+
+import random
+from datetime import date, datetime, timedelta
+
+import pytest
+import pytest_asyncio
+
+from app.jobs import backfill_cycle_stats
+from app.models.cycle import LogPeriodRequest, UpdateCycleRequest
+from app.services import cycle_service
+from app.utils import firestore as firestore_utils
+from benchmarks.cycle_stats import check_random_writes, random_write
+from tests.conftest import USER_HEADER
+
+FIRST = date(2025, 1, 6)
+# Completed lengths, oldest first: median 27, integer mean 28
+LENGTHS = (27, 32, 26)
+
+
+@pytest_asyncio.fixture
+async def tracked(seed_profile):
+    seed_profile("alex")
+    starts = [FIRST]
+    for length in LENGTHS:
+        starts.append(starts[-1] + timedelta(days=length))
+    await cycle_service.initialize_cycle_tracking("alex", starts)
+    return starts
+
+
+async def _history(client, uid: str = "alex", **params) -> dict:
+    response = await client.get(
+        "/api/v1/cycle/history", headers={USER_HEADER: uid}, params=params
+    )
+    assert response.status_code == 200
+    return response.json()
+
+
+def _page_summary(cycles: list) -> dict:
+    """Average and count as /cycle/history has always reported them."""
+    completed = [c.cycle_length for c in cycles if c.cycle_length is not None]
+    return {
+        "average_cycle_length": sum(completed) // len(completed) if completed else 28,
+        "total_cycles_logged": len(cycles),
+    }
+
+
+@pytest.mark.asyncio
+async def test_history_response(client, tracked):
+    body = await _history(client, limit=2)
+    for cycle in body["cycles"]:
+        assert cycle.pop("created_at")
+    assert body == {
+        "cycles": [
+            {
+                "id": body["cycles"][0]["id"],
+                "user_id": "alex",
+                "start_date": "2025-04-01",
+                "end_date": None,
+                "cycle_length": None,
+                "notes": "Initial data from onboarding",
+            },
+            {
+                "id": body["cycles"][1]["id"],
+                "user_id": "alex",
+                "start_date": "2025-03-06",
+                "end_date": "2025-04-01",
+                "cycle_length": 26,
+                "notes": "Initial data from onboarding",
+            },
+        ],
+        # Both describe the returned page, not the whole history
+        "average_cycle_length": 26,
+        "total_cycles_logged": 2,
+    }
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("limit,average,total", [(1, 28, 1), (3, 29, 3), (12, 28, 4)])
+async def test_history_average_and_count_cover_the_page(client, tracked, limit, average, total):
+    body = await _history(client, limit=limit)
+    assert [c["start_date"] for c in body["cycles"]] == [
+        start.isoformat() for start in reversed(tracked)
+    ][:limit]
+    assert (body["average_cycle_length"], body["total_cycles_logged"]) == (average, total)
+
+
+@pytest.mark.asyncio
+async def test_history_follows_cycle_writes(client, tracked):
+    newest = (await _history(client))["cycles"]
+
+    logged = LogPeriodRequest(start_date=tracked[-1] + timedelta(days=29))
+    await cycle_service.log_period("alex", logged)
+    body = await _history(client)
+    assert body["total_cycles_logged"] == 5
+    assert body["cycles"][1]["cycle_length"] == 29
+    assert body["average_cycle_length"] == (27 + 32 + 26 + 29) // 4
+
+    await cycle_service.update_cycle_entry(
+        "alex", newest[2]["id"], UpdateCycleRequest(notes="edited")
+    )
+    body = await _history(client)
+    assert body["cycles"][3]["notes"] == "edited"
+
+    await cycle_service.delete_cycle_entry("alex", newest[-1]["id"])
+    body = await _history(client)
+    assert body["total_cycles_logged"] == 4
+    assert newest[-1]["id"] not in {c["id"] for c in body["cycles"]}
+
+
+@pytest.mark.asyncio
+async def test_history_without_cycles(client, seed_profile):
+    seed_profile("alex")
+    assert await _history(client) == {
+        "cycles": [], "average_cycle_length": 28, "total_cycles_logged": 0,
+    }
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("seed", range(3))
+async def test_stats_match_a_rebuild_after_random_writes(db, monkeypatch, seed):
+    # check_random_writes points the backfill job at the fake too
+    monkeypatch.setattr(backfill_cycle_stats, "get_firestore_client", lambda: db)
+    await check_random_writes(db, operations=120, seed=seed)
+
+
+@pytest.mark.asyncio
+async def test_history_matches_the_cycle_query_after_random_writes(client, db, tracked):
+    rng = random.Random(11)
+    used = set(tracked)
+    for _ in range(60):
+        await random_write(db, "alex", rng, used)
+        for limit in (1, 5, 12, 24):
+            cycles = await cycle_service.get_cycle_history("alex", limit=limit)
+            body = await _history(client, limit=limit)
+            assert [c["id"] for c in body["cycles"]] == [c.id for c in cycles]
+            assert {k: body[k] for k in _page_summary(cycles)} == _page_summary(cycles)
+
+
+def _imported(first: date, count: int) -> dict:
+    return {first + timedelta(days=30 * k): None for k in range(count)}
+
+
+@pytest.mark.asyncio
+async def test_import_retries_over_a_concurrent_log_period(db, tracked, monkeypatch):
+    plan = cycle_service._plan_period_merge
+    raced = tracked[-1] + timedelta(days=28)
+    attempts = 0
+
+    def racing_plan(user_ref, docs, periods, now):
+        nonlocal attempts
+        attempts += 1
+        if attempts == 1:
+            # Another request logs a period, and rewrites the stats, mid-merge
+            db.seed("users/alex/cycleData/raced", {
+                "user_id": "alex",
+                "start_date": datetime.combine(raced, datetime.min.time()),
+                "end_date": None, "cycle_length": None, "notes": None, "created_at": None,
+            })
+            db.document("users/alex/cycleStats/summary").update({"count": len(tracked) + 1})
+        return plan(user_ref, docs, periods, now)
+
+    monkeypatch.setattr(cycle_service, "_plan_period_merge", racing_plan)
+    periods = _imported(FIRST - timedelta(days=300), 3)
+
+    assert await cycle_service.merge_imported_periods("alex", periods) == 3
+
+    assert attempts == 2
+    stats = await cycle_service.get_cycle_stats("alex")
+    assert stats.count == len(tracked) + 1 + 3
+    assert stats.recent[0].start_date == raced
+    profile = db.document("users/alex").get().to_dict()
+    assert profile["last_period_start_date"].date() == raced
+
+
+@pytest.mark.asyncio
+async def test_import_too_big_for_one_commit_drops_the_stats_first(db, tracked, monkeypatch):
+    monkeypatch.setattr(cycle_service, "MAX_BATCH_WRITES", 4)
+    monkeypatch.setattr("app.utils.firestore.MAX_BATCH_WRITES", 4)
+    commit_batch = firestore_utils.commit_batch
+    commits = 0
+
+    async def failing_commit(batch):
+        nonlocal commits
+        commits += 1
+        if commits == 2:
+            raise RuntimeError("deadline exceeded")
+        await commit_batch(batch)
+
+    monkeypatch.setattr(firestore_utils, "commit_batch", failing_commit)
+    periods = _imported(FIRST - timedelta(days=400), 10)
+
+    with pytest.raises(RuntimeError):
+        await cycle_service.merge_imported_periods("alex", periods)
+
+    # Half the cycles were written; the stats are rebuilt from them
+    assert not db.document("users/alex/cycleStats/summary").get().exists
+    stored = len(db._collections["users/alex/cycleData"])
+    assert len(tracked) < stored < len(tracked) + 10
+    assert (await cycle_service.get_cycle_stats("alex")).count == stored
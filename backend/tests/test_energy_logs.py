@@ -0,0 +1,191 @@
+"""
+Tests for date-keyed energy logs and the migration to them.
+"""
+
+from datetime import date, datetime, timedelta, timezone
+
+import pytest
+
+from app.jobs import migrate_energy_log_ids as migration
+from app.middleware import request_metrics
+from app.middleware.request_metrics import RequestStats
+from app.models.energy import LogEnergyRequest
+from app.services import energy_service
+from tests.conftest import USER_HEADER
+
+DAY = date(2026, 3, 14)
+# Firestore reads timestamps back as UTC-aware datetimes
+MIDNIGHT = datetime(2026, 3, 14, tzinfo=timezone.utc)
+EARLY = datetime(2026, 3, 14, 8, tzinfo=timezone.utc)
+LATE = datetime(2026, 3, 14, 20, tzinfo=timezone.utc)
+
+
+def _logs(db, uid: str = "alex"):
+    return db.collection("users").document(uid).collection("energy_logs")
+
+
+def _stored(db, uid: str = "alex") -> dict:
+    return {doc.id: doc.to_dict() for doc in _logs(db, uid).stream()}
+
+
+def _legacy(db, doc_id: str, **fields) -> None:
+    db.seed(f"users/alex/energy_logs/{doc_id}", {"user_id": "alex", "score": 5, **fields})
+
+
+@pytest.fixture
+def firestore_usage():
+    """Stats that Firestore calls made by the test body are counted in."""
+    stats = RequestStats()
+    token = request_metrics._request_stats.set(stats)
+    yield stats
+    request_metrics._request_stats.reset(token)
+
+
+@pytest.mark.asyncio
+async def test_relogging_a_day_keeps_created_at(db, firestore_usage):
+    first = await energy_service.log_energy("alex", LogEnergyRequest(date=DAY, score=4))
+    assert (firestore_usage.firestore_reads, firestore_usage.firestore_writes) == (0, 1)
+
+    second = await energy_service.log_energy(
+        "alex", LogEnergyRequest(date=DAY, score=8, notes="better")
+    )
+
+    # The refused create and the merge; nothing is read
+    assert firestore_usage.firestore_calls == 3
+    assert (firestore_usage.firestore_reads, firestore_usage.firestore_writes) == (0, 2)
+    assert second.id == first.id == "2026-03-14"
+    assert second.updated_at > first.updated_at
+    stored = await energy_service.get_energy_for_date("alex", DAY)
+    assert (stored.score, stored.notes) == (8, "better")
+    assert stored.created_at == first.created_at.replace(tzinfo=timezone.utc)
+    assert stored.updated_at == second.updated_at.replace(tzinfo=timezone.utc)
+    assert list(_stored(db)) == ["2026-03-14"]
+
+
+@pytest.mark.asyncio
+async def test_relogging_a_day_logged_without_created_at(db):
+    db.seed("users/alex/energy_logs/2026-03-14", {
+        "user_id": "alex", "date": MIDNIGHT, "score": 3, "notes": None, "updated_at": EARLY,
+    })
+
+    log = await energy_service.log_energy("alex", LogEnergyRequest(date=DAY, score=6))
+
+    stored = _stored(db)["2026-03-14"]
+    assert "created_at" not in stored
+    assert stored["score"] == 6
+    # Read back with updated_at standing in
+    assert (await energy_service.get_energy_for_date("alex", DAY)).created_at == (
+        log.updated_at.replace(tzinfo=timezone.utc)
+    )
+
+
+@pytest.mark.asyncio
+async def test_imported_logs_record_created_at(client, db, seed_profile):
+    seed_profile("alex")
+
+    response = await client.post(
+        "/api/v1/users/me/import",
+        content=b'{"type": "energy", "date": "2026-03-14", "score": 7}\n',
+        headers={USER_HEADER: "alex", "Content-Type": "application/x-ndjson"},
+    )
+
+    assert response.json()["energy_logs_imported"] == 1
+    stored = _stored(db)["2026-03-14"]
+    assert stored["created_at"] == stored["updated_at"]
+
+
+def test_plan_picks_newest_log_and_earliest_created_at(db):
+    _legacy(db, "a", date=MIDNIGHT, score=3, created_at=EARLY, updated_at=EARLY)
+    _legacy(db, "b", date="2026-03-14", score=7, created_at=LATE, updated_at=LATE)
+    _legacy(db, "c", date=DAY.isoformat(), score=5, created_at=EARLY + timedelta(hours=1))
+    _legacy(db, "d", date=datetime(2026, 3, 15, 13), score=9, created_at=LATE)
+
+    rewrites, skipped = migration.plan_user_migration(list(_logs(db).stream()))
+
+    assert skipped == 0
+    plans = {key: (data, sorted(doc.id for doc in legacy)) for key, data, legacy in rewrites}
+    assert set(plans) == {"2026-03-14", "2026-03-15"}
+
+    data, legacy = plans["2026-03-14"]
+    assert legacy == ["a", "b", "c"]
+    assert (data["score"], data["date"]) == (7, datetime(2026, 3, 14))
+    assert (data["created_at"], data["updated_at"]) == (EARLY, LATE)
+
+    data, legacy = plans["2026-03-15"]
+    assert legacy == ["d"]
+    # Normalized to midnight; created_at stands in for a missing updated_at
+    assert data["date"] == datetime(2026, 3, 15)
+    assert data["updated_at"] == LATE
+
+
+def test_plan_keeps_a_newer_date_keyed_log(db):
+    _legacy(db, "old", date=MIDNIGHT, score=3, created_at=EARLY, updated_at=EARLY)
+    _legacy(db, "2026-03-14", date=MIDNIGHT, score=8, created_at=LATE, updated_at=LATE)
+
+    (key, data, legacy), = migration.plan_user_migration(list(_logs(db).stream()))[0]
+
+    assert key == "2026-03-14"
+    assert [doc.id for doc in legacy] == ["old"]
+    assert (data["score"], data["created_at"]) == (8, EARLY)
+
+
+def test_plan_skips_migrated_and_unreadable_logs(db):
+    _legacy(db, "2026-03-14", date=MIDNIGHT, updated_at=EARLY)
+    _legacy(db, "bad", date="not a date", updated_at=EARLY)
+    _legacy(db, "missing", updated_at=EARLY)
+
+    assert migration.plan_user_migration(list(_logs(db).stream())) == ([], 2)
+
+
+@pytest.mark.asyncio
+async def test_migrate_user_rewrites_and_is_idempotent(db):
+    _legacy(db, "a", date=MIDNIGHT, score=3, created_at=EARLY, updated_at=EARLY)
+    _legacy(db, "b", date=MIDNIGHT, score=7, created_at=LATE, updated_at=LATE)
+    _legacy(db, "c", date=datetime(2026, 3, 15), score=9, created_at=LATE, updated_at=LATE)
+
+    stats = migration.MigrationStats()
+    await migration.migrate_user(db, "alex", False, stats)
+
+    assert stats.summary() == "users=1 migrated=2 duplicates_merged=1 unreadable=0"
+    stored = _stored(db)
+    assert set(stored) == {"2026-03-14", "2026-03-15"}
+    assert (stored["2026-03-14"]["score"], stored["2026-03-14"]["created_at"]) == (7, EARLY)
+    log = await energy_service.get_energy_for_date("alex", DAY)
+    assert (log.score, log.created_at, log.updated_at) == (7, EARLY, LATE)
+
+    again = migration.MigrationStats()
+    await migration.migrate_user(db, "alex", False, again)
+    assert again.users == 0
+    assert _stored(db) == stored
+
+
+@pytest.mark.asyncio
+async def test_migrate_user_dry_run_writes_nothing(db):
+    _legacy(db, "a", date=MIDNIGHT, updated_at=EARLY)
+    before = _stored(db)
+
+    stats = migration.MigrationStats()
+    await migration.migrate_user(db, "alex", True, stats)
+
+    assert (stats.users, stats.migrated) == (1, 1)
+    assert _stored(db) == before
+
+
+@pytest.mark.asyncio
+async def test_migration_keeps_an_upsert_made_after_planning(db, monkeypatch):
+    _legacy(db, "a", date=MIDNIGHT, score=3, created_at=EARLY, updated_at=EARLY)
+    fetch_documents = migration.fetch_documents
+
+    async def fetch_then_upsert(query):
+        docs = await fetch_documents(query)
+        # The app logs the same day between the job's read and its write
+        await energy_service.log_energy("alex", LogEnergyRequest(date=DAY, score=9))
+        return docs
+
+    monkeypatch.setattr(migration, "fetch_documents", fetch_then_upsert)
+    await migration.migrate_user(db, "alex", False, migration.MigrationStats())
+
+    stored = _stored(db)
+    assert list(stored) == ["2026-03-14"]
+    assert stored["2026-03-14"]["score"] == 9
+    assert stored["2026-03-14"]["created_at"] == EARLY
@@ -0,0 +1,168 @@
+"""
+Tests for GET /users/me/export: NDJSON and zipped CSV, read a page at a time.
+"""
+
+import csv
+import io
+import json
+import zipfile
+from datetime import date, datetime, timedelta
+
+import pytest
+
+from app.config.settings import get_settings
+from tests.conftest import USER_HEADER
+
+HEADERS = {USER_HEADER: "alex"}
+FIRST = date(2024, 1, 3)
+
+
+@pytest.fixture
+def page_size(monkeypatch):
+    """Pages of 3 documents, so every section spans several pages."""
+    monkeypatch.setenv("EXPORT_PAGE_SIZE", "3")
+    get_settings.cache_clear()
+    yield 3
+    monkeypatch.undo()
+    get_settings.cache_clear()
+
+
+def _midnight(day: date) -> datetime:
+    return datetime.combine(day, datetime.min.time())
+
+
+@pytest.fixture
+def history(db, seed_profile, catalog):
+    """7 cycles, 6 energy logs (two full pages) and 4 workouts."""
+    seed_profile("alex", goals=["build_strength", "reduce_stress"], display_name="Alex")
+    starts = [FIRST + timedelta(days=29 * k) for k in range(7)]
+    for k, start in enumerate(starts):
+        last = k == len(starts) - 1
+        db.seed(f"users/alex/cycleData/c{k}", {
+            "user_id": "alex",
+            "start_date": _midnight(start),
+            # A cycle ends on the day the next one starts
+            "end_date": None if last else _midnight(starts[k + 1]),
+            "cycle_length": None if last else 29,
+            "notes": "heavy,\n\"crampy\"" if k == 2 else None,
+            "created_at": _midnight(start),
+        })
+    for k in range(6):
+        day = FIRST + timedelta(days=k)
+        db.seed(f"users/alex/energy_logs/{day.isoformat()}", {
+            "user_id": "alex",
+            "date": _midnight(day),
+            "score": k + 3,
+            "notes": None,
+            "created_at": _midnight(day),
+            "updated_at": _midnight(day),
+        })
+    workout = catalog.workouts[0]
+    for k in range(4):
+        db.seed(f"users/alex/workoutHistory/h{k}", {
+            "user_id": "alex",
+            "workout_id": workout.id,
+            "workout_title": workout.title,
+            "completed_at": datetime(2024, 2, 1 + k, 18, 30),
+            "duration_minutes": 30,
+            "calories_burned": 200,
+            "notes": None,
+        })
+
+
+def _ndjson(response) -> list[dict]:
+    return [json.loads(line) for line in response.text.splitlines()]
+
+
+def _history(rows: list[dict]) -> list[tuple]:
+    """Exported logs without IDs and bookkeeping timestamps."""
+    return sorted(
+        (row["type"], row.get("date") or row.get("start_date") or row["completed_at"],
+         row.get("end_date"), row.get("score"), row.get("notes"))
+        for row in rows[1:]
+    )
+
+
+@pytest.mark.asyncio
+async def test_ndjson_export_holds_every_document(client, history, page_size):
+    response = await client.get("/api/v1/users/me/export", headers=HEADERS)
+
+    assert response.status_code == 200
+    assert response.headers["content-type"] == "application/x-ndjson"
+    rows = _ndjson(response)
+    profile, rows = rows[0], rows[1:]
+    assert (profile["type"], profile["id"], profile["display_name"]) == ("profile", "alex", "Alex")
+    assert profile["goals"] == ["build_strength", "reduce_stress"]
+
+    assert [(row["type"], row["id"]) for row in rows] == (
+        [("period", f"c{k}") for k in range(7)]
+        + [("energy", (FIRST + timedelta(days=k)).isoformat()) for k in range(6)]
+        + [("workout", f"h{k}") for k in range(4)]
+    )
+    # Midnight timestamps are exported as dates, other timestamps in full
+    assert rows[0]["start_date"] == "2024-01-03"
+    assert rows[0]["end_date"] == "2024-02-01"
+    assert rows[2]["notes"] == "heavy,\n\"crampy\""
+    assert rows[7] == {
+        "type": "energy", "id": "2024-01-03", "date": "2024-01-03", "score": 3,
+        "notes": None, "created_at": "2024-01-03T00:00:00+00:00",
+        "updated_at": "2024-01-03T00:00:00+00:00",
+    }
+    assert rows[-1]["completed_at"] == "2024-02-04T18:30:00+00:00"
+
+
+@pytest.mark.asyncio
+async def test_csv_export_is_a_zip_of_sections(client, history, page_size):
+    response = await client.get(
+        "/api/v1/users/me/export", headers=HEADERS, params={"format": "csv"}
+    )
+
+    assert response.status_code == 200
+    assert response.headers["content-type"] == "application/zip"
+    archive = zipfile.ZipFile(io.BytesIO(response.content))
+    assert archive.testzip() is None
+    assert archive.namelist() == ["profile.csv", "cycles.csv", "energy_logs.csv", "workouts.csv"]
+
+    def read(name: str) -> list[dict]:
+        return list(csv.DictReader(io.StringIO(archive.read(name).decode())))
+
+    (profile,) = read("profile.csv")
+    assert profile["goals"] == "build_strength;reduce_stress"
+    assert profile["timezone"] == ""
+
+    cycles = read("cycles.csv")
+    assert [row["id"] for row in cycles] == [f"c{k}" for k in range(7)]
+    assert cycles[2]["notes"] == "heavy,\n\"crampy\""
+    assert (cycles[6]["end_date"], cycles[6]["cycle_length"]) == ("", "")
+
+    energy = read("energy_logs.csv")
+    assert list(energy[0]) == ["type", "id", "date", "score", "notes", "created_at", "updated_at"]
+    assert [row["score"] for row in energy] == [str(k + 3) for k in range(6)]
+    assert len(read("workouts.csv")) == 4
+
+
+@pytest.mark.asyncio
+async def test_export_can_be_imported_again(client, db, history, seed_profile):
+    exported = await client.get("/api/v1/users/me/export", headers=HEADERS)
+    seed_profile("sam")
+
+    response = await client.post(
+        "/api/v1/users/me/import",
+        content=exported.content,
+        headers={USER_HEADER: "sam", "Content-Type": "application/x-ndjson"},
+    )
+
+    result = response.json()
+    assert (result["periods_imported"], result["energy_logs_imported"]) == (7, 6)
+    assert result["workouts_imported"] == 4
+    # Only the profile line isn't an importable row
+    assert [error["line"] for error in result["errors"]] == [1]
+
+    again = await client.get("/api/v1/users/me/export", headers={USER_HEADER: "sam"})
+    assert _history(_ndjson(again)) == _history(_ndjson(exported))
+
+
+@pytest.mark.asyncio
+async def test_export_without_a_profile_is_404(client):
+    response = await client.get("/api/v1/users/me/export", headers=HEADERS)
+    assert response.status_code == 404
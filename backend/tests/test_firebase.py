@@ -0,0 +1,65 @@
+"""
+Tests for the ID token signing certificate prefetch.
+
+The HTTP layer under the Admin SDK's certificate fetch is replaced, so
+these run offline, and fail if a firebase-admin or google-auth release
+stops fetching certificates when verifying a token with valid claims.
+"""
+
+import json
+
+import firebase_admin
+import pytest
+import requests
+from firebase_admin import auth, credentials
+from google.auth.credentials import AnonymousCredentials
+
+from app.config import firebase
+
+CERT_URL = "https://www.googleapis.com/robot/v1/metadata/x509/securetoken@system.gserviceaccount.com"
+
+
+class _AnonymousCredential(credentials.Base):
+    def get_credential(self):
+        return AnonymousCredentials()
+
+
+@pytest.fixture
+def firebase_app(monkeypatch):
+    monkeypatch.delenv("FIREBASE_AUTH_EMULATOR_HOST", raising=False)
+    app = firebase_admin.initialize_app(_AnonymousCredential(), {"projectId": "demo-project"})
+    yield app
+    firebase_admin.delete_app(app)
+
+
+def _serve_certificates(monkeypatch, status: int) -> list[str]:
+    """Answer every HTTP request with ``status``; returns the URLs requested."""
+    fetched = []
+
+    def send(adapter, request, *args, **kwargs):
+        fetched.append(request.url)
+        response = requests.Response()
+        response.status_code = status
+        response._content = json.dumps({"other-key": "not a certificate"}).encode()
+        response.headers["Content-Type"] = "application/json"
+        response.url = request.url
+        response.request = request
+        return response
+
+    monkeypatch.setattr(requests.adapters.HTTPAdapter, "send", send)
+    return fetched
+
+
+def test_prefetch_fetches_the_signing_certificates(firebase_app, monkeypatch):
+    fetched = _serve_certificates(monkeypatch, 200)
+
+    firebase.prefetch_token_certificates()
+
+    assert fetched == [CERT_URL]
+
+
+def test_prefetch_reports_a_failed_fetch(firebase_app, monkeypatch):
+    _serve_certificates(monkeypatch, 500)
+
+    with pytest.raises(auth.CertificateFetchError):
+        firebase.prefetch_token_certificates()
@@ -0,0 +1,88 @@
+"""
+Tests for ETag / If-None-Match on the catalog and calendar routes.
+"""
+
+from datetime import date, timedelta
+
+import pytest
+import pytest_asyncio
+
+from app.models.cycle import LogPeriodRequest
+from app.services import cycle_service
+from tests.conftest import USER_HEADER
+
+HEADERS = {USER_HEADER: "alex"}
+
+
+async def _revalidate(client, path: str, etag: str, **params):
+    headers = {**HEADERS, "If-None-Match": etag}
+    return await client.get(path, headers=headers, params=params or None)
+
+
+@pytest_asyncio.fixture
+async def tracked(seed_profile):
+    seed_profile("alex")
+    first = date.today() - timedelta(days=80)
+    await cycle_service.initialize_cycle_tracking(
+        "alex", [first + timedelta(days=28 * k) for k in range(3)]
+    )
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("path", [
+    "/api/v1/workouts",
+    "/api/v1/workouts/recommended?phase=luteal",
+    "/api/v1/workouts/w3",
+])
+async def test_catalog_routes_return_304_until_the_catalog_changes(client, catalog, path):
+    first = await client.get(path, headers=HEADERS)
+    assert first.status_code == 200
+    etag = first.headers["etag"]
+    assert first.headers["cache-control"] == "private, max-age=60"
+
+    unchanged = await _revalidate(client, path, etag)
+    assert unchanged.status_code == 304
+    assert unchanged.content == b""
+    assert unchanged.headers["etag"] == etag
+
+    # Weak and listed validators match too
+    assert (await _revalidate(client, path, f'"other", W/{etag}')).status_code == 304
+    assert (await _revalidate(client, path, "*")).status_code == 304
+    assert (await _revalidate(client, path, '"other"')).status_code == 200
+
+    catalog.apply_changes([catalog.get("w3").model_copy(update={"title": "Renamed"})])
+    changed = await _revalidate(client, path, etag)
+    assert changed.status_code == 200
+    assert changed.headers["etag"] != etag
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("response_format", ["days", "runs"])
+async def test_predictions_return_304_until_a_cycle_write(client, tracked, response_format):
+    path = "/api/v1/cycle/predictions"
+    params = {"format": response_format}
+    first = await client.get(path, headers=HEADERS, params=params)
+    assert first.status_code == 200
+    etag = first.headers["etag"]
+    assert first.headers["cache-control"] == "private, no-cache"
+
+    unchanged = await _revalidate(client, path, etag, **params)
+    assert unchanged.status_code == 304
+    assert unchanged.content == b""
+
+    # Other parameters are other representations
+    assert (await _revalidate(client, path, etag, format=response_format, days=60)).status_code == 200
+
+    await cycle_service.log_period("alex", LogPeriodRequest(start_date=date.today()))
+    changed = await _revalidate(client, path, etag, **params)
+    assert changed.status_code == 200
+    assert changed.headers["etag"] != etag
+    assert changed.json() != first.json()
+
+
+@pytest.mark.asyncio
+async def test_predictions_without_a_logged_period_are_404(client, seed_profile):
+    seed_profile("alex")
+    response = await client.get("/api/v1/cycle/predictions", headers=HEADERS)
+    assert response.status_code == 404
+    assert "etag" not in response.headers
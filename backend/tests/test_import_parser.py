@@ -0,0 +1,174 @@
+"""
+Tests for the streaming NDJSON / CSV parser behind POST /users/me/import.
+"""
+
+import pytest
+
+from app.services import import_service
+from app.services.import_service import ImportFormatError, _RowError
+from tests.conftest import USER_HEADER
+
+BOM = "﻿".encode()
+LIMIT = import_service._MAX_LINE_CHARS
+
+
+async def _chunks(data: bytes, size: int):
+    for start in range(0, len(data), size):
+        yield data[start:start + size]
+
+
+async def _collect(rows) -> list:
+    return [row async for row in rows]
+
+
+async def _lines(data: bytes, size: int = 4096) -> list[tuple[int, str]]:
+    return await _collect(import_service._iter_lines(_chunks(data, size)))
+
+
+async def _csv(data: bytes, size: int = 4096) -> list[tuple[int, object]]:
+    return await _collect(import_service._csv_rows(import_service._iter_lines(_chunks(data, size))))
+
+
+def _errors(rows) -> list[tuple[int, str]]:
+    return [(line, str(row)) for line, row in rows if isinstance(row, _RowError)]
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("size", [1, 2, 3, 5, 4096])
+async def test_lines_survive_any_chunking(size):
+    data = BOM + "café,1\r\n\n漢字\nlast".encode()
+
+    assert await _lines(data, size) == [
+        (1, "café,1"), (2, ""), (3, "漢字"), (4, "last"),
+    ]
+
+
+@pytest.mark.asyncio
+async def test_byte_order_mark_is_dropped_only_at_the_start():
+    lines = await _lines(BOM + b"a\n" + BOM + b"b\n")
+    assert lines == [(1, "a"), (2, "﻿b")]
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("size", [1, 7, 4096])
+async def test_invalid_utf8_reports_its_line(size):
+    data = b"ok\nfine\nbad \xff byte\nnever read\n"
+
+    lines = []
+    with pytest.raises(ImportFormatError) as error:
+        async for line in import_service._iter_lines(_chunks(data, size)):
+            lines.append(line)
+
+    assert lines == [(1, "ok"), (2, "fine")]
+    assert (error.value.line, str(error.value)) == (3, "not valid UTF-8")
+
+
+@pytest.mark.asyncio
+async def test_truncated_multibyte_character_at_the_end_is_invalid():
+    with pytest.raises(ImportFormatError, match="not valid UTF-8"):
+        await _lines("ok\ncafé".encode()[:-1])
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("size", [1000, LIMIT * 4])
+async def test_line_over_the_limit_is_refused(size):
+    data = b"short\n" + b"x" * (LIMIT + 1) + b"\nafter\n"
+
+    with pytest.raises(ImportFormatError) as error:
+        await _lines(data, size)
+
+    assert (error.value.line, str(error.value)) == (2, "line is too long")
+
+
+@pytest.mark.asyncio
+async def test_line_at_the_limit_is_accepted():
+    assert await _lines(b"x" * LIMIT + b"\n") == [(1, "x" * LIMIT)]
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("size", [1, 4, 4096])
+async def test_csv_multi_line_quoted_fields(size):
+    data = (
+        BOM
+        + b'type,date,score,notes\r\n'
+        + b'energy,2024-03-01,7,"first line\r\nsecond, with a comma\r\n""quoted"""\r\n'
+        + b'energy,2024-03-02,5,\r\n'
+        + b'\r\n'
+        + b'energy,2024-03-03,6,"one line"\r\n'
+    )
+
+    assert await _csv(data, size) == [
+        (2, {
+            "type": "energy", "date": "2024-03-01", "score": "7",
+            "notes": 'first line\nsecond, with a comma\n"quoted"',
+        }),
+        # Empty cells are left out
+        (5, {"type": "energy", "date": "2024-03-02", "score": "5"}),
+        (7, {"type": "energy", "date": "2024-03-03", "score": "6", "notes": "one line"}),
+    ]
+
+
+@pytest.mark.asyncio
+async def test_csv_column_count_mismatch_is_a_row_error():
+    rows = await _csv(b'type,date,score\nenergy,2024-03-01\nenergy,2024-03-02,"4,5",x\n')
+    assert _errors(rows) == [(2, "expected 3 columns, got 2"), (3, "expected 3 columns, got 4")]
+
+
+@pytest.mark.asyncio
+async def test_csv_unterminated_quote_stops_the_upload():
+    with pytest.raises(ImportFormatError) as error:
+        await _csv(b'type,notes\nenergy,ok\nenergy,"never closed\nmore\n')
+    assert (error.value.line, str(error.value)) == (3, "unterminated quoted field")
+
+
+@pytest.mark.asyncio
+async def test_csv_quoted_field_over_the_limit_is_refused():
+    # Every line is short, but the quoted field spans 70k characters
+    data = b'type,notes\nenergy,"' + (b"y" * 1000 + b"\n") * 70
+
+    with pytest.raises(ImportFormatError) as error:
+        await _csv(data)
+
+    assert (error.value.line, str(error.value)) == (2, "row is too long")
+
+
+@pytest.mark.asyncio
+async def test_ndjson_bad_lines_are_row_errors():
+    data = BOM + b'{"type": "energy"}\n\n{oops\n[1, 2]\n'
+    rows = await _collect(import_service._ndjson_rows(import_service._iter_lines(_chunks(data, 3))))
+
+    assert rows[0] == (1, {"type": "energy"})
+    assert _errors(rows)[0][0] == 3
+    assert rows[2] == (4, [1, 2])
+
+
+@pytest.mark.asyncio
+async def test_import_keeps_rows_before_an_unreadable_line(client, seed_profile, db):
+    seed_profile("alex")
+    body = (
+        BOM
+        + b'type,date,score,notes\n'
+        + b'energy,2024-03-01,7,"slept\nwell"\n'
+        + b'energy,2024-03-02,11,\n'
+        + b'energy,2024-03-03,\xff,\n'
+        + b'energy,2024-03-04,5,\n'
+    )
+
+    response = await client.post(
+        "/api/v1/users/me/import",
+        content=body,
+        headers={USER_HEADER: "alex", "Content-Type": "text/csv"},
+    )
+
+    assert response.status_code == 200
+    result = response.json()
+    assert result["energy_logs_imported"] == 1
+    assert result["rows_rejected"] == 1
+    assert result["complete"] is False
+    assert [error["line"] for error in result["errors"]] == [4, 5]
+    assert result["errors"][1]["message"] == "not valid UTF-8"
+
+    logs = db.collection("users").document("alex").collection("energy_logs")
+    assert {doc.id: doc.to_dict()["notes"] for doc in logs.stream()} == {
+        "2024-03-01": "slept\nwell",
+    }
@@ -0,0 +1,50 @@
+"""
+Tests for access to the /metrics endpoint.
+"""
+
+import pytest
+
+from app.config.settings import get_settings
+
+TOKEN = "scrape-secret"
+
+
+@pytest.fixture
+def metrics_token(monkeypatch):
+    def use(token: str) -> None:
+        monkeypatch.setenv("METRICS_TOKEN", token)
+        get_settings.cache_clear()
+
+    yield use
+    monkeypatch.undo()
+    get_settings.cache_clear()
+
+
+@pytest.mark.asyncio
+async def test_not_served_without_a_configured_token(client):
+    response = await client.get("/metrics", headers={"Authorization": "Bearer "})
+    assert response.status_code == 404
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("authorization", [None, "Bearer wrong", f"Basic {TOKEN}", TOKEN])
+async def test_refused_without_the_token(client, metrics_token, authorization):
+    metrics_token(TOKEN)
+    headers = {"Authorization": authorization} if authorization else {}
+
+    response = await client.get("/metrics", headers=headers)
+
+    assert response.status_code == 401
+    assert response.headers["www-authenticate"] == "Bearer"
+    assert "http_request" not in response.text
+
+
+@pytest.mark.asyncio
+async def test_served_with_the_token(client, metrics_token):
+    metrics_token(TOKEN)
+
+    response = await client.get("/metrics", headers={"Authorization": f"Bearer {TOKEN}"})
+
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/plain; version=0.0.4")
+    assert "# TYPE" in response.text
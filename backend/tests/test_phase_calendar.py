@@ -0,0 +1,71 @@
+"""
+Tests for the per-user phase calendar cache (cycle_service._get_phase_calendar).
+"""
+
+from datetime import date, timedelta
+
+import pytest
+import pytest_asyncio
+
+from app.models.cycle import UpdateCycleRequest
+from app.services import cycle_service
+
+
+def _cycle_id(db, uid: str, start: date) -> str:
+    for cycle_id, data in db._collections[f"users/{uid}/cycleData"].items():
+        if data["start_date"].date() == start:
+            return cycle_id
+    raise KeyError(start)
+
+
+@pytest_asyncio.fixture
+async def history(db, seed_profile):
+    """A user with four cycles of 28 days, the last one open."""
+    seed_profile("alex")
+    first = date.today() - timedelta(days=100)
+    starts = [first + timedelta(days=28 * k) for k in range(4)]
+    await cycle_service.initialize_cycle_tracking("alex", starts)
+    return starts
+
+
+@pytest.mark.asyncio
+async def test_calendar_is_cached(history):
+    first = await cycle_service._get_phase_calendar("alex", 30)
+    assert first.start_date == history[0]
+    assert await cycle_service._get_phase_calendar("alex", 30) is first
+
+
+@pytest.mark.asyncio
+async def test_cycle_write_replaces_cached_calendar(db, history):
+    await cycle_service._get_phase_calendar("alex", 30)
+
+    await cycle_service.delete_cycle_entry("alex", _cycle_id(db, "alex", history[0]))
+
+    calendar = await cycle_service._get_phase_calendar("alex", 30)
+    assert calendar.start_date == history[1]
+
+
+@pytest.mark.asyncio
+async def test_write_on_another_instance_replaces_cached_calendar(db, history, monkeypatch):
+    await cycle_service._get_phase_calendar("alex", 30)
+
+    # Another instance deletes the oldest cycle: this one's cache isn't
+    # told, and the averages and last period (all 28 days) don't change
+    monkeypatch.setattr(cycle_service, "invalidate_phase_calendar", lambda user_id: None)
+    await cycle_service.delete_cycle_entry("alex", _cycle_id(db, "alex", history[0]))
+
+    calendar = await cycle_service._get_phase_calendar("alex", 30)
+    assert calendar.start_date == history[1]
+
+
+@pytest.mark.asyncio
+async def test_calendar_fingerprint_matches_etag_inputs(db, history, monkeypatch):
+    calendar = await cycle_service._get_phase_calendar("alex", 30)
+    version = await cycle_service.get_calendar_version("alex")
+
+    monkeypatch.setattr(cycle_service, "invalidate_phase_calendar", lambda user_id: None)
+    cycle_id = _cycle_id(db, "alex", history[1])
+    await cycle_service.update_cycle_entry("alex", cycle_id, UpdateCycleRequest(notes="edited"))
+
+    assert await cycle_service.get_calendar_version("alex") != version
+    assert await cycle_service._get_phase_calendar("alex", 30) is not calendar
@@ -0,0 +1,86 @@
+"""
+Property tests: predict_phase_range and predict_phase_runs give the same
+calendar as the original per-day calculate_current_phase loop (kept in
+benchmarks/reference_cycle.py), for every valid cycle configuration.
+"""
+
+import random
+from datetime import date, timedelta
+
+import pytest
+
+from app.models.cycle import PhasePrediction
+from app.utils.cycle_calculations import (
+    MAX_CYCLE_LENGTH,
+    MAX_PERIOD_LENGTH,
+    MIN_CYCLE_LENGTH,
+    MIN_PERIOD_LENGTH,
+    predict_phase_range,
+    predict_phase_runs,
+)
+from benchmarks import reference_cycle
+
+CYCLE_LENGTHS = range(MIN_CYCLE_LENGTH, MAX_CYCLE_LENGTH + 1)
+PERIOD_LENGTHS = range(MIN_PERIOD_LENGTH, MAX_PERIOD_LENGTH + 1)
+SAMPLES = 8
+
+
+def _expand(runs) -> list[PhasePrediction]:
+    """The day-by-day calendar a list of PhaseRuns stands for."""
+    return [
+        PhasePrediction(
+            date=run.start_date + timedelta(days=n),
+            predicted_phase=run.phase,
+            cycle_day=run.start_cycle_day + n * run.cycle_day_step,
+        )
+        for run in runs
+        for n in range(run.length)
+    ]
+
+
+def _ranges(cycle_length: int, period_length: int):
+    """Random (last_period, start, total_days), half starting before last_period."""
+    rng = random.Random(cycle_length * 100 + period_length)
+    today = date(2026, 10, 17)
+    for sample in range(SAMPLES):
+        last_period = today - timedelta(days=rng.randint(-40, 400))
+        if sample % 2:
+            start = last_period - timedelta(days=rng.randint(1, 24 * cycle_length))
+        else:
+            start = last_period + timedelta(days=rng.randint(0, 3 * cycle_length))
+        yield last_period, start, rng.randint(0, 400)
+
+
+@pytest.mark.parametrize("period_length", PERIOD_LENGTHS)
+@pytest.mark.parametrize("cycle_length", CYCLE_LENGTHS)
+def test_range_matches_per_day_loop(cycle_length, period_length):
+    for last_period, start, total_days in _ranges(cycle_length, period_length):
+        expected = reference_cycle.predict_phase_range(
+            last_period, start, total_days, cycle_length, period_length
+        )
+        actual = predict_phase_range(
+            last_period, start, total_days, cycle_length, period_length
+        )
+        assert actual == expected, (last_period, start, total_days)
+
+
+@pytest.mark.parametrize("period_length", PERIOD_LENGTHS)
+@pytest.mark.parametrize("cycle_length", CYCLE_LENGTHS)
+def test_runs_match_per_day_loop(cycle_length, period_length):
+    for last_period, start, total_days in _ranges(cycle_length, period_length):
+        expected = reference_cycle.predict_phase_range(
+            last_period, start, total_days, cycle_length, period_length
+        )
+        runs = predict_phase_runs(
+            last_period, start, total_days, cycle_length, period_length
+        )
+        assert _expand(runs) == expected, (last_period, start, total_days)
+        # Runs are contiguous, each starting the day after the previous ends
+        for previous, run in zip(runs, runs[1:]):
+            assert run.start_date == previous.start_date + timedelta(days=previous.length)
+
+
+def test_range_before_last_period_is_cycle_day_one():
+    last_period = date(2026, 3, 1)
+    predictions = predict_phase_range(last_period, last_period - timedelta(days=10), 12, 28, 5)
+    assert [p.cycle_day for p in predictions] == [1] * 11 + [2]
@@ -0,0 +1,137 @@
+"""
+Tests for the nightly recommendation pre-generation job.
+"""
+
+import argparse
+from datetime import datetime, timedelta
+
+import pytest
+
+from app.config.settings import get_settings
+from app.jobs import pregenerate_recommendations
+from app.services import recommendation_service, workout_service
+from benchmarks.workout_catalog import synthetic_workouts
+from tests.conftest import USER_HEADER
+
+
+@pytest.fixture
+def cache_backend(monkeypatch):
+    def use(backend: str) -> None:
+        monkeypatch.setenv("RECOMMENDATION_CACHE_BACKEND", backend)
+        get_settings.cache_clear()
+
+    yield use
+    monkeypatch.undo()
+    get_settings.cache_clear()
+
+
+def test_refuses_to_run_without_a_shared_cache(cache_backend, monkeypatch, capsys):
+    cache_backend("memory")
+    monkeypatch.setattr("sys.argv", ["pregenerate_recommendations"])
+    started = []
+    monkeypatch.setattr(pregenerate_recommendations, "initialize_firebase", lambda: started.append(1))
+
+    with pytest.raises(SystemExit) as exit_info:
+        pregenerate_recommendations.main()
+
+    assert exit_info.value.code == 1
+    assert started == []
+    assert "RECOMMENDATION_CACHE_BACKEND" in capsys.readouterr().out
+
+
+@pytest.fixture
+def tracking_users(seed_profile):
+    """Two users whose prompts differ only in fitness level."""
+    last_period = datetime.combine(datetime.utcnow().date(), datetime.min.time()) - timedelta(days=20)
+    for uid, level in (("kim", "advanced"), ("sam", "beginner")):
+        seed_profile(uid, fitness_level=level, last_period_start_date=last_period)
+
+
+async def _run(checkpoint) -> pregenerate_recommendations.JobStats:
+    return await pregenerate_recommendations.run(
+        days_ahead=0, concurrency=2, rate=0, page_size=10, checkpoint_path=str(checkpoint)
+    )
+
+
+@pytest.mark.asyncio
+async def test_fallback_results_count_as_failed(tracking_users, catalog, claude, monkeypatch, tmp_path):
+    create_message = recommendation_service.create_message
+
+    async def failing_for_advanced(**kwargs):
+        if "Fitness level: advanced" in kwargs["messages"][0]["content"]:
+            raise RuntimeError("overloaded")
+        return await create_message(**kwargs)
+
+    monkeypatch.setattr(recommendation_service, "create_message", failing_for_advanced)
+
+    stats = await _run(tmp_path / "checkpoint.json")
+
+    assert (stats.users, stats.failed, stats.skipped, stats.tokens) == (1, 1, 0, 15)
+    assert stats.users_this_run == 1
+
+
+@pytest.fixture
+def job_clients(monkeypatch):
+    """Stand-ins for the Firebase and Claude setup done by the job's entry point."""
+    monkeypatch.setattr(pregenerate_recommendations, "initialize_firebase", lambda: None)
+    monkeypatch.setattr(pregenerate_recommendations, "init_anthropic_client", lambda: object())
+
+    async def close():
+        pass
+
+    monkeypatch.setattr(pregenerate_recommendations, "close_anthropic_client", close)
+    # Leave the process-wide catalog as it was
+    monkeypatch.setattr(workout_service, "_catalog", None)
+    monkeypatch.setattr(workout_service, "_catalog_is_placeholder", True)
+
+
+def _args(tmp_path) -> argparse.Namespace:
+    return argparse.Namespace(
+        days_ahead=0, concurrency=2, rate=0, page_size=10,
+        checkpoint=str(tmp_path / "checkpoint.json"),
+    )
+
+
+@pytest.mark.asyncio
+async def test_pregenerated_recommendations_are_served(
+    client, db, tracking_users, job_clients, claude, cache_backend, monkeypatch, tmp_path
+):
+    cache_backend("firestore")
+    for workout in synthetic_workouts(40):
+        db.seed(f"workouts/{workout.id}", workout.model_dump(exclude={"id"}))
+
+    stats = await pregenerate_recommendations._run_with_clients(_args(tmp_path))
+    assert (stats.users, stats.failed) == (2, 0)
+    assert len(claude) == 2
+
+    # The API process loads the catalog at startup too
+    monkeypatch.setattr(workout_service, "_catalog", None)
+    await workout_service.load_workout_catalog()
+    history_reads = []
+    get_workout_history = workout_service.get_workout_history
+
+    async def counted(user_id, *args, **kwargs):
+        history_reads.append(user_id)
+        return await get_workout_history(user_id, *args, **kwargs)
+
+    monkeypatch.setattr(workout_service, "get_workout_history", counted)
+    for uid in ("kim", "sam"):
+        response = await client.get("/api/v1/recommendations/today", headers={USER_HEADER: uid})
+        assert response.status_code == 200
+        assert response.json()["daily_message"] == "Stub message"
+
+    # Served from the users' pointers: no new Claude call, no inputs re-read
+    assert len(claude) == 2
+    assert history_reads == []
+
+
+@pytest.mark.asyncio
+async def test_refuses_to_pregenerate_against_the_placeholder_catalog(
+    db, tracking_users, job_clients, claude, tmp_path, capsys
+):
+    with pytest.raises(SystemExit) as exit_info:
+        await pregenerate_recommendations._run_with_clients(_args(tmp_path))
+
+    assert exit_info.value.code == 1
+    assert claude == []
+    assert "no workouts" in capsys.readouterr().out
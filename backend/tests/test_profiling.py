@@ -0,0 +1,171 @@
+"""
+Tests for the opt-in request profiler.
+
+pyinstrument is replaced by a stub, so these run without it installed.
+"""
+
+import asyncio
+import importlib.machinery
+import re
+import sys
+import types
+
+import httpx
+import pytest
+import pytest_asyncio
+
+from app.config.settings import get_settings
+from app.middleware import profiling
+from app.middleware.profiling import ProfilingMiddleware, _profile_filename
+
+TOKEN = "profile-secret"
+
+
+def test_profile_filenames_are_unique_within_a_second():
+    scope = {"path": "/api/v1/cycle/predictions", "method": "GET"}
+
+    names = {_profile_filename(scope) for _ in range(100)}
+
+    assert len(names) == 100
+    for name in names:
+        assert re.fullmatch(
+            r"\d{8}T\d{6}\.\d{3}-GET-api-v1-cycle-predictions-[0-9a-f]{6}\.speedscope\.json", name
+        ), name
+
+
+def test_profile_filename_for_root():
+    assert "-GET-root-" in _profile_filename({"path": "/", "method": "GET"})
+
+
+class _StubProfiler:
+    """Records its lifecycle in place of pyinstrument.Profiler."""
+
+    instances: list["_StubProfiler"] = []
+
+    def __init__(self, interval, async_mode):
+        self.interval = interval
+        self.events = []
+        _StubProfiler.instances.append(self)
+
+    def start(self):
+        self.events.append("start")
+
+    def stop(self):
+        self.events.append("stop")
+
+    def output(self, renderer):
+        return f'{{"renderer": "{type(renderer).__name__}"}}'
+
+
+class _StubRenderer:
+    pass
+
+
+@pytest.fixture
+def settings(monkeypatch, tmp_path):
+    """Profiling settings writing to tmp_path, with pyinstrument stubbed out."""
+    pyinstrument = types.ModuleType("pyinstrument")
+    pyinstrument.__spec__ = importlib.machinery.ModuleSpec("pyinstrument", None)
+    pyinstrument.Profiler = _StubProfiler
+    renderers = types.ModuleType("pyinstrument.renderers")
+    renderers.SpeedscopeRenderer = _StubRenderer
+    monkeypatch.setitem(sys.modules, "pyinstrument", pyinstrument)
+    monkeypatch.setitem(sys.modules, "pyinstrument.renderers", renderers)
+    monkeypatch.setattr(_StubProfiler, "instances", [])
+
+    def use(**values) -> None:
+        for name, value in values.items():
+            monkeypatch.setenv(name.upper(), str(value))
+        get_settings.cache_clear()
+
+    use(profiling_enabled=True, profiling_token=TOKEN, profiling_output_dir=tmp_path)
+    yield use
+    monkeypatch.undo()
+    get_settings.cache_clear()
+
+
+@pytest_asyncio.fixture
+async def profiled(settings):
+    """A client for a small app behind ProfilingMiddleware; returns (client, gate)."""
+    # Requests to /slow wait here, so tests can hold one in flight
+    gate = asyncio.Event()
+
+    async def app(scope, receive, send):
+        if scope["path"] == "/slow":
+            await gate.wait()
+        await send({"type": "http.response.start", "status": 200, "headers": []})
+        await send({"type": "http.response.body", "body": b"ok"})
+
+    transport = httpx.ASGITransport(app=ProfilingMiddleware(app))
+    async with httpx.AsyncClient(transport=transport, base_url="http://test") as http:
+        yield http, gate
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("headers", [{}, {"X-Profile": "wrong"}, {"X-Profile": ""}])
+async def test_requests_without_the_token_pass_through(profiled, tmp_path, headers):
+    client, _ = profiled
+
+    response = await client.get("/api/v1/cycle/current", headers=headers)
+
+    assert (response.status_code, response.text) == (200, "ok")
+    assert "x-profile-file" not in response.headers
+    assert _StubProfiler.instances == []
+    assert list(tmp_path.iterdir()) == []
+
+
+@pytest.mark.asyncio
+async def test_request_with_the_token_is_profiled(profiled, tmp_path):
+    client, _ = profiled
+
+    response = await client.get("/api/v1/cycle/current", headers={"X-Profile": TOKEN})
+
+    assert (response.status_code, response.text) == (200, "ok")
+    filename = response.headers["x-profile-file"]
+    assert re.fullmatch(r"[\d.T]+-GET-api-v1-cycle-current-[0-9a-f]{6}\.speedscope\.json", filename)
+    assert (tmp_path / filename).read_text() == '{"renderer": "_StubRenderer"}'
+    (profiler,) = _StubProfiler.instances
+    assert profiler.events == ["start", "stop"]
+    assert profiler.interval == get_settings().profiling_interval_seconds
+
+
+@pytest.mark.asyncio
+async def test_one_profile_at_a_time(profiled, tmp_path):
+    client, gate = profiled
+    headers = {"X-Profile": TOKEN}
+
+    first = asyncio.create_task(client.get("/slow", headers=headers))
+    while not _StubProfiler.instances:
+        await asyncio.sleep(0.01)
+
+    # Arrives while the first is still being profiled: served unprofiled
+    second = await client.get("/fast", headers=headers)
+    assert second.status_code == 200
+    assert "x-profile-file" not in second.headers
+
+    gate.set()
+    first = await first
+    assert "x-profile-file" in first.headers
+    assert len(_StubProfiler.instances) == 1
+
+    # The guard is released once the profile is written
+    third = await client.get("/fast", headers=headers)
+    assert "x-profile-file" in third.headers
+    assert len(list(tmp_path.iterdir())) == 2
+
+
+def test_profiling_needs_a_token(settings, monkeypatch, capsys):
+    monkeypatch.delenv("PROFILING_TOKEN")
+    get_settings.cache_clear()
+
+    assert profiling.profiling_available() is False
+    assert "without PROFILING_TOKEN" in capsys.readouterr().out
+
+
+def test_profiling_needs_pyinstrument(settings, monkeypatch, capsys):
+    assert profiling.profiling_available() is True
+
+    monkeypatch.setattr(profiling.importlib.util, "find_spec", lambda name: None)
+
+    assert profiling.profiling_available() is False
+    assert "pyinstrument is not installed" in capsys.readouterr().out
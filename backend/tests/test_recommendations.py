@@ -0,0 +1,78 @@
+"""
+Tests for the daily recommendation cache (recommendation_service).
+"""
+
+import pytest
+
+from app.models.workout import CyclePhase
+from app.services import recommendation_service, user_service, workout_service
+
+
+@pytest.fixture
+def history_reads(monkeypatch) -> list[str]:
+    """User IDs whose workout history was read."""
+    reads = []
+    get_workout_history = workout_service.get_workout_history
+
+    async def counted(user_id, *args, **kwargs):
+        reads.append(user_id)
+        return await get_workout_history(user_id, *args, **kwargs)
+
+    monkeypatch.setattr(workout_service, "get_workout_history", counted)
+    return reads
+
+
+async def _recommend(uid: str):
+    user = await user_service.get_user_profile(uid)
+    return await recommendation_service.get_recommendations_for_profile(user, "luteal", 20)
+
+
+@pytest.mark.asyncio
+async def test_repeat_request_is_served_from_the_user_pointer(seed_profile, catalog, claude, history_reads):
+    seed_profile("sam")
+
+    first = await _recommend("sam")
+    second = await _recommend("sam")
+
+    assert len(claude) == 1
+    assert history_reads == ["sam"]
+    assert second.to_dict() == first.to_dict()
+
+
+@pytest.mark.asyncio
+async def test_identical_prompts_share_one_call(seed_profile, catalog, claude):
+    seed_profile("sam")
+    seed_profile("kim")
+
+    await _recommend("sam")
+    await _recommend("kim")
+
+    assert len(claude) == 1
+
+
+@pytest.mark.asyncio
+async def test_catalog_reload_bypasses_the_user_pointer(seed_profile, catalog, claude, history_reads):
+    seed_profile("sam")
+    await _recommend("sam")
+
+    # A hot reload renames a workout offered for the luteal phase
+    workout = next(w for w in catalog.workouts if CyclePhase.LUTEAL in w.recommended_phases)
+    assert catalog.apply_changes([workout.model_copy(update={"title": "Renamed"})])
+
+    await _recommend("sam")
+
+    assert history_reads == ["sam", "sam"]
+    assert len(claude) == 2
+    assert "Renamed" in claude[1]
+
+
+@pytest.mark.asyncio
+async def test_profile_change_invalidates_the_user_pointer(seed_profile, catalog, claude, history_reads):
+    seed_profile("sam")
+    await _recommend("sam")
+
+    await recommendation_service.invalidate_user_recommendations("sam")
+    await _recommend("sam")
+
+    assert history_reads == ["sam", "sam"]
+    assert len(claude) == 1
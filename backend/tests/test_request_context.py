@@ -0,0 +1,112 @@
+"""
+Tests for the request-scoped profile memo behind user_service.get_user_profile.
+"""
+
+import pytest
+
+from app.middleware.request_context import RequestContextMiddleware
+from app.models.user import UserUpdate
+from app.services import user_service
+
+
+@pytest.fixture
+def profile_reads(monkeypatch) -> list[str]:
+    """Paths of the documents user_service reads, in order."""
+    get_document = user_service.get_document
+    reads = []
+
+    async def counting_get(ref):
+        reads.append(ref.path)
+        return await get_document(ref)
+
+    monkeypatch.setattr(user_service, "get_document", counting_get)
+    return reads
+
+
+async def _in_request(handler) -> None:
+    """Run handler inside RequestContextMiddleware, as an API request would."""
+
+    async def app(scope, receive, send):
+        await handler()
+
+    await RequestContextMiddleware(app)({"type": "http"}, None, None)
+
+
+@pytest.mark.asyncio
+async def test_repeated_reads_in_a_request_hit_firestore_once(seed_profile, profile_reads):
+    seed_profile("alex", display_name="Alex")
+    seen = []
+
+    async def handler():
+        for _ in range(3):
+            seen.append(await user_service.get_user_profile("alex"))
+
+    await _in_request(handler)
+
+    assert profile_reads == ["users/alex"]
+    assert [profile.display_name for profile in seen] == ["Alex"] * 3
+
+
+@pytest.mark.asyncio
+async def test_invalidating_after_a_write_makes_the_next_read_fresh(db, seed_profile, profile_reads):
+    seed_profile("alex", display_name="Alex")
+    names = []
+
+    async def handler():
+        names.append((await user_service.get_user_profile("alex")).display_name)
+        db.document("users/alex").update({"display_name": "Al"})
+        # Without invalidation the memo still holds the old profile
+        names.append((await user_service.get_user_profile("alex")).display_name)
+        user_service.invalidate_cached_profile("alex")
+        names.append((await user_service.get_user_profile("alex")).display_name)
+        names.append((await user_service.get_user_profile("alex")).display_name)
+
+    await _in_request(handler)
+
+    assert names == ["Alex", "Alex", "Al", "Al"]
+    assert profile_reads == ["users/alex"] * 2
+
+
+@pytest.mark.asyncio
+async def test_update_user_profile_refreshes_the_memo(seed_profile, profile_reads):
+    seed_profile("alex", display_name="Alex")
+    names = []
+
+    async def handler():
+        names.append((await user_service.get_user_profile("alex")).display_name)
+        await user_service.update_user_profile("alex", UserUpdate(display_name="Al"))
+        names.append((await user_service.get_user_profile("alex")).display_name)
+
+    await _in_request(handler)
+
+    assert names == ["Alex", "Al"]
+    # The memoized read, the update's existence check and its re-read of
+    # the new profile; the last get_user_profile is served from the memo
+    assert profile_reads == ["users/alex"] * 3
+
+
+@pytest.mark.asyncio
+async def test_missing_profile_is_memoized_too(db, profile_reads):
+    async def handler():
+        assert await user_service.get_user_profile("nobody") is None
+        assert await user_service.get_user_profile("nobody") is None
+
+    await _in_request(handler)
+
+    assert profile_reads == ["users/nobody"]
+
+
+@pytest.mark.asyncio
+async def test_each_request_and_background_work_read_again(seed_profile, profile_reads):
+    seed_profile("alex")
+
+    async def handler():
+        await user_service.get_user_profile("alex")
+
+    await _in_request(handler)
+    await _in_request(handler)
+    # Outside a request there is no memo
+    await user_service.get_user_profile("alex")
+    await user_service.get_user_profile("alex")
+
+    assert profile_reads == ["users/alex"] * 4
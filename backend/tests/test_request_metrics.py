@@ -0,0 +1,215 @@
+"""
+Tests for the per-request Firestore accounting and the Server-Timing header.
+"""
+
+import re
+from types import SimpleNamespace
+
+import pytest
+
+from app.config.settings import get_settings
+from app.middleware import request_metrics
+from app.middleware.request_metrics import (
+    RequestMetricsMiddleware,
+    document_size,
+    get_request_stats,
+)
+from app.utils.firestore import (
+    BatchWriter,
+    commit_batch,
+    fetch_documents,
+    get_document,
+    run_transaction,
+)
+from tests.conftest import USER_HEADER
+
+# users/alex holding {"n": 1}: name 6 + 5 + 16, field 2 + 8, overhead 32
+ALEX_SIZE = 27 + 10 + 32
+
+_FIRESTORE_TIMING = re.compile(
+    r'firestore;dur=[\d.]+;desc="(\d+) reads, (\d+) writes, (\d+) B"'
+)
+
+
+async def _request(handler) -> tuple[request_metrics.RequestStats, str]:
+    """
+    Run handler as an HTTP request behind RequestMetricsMiddleware.
+
+    Returns:
+        The request's stats and its Server-Timing header ("" if not sent)
+    """
+    seen = {}
+
+    async def app(scope, receive, send):
+        await handler()
+        seen["stats"] = get_request_stats()
+        await send({"type": "http.response.start", "status": 200, "headers": []})
+        await send({"type": "http.response.body", "body": b""})
+
+    messages = []
+
+    async def send(message):
+        messages.append(message)
+
+    scope = {"type": "http", "method": "GET", "path": "/probe"}
+    await RequestMetricsMiddleware(app)(scope, None, send)
+    headers = dict(messages[0]["headers"])
+    return seen["stats"], headers.get(b"server-timing", b"").decode()
+
+
+def _firestore_timing(header: str) -> tuple[int, int, int]:
+    reads, writes, size = _FIRESTORE_TIMING.search(header).groups()
+    return int(reads), int(writes), int(size)
+
+
+@pytest.fixture
+def alex(db):
+    db.seed("users/alex", {"n": 1})
+    return db.collection("users").document("alex")
+
+
+def test_document_size_uses_the_public_snapshot_api():
+    snapshot = SimpleNamespace(
+        exists=True,
+        reference=SimpleNamespace(path="users/alex"),
+        to_dict=lambda: {"n": 1},
+    )
+    assert document_size(snapshot) == ALEX_SIZE
+    assert document_size(SimpleNamespace(exists=False)) == 0
+
+
+@pytest.mark.asyncio
+async def test_point_reads(db, alex):
+    async def handler():
+        await get_document(alex)
+        # A missing document is still a billed read, of no bytes
+        await get_document(db.collection("users").document("nobody"))
+
+    stats, header = await _request(handler)
+
+    assert (stats.firestore_calls, stats.firestore_reads, stats.firestore_writes) == (2, 2, 0)
+    assert stats.firestore_bytes_read == ALEX_SIZE
+    assert _firestore_timing(header) == (2, 0, ALEX_SIZE)
+    assert header.startswith("app;dur=")
+
+
+@pytest.mark.asyncio
+async def test_queries_read_every_result_and_at_least_one(db):
+    for k in range(3):
+        db.seed(f"users/u{k}", {"n": k})
+
+    async def handler():
+        await fetch_documents(db.collection("users"))
+        await fetch_documents(db.collection("users").where("n", ">", 5))
+
+    stats, header = await _request(handler)
+
+    assert (stats.firestore_calls, stats.firestore_reads) == (2, 3 + 1)
+    assert stats.firestore_bytes_read == 3 * (25 + 10 + 32)
+    assert _firestore_timing(header)[:2] == (4, 0)
+
+
+@pytest.mark.asyncio
+async def test_batches_count_each_write(db, monkeypatch):
+    monkeypatch.setattr("app.utils.firestore.MAX_BATCH_WRITES", 2)
+    users = db.collection("users")
+
+    async def handler():
+        batch = db.batch()
+        batch.set(users.document("a"), {"n": 1})
+        batch.update(users.document("a"), {"n": 2})
+        batch.delete(users.document("b"))
+        await commit_batch(batch)
+        # Commits a batch of 2 when full, then 1 on flush
+        writer = BatchWriter(db)
+        for k in range(3):
+            await writer.set(users.document(f"w{k}"), {"n": k})
+        await writer.flush()
+
+    stats, header = await _request(handler)
+
+    assert (stats.firestore_calls, stats.firestore_reads, stats.firestore_writes) == (3, 0, 6)
+    assert _firestore_timing(header) == (0, 6, 0)
+
+
+@pytest.mark.asyncio
+async def test_retried_transaction_counts_every_attempts_reads(db, alex):
+    attempts = 0
+
+    def increment(ops, ref):
+        nonlocal attempts
+        attempts += 1
+        n = ops.get(ref).get("n")
+        if attempts == 1:
+            # Another client writes the document mid-transaction: aborted
+            db.document("users/alex").update({"n": 10})
+        ops.set(ref, {"n": n + 1})
+        ops.update(ref, {"seen": True})
+
+    async def handler():
+        await run_transaction(db, increment, alex)
+
+    stats, header = await _request(handler)
+
+    assert attempts == 2
+    assert db.document("users/alex").get().to_dict() == {"n": 11, "seen": True}
+    # Both attempts' reads are billed; only the last attempt's writes commit
+    assert (stats.firestore_calls, stats.firestore_reads, stats.firestore_writes) == (1, 2, 2)
+    assert stats.firestore_bytes_read == ALEX_SIZE * 2
+    assert _firestore_timing(header) == (2, 2, ALEX_SIZE * 2)
+
+
+@pytest.mark.asyncio
+async def test_no_firestore_entry_without_firestore_calls(db):
+    async def handler():
+        pass
+
+    stats, header = await _request(handler)
+
+    assert stats.firestore_calls == 0
+    assert header.startswith("app;dur=") and "firestore" not in header
+
+
+@pytest.mark.asyncio
+async def test_server_timing_can_be_turned_off(db, alex, monkeypatch):
+    monkeypatch.setenv("SERVER_TIMING_HEADER", "false")
+    get_settings.cache_clear()
+    try:
+        async def handler():
+            await get_document(alex)
+
+        stats, header = await _request(handler)
+    finally:
+        monkeypatch.undo()
+        get_settings.cache_clear()
+
+    assert stats.firestore_reads == 1
+    assert header == ""
+
+
+@pytest.mark.asyncio
+async def test_reads_outside_a_request_are_counted_without_a_route(db, alex):
+    before = request_metrics.FIRESTORE_READS.value(route="none")
+
+    await get_document(alex)
+
+    assert get_request_stats() is None
+    assert request_metrics.FIRESTORE_READS.value(route="none") == before + 1
+
+
+@pytest.mark.asyncio
+async def test_per_route_totals(client, seed_profile):
+    seed_profile("alex")
+    route = "/api/v1/users/me"
+    requests_before = request_metrics.HTTP_REQUESTS.value(method="GET", route=route, status=200)
+    reads_before = request_metrics.FIRESTORE_READS.value(route=route)
+
+    response = await client.get(route, headers={USER_HEADER: "alex"})
+
+    assert response.status_code == 200
+    reads = _firestore_timing(response.headers["server-timing"])[0]
+    assert reads >= 1
+    assert request_metrics.HTTP_REQUESTS.value(method="GET", route=route, status=200) == (
+        requests_before + 1
+    )
+    assert request_metrics.FIRESTORE_READS.value(route=route) == reads_before + reads
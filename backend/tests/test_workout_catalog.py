@@ -0,0 +1,90 @@
+"""
+Tests for the indexed workout catalog, against the list scans it replaced
+(kept in benchmarks/workout_catalog.py).
+"""
+
+import itertools
+import json
+import random
+
+import pytest
+
+from app.models.workout import CyclePhase, IntensityLevel, WorkoutCategory
+from app.services.workout_catalog import WorkoutCatalog
+from benchmarks.workout_catalog import scan_filter, scan_get, synthetic_workouts
+
+FILTERS = list(itertools.product(
+    [None, *WorkoutCategory],
+    [None, *IntensityLevel],
+    [None, *CyclePhase],
+))
+
+
+@pytest.fixture
+def workouts():
+    return synthetic_workouts(300)
+
+
+@pytest.mark.parametrize("category,intensity,phase", FILTERS)
+def test_filter_matches_scan(workouts, category, intensity, phase):
+    catalog = WorkoutCatalog(workouts)
+    for offset in (0, 7, 100, 300):
+        expected = scan_filter(workouts, category, intensity, phase, 20, offset)
+        assert catalog.filter(category, intensity, phase, 20, offset) == expected
+
+
+def test_filter_json_matches_filter(workouts):
+    catalog = WorkoutCatalog(workouts)
+    for category, intensity, phase in FILTERS:
+        summaries, total = catalog.filter(category, intensity, phase, limit=50)
+        encoded, encoded_total = catalog.filter_json(category, intensity, phase, limit=50)
+        assert encoded_total == total
+        assert [json.loads(e) for e in encoded] == [s.model_dump(mode="json") for s in summaries]
+
+
+def test_lookups(workouts):
+    catalog = WorkoutCatalog(workouts)
+    for workout in random.Random(1).sample(workouts, 50):
+        assert catalog.get(workout.id) is scan_get(workouts, workout.id)
+        assert json.loads(catalog.get_json(workout.id)) == workout.model_dump(mode="json")
+    assert catalog.get("missing") is None
+    assert catalog.get_json("missing") is None
+    assert len(catalog) == len(workouts)
+
+
+def test_duplicate_ids_keep_first_position_and_last_entry(workouts):
+    replacement = workouts[0].model_copy(update={"title": "Replacement"})
+    catalog = WorkoutCatalog([*workouts, replacement])
+
+    assert len(catalog) == len(workouts)
+    assert catalog.workouts[0] is replacement
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_edits_keep_indexes_consistent(workouts, seed):
+    """After random upserts and removals, filters still match a scan."""
+    rng = random.Random(seed)
+    catalog = WorkoutCatalog(workouts)
+    current = {w.id: w for w in workouts}
+    extra = synthetic_workouts(400, seed=seed + 100)[300:]
+
+    for _ in range(20):
+        removals = rng.sample(sorted(current), 5)
+        upserts = [
+            w.model_copy(update={"intensity": rng.choice(list(IntensityLevel))})
+            for w in rng.sample(list(current.values()), 5)
+        ] + [extra.pop() for _ in range(3)]
+        catalog.apply_changes(upserts, removals)
+        # Upserts apply first, then removals
+        for workout in upserts:
+            current[workout.id] = workout
+        for workout_id in removals:
+            current.pop(workout_id, None)
+
+    # Catalog order: surviving original positions, then additions
+    ordered = catalog.workouts
+    assert {w.id for w in ordered} == set(current)
+    for category, intensity, phase in FILTERS:
+        expected = scan_filter(ordered, category, intensity, phase, 20, 10)
+        assert catalog.filter(category, intensity, phase, 20, 10) == expected
+    assert WorkoutCatalog(ordered).filter(limit=1000) == catalog.filter(limit=1000)